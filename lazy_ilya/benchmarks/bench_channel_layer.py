@@ -0,0 +1,98 @@
+"""
+Пропускная способность слоя каналов: InMemoryChannelLayer и SQLiteChannelLayer.
+
+Замеряются send + receive по одному каналу, group_send в группу из нескольких
+каналов с чтением всех копий и задержка доставки сообщения из другого процесса
+(только для SQLite: слой в памяти другим процессам не виден).
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_channel_layer --messages 2000 --group-size 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from channels.layers import InMemoryChannelLayer
+
+from lazy_ilya.utils.sqlite_channel_layer import SQLiteChannelLayer
+
+MESSAGE = {"type": "send_progress", "progress": {"job_id": 1, "progress": 50, "rows_done": 500}}
+
+
+async def send_receive(layer, messages: int) -> float:
+    """send и сразу receive по одному каналу; возвращает сообщений в секунду."""
+    start = time.perf_counter()
+    for _ in range(messages):
+        await layer.send("bench.channel", MESSAGE)
+        await layer.receive("bench.channel")
+    return messages / (time.perf_counter() - start)
+
+
+async def group_fan_out(layer, messages: int, group_size: int) -> float:
+    """group_send в группу и чтение всех копий; возвращает доставленных сообщений в секунду."""
+    channels = [f"bench.member{num}" for num in range(group_size)]
+    for channel in channels:
+        await layer.group_add("bench", channel)
+    start = time.perf_counter()
+    for _ in range(messages):
+        await layer.group_send("bench", MESSAGE)
+        for channel in channels:
+            await layer.receive(channel)
+    return messages * group_size / (time.perf_counter() - start)
+
+
+def remote_sender(path: str, messages: int) -> None:
+    """Отправляет сообщения из другого процесса, вложив время отправки."""
+    layer = SQLiteChannelLayer(path)
+
+    async def send_all():
+        for _ in range(messages):
+            await layer.send("bench.remote", {"type": "ping", "sent": time.time()})
+            await asyncio.sleep(0.01)
+
+    asyncio.run(send_all())
+
+
+async def cross_process_latency(path: str, messages: int) -> float:
+    """Средняя задержка доставки сообщения из другого процесса, в миллисекундах."""
+    layer = SQLiteChannelLayer(path)
+    process = multiprocessing.get_context("spawn").Process(target=remote_sender, args=(path, messages))
+    process.start()
+    latencies = []
+    for _ in range(messages):
+        message = await layer.receive("bench.remote")
+        latencies.append(time.time() - message["sent"])
+    process.join()
+    await layer.close()
+    return sum(latencies) / len(latencies) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000, help="Количество сообщений.")
+    parser.add_argument("--group-size", type=int, default=10, help="Каналов в группе.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "channels.sqlite3")
+        layers = {
+            "InMemoryChannelLayer": lambda: InMemoryChannelLayer(capacity=args.messages),
+            "SQLiteChannelLayer": lambda: SQLiteChannelLayer(path, capacity=args.messages),
+        }
+        print(f"Сообщений: {args.messages}, каналов в группе: {args.group_size}")
+        for name, make_layer in layers.items():
+            layer = make_layer()
+            single = asyncio.run(send_receive(layer, args.messages))
+            fan_out = asyncio.run(group_fan_out(layer, args.messages // args.group_size, args.group_size))
+            print(f"{name:22} send+receive: {single:9.0f} сообщ./с   group_send: {fan_out:9.0f} сообщ./с")
+            asyncio.run(layer.close())
+
+        latency = asyncio.run(cross_process_latency(path, 100))
+        print(f"SQLiteChannelLayer: задержка доставки из другого процесса {latency:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Время синхронизации записей городов с базой при повторном импорте.
+
+Сравниваются синхронизация через ORM (bulk_create, bulk_update и удаление
+через exclude(id__in=[...])) и через временную таблицу city_staging
+(GlobusParser._sync_city_data). Повторный импорт меняет все строки и удаляет
+последнюю. Замеры идут на отдельной тестовой базе, рабочая база не трогается.
+
+33000 строк больше SQLITE_MAX_VARIABLE_NUMBER по умолчанию (32766): со сборкой
+SQLite с этим пределом синхронизация через ORM на таком объеме падает (в таблице
+"падает"), через staging — нет. В тестах тот же случай проверяется с пределом,
+сниженным до 100.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_city_sync --rows 1000 10000 33000
+"""
+import argparse
+import os
+import time
+from typing import Any, List, Optional, Tuple
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lazy_ilya.settings")
+import django
+
+django.setup()
+
+from django.db import connection, OperationalError
+
+from cities.models import CityData, TableNames
+from cities.utils.parser_word.globus_parser import GlobusParser
+
+UPDATE_FIELDS = [
+    "location", "name_organ", "pseudonim", "letters",
+    "writing", "ip_address", "some_number", "work_time",
+]
+
+
+def staged_rows(table_id: int, rows_count: int, prefix: str) -> List[Tuple[Any, ...]]:
+    """Строки в формате staging: (table_id, *GlobusParser.SYNC_FIELDS)."""
+    return [
+        (table_id, num, f"{prefix} {num}", f"Орган {num}", f"Псевдоним {num}", True, False,
+         f"10.0.{num // 250}.{num % 250}", str(num), "9-18")
+        for num in range(1, rows_count + 1)
+    ]
+
+
+def sync_with_orm(table: TableNames, rows: List[Tuple[Any, ...]]) -> None:
+    """Синхронизация до оптимизации: bulk_create, bulk_update и exclude(id__in=[...])."""
+    existing = {row.dock_num: row for row in CityData.objects.filter(table_id=table)}
+    to_add, to_update, processed = [], [], []
+    for _, dock_num, *values in rows:
+        data = dict(zip(UPDATE_FIELDS, values))
+        row = existing.get(dock_num)
+        if row is None:
+            row = CityData(table_id=table, dock_num=dock_num, **data)
+            to_add.append(row)
+        elif any(getattr(row, key) != value for key, value in data.items()):
+            for key, value in data.items():
+                setattr(row, key, value)
+            to_update.append(row)
+        processed.append(row)
+    CityData.objects.bulk_create(to_add)
+    CityData.objects.bulk_update(to_update, UPDATE_FIELDS)
+    CityData.objects.exclude(id__in=[row.id for row in processed]).delete()
+
+
+def sync_with_staging(table: TableNames, rows: List[Tuple[Any, ...]]) -> None:
+    """Синхронизация через временную таблицу."""
+    GlobusParser._sync_city_data(rows)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM city_staging")
+        if cursor.fetchone()[0]:
+            raise SystemExit("Временная таблица city_staging не очищена!")
+
+
+def measure(sync, rows_count: int) -> Optional[float]:
+    """
+    Загружает rows_count строк и замеряет повторный импорт с изменением всех строк.
+
+    Returns:
+        Optional[float]: Время повторного импорта или None, если запрос превысил
+        предел числа параметров SQLite.
+    """
+    CityData.objects.all().delete()
+    TableNames.objects.all().delete()
+    table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+    sync(table, staged_rows(table.id, rows_count, "Город"))
+    reimport = staged_rows(table.id, rows_count - 1, "Новый")
+    start = time.perf_counter()
+    try:
+        sync(table, reimport)
+    except OperationalError as e:
+        if "too many SQL variables" not in str(e):
+            raise
+        return None
+    elapsed = time.perf_counter() - start
+    if CityData.objects.filter(location__startswith="Новый").count() != rows_count - 1:
+        raise SystemExit("Результаты синхронизации не совпадают!")
+    return elapsed
+
+
+def format_time(seconds: Optional[float]) -> str:
+    return f"{seconds:.3f}" if seconds is not None else "падает"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000, 33_000],
+                        help="Количество строк в таблице (можно несколько).")
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f"{'Строк':>8} {'ORM, c':>10} {'staging, c':>12}")
+        for rows_count in args.rows:
+            orm_time = measure(sync_with_orm, rows_count)
+            staging_time = measure(sync_with_staging, rows_count)
+            print(f"{rows_count:>8} {format_time(orm_time):>10} {format_time(staging_time):>12}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
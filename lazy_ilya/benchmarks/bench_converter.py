@@ -0,0 +1,72 @@
+"""
+Сравнение последовательной и параллельной конвертации .doc/.rtf в .docx (Converter.convert_files)
+в пуле из одного и из нескольких процессов (ConverterPool).
+
+Файлы test_files/*.doc и test_files/*.rtf копируются во временный каталог столько раз,
+сколько нужно для заданного размера пакета.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_converter --files 20 --workers 4
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from file_creator.utils.custom_converter.converter_to_docx import Converter, warm_up
+from file_creator.utils.custom_converter.worker_pool import ConverterPool
+
+TEST_FILES = Path(__file__).resolve().parent.parent.parent / "test_files"
+
+
+def source_files() -> List[Path]:
+    """Возвращает исходные .doc и .rtf из test_files."""
+    return sorted([*TEST_FILES.glob("*.doc"), *TEST_FILES.glob("*.rtf")])
+
+
+def prepare_batch(directory: Path, files_count: int) -> None:
+    """Копирует исходные файлы в directory, пока их не станет files_count."""
+    sources = source_files()
+    for index in range(files_count):
+        source = sources[index % len(sources)]
+        shutil.copy(source, directory / f"{index + 1}_{source.name}")
+
+
+def run(files_count: int, workers: int) -> float:
+    """Конвертирует пакет из files_count файлов в прогретом пуле и возвращает время в секундах."""
+    pool = ConverterPool(size=workers, warmup=warm_up)
+    pool.start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = Path(tmp_dir)
+        prepare_batch(directory, files_count)
+        converter = Converter(str(directory), max_workers=workers, pool=pool)
+        converter.convert_files()  # Дожидаемся прогрева процессов
+        start = time.perf_counter()
+        converted = converter.convert_files()
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        if len(converted) != files_count or converter.errors:
+            raise SystemExit(f"Ошибки конвертации: {converter.errors}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20, help="Количество файлов в пакете.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Количество процессов.")
+    args = parser.parse_args()
+
+    serial = run(args.files, workers=1)
+    parallel = run(args.files, workers=args.workers)
+
+    print(f"Файлов: {args.files}, ядер: {os.cpu_count()}")
+    print(f"Последовательно:           {serial:.2f} c")
+    print(f"Параллельно ({args.workers} процесса): {parallel:.2f} c")
+    print(f"Ускорение:                 x{serial / parallel:.1f}")
+
+
+if __name__ == "__main__":
+    main()
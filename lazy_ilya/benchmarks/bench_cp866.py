@@ -0,0 +1,62 @@
+"""
+Сравнение замены неподдерживаемых cp866 символов: проверка каждого символа через
+encode в try/except (прежний replace_unsupported_characters) против одного вызова кодека.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_cp866 --megabytes 4
+"""
+import argparse
+import random
+import time
+from typing import Callable
+
+from file_creator.utils.parser_word.cp866_text import to_cp866_text
+
+# Обычный русский текст с небольшой долей типографских и прочих символов вне cp866
+ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя АБВГД 0123456789 .,;:!?-\n" * 20 + "«»—–“”…€☺"
+
+
+def legacy_replace(text: str, replacement: str = "?") -> str:
+    """Прежняя реализация: encode и исключение на каждый символ."""
+
+    def can_encode(char: str) -> bool:
+        try:
+            char.encode("cp866")
+            return True
+        except UnicodeEncodeError:
+            return False
+
+    return "".join(char if can_encode(char) else replacement for char in text)
+
+
+def measure(func: Callable[[], object]) -> float:
+    """Время выполнения func в секундах."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=4, help="Размер текста в мегабайтах (символах * 2^20).")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    text = "".join(rnd.choices(ALPHABET, k=int(args.megabytes * 2 ** 20)))
+    unsupported = sum(1 for char in set(text) if legacy_replace(char) == "?" and char != "?")
+
+    if to_cp866_text(text) != legacy_replace(text):
+        raise SystemExit("Результаты различаются")
+
+    legacy = measure(lambda: legacy_replace(text))
+    current = measure(lambda: to_cp866_text(text))
+    translit = measure(lambda: to_cp866_text(text, transliterate=True))
+
+    print(f"Символов: {len(text)}, из них разных вне cp866: {unsupported}")
+    print(f"Посимвольно:          {legacy:.3f} c")
+    print(f"Кодек, замена на '?': {current:.3f} c  (x{legacy / current:.0f})")
+    print(f"Кодек, транслитерация: {translit:.3f} c  (x{legacy / translit:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Сравнение скорости чтения globus.docx: python-docx против потокового чтения через lxml.iterparse.
+
+Исходный test_files/globus.docx размножается до заданного количества строк таблиц.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_globus_reader --rows 10000
+"""
+import argparse
+import copy
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from docx import Document
+
+from cities.utils.parser_word.docx_stream_reader import read_docx_tables
+from file_creator.utils.custom_converter.worker_pool import peak_rss
+
+GLOBUS_FILE = Path(__file__).resolve().parent.parent.parent / "test_files" / "globus.docx"
+
+
+def build_scaled_document(target_rows: int, path: Path) -> int:
+    """
+    Размножает строки данных таблиц globus.docx, пока их не станет не меньше target_rows.
+
+    Returns:
+        int: Итоговое количество строк во всех таблицах.
+    """
+    document = Document(GLOBUS_FILE)
+    tables = document.tables
+    total = sum(len(table.rows) for table in tables)
+    while total < target_rows:
+        for table in tables:
+            data_rows = [row._tr for row in table.rows[3:]]
+            for tr in data_rows:
+                table._tbl.append(copy.deepcopy(tr))
+            total += len(data_rows)
+    document.save(path)
+    return total
+
+
+def read_with_python_docx(path: Path) -> List[List[List[str]]]:
+    """Путь чтения до оптимизации: объектная модель python-docx и cell.text по каждой ячейке."""
+    document = Document(path)
+    _ = [p.text for p in document.paragraphs]
+    return [[[cell.text.strip() for cell in row.cells] for row in table.rows[3:]] for table in document.tables]
+
+
+def read_with_stream(path: Path) -> List[List[List[str]]]:
+    """Потоковое чтение через lxml.iterparse."""
+    _, tables = read_docx_tables(path)
+    return [[[cell.strip() for cell in row] for row in table[3:]] for table in tables]
+
+
+def measure(func: Callable[[Path], list], path: Path, repeat: int) -> float:
+    """Возвращает лучшее время выполнения из repeat запусков, в секундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _ru_maxrss_bytes() -> Optional[int]:
+    """Пик RSS по getrusage, если на платформе нет ни VmHWM, ни PeakWorkingSetSize (macOS)."""
+    try:
+        import resource  # Модуля нет в Windows
+    except ImportError:
+        return None
+    # В macOS ru_maxrss в байтах, в остальных Unix — в килобайтах
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def _peak_rss_worker(func: Callable[[Path], list], path: Path, queue: multiprocessing.Queue) -> None:
+    func(path)
+    # ru_maxrss в Linux сохраняется через execve и наследует пик родителя, поэтому сначала VmHWM
+    peak = peak_rss()
+    queue.put(peak if peak is not None else _ru_maxrss_bytes())
+
+
+def measure_peak_rss(func: Callable[[Path], list], path: Path) -> Optional[float]:
+    """
+    Возвращает пиковое потребление памяти (RSS) отдельного свежего процесса, выполнившего func, в МБ.
+
+    Returns:
+        Optional[float]: Пик RSS или None, если на этой платформе его не узнать.
+    """
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_peak_rss_worker, args=(func, path, queue))
+    process.start()
+    peak = queue.get(timeout=600)
+    process.join()
+    return peak / 2 ** 20 if peak is not None else None
+
+
+def format_rss(megabytes: Optional[float]) -> str:
+    return f"{megabytes:.0f} МБ" if megabytes is not None else "н/д"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Минимальное количество строк таблиц.")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов каждого замера.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "globus_scaled.docx"
+        total_rows = build_scaled_document(args.rows, path)
+        if read_with_python_docx(path) != read_with_stream(path):
+            raise SystemExit("Результаты чтения не совпадают!")
+
+        docx_time = measure(read_with_python_docx, path, args.repeat)
+        stream_time = measure(read_with_stream, path, args.repeat)
+        docx_rss = measure_peak_rss(read_with_python_docx, path)
+        stream_rss = measure_peak_rss(read_with_stream, path)
+
+    print(f"Строк в таблицах: {total_rows}")
+    print(f"python-docx:    {docx_time:.3f} c, пик памяти {format_rss(docx_rss)}")
+    print(f"lxml iterparse: {stream_time:.3f} c, пик памяти {format_rss(stream_rss)}")
+    print(f"Ускорение:      x{docx_time / stream_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
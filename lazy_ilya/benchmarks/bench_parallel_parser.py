@@ -0,0 +1,91 @@
+"""
+Сравнение последовательного разбора загруженных .docx и разбора в пуле parser_pool (iter_parsed_documents).
+
+Создаются синтетические документы: колонтитул с таблицей «Из:» / «г. Москва»,
+абзацы текста и таблицы, последняя — с подписью «Особый знак». Пул запускается
+до замера, как при старте приложения (asgi.py), поэтому время не включает запуск
+процессов. Результаты обоих способов сравниваются.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_parallel_parser --documents 50 --workers 4
+"""
+import argparse
+import io
+import os
+import time
+from typing import Dict, List
+from unittest.mock import patch
+
+from docx import Document
+
+from file_creator.utils.custom_converter.worker_pool import ConverterPool
+from file_creator.utils.parse_cache.cached_parsing import ParsedDocument, iter_parsed_documents
+from file_creator.utils.parse_cache.parse_cache import ParseResultCache
+from file_creator.utils.parser_word.my_parser import warm_up_parser
+
+
+def build_document(index: int, paragraphs: int, tables: int) -> bytes:
+    """Создает синтетический документ с колонтитулом, абзацами и таблицами."""
+    document = Document()
+    section = document.sections[0]
+    section.different_first_page_header_footer = True
+    header = section.first_page_header.add_table(rows=1, cols=2, width=section.page_width)
+    header.cell(0, 0).text = "Из:"
+    header.cell(0, 1).text = f"г. Москва молокозавод ильича д{index}"
+
+    document.add_paragraph(f"Куда и кому: г. Самара, получатель {index}")
+    document.add_paragraph("Уважаемый Федор Венедиктович!")
+    for table_index in range(tables):
+        for paragraph in range(paragraphs // tables):
+            document.add_paragraph(f"Абзац {index}.{table_index}.{paragraph} " + "lorem ipsum dolor sit amet " * 12)
+        table = document.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = f"Ячейка {table_index}"
+    document.tables[-1].cell(2, 0).text = "Особый знак"
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def run(documents: Dict[str, bytes], pool: ConverterPool) -> tuple:
+    """Разбирает загруженные документы без кэша и возвращает (время в секундах, результат)."""
+    start = time.perf_counter()
+    with patch("file_creator.utils.parser_word.my_parser.parser_pool", pool):
+        result: List[ParsedDocument] = sorted(
+            iter_parsed_documents(documents, 1, cache=ParseResultCache(max_bytes=0))
+        )
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50, help="Количество документов.")
+    parser.add_argument("--paragraphs", type=int, default=200, help="Абзацев в документе.")
+    parser.add_argument("--tables", type=int, default=40, help="Таблиц в документе.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Количество процессов.")
+    args = parser.parse_args()
+
+    documents = {
+        f"{index:03}.docx": build_document(index, args.paragraphs, args.tables) for index in range(args.documents)
+    }
+    pool = ConverterPool(size=args.workers, warmup=warm_up_parser, title="разбора")
+    pool.start()
+    try:
+        run(dict(list(documents.items())[:args.workers]), pool)  # Дождаться прогрева процессов
+        serial, serial_result = run(documents, ConverterPool(size=1))
+        parallel, parallel_result = run(documents, pool)
+    finally:
+        pool.shutdown()
+
+    if parallel_result != serial_result:
+        raise SystemExit("Результаты различаются")
+
+    print(f"Документов: {args.documents}, ядер: {os.cpu_count()}")
+    print(f"Последовательно:             {serial:.2f} c")
+    print(f"Параллельно, процессов {args.workers}:    {parallel:.2f} c")
+    print(f"Ускорение:                   x{serial / parallel:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Зависимость времени Parser.parse_document от количества таблиц и абзацев в документе.
+
+Синтетический документ состоит из чередующихся абзацев и таблиц; последняя таблица
+содержит подпись «Особый знак». Для сравнения замеряется и прежний способ обхода,
+который на каждую таблицу обращался к document.tables.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_parser --tables 100 200 400 800
+"""
+import argparse
+import io
+import time
+from typing import Callable, List
+
+from docx import Document
+from docx.document import Document as DocumentObject
+
+from file_creator.utils.parser_word.my_parser import Parser
+
+
+def build_document(tables_count: int, paragraphs_per_table: int = 2) -> bytes:
+    """Создает .docx с tables_count таблицами 3x3 и абзацами между ними."""
+    document = Document()
+    document.add_paragraph("Куда и кому: Тестовый адресат")
+    for index in range(tables_count):
+        for paragraph in range(paragraphs_per_table):
+            document.add_paragraph(f"Абзац {index}.{paragraph} " + "слово " * 20)
+        table = document.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = f"Ячейка {index}"
+    document.tables[-1].cell(2, 0).text = "Особый знак"
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def legacy_walk(document: DocumentObject) -> int:
+    """Прежний обход тела: document.tables вычисляется заново для каждой таблицы."""
+    num_tables = 0
+    for element in document.element.body:
+        if element.tag.endswith("tbl") and num_tables < len(document.tables):
+            table = document.tables[num_tables]
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text
+            num_tables += 1
+    return num_tables
+
+
+def measure(func: Callable[[DocumentObject], object], data: bytes, repeat: int) -> float:
+    """Лучшее время func на уже открытом документе, в секундах."""
+    document = Document(io.BytesIO(data))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(document)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, nargs="+", default=[100, 200, 400, 800], help="Количество таблиц.")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов замера.")
+    args = parser.parse_args()
+
+    rows: List[str] = []
+    for tables_count in args.tables:
+        data = build_document(tables_count)
+        current = measure(lambda document: Parser(None, 1).parse_document(document, "bench.docx"), data, args.repeat)
+        legacy = measure(legacy_walk, data, args.repeat)
+        rows.append(
+            f"{tables_count:>7} | {current:>9.3f} | {current / tables_count * 1000:>13.3f} | "
+            f"{legacy:>10.3f} | {legacy / tables_count * 1000:>14.3f}"
+        )
+
+    print("Таблиц  | Новый, c  | мс на таблицу | Прежний, c | мс на таблицу")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Сравнение разбора .rtf: конвертация Spire.Doc в .docx и разбор python-docx
+(convert_bytes_to_docx + Parser.stream_template) против прямого разбора RTF
+(Parser.rtf_template).
+
+Конвертация выполняется в текущем процессе, без пула: так измеряется работа,
+которую делает один процесс конвертера на каждый файл.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_rtf --repeat 10
+"""
+import argparse
+import io
+import time
+from pathlib import Path
+from typing import Callable
+
+from file_creator.utils.custom_converter.converter_to_docx import convert_bytes_to_docx
+from file_creator.utils.parser_word.my_parser import Parser
+
+TEST_FILES = Path(__file__).resolve().parent.parent.parent / "test_files"
+DEFAULT_FILES = ("example2.rtf", "example5.rtf")
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Среднее время одного вызова func в секундах."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Количество повторов на файл.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="Файлы .rtf из test_files.")
+    args = parser.parse_args()
+
+    word_parser = Parser(None, 1)
+    convert_bytes_to_docx(b"{\\rtf1 }", "warmup.rtf")  # Загрузка Spire.Doc не входит в замер
+
+    for name in args.files:
+        data = (TEST_FILES / name).read_bytes()
+
+        def spire() -> str:
+            return word_parser.stream_template(io.BytesIO(convert_bytes_to_docx(data, name)))
+
+        def direct() -> str:
+            return word_parser.rtf_template(data)
+
+        if spire() != direct():
+            raise SystemExit(f"{name}: результаты различаются")
+
+        spire_time = measure(spire, args.repeat)
+        direct_time = measure(direct, args.repeat)
+        print(f"{name} ({len(data) // 1024} КБ)")
+        print(f"  Spire.Doc + python-docx: {spire_time * 1000:8.1f} мс")
+        print(f"  Разбор RTF:              {direct_time * 1000:8.1f} мс  (x{spire_time / direct_time:.0f})")
+
+
+if __name__ == "__main__":
+    main()
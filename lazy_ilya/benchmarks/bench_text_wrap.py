@@ -0,0 +1,66 @@
+"""
+Сравнение переноса строк: прежний Parser.format_text против TextWrapper.
+
+Прежняя реализация собирала строку заново на каждое слово, поэтому время на абзац
+росло квадратично от числа слов в строке; TextWrapper хранит ширину строки числом.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_text_wrap --paragraphs 2000 --width 60 120 400
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from file_creator.utils.parser_word.text_wrap import TextWrapper
+
+WORDS = "Лорем ипсум долор сит амет консектетур адиписцинг элит г. Москва, д. 5".split()
+
+
+def legacy_format_text(text: str, max_length: int = 60) -> str:
+    """Прежняя реализация Parser.format_text."""
+    formatted_lines, current_line = [], []
+    for word in text.split():
+        if len(" ".join(current_line + [word])) <= max_length:
+            current_line.append(word)
+        else:
+            formatted_lines.append(" ".join(current_line))
+            current_line = [word]
+    if current_line:
+        formatted_lines.append(" ".join(current_line))
+    return "\n".join(formatted_lines)
+
+
+def build_paragraphs(count: int, words_per_paragraph: int = 120) -> List[str]:
+    """Случайные абзацы из WORDS."""
+    rnd = random.Random(0)
+    return [" ".join(rnd.choice(WORDS) for _ in range(words_per_paragraph)) for _ in range(count)]
+
+
+def measure(func: Callable[[], object]) -> float:
+    """Время выполнения func в секундах."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=2000, help="Количество абзацев.")
+    parser.add_argument("--width", type=int, nargs="+", default=[60, 120, 400], help="Ширина строки.")
+    args = parser.parse_args()
+
+    paragraphs = build_paragraphs(args.paragraphs)
+    print("Ширина | Прежний, c | TextWrapper, c | Ускорение")
+    for width in args.width:
+        wrapper = TextWrapper(width)
+        legacy_result = [legacy_format_text(text, width) for text in paragraphs]
+        if wrapper.wrap_many(paragraphs) != legacy_result:
+            raise SystemExit(f"Результаты различаются при ширине {width}")
+        legacy = measure(lambda: [legacy_format_text(text, width) for text in paragraphs])
+        current = measure(lambda: wrapper.wrap_many(paragraphs))
+        print(f"{width:>6} | {legacy:>10.3f} | {current:>14.3f} | x{legacy / current:.1f}")
+
+
+if __name__ == "__main__":
+    main()
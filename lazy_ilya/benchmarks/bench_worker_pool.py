@@ -0,0 +1,66 @@
+"""
+Задержка первой конвертации и память веб-процесса: конвертация в холодном пуле,
+в заранее прогретом пуле (ConverterPool.start) и прямо в текущем процессе.
+
+Запуск (из каталога lazy_ilya):
+    python -m benchmarks.bench_worker_pool --files 20
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from file_creator.utils.custom_converter.converter_to_docx import convert_bytes_to_docx, warm_up
+from file_creator.utils.custom_converter.worker_pool import ConverterPool, current_rss
+
+TEST_FILES = Path(__file__).resolve().parent.parent.parent / "test_files"
+
+
+def megabytes(value: int) -> str:
+    """Байты в мегабайтах для вывода."""
+    return f"{value / 2 ** 20:.0f} МБ"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20, help="Количество конвертаций для замера памяти.")
+    args = parser.parse_args()
+
+    data = (TEST_FILES / "example.doc").read_bytes()
+    rss_start = current_rss() or 0
+
+    cold = ConverterPool(size=1, warmup=warm_up)
+    start = time.perf_counter()
+    cold.run(convert_bytes_to_docx, (data, "example.doc"), timeout=120)
+    cold_latency = time.perf_counter() - start
+    cold.shutdown()
+
+    warm = ConverterPool(size=1, warmup=warm_up)
+    warm.start()
+    warm.run(os.getpid, (), timeout=120)  # Дожидаемся окончания прогрева, как после старта приложения
+    start = time.perf_counter()
+    warm.run(convert_bytes_to_docx, (data, "example.doc"), timeout=120)
+    warm_latency = time.perf_counter() - start
+    for _ in range(args.files):
+        warm.run(convert_bytes_to_docx, (data, "example.doc"), timeout=120)
+    rss_pool = current_rss() or 0
+    warm.shutdown()
+
+    start = time.perf_counter()
+    convert_bytes_to_docx(data, "example.doc")
+    inline_latency = time.perf_counter() - start
+    for _ in range(args.files):
+        convert_bytes_to_docx(data, "example.doc")
+    rss_inline = current_rss() or 0
+
+    print("Первая конвертация example.doc:")
+    print(f"  Холодный пул:          {cold_latency * 1000:7.0f} мс")
+    print(f"  Прогретый пул:         {warm_latency * 1000:7.0f} мс")
+    print(f"  В текущем процессе:    {inline_latency * 1000:7.0f} мс")
+    print(f"Память текущего процесса после {args.files} конвертаций:")
+    print(f"  В пуле:                {megabytes(rss_pool)} (в начале {megabytes(rss_start)})")
+    print(f"  В текущем процессе:    {megabytes(rss_inline)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ from typing import Tuple, List
 
 from django.contrib import admin
 
-from cities.models import CityData, TableNames, CounterCities
+from cities.models import CityData, CityDailyTop, CityDelta, CityHitBucket, TableNames, CounterCities, ImportJob
 
 
 class CityDataInline(admin.TabularInline):
@@ -105,3 +105,66 @@ class CounterCitiesAdmin(admin.ModelAdmin):
     )
     list_display_links: Tuple[str] = "id", "dock_num"
     list_filter: Tuple[str] = ("processed_at", "dock_num", "count_responses")
+
+
+@admin.register(CityHitBucket)
+class CityHitBucketAdmin(admin.ModelAdmin):
+    """
+    Административный интерфейс для модели CityHitBucket.
+
+    Attributes:
+        list_display (Tuple[str]): Поля для отображения в списке.
+        list_filter (Tuple[str]): Фильтры для боковой панели.
+    """
+    list_display: Tuple[str] = ("id", "city", "granularity", "bucket_start", "hits")
+    list_filter: Tuple[str] = ("granularity", "bucket_start")
+
+
+@admin.register(CityDailyTop)
+class CityDailyTopAdmin(admin.ModelAdmin):
+    """
+    Административный интерфейс для модели CityDailyTop.
+
+    Attributes:
+        list_display (Tuple[str]): Поля для отображения в списке.
+        list_filter (Tuple[str]): Фильтры для боковой панели.
+    """
+    list_display: Tuple[str] = ("day", "rank", "city", "hits")
+    list_filter: Tuple[str] = ("day",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """
+    Административный интерфейс для модели ImportJob.
+
+    Attributes:
+        list_display (Tuple[str]): Поля для отображения в списке.
+        list_display_links (Tuple[str]): Поля, по которым можно перейти к записи.
+        list_filter (Tuple[str]): Фильтры для боковой панели.
+        readonly_fields (Tuple[str]): Поля, доступные только для чтения.
+    """
+    list_display: Tuple[str] = (
+        "id",
+        "file_path",
+        "status",
+        "created_at",
+        "finished_at",
+        "rows_total",
+    )
+    list_display_links: Tuple[str] = "id", "file_path"
+    list_filter: Tuple[str] = ("status", "created_at")
+    readonly_fields: Tuple[str] = ("created_at", "started_at", "finished_at")
+
+
+@admin.register(CityDelta)
+class CityDeltaAdmin(admin.ModelAdmin):
+    """
+    Административный интерфейс для модели CityDelta.
+
+    Attributes:
+        list_display (Tuple[str]): Поля для отображения в списке.
+        readonly_fields (Tuple[str]): Поля, доступные только для чтения.
+    """
+    list_display: Tuple[str] = ("version", "created_at", "__str__")
+    readonly_fields: Tuple[str] = ("version", "message", "created_at")
@@ -5,3 +5,9 @@ class CitiesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cities"
     verbose_name="Книга городов"
+
+    def ready(self) -> None:
+        # PRAGMA подключений к SQLite (WAL и т.д.) для импорта справочника и чтения /cities/
+        import lazy_ilya.utils.sqlite_pragmas  # noqa: F401
+        # Сброс хэша содержимого таблиц и кэша списка городов при изменении записей через ORM
+        import cities.signals  # noqa: F401
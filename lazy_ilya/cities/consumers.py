@@ -5,10 +5,15 @@ import queue
 import threading
 import time
 from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs
 
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 from lazy_ilya.utils.settings_for_app import logger
+from .utils.common_func.city_deltas import current_delta_version, deltas_since, resync_message
+from .utils.import_jobs.progress_publisher import job_group
 from .utils.parser_word.globus_parser import GlobusParser
 
 
@@ -16,14 +21,25 @@ class UploadProgressConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer для отправки клиенту обновлений прогресса обработки файлов.
 
-    Клиенты подключаются к группе `progress_updates`, чтобы получать сообщения
-    с обновлением прогресса в формате JSON.
+    Клиенты подключаются к группе `progress_updates`, чтобы получать изменения
+    списка городов. Прогресс импорта публикуется в группу задачи (job_group):
+    администратор подписывается на нее сообщением {"type": "subscribe", "job_id": N},
+    поэтому остальные пользователи чужой прогресс не получают.
+
+    После импорта клиенты получают только изменения списка городов (cities_delta)
+    с номером версии. Клиент может сообщить свою версию (параметр ?version=N при
+    подключении или сообщение {"type": "sync", "version": N}) — тогда ему досылаются
+    пропущенные дельты, а если их уже нет в журнале, приходит cities_resync.
 
     Атрибуты:
         group_name (str): Имя группы WebSocket, к которой подключается клиент.
+        version (Optional[int]): Последняя версия данных, известная клиенту.
+        job_groups (set): Группы задач импорта, на которые подписан клиент.
     """
 
     group_name: str
+    version: Optional[int] = None
+    job_groups: set
 
     async def connect(self) -> None:
         """
@@ -39,12 +55,17 @@ class UploadProgressConsumer(AsyncWebsocketConsumer):
             logger.info("Анонимный пользователь подключен к WebSocket")
 
         self.group_name = "progress_updates"
+        self.job_groups = set()
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
         logger.bind(user=user.username).info(f"Клиент подключен к группе: {self.group_name}")
 
+        version = parse_qs(self.scope.get("query_string", b"").decode()).get("version")
+        if version and version[0].isdigit():
+            await self.catch_up(int(version[0]))
+
     async def disconnect(self, close_code: int) -> None:
         """
         Обрабатывает отключение клиента от WebSocket.
@@ -55,6 +76,8 @@ class UploadProgressConsumer(AsyncWebsocketConsumer):
             close_code (int): Код закрытия WebSocket-соединения.
         """
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        for group in self.job_groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
         logger.info(f"Клиент отключился от WebSocket: {self.group_name}")
 
     async def send_progress(self, event: dict) -> None:
@@ -67,3 +90,76 @@ class UploadProgressConsumer(AsyncWebsocketConsumer):
         progress_data = event.get("progress", {})
         await self.send(text_data=json.dumps(progress_data))
         logger.debug(f"Отправлено обновление прогресса: {progress_data}")
+
+    async def receive(self, text_data: Optional[str] = None, bytes_data: Optional[bytes] = None) -> None:
+        """
+        Обрабатывает сообщения клиента:
+        {"type": "sync", "version": N} — досылает пропущенные изменения списка городов;
+        {"type": "subscribe", "job_id": N} — подписывает администратора на прогресс задачи импорта.
+
+        Args:
+            text_data (Optional[str]): Текст сообщения в формате JSON.
+            bytes_data (Optional[bytes]): Не используется.
+        """
+        try:
+            message = json.loads(text_data or "")
+        except ValueError:
+            return
+        if not isinstance(message, dict):
+            return
+        if message.get("type") == "sync" and isinstance(message.get("version"), int):
+            await self.catch_up(message["version"])
+        elif message.get("type") == "subscribe" and isinstance(message.get("job_id"), int):
+            await self.subscribe(message["job_id"])
+
+    async def subscribe(self, job_id: int) -> None:
+        """
+        Добавляет клиента в группу задачи импорта, если он в группе admin.
+
+        Args:
+            job_id (int): ID задачи импорта.
+        """
+        user = self.scope["user"]
+        if not user.is_authenticated or not await database_sync_to_async(
+                user.groups.filter(name="admin").exists)():
+            logger.warning(f"Отказано в подписке на прогресс задачи импорта №{job_id}")
+            return
+        group = job_group(job_id)
+        await self.channel_layer.group_add(group, self.channel_name)
+        self.job_groups.add(group)
+        logger.bind(user=user.username).debug(f"Клиент подписан на прогресс задачи импорта №{job_id}")
+
+    async def send_delta(self, event: dict) -> None:
+        """
+        Отправляет клиенту изменения списка городов.
+
+        Если клиент пропустил предыдущие версии, вместо одной дельты ему досылаются все
+        пропущенные (или cities_resync, если их уже нет в журнале).
+
+        Args:
+            event (dict): Словарь события с ключом 'delta' (cities_delta или cities_resync).
+        """
+        delta = event["delta"]
+        if self.version is not None and delta.get("base_version") != self.version:
+            await self.catch_up(self.version)
+            return
+        await self.send(text_data=json.dumps(delta, ensure_ascii=False))
+        self.version = delta["version"]
+
+    async def catch_up(self, version: int) -> None:
+        """
+        Досылает клиенту изменения после версии version или указание загрузить список заново.
+
+        Args:
+            version (int): Последняя версия, известная клиенту.
+        """
+        missed = await sync_to_async(deltas_since)(version)
+        if missed is None:
+            current = await sync_to_async(current_delta_version)()
+            logger.debug(f"Клиент с версией {version} отстал, отправляется resync до версии {current}")
+            await self.send(text_data=json.dumps(resync_message(current)))
+            self.version = current
+            return
+        for delta in missed:
+            await self.send(text_data=json.dumps(delta, ensure_ascii=False))
+        self.version = missed[-1]["version"] if missed else version
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from cities.utils.counters.city_stats import HOUR_BUCKETS_KEEP_DAYS, prune_hour_buckets, rebuild_daily_top
+
+
+class Command(BaseCommand):
+    """
+    Django management-команда для обслуживания статистики запросов к городам.
+
+    Пересчитывает суточные рейтинги CityDailyTop за последние дни (например, после
+    ручной правки интервалов) и удаляет устаревшие часовые интервалы CityHitBucket.
+    Рейтинг за сегодня пересчитывается и без неё — при каждом сбросе счетчиков.
+    """
+
+    help = "Пересчитывает суточные рейтинги городов и удаляет старые часовые интервалы."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="За сколько последних дней пересчитать рейтинги.",
+        )
+        parser.add_argument(
+            "--keep-hours-days",
+            type=int,
+            default=HOUR_BUCKETS_KEEP_DAYS,
+            help="Сколько дней хранить часовые интервалы.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод, вызываемый при выполнении команды.
+        """
+        today = timezone.localdate()
+        for offset in range(options["days"]):
+            rebuild_daily_top(today - timedelta(days=offset))
+        deleted = prune_hour_buckets(options["keep_hours_days"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Пересчитано рейтингов: {options['days']}, удалено часовых интервалов: {deleted}"
+        ))
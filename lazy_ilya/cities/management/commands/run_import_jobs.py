@@ -0,0 +1,45 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from cities.utils.import_jobs.import_worker import ImportWorker
+from lazy_ilya.utils.settings_for_app import logger
+
+
+class Command(BaseCommand):
+    """
+    Django management-команда для выполнения задач импорта globus.docx.
+
+    Выполняет задачи по одной; перед каждым разбором очереди возвращает в нее
+    задачи, чей обработчик завершился или перестал подавать сигнал.
+    """
+
+    help = "Выполняет задачи импорта файла с городами (ImportJob) по одной."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Разобрать текущую очередь и завершиться.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Пауза между проверками очереди в секундах.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Основной метод, вызываемый при выполнении команды.
+        """
+        worker = ImportWorker()
+        logger.info("Обработчик задач импорта запущен")
+        while True:
+            processed = worker.run_pending()
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"✅ Выполнено задач импорта: {processed}"))
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
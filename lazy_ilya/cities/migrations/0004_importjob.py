@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0003_countercities'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('file_path', models.CharField(max_length=255, verbose_name='Файл')),
+                ('status', models.CharField(choices=[('queued', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершена'), ('failed', 'Ошибка')], db_index=True, default='queued', max_length=10, verbose_name='Состояние')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Начало обработки')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Окончание обработки')),
+                ('rows_total', models.IntegerField(default=0, verbose_name='Строк в документе')),
+                ('rows_added', models.IntegerField(default=0, verbose_name='Добавлено записей')),
+                ('rows_updated', models.IntegerField(default=0, verbose_name='Обновлено записей')),
+                ('rows_deleted', models.IntegerField(default=0, verbose_name='Удалено записей')),
+                ('error', models.TextField(blank=True, default='', verbose_name='Текст ошибки')),
+            ],
+            options={
+                'verbose_name': 'Задача импорта',
+                'verbose_name_plural': 'Задачи импорта',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0004_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='file_hash',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Хэш файла'),
+        ),
+        migrations.AddField(
+            model_name='tablenames',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='Хэш содержимого'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+FTS_TABLE = "cities_citydata_fts"
+CITY_TABLE = "cities_citydata"
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        location, name_organ, pseudonim,
+        content='{CITY_TABLE}', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CITY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, location, name_organ, pseudonim)
+        VALUES (new.id, new.location, new.name_organ, new.pseudonim);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CITY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, name_organ, pseudonim)
+        VALUES ('delete', old.id, old.location, old.name_organ, old.pseudonim);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF location, name_organ, pseudonim
+    ON {CITY_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, name_organ, pseudonim)
+        VALUES ('delete', old.id, old.location, old.name_organ, old.pseudonim);
+        INSERT INTO {FTS_TABLE}(rowid, location, name_organ, pseudonim)
+        VALUES (new.id, new.location, new.name_organ, new.pseudonim);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def _run(schema_editor, statements):
+    # Полнотекстовый индекс FTS5 есть только в SQLite, на других СУБД поиск работает без него
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, CREATE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0005_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0006_citydata_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityDailyTop',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Дата')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('hits', models.IntegerField(default=0, verbose_name='Количество запросов')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_tops', to='cities.citydata', verbose_name='Город')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг городов за сутки',
+                'verbose_name_plural': 'Рейтинги городов за сутки',
+                'ordering': ['day', 'rank'],
+                'unique_together': {('day', 'rank')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CityHitBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Час'), ('day', 'Сутки')], max_length=4, verbose_name='Интервал')),
+                ('bucket_start', models.DateTimeField(verbose_name='Начало интервала')),
+                ('hits', models.IntegerField(default=0, verbose_name='Количество запросов')),
+                ('city', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hit_buckets', to='cities.citydata', verbose_name='Город')),
+            ],
+            options={
+                'verbose_name': 'Запросы к городу за интервал',
+                'verbose_name_plural': 'Запросы к городам по интервалам',
+                'ordering': ['pk'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='cities_city_granula_c0a60f_idx')],
+                'unique_together': {('city', 'granularity', 'bucket_start')},
+            },
+        ),
+    ]
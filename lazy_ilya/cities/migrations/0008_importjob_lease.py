@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0007_city_hit_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний сигнал обработчика'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='worker',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='Обработчик'),
+        ),
+    ]
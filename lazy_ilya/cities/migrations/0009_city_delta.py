@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cities', '0008_importjob_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityDelta',
+            fields=[
+                ('version', models.PositiveIntegerField(primary_key=True, serialize=False, verbose_name='Версия')),
+                ('message', models.JSONField(verbose_name='Сообщение для клиентов')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата записи')),
+            ],
+            options={
+                'verbose_name': 'Изменение списка городов',
+                'verbose_name_plural': 'Изменения списка городов',
+                'ordering': ['version'],
+            },
+        ),
+    ]
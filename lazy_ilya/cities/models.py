@@ -12,10 +12,13 @@ class TableNames(models.Model):
     Атрибуты:
         processed_at (DateTimeField): Дата и время создания записи.
         table_name (CharField): Название таблицы, уникальное значение.
+        content_hash (CharField): SHA-256 нормализованного содержимого таблицы
+                    при последнем импорте; пустая строка, если строки менялись вручную.
 
     Методы:
         __str__(): Возвращает строковое представление объекта,
                     показывающее дату создания и название таблицы.
+        invalidate_content_hash(): Сбрасывает хэш содержимого таблицы.
     """
 
     processed_at: models.DateTimeField = models.DateTimeField(
@@ -24,6 +27,9 @@ class TableNames(models.Model):
     table_name: models.CharField = models.CharField(
         max_length=30, null=False, unique=True, verbose_name="Название таблицы"
     )
+    content_hash: models.CharField = models.CharField(
+        max_length=64, blank=True, default="", verbose_name="Хэш содержимого"
+    )
 
     class Meta:
         ordering = ["pk"]
@@ -33,6 +39,14 @@ class TableNames(models.Model):
     def __str__(self) -> str:
         return f"Processed on {self.processed_at.strftime('%d.%m.%Y %H:%M')} = {self.table_name}"
 
+    @classmethod
+    def invalidate_content_hash(cls, table_id: int) -> None:
+        """
+        Сбрасывает хэш содержимого таблицы после ручного изменения её строк,
+        чтобы следующий импорт не пропустил эту таблицу (вызывается из cities.signals).
+        """
+        cls.objects.filter(pk=table_id).update(content_hash="")
+
 
 class CityData(models.Model):
     """
@@ -218,3 +232,200 @@ class CounterCities(models.Model):
         ordering = ["pk", "dock_num", "count_responses"]
         verbose_name = "Счетчик городов"
         verbose_name_plural = "Счетчики городов"
+
+
+class CityHitBucket(models.Model):
+    """
+    Модель для хранения количества запросов к городу за час или за сутки.
+
+    Заполняется вместе с CounterCities при сбросе накопленных счетчиков,
+    чтобы страница статистики могла показывать динамику, а не только общий итог.
+
+    Атрибуты:
+        city (ForeignKey): Запись CityData, к которой относятся запросы.
+        granularity (CharField): Размер интервала — час (hour) или сутки (day).
+        bucket_start (DateTimeField): Начало интервала (местное время, округлённое до часа или суток).
+        hits (IntegerField): Количество запросов за интервал.
+    """
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour", "Час"
+        DAY = "day", "Сутки"
+
+    city: models.ForeignKey = models.ForeignKey(
+        CityData, on_delete=models.CASCADE, related_name="hit_buckets", verbose_name="Город"
+    )
+    granularity: models.CharField = models.CharField(
+        max_length=4, choices=Granularity.choices, verbose_name="Интервал"
+    )
+    bucket_start: models.DateTimeField = models.DateTimeField(verbose_name="Начало интервала")
+    hits: models.IntegerField = models.IntegerField(default=0, verbose_name="Количество запросов")
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = "Запросы к городу за интервал"
+        verbose_name_plural = "Запросы к городам по интервалам"
+        unique_together = (("city", "granularity", "bucket_start"),)
+        indexes = [models.Index(fields=["granularity", "bucket_start"])]
+
+
+class CityDailyTop(models.Model):
+    """
+    Модель для хранения заранее посчитанного рейтинга городов за сутки.
+
+    Пересчитывается из суточных CityHitBucket при сбросе счетчиков, поэтому
+    страница статистики читает готовые строки рейтинга, а не сортирует счетчики.
+
+    Атрибуты:
+        day (DateField): Дата (местное время).
+        rank (PositiveSmallIntegerField): Место в рейтинге, начиная с 1.
+        city (ForeignKey): Запись CityData.
+        hits (IntegerField): Количество запросов за сутки.
+    """
+    day: models.DateField = models.DateField(verbose_name="Дата")
+    rank: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField(verbose_name="Место")
+    city: models.ForeignKey = models.ForeignKey(
+        CityData, on_delete=models.CASCADE, related_name="daily_tops", verbose_name="Город"
+    )
+    hits: models.IntegerField = models.IntegerField(default=0, verbose_name="Количество запросов")
+
+    class Meta:
+        ordering = ["day", "rank"]
+        verbose_name = "Рейтинг городов за сутки"
+        verbose_name_plural = "Рейтинги городов за сутки"
+        unique_together = (("day", "rank"),)
+
+
+class ImportJob(models.Model):
+    """
+    Модель задачи импорта файла globus.docx.
+
+    Задачи выполняются фоновым обработчиком (ImportWorker) строго по одной,
+    поэтому состояние сохраняется в базе и переживает перезапуск процесса.
+
+    Атрибуты:
+        created_at (DateTimeField): Дата и время постановки задачи в очередь.
+        file_path (CharField): Имя загруженного файла в каталоге tlg_dir.
+        file_hash (CharField): SHA-256 содержимого загруженного файла.
+        status (CharField): Состояние задачи (queued/running/done/failed).
+        started_at (DateTimeField): Время начала обработки.
+        finished_at (DateTimeField): Время окончания обработки.
+        rows_total (IntegerField): Количество строк городов в документе.
+        rows_added (IntegerField): Количество добавленных записей.
+        rows_updated (IntegerField): Количество обновлённых записей.
+        rows_deleted (IntegerField): Количество удалённых записей.
+        error (TextField): Текст ошибки, если задача завершилась неудачно.
+        worker (CharField): Обработчик, выполняющий задачу ("хост:pid").
+        heartbeat_at (DateTimeField): Последний сигнал обработчика о том, что задача еще выполняется;
+            задачу с устаревшим сигналом можно вернуть в очередь.
+
+    Методы:
+        to_dict(): Преобразует задачу в словарь для ответа клиенту.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "В очереди"
+        RUNNING = "running", "Выполняется"
+        DONE = "done", "Завершена"
+        FAILED = "failed", "Ошибка"
+
+    created_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+    file_path: models.CharField = models.CharField(
+        max_length=255, verbose_name="Файл"
+    )
+    file_hash: models.CharField = models.CharField(
+        max_length=64, blank=True, default="", verbose_name="Хэш файла"
+    )
+    status: models.CharField = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.QUEUED,
+        db_index=True,
+        verbose_name="Состояние",
+    )
+    started_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, verbose_name="Начало обработки"
+    )
+    finished_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, verbose_name="Окончание обработки"
+    )
+    rows_total: models.IntegerField = models.IntegerField(
+        default=0, verbose_name="Строк в документе"
+    )
+    rows_added: models.IntegerField = models.IntegerField(
+        default=0, verbose_name="Добавлено записей"
+    )
+    rows_updated: models.IntegerField = models.IntegerField(
+        default=0, verbose_name="Обновлено записей"
+    )
+    rows_deleted: models.IntegerField = models.IntegerField(
+        default=0, verbose_name="Удалено записей"
+    )
+    error: models.TextField = models.TextField(
+        blank=True, default="", verbose_name="Текст ошибки"
+    )
+    worker: models.CharField = models.CharField(
+        max_length=255, blank=True, default="", verbose_name="Обработчик"
+    )
+    heartbeat_at: models.DateTimeField = models.DateTimeField(
+        null=True, blank=True, verbose_name="Последний сигнал обработчика"
+    )
+
+    class Meta:
+        ordering = ["pk"]
+        verbose_name = "Задача импорта"
+        verbose_name_plural = "Задачи импорта"
+
+    def to_dict(self) -> dict:
+        """Преобразует задачу в словарь."""
+        duration = None
+        if self.started_at and self.finished_at:
+            duration = (self.finished_at - self.started_at).total_seconds()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "file_path": self.file_path,
+            "file_hash": self.file_hash,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration": duration,
+            "rows_total": self.rows_total,
+            "rows_added": self.rows_added,
+            "rows_updated": self.rows_updated,
+            "rows_deleted": self.rows_deleted,
+            "error": self.error,
+        }
+
+    def __str__(self) -> str:
+        return f"Импорт №{self.id} - {self.file_path} - {self.get_status_display()}"
+
+
+class CityDelta(models.Model):
+    """
+    Модель журнала изменений списка городов, которые рассылаются клиентам после импорта.
+
+    Номер версии выдается внутри транзакции импорта (record_change_set), поэтому
+    параллельные импорты не получат одинаковых версий, а журнал не пропадет
+    при очистке кэша.
+
+    Атрибуты:
+        version (PositiveIntegerField): Номер версии данных после этих изменений.
+        message (JSONField): Сообщение для клиентов (cities_delta или cities_resync).
+        created_at (DateTimeField): Дата и время записи.
+    """
+    version: models.PositiveIntegerField = models.PositiveIntegerField(
+        primary_key=True, verbose_name="Версия"
+    )
+    message: models.JSONField = models.JSONField(verbose_name="Сообщение для клиентов")
+    created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True, verbose_name="Дата записи")
+
+    class Meta:
+        ordering = ["version"]
+        verbose_name = "Изменение списка городов"
+        verbose_name_plural = "Изменения списка городов"
+
+    def __str__(self) -> str:
+        return f"Версия {self.version}: {self.message.get('type')}"
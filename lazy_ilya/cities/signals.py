@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from cities.models import CityData, TableNames
+from cities.utils.common_func.cities_cache import invalidate_cities_cache
+
+
+def _invalidate_cities_cache_on_commit() -> None:
+    """
+    Сбрасывает кэш списка городов после фиксации текущей транзакции: если сбросить
+    его раньше, параллельный запрос соберет список из старого снимка под новой версией.
+    """
+    transaction.on_commit(invalidate_cities_cache)
+
+
+@receiver(pre_save, sender=CityData)
+def remember_previous_table(sender, instance: CityData, raw: bool = False, **kwargs) -> None:
+    """
+    Запоминает таблицу, в которой запись лежала до сохранения: если запись
+    перенесли в другую таблицу (CityInfoView.put, админка), меняются обе.
+    """
+    instance._previous_table_id = None
+    if raw or instance.pk is None:
+        return
+    instance._previous_table_id = (
+        CityData.objects.filter(pk=instance.pk).values_list("table_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=CityData)
+def city_saved(sender, instance: CityData, raw: bool = False, **kwargs) -> None:
+    """
+    После изменения записи через ORM (представления /cities/, админка) сбрасывает
+    хэш содержимого ее таблиц, чтобы следующий импорт их не пропустил, и кэш списка городов.
+
+    Импорт синхронизирует записи SQL-запросами мимо сигналов, сам выставляет хэш
+    и сбрасывает кэш.
+    """
+    _invalidate_cities_cache_on_commit()
+    if raw:
+        return
+    for table_id in {instance.table_id_id, getattr(instance, "_previous_table_id", None)} - {None}:
+        TableNames.invalidate_content_hash(table_id)
+
+
+@receiver(post_delete, sender=CityData)
+def city_deleted(sender, instance: CityData, origin=None, **kwargs) -> None:
+    """
+    После удаления записи сбрасывает хэш содержимого ее таблицы и кэш списка городов.
+
+    Если удаляется сама таблица (записи удаляются каскадом), это делает table_deleted.
+    """
+    if isinstance(origin, TableNames) or getattr(origin, "model", None) is TableNames:
+        return
+    TableNames.invalidate_content_hash(instance.table_id_id)
+    _invalidate_cities_cache_on_commit()
+
+
+@receiver(post_save, sender=TableNames)
+def table_saved(sender, instance: TableNames, **kwargs) -> None:
+    """Название таблицы входит в список городов: после изменения сбрасывает его кэш."""
+    _invalidate_cities_cache_on_commit()
+
+
+@receiver(post_delete, sender=TableNames)
+def table_deleted(sender, instance: TableNames, **kwargs) -> None:
+    """Вместе с таблицей каскадом удалены ее записи: сбрасывает кэш списка городов."""
+    _invalidate_cities_cache_on_commit()
@@ -1 +1,732 @@
-/* empty css        */import{t as u}from"./toggleAccent.js";import{s as l}from"./utils.js";class g{constructor(e,t,s=[]){if(this.input=document.getElementById(e),this.suggestions=document.getElementById(t),this.counter=document.getElementById("counter"),this.citiesData=s,this.selectedIndex=-1,this.renderedCities=[],this.remainingCities=[],this.renderingCancelled=!1,this.observer=null,!this.input||!this.suggestions){console.warn("CityAutocomplete: Элементы не найдены на странице.");return}this.bindEvents()}bindEvents(){this.input.addEventListener("input",()=>this.handleInput()),this.input.addEventListener("keydown",e=>this.handleKeyDown(e)),document.addEventListener("click",e=>this.handleDocumentClick(e))}clearSelection(){this.suggestions.querySelectorAll("li").forEach(e=>e.classList.remove("bg-gray-300")),this.selectedIndex=-1}async loadMoreCities(e=10,t=100){var n;const s=this.remainingCities.splice(0,e),i=[];for(const a of s){if(this.renderingCancelled)return;this.createCityCard(a),i.push(a),await new Promise(o=>setTimeout(o,t))}i.length>0&&await this.sendRenderedCityStats(i),this.remainingCities.length===0&&((n=this.observer)==null||n.disconnect())}observeScroll(){const e=document.getElementById("city-cards");if(!e||document.getElementById("scroll-sentinel"))return;const t=document.createElement("div");t.id="scroll-sentinel",e.appendChild(t),this.observer=new IntersectionObserver(([s])=>{s.isIntersecting&&this.remainingCities.length&&this.loadMoreCities()},{root:null,threshold:.1}),this.observer.observe(t)}highlightItem(e){const t=this.suggestions.querySelectorAll("li");if(!t.length)return;this.clearSelection();const s=(e+t.length)%t.length;t[s].classList.add("bg-gray-300"),t[s].scrollIntoView({block:"nearest"}),this.selectedIndex=s}createCityCard(e){const t=document.getElementById("city-cards");if(!t)return;const s=document.createElement("div");s.classList.add("card-style"),s.style.cursor="pointer",s.dataset.city=JSON.stringify(e);const i=[["Организация",e.name_organ],["Псевдоним",e.pseudonim],["Время работы",e.work_time],["Название раздела",e.table_name],["Номер в таблице",e.some_number],["IP address",e.ip_address]];s.innerHTML=`<h3 class="text-lg font-semibold mb-2 text-center">${e.location||"Неизвестно"}</h3>`+i.filter(([a,o])=>o).map(([a,o])=>`<p><strong>${a}:</strong> ${o}</p>`).join("");const n=document.getElementById("scroll-sentinel");t.insertBefore(s,n||null)}clearCityCards(){var e;(e=document.getElementById("city-cards"))==null||e.replaceChildren()}async renderCardsWithDelay(e,t=100){this.cancelRendering(),this.clearCityCards(),this.renderingCancelled=!1,this.renderedCities=e.slice(0,10),this.remainingCities=e.slice(10);for(const s of this.renderedCities){if(this.renderingCancelled)return;this.createCityCard(s),await new Promise(i=>setTimeout(i,t))}await this.sendRenderedCityStats(this.renderedCities),this.observeScroll()}cancelRendering(){var e,t;this.renderingCancelled=!0,(e=this.observer)==null||e.disconnect(),(t=document.getElementById("scroll-sentinel"))==null||t.remove()}handleInput(){var s,i;const e=this.input.value.trim().toLowerCase();if(this.cancelRendering(),this.clearSelection(),this.clearCityCards(),this.suggestions.innerHTML="",!e){this.suggestions.style.display="none",(s=this.counter)==null||s.classList.add("opacity-0");return}const t=this.citiesData.filter(n=>n.location&&n.location.toLowerCase().includes(e)||n.name_organ&&n.name_organ.toLowerCase().includes(e)||n.pseudonim&&n.pseudonim.toLowerCase().includes(e));if((i=this.counter)==null||i.classList.remove("opacity-0"),this.counter&&(this.counter.textContent=`Найдено совпадений: ${t.length}`),!t.length){this.suggestions.style.display="none";return}t.slice(0,20).forEach(n=>{const a=document.createElement("li");a.classList.add("cursor-pointer","px-3","py-1","hover:bg-gray-200"),a.textContent=`${n.location||""}${n.name_organ?` — ${n.name_organ}`:""}${n.pseudonim?` — (${n.pseudonim})`:""}`,a.addEventListener("click",()=>{this.input.value=`${n.location} - ${n.name_organ||""} - ${n.pseudonim||""}`,this.suggestions.style.display="none",this.clearCityCards(),this.cancelRendering(),this.createCityCard(n),this.sendRenderedCityStats([n])}),this.suggestions.appendChild(a)}),this.suggestions.style.display="block"}handleKeyDown(e){const t=this.suggestions.querySelectorAll("li");if(t.length)switch(e.key){case"ArrowDown":e.preventDefault(),this.highlightItem(this.selectedIndex+1);break;case"ArrowUp":e.preventDefault(),this.highlightItem(this.selectedIndex-1);break;case"Enter":if(e.preventDefault(),this.selectedIndex>=0)t[this.selectedIndex].click();else{const s=this.input.value.trim().toLowerCase();if(!s)return;const i=this.citiesData.filter(n=>n.location&&n.location.toLowerCase().includes(s)||n.name_organ&&n.name_organ.toLowerCase().includes(s)||n.pseudonim&&n.pseudonim.toLowerCase().includes(s));this.renderCardsWithDelay(i),this.suggestions.style.display="none"}break;case"Escape":this.cancelRendering(),this.suggestions.style.display="none",this.clearSelection(),this.clearCityCards();break}}handleDocumentClick(e){!this.input.contains(e.target)&&!this.suggestions.contains(e.target)&&(this.suggestions.style.display="none",this.clearSelection())}async sendRenderedCityStats(e){const t=e.map(i=>i.table_id).filter(Boolean),s=e.map(i=>i.dock_num).filter(Boolean);if(t.length)try{await fetch("api/city-counter/",{method:"POST",headers:{"Content-Type":"application/json","X-CSRFToken":this.getCSRFToken()},body:JSON.stringify({table_ids:t,dock_num:s})})}catch(i){l("Ошибка отправки статистики:",i),console.error("Ошибка отправки статистики:",i)}}getCSRFToken(){const e=document.cookie.match(/csrftoken=([\w-]+)/);return e?e[1]:""}}class p{constructor(e,t=[]){var s,i,n,a;this.modal=document.getElementById(e),this.form=(s=this.modal)==null?void 0:s.querySelector("form"),this.saveBtn=(i=this.modal)==null?void 0:i.querySelector("#save-city"),this.deleteBtn=(n=this.modal)==null?void 0:n.querySelector("#delete-city"),this.closeBtn=(a=this.modal)==null?void 0:a.querySelector("#close-modal"),this.csrfToken=document.querySelector("[name=csrfmiddlewaretoken]").value,this.currentCity=null,this.citiesData=t,this.bindEvents(),this.observeCards()}bindEvents(){var e,t,s;(e=this.closeBtn)==null||e.addEventListener("click",()=>this.hideModal()),(t=this.saveBtn)==null||t.addEventListener("click",async()=>{if(!this.currentCity)return;const i=this.getFormData();await this.updateCity(this.currentCity,i),this.hideModal()}),(s=this.deleteBtn)==null||s.addEventListener("click",async()=>{this.currentCity&&(await this.deleteCity(this.currentCity),this.hideModal())}),window.addEventListener("click",i=>{var o;if(!this.modal||this.modal.classList.contains("hidden"))return;const n=!((o=this.modal.querySelector("form"))!=null&&o.contains(i.target)),a=this.modal.contains(i.target);n&&a&&this.hideModal()}),window.addEventListener("keydown",i=>{i.key==="Escape"&&!this.modal.classList.contains("hidden")&&this.hideModal()})}observeCards(){document.addEventListener("click",e=>{const t=e.target.closest(".card-style");if(!t)return;const s=t.dataset.city?JSON.parse(t.dataset.city):null;s&&this.showModal(s)})}showModal(e){var t;this.currentCity=e,this.modal&&(this.modal.querySelector("#modal-location").value=e.location||"",this.modal.querySelector("#modal-name_organ").value=e.name_organ||"",this.modal.querySelector("#modal-pseudonim").value=e.pseudonim||"",this.modal.querySelector("#modal-work_time").value=e.work_time||"",this.modal.querySelector("#modal-table_name").value=e.table_name||"",this.modal.querySelector("#modal-number").value=e.dock_num||"",this.modal.querySelector("#modal-some_number").value=e.some_number||"",this.modal.querySelector("#modal-ip_address").value=e.ip_address||"",this.modal.classList.remove("hidden"),(t=this.form)==null||t.classList.add("animate-popup"))}hideModal(){var e;(e=this.modal)==null||e.classList.add("hidden"),this.currentCity=null}getFormData(){var e;return{location:this.modal.querySelector("#modal-location").value.trim(),name_organ:this.modal.querySelector("#modal-name_organ").value.trim(),pseudonim:this.modal.querySelector("#modal-pseudonim").value.trim(),work_time:this.modal.querySelector("#modal-work_time").value.trim(),table_name:this.modal.querySelector("#modal-table_name").value.trim(),some_number:this.modal.querySelector("#modal-some_number").value.trim(),ip_address:this.modal.querySelector("#modal-ip_address").value.trim(),table_id:((e=this.currentCity)==null?void 0:e.table_id)||null}}async updateCity(e,t){try{const s=await fetch(`cities/${e.table_id}/${e.dock_num}/`,{method:"PUT",headers:{"Content-Type":"application/json","X-CSRFToken":this.csrfToken},body:JSON.stringify(t)});if(!s.ok){const o=await s.json().catch(()=>null);l((o==null?void 0:o.message)||"Ошибка при обновлении города");return}const i=this.citiesData.findIndex(o=>o.table_id===e.table_id&&o.dock_num===e.dock_num);i!==-1&&Object.assign(this.citiesData[i],t),Object.assign(e,t);const a=document.getElementById("city-cards").querySelectorAll(".card-style");document.getElementById("default-search").value="";for(const o of a){const r=JSON.parse(o.dataset.city||"{}");if(r.table_id===e.table_id&&r.dock_num===e.dock_num){o.dataset.city=JSON.stringify(e);const c=[["Организация",e.name_organ],["Псевдоним",e.pseudonim],["Время работы",e.work_time],["Название раздела",e.table_name],["Номер в таблице",e.some_number],["IP address",e.ip_address]];o.innerHTML=`<h3 class="text-lg font-semibold mb-2 text-center">${e.location||"Неизвестно"}</h3>`+c.filter(([m,h])=>h).map(([m,h])=>`<p><strong>${m}:</strong> ${h}</p>`).join("");break}}this.showSuccessMessage(`Город "${t.name_organ}" успешно обновлён`)}catch(s){console.error("Ошибка PUT-запроса:",s),l(s)}}async deleteCity(e){if(await this.showDeleteConfirmation(e))try{const s=await fetch(`cities/${e.table_id}/${e.dock_num}/`,{method:"DELETE",headers:{"Content-Type":"application/json","X-CSRFToken":this.csrfToken}});if(!s.ok){const o=await s.json().catch(()=>null);l((o==null?void 0:o.message)||"Ошибка при удалении города");return}const i=this.citiesData.findIndex(o=>o.table_id===e.table_id&&o.dock_num===e.dock_num);i!==-1&&this.citiesData.splice(i,1);const a=document.getElementById("city-cards").querySelectorAll(".card-style");document.getElementById("default-search").value="";for(const o of a){const r=JSON.parse(o.dataset.city||"{}");if(r.table_id===e.table_id&&r.dock_num===e.dock_num){o.remove();break}}this.showSuccessMessage(`Город "${e.name_organ}" успешно удалён`),this.hideModal()}catch(s){console.error("Ошибка DELETE-запроса:",s),l(s)}}showSuccessMessage(e){const t=document.getElementById("server-info");t.classList.remove("hidden","animate-popup-reverse"),t.classList.add("flex","animate-popup"),t.querySelector("p").textContent=e,t.scrollIntoView({behavior:"smooth",block:"start"}),setTimeout(()=>{t.classList.remove("animate-popup"),t.classList.add("animate-popup-reverse"),setTimeout(()=>{t.classList.add("hidden"),t.classList.remove("flex","animate-popup-reverse")},1e3)},5e3)}showDeleteConfirmation(e){return new Promise(t=>{const s=document.getElementById("server-info");s.classList.remove("hidden","animate-popup-reverse"),s.classList.add("flex","animate-popup"),s.querySelector("h3").textContent="Подтверждение удаления",s.querySelector("p").textContent=`Вы уверены, что хотите удалить "${e.name_organ}"?`,s.scrollIntoView({behavior:"smooth",block:"start"});const i=document.getElementById("btn-div");i.innerHTML="";const n=document.createElement("button");n.id="confirm-delete",n.textContent="Удалить",n.classList.add("btn-submit","!p-1","!font-medium");const a=document.createElement("button");a.id="cancel-delete",a.textContent="Отмена",a.classList.add("btn-cancel","!p-1","!font-medium"),i.appendChild(n),i.appendChild(a);let o=!1;const r=()=>new Promise(m=>{s.classList.remove("animate-popup"),s.classList.add("animate-popup-reverse"),setTimeout(()=>{i.innerHTML="",s.querySelector("h3").textContent="",s.querySelector("p").textContent="",s.classList.add("hidden"),m()},1e3)}),c=setTimeout(()=>{o||(o=!0,r().then(()=>t(!1)))},5e3);n.addEventListener("click",()=>{o||(o=!0,clearTimeout(c),r().then(()=>t(!0)))}),a.addEventListener("click",()=>{o||(o=!0,clearTimeout(c),r().then(()=>t(!1)))})})}}document.addEventListener("DOMContentLoaded",()=>{u("a-cities","a-cities-mob"),console.log(citiesData);const d=citiesData;new g("default-search","suggestions",d),new p("city-modal",d)});
+import {t as toggleAccentClasses} from "./toggleAccent.js";
+import {s as showError} from "./utils.js";
+
+/**
+ * Автокомплит для поиска и отображения городов с возможностью ленивой загрузки карточек.
+ *
+ * Поиск выполняется на сервере (api/search/), результаты приходят постранично.
+ */
+class CityAutocomplete {
+    /**
+     * @param {string} inputId - ID текстового поля ввода.
+     * @param {string} suggestionsId - ID контейнера подсказок.
+     * @param {string} searchUrl - Адрес API поиска городов.
+     * @param {number} debounceMs - Задержка перед запросом после ввода (мс).
+     */
+    constructor(inputId, suggestionsId, searchUrl = 'api/search/', debounceMs = 200) {
+        this.input = document.getElementById(inputId);
+        this.suggestions = document.getElementById(suggestionsId);
+        this.counter = document.getElementById('counter');
+        this.searchUrl = searchUrl;
+        this.debounceMs = debounceMs;
+
+        this.selectedIndex = -1;
+        this.renderedCities = [];
+        this.remainingCities = [];
+        this.renderingCancelled = false;
+        this.observer = null;
+
+        this.debounceTimer = null;
+        this.abortController = null;
+        // Состояние постраничной загрузки карточек по нажатию Enter
+        this.cardsQuery = '';
+        this.nextPage = null;
+        this.loadingPage = false;
+
+        if (!this.input || !this.suggestions) {
+            console.warn("CityAutocomplete: Элементы не найдены на странице.");
+            return;
+        }
+
+        this.bindEvents();
+    }
+
+    /** Привязка обработчиков событий */
+    bindEvents() {
+        this.input.addEventListener('input', () => this.handleInput());
+        this.input.addEventListener('keydown', (e) => this.handleKeyDown(e));
+        document.addEventListener('click', (e) => this.handleDocumentClick(e));
+    }
+
+    /** Убирает выделение всех подсказок */
+    clearSelection() {
+        this.suggestions.querySelectorAll('li').forEach(item => item.classList.remove('bg-gray-300'));
+        this.selectedIndex = -1;
+    }
+
+    /**
+     * Запрашивает страницу результатов поиска.
+     * Предыдущий незавершённый запрос отменяется, чтобы устаревшие ответы не перезаписали новые.
+     * @param {string} query - Строка поиска
+     * @param {number} page - Номер страницы (с 1)
+     * @param {number} pageSize - Размер страницы
+     * @returns {Promise<{results: Array<Object>, total: number, has_next: boolean}|null>}
+     *          null, если запрос был отменён
+     */
+    async fetchCities(query, page = 1, pageSize = 20) {
+        this.abortController?.abort();
+        this.abortController = new AbortController();
+
+        const params = new URLSearchParams({q: query, page: String(page), page_size: String(pageSize)});
+        try {
+            const response = await fetch(`${this.searchUrl}?${params}`, {signal: this.abortController.signal});
+            if (!response.ok) {
+                throw new Error(`Ошибка поиска: ${response.status}`);
+            }
+            return await response.json();
+        } catch (err) {
+            if (err.name === 'AbortError') return null;
+            showError(err);
+            console.error('Ошибка поиска городов:', err);
+            return null;
+        }
+    }
+
+    /**
+     * Догружает следующую страницу результатов для карточек, если она есть.
+     * @param {number} pageSize - Размер страницы
+     */
+    async fetchNextCardsPage(pageSize = 50) {
+        if (this.nextPage === null || this.loadingPage) return;
+        this.loadingPage = true;
+        const data = await this.fetchCities(this.cardsQuery, this.nextPage, pageSize);
+        this.loadingPage = false;
+        if (!data || this.renderingCancelled) return;
+
+        this.remainingCities.push(...data.results);
+        this.nextPage = data.has_next ? this.nextPage + 1 : null;
+    }
+
+    /**
+     * Лениво подгружает карточки
+     * @param {number} batchSize - Количество карточек за раз
+     * @param {number} delay - Задержка между карточками (мс)
+     */
+    async loadMoreCities(batchSize = 10, delay = 100) {
+        if (this.remainingCities.length < batchSize) {
+            await this.fetchNextCardsPage();
+        }
+        const nextBatch = this.remainingCities.splice(0, batchSize);
+        const renderedNow = [];
+        for (const city of nextBatch) {
+            if (this.renderingCancelled) return;
+            this.createCityCard(city);
+            renderedNow.push(city); // 👈 собираем отрендеренные карточки
+            await new Promise(res => setTimeout(res, delay));
+        }
+        // 👇 Отправка статистики о догруженных карточках
+        if (renderedNow.length > 0) {
+            await this.sendRenderedCityStats(renderedNow);
+        }
+
+
+        if (this.remainingCities.length === 0 && this.nextPage === null) {
+            this.observer?.disconnect();
+        }
+    }
+
+    /** Подключает IntersectionObserver для подгрузки карточек при скролле */
+    observeScroll() {
+        const container = document.getElementById('city-cards');
+        if (!container || document.getElementById('scroll-sentinel')) return;
+
+        const sentinel = document.createElement('div');
+        sentinel.id = 'scroll-sentinel';
+        container.appendChild(sentinel);
+
+        this.observer = new IntersectionObserver(([entry]) => {
+            if (entry.isIntersecting && (this.remainingCities.length || this.nextPage !== null)) {
+                this.loadMoreCities();
+            }
+        }, {root: null, threshold: 0.1});
+
+        this.observer.observe(sentinel);
+    }
+
+    /**
+     * Подсвечивает подсказку по индексу
+     * @param {number} index
+     */
+    highlightItem(index) {
+        const items = this.suggestions.querySelectorAll('li');
+        if (!items.length) return;
+
+        this.clearSelection();
+        const normalizedIndex = (index + items.length) % items.length;
+
+        items[normalizedIndex].classList.add('bg-gray-300');
+        items[normalizedIndex].scrollIntoView({block: 'nearest'});
+        this.selectedIndex = normalizedIndex;
+    }
+
+    /**
+     * Создает и добавляет карточку города
+     * @param {Object} city
+     */
+    createCityCard(city) {
+        const container = document.getElementById('city-cards');
+        if (!container) return;
+
+        const card = document.createElement('div');
+        card.classList.add('card-style');
+        card.style.cursor = 'pointer'; // ✅ указатель "рука" для визуального отклика
+        // ✅ Добавляем сериализованные данные города в data-атрибут
+        card.dataset.city = JSON.stringify(city);
+
+        const props = [
+            ['Организация', city.name_organ],
+            ['Псевдоним', city.pseudonim],
+            ['Время работы', city.work_time],
+            ['Название раздела', city.table_name],
+            ['Номер в таблице', city.some_number],
+            ['IP address', city.ip_address]
+        ];
+
+        card.innerHTML = `<h3 class="text-lg font-semibold mb-2 text-center">${city.location || 'Неизвестно'}</h3>` +
+            props.filter(([_, val]) => val).map(([label, val]) => `<p><strong>${label}:</strong> ${val}</p>`).join('');
+
+        const sentinel = document.getElementById('scroll-sentinel');
+        container.insertBefore(card, sentinel || null);
+    }
+
+    /** Очищает карточки */
+    clearCityCards() {
+        document.getElementById('city-cards')?.replaceChildren();
+    }
+
+    /**
+     * Плавно отрисовывает карточки всех совпадений, подгружая их с сервера постранично
+     * @param {string} query
+     * @param {number} delay
+     */
+    async renderCardsWithDelay(query, delay = 100) {
+        this.cancelRendering();
+        this.clearCityCards();
+
+        this.renderingCancelled = false;
+        this.cardsQuery = query;
+        this.nextPage = 1;
+        this.remainingCities = [];
+        await this.fetchNextCardsPage();
+        if (this.renderingCancelled) return;
+
+        this.renderedCities = this.remainingCities.splice(0, 10);
+
+        for (const city of this.renderedCities) {
+            if (this.renderingCancelled) return;
+            this.createCityCard(city);
+            await new Promise(res => setTimeout(res, delay));
+        }
+        // 👇 Отправка статистики на бэк
+        await this.sendRenderedCityStats(this.renderedCities);
+        this.observeScroll();
+    }
+
+    /** Отменяет текущую отрисовку и отслеживание */
+    cancelRendering() {
+        this.renderingCancelled = true;
+        this.observer?.disconnect();
+        document.getElementById('scroll-sentinel')?.remove();
+    }
+
+    /** Обработка ввода в поле: запрос к серверу откладывается, пока пользователь печатает */
+    handleInput() {
+        const query = this.input.value.trim();
+        this.cancelRendering();
+        this.clearSelection();
+        this.clearCityCards();
+        clearTimeout(this.debounceTimer);
+
+        if (!query) {
+            this.abortController?.abort();
+            this.suggestions.innerHTML = '';
+            this.suggestions.style.display = 'none';
+            this.counter?.classList.add('opacity-0');
+            return;
+        }
+
+        this.debounceTimer = setTimeout(() => this.showSuggestions(query), this.debounceMs);
+    }
+
+    /**
+     * Запрашивает первую страницу совпадений и показывает подсказки
+     * @param {string} query
+     */
+    async showSuggestions(query) {
+        const data = await this.fetchCities(query);
+        // Пока шёл запрос, строка поиска могла измениться
+        if (!data || query !== this.input.value.trim()) return;
+
+        const matches = data.results;
+        this.suggestions.innerHTML = '';
+        this.counter?.classList.remove('opacity-0');
+        if (this.counter) this.counter.textContent = `Найдено совпадений: ${data.total}`;
+
+        if (!matches.length) {
+            this.suggestions.style.display = 'none';
+            return;
+        }
+
+        matches.forEach(city => {
+            const li = document.createElement('li');
+            li.classList.add('cursor-pointer', 'px-3', 'py-1', 'hover:bg-gray-200');
+            li.textContent = `${city.location || ''}${city.name_organ ? ` — ${city.name_organ}` : ''}${city.pseudonim ? ` — (${city.pseudonim})` : ''}`;
+            li.addEventListener('click', () => {
+                this.input.value = `${city.location} - ${city.name_organ || ''} - ${city.pseudonim || ''}`;
+                this.suggestions.style.display = 'none';
+                this.clearCityCards();
+                this.cancelRendering();
+                this.createCityCard(city);
+                // 👇 Отправка статистики при одиночном выборе
+                this.sendRenderedCityStats([city]);
+            });
+            this.suggestions.appendChild(li);
+        });
+
+        this.suggestions.style.display = 'block';
+    }
+
+    /**
+     * Обработка клавиатурных событий
+     * @param {KeyboardEvent} e
+     */
+    handleKeyDown(e) {
+        const items = this.suggestions.querySelectorAll('li');
+        if (!items.length) return;
+
+        switch (e.key) {
+            case 'ArrowDown':
+                e.preventDefault();
+                this.highlightItem(this.selectedIndex + 1);
+                break;
+
+            case 'ArrowUp':
+                e.preventDefault();
+                this.highlightItem(this.selectedIndex - 1);
+                break;
+
+            case 'Enter':
+                e.preventDefault();
+                if (this.selectedIndex >= 0) {
+                    items[this.selectedIndex].click();
+                } else {
+                    const query = this.input.value.trim();
+                    if (!query) return;
+
+                    clearTimeout(this.debounceTimer);
+                    this.renderCardsWithDelay(query);
+                    this.suggestions.style.display = 'none';
+                }
+                break;
+
+            case 'Escape':
+                this.cancelRendering();
+                this.suggestions.style.display = 'none';
+                this.clearSelection();
+                this.clearCityCards();
+                break;
+        }
+    }
+
+    /**
+     * Скрывает подсказки при клике вне поля
+     * @param {MouseEvent} e
+     */
+    handleDocumentClick(e) {
+        if (!this.input.contains(e.target) && !this.suggestions.contains(e.target)) {
+            this.suggestions.style.display = 'none';
+            this.clearSelection();
+        }
+    }
+
+    async sendRenderedCityStats(cities) {
+        const tableIds = cities.map(city => city.table_id).filter(Boolean);
+        const dockNum = cities.map(city => city.dock_num).filter(Boolean);
+        if (!tableIds.length) return;
+
+        try {
+            await fetch('api/city-counter/', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': this.getCSRFToken(), // если нужен CSRF
+                },
+                body: JSON.stringify({
+                    table_ids: tableIds,
+                    dock_num: dockNum,
+                }),
+            });
+        } catch (err) {
+            showError('Ошибка отправки статистики:', err)
+            console.error('Ошибка отправки статистики:', err);
+        }
+    }
+
+    // Получение CSRF-токена (если требуется)
+    getCSRFToken() {
+        const match = document.cookie.match(/csrftoken=([\w-]+)/);
+        return match ? match[1] : '';
+    }
+}
+
+/**
+ * Обработчик модального окна редактирования и удаления карточек городов.
+ */
+class CityModalHandler {
+    /**
+     * @param {string} modalId - ID модального окна.
+     * @param {Array<Object>} citiesData - Массив объектов с данными о городах.
+     */
+    constructor(modalId, citiesData = []) {
+        /** @type {HTMLElement|null} */
+        this.modal = document.getElementById(modalId);
+        /** @type {HTMLFormElement|null} */
+        this.form = this.modal?.querySelector('form');
+        this.saveBtn = this.modal?.querySelector('#save-city');
+        this.deleteBtn = this.modal?.querySelector('#delete-city');
+        this.closeBtn = this.modal?.querySelector('#close-modal');
+        /** @type {string} */
+        this.csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+
+        /** @type {Object|null} */
+        this.currentCity = null;
+        /** @type {Array<Object>} */
+        this.citiesData = citiesData;
+
+        this.bindEvents();
+        this.observeCards();
+    }
+
+    /**
+     * Привязывает обработчики событий для кнопок модального окна и клавиш.
+     */
+    bindEvents() {
+        this.closeBtn?.addEventListener('click', () => this.hideModal());
+
+        this.saveBtn?.addEventListener('click', async () => {
+            if (!this.currentCity) return;
+            const updatedData = this.getFormData();
+            await this.updateCity(this.currentCity, updatedData);
+            this.hideModal();
+        });
+
+        this.deleteBtn?.addEventListener('click', async () => {
+            if (!this.currentCity) return;
+            await this.deleteCity(this.currentCity);
+            this.hideModal();
+        });
+
+        window.addEventListener('click', (e) => {
+            if (!this.modal || this.modal.classList.contains('hidden')) return;
+
+            const isClickOutside = !this.modal.querySelector('form')?.contains(e.target);
+            const isClickInsideModal = this.modal.contains(e.target);
+
+            if (isClickOutside && isClickInsideModal) {
+                this.hideModal();
+            }
+        });
+
+        window.addEventListener('keydown', (e) => {
+            if (e.key === 'Escape' && !this.modal.classList.contains('hidden')) {
+                this.hideModal();
+            }
+        });
+    }
+
+    /**
+     * Отслеживает клики по карточкам и открывает модальное окно с данными города.
+     */
+    observeCards() {
+        document.addEventListener('click', (e) => {
+            const card = e.target.closest('.card-style');
+            if (!card) return;
+
+            const cityData = card.dataset.city ? JSON.parse(card.dataset.city) : null;
+            if (cityData) {
+                this.showModal(cityData);
+            }
+        });
+    }
+
+    /**
+     * Открывает модальное окно с данными выбранного города.
+     * @param {Object} city - Объект с данными города.
+     */
+    showModal(city) {
+        this.currentCity = city;
+
+        if (this.modal) {
+            this.modal.querySelector('#modal-location').value = city.location || '';
+            this.modal.querySelector('#modal-name_organ').value = city.name_organ || '';
+            this.modal.querySelector('#modal-pseudonim').value = city.pseudonim || '';
+            this.modal.querySelector('#modal-work_time').value = city.work_time || '';
+            this.modal.querySelector('#modal-table_name').value = city.table_name || '';
+            this.modal.querySelector('#modal-number').value = city.dock_num || '';
+            this.modal.querySelector('#modal-some_number').value = city.some_number || '';
+            this.modal.querySelector('#modal-ip_address').value = city.ip_address || '';
+            this.modal.classList.remove('hidden');
+            this.form?.classList.add('animate-popup');
+        }
+    }
+
+    /**
+     * Скрывает модальное окно и сбрасывает текущий выбранный город.
+     */
+    hideModal() {
+        this.modal?.classList.add('hidden');
+        this.currentCity = null;
+    }
+
+    /**
+     * Получает данные из формы модального окна.
+     * @returns {Object} Объект с обновлёнными данными города.
+     */
+    getFormData() {
+        return {
+            location: this.modal.querySelector('#modal-location').value.trim(),
+            name_organ: this.modal.querySelector('#modal-name_organ').value.trim(),
+            pseudonim: this.modal.querySelector('#modal-pseudonim').value.trim(),
+            work_time: this.modal.querySelector('#modal-work_time').value.trim(),
+            table_name: this.modal.querySelector('#modal-table_name').value.trim(),
+            some_number: this.modal.querySelector('#modal-some_number').value.trim(),
+            ip_address: this.modal.querySelector('#modal-ip_address').value.trim(),
+            table_id: this.currentCity?.table_id || null
+        };
+    }
+
+    /**
+     * Отправляет PUT-запрос для обновления данных города.
+     * @param {Object} currentCity - Объект текущего города.
+     * @param {Object} data - Обновлённые данные города.
+     */
+    async updateCity(currentCity, data) {
+        try {
+            const response = await fetch(`cities/${currentCity.table_id}/${currentCity.dock_num}/`, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': this.csrfToken,
+                },
+                body: JSON.stringify(data),
+            });
+
+            if (!response.ok) {
+                const errorData = await response.json().catch(() => null);
+                showError(errorData?.message || 'Ошибка при обновлении города');
+                return;
+            }
+
+            // Обновляем citiesData
+            const index = this.citiesData.findIndex(city =>
+                city.table_id === currentCity.table_id &&
+                city.dock_num === currentCity.dock_num
+            );
+
+            if (index !== -1) {
+                Object.assign(this.citiesData[index], data);
+            }
+
+            Object.assign(currentCity, data);
+
+            // Обновляем DOM
+            const container = document.getElementById('city-cards');
+            const cards = container.querySelectorAll('.card-style');
+            document.getElementById('default-search').value = '';
+            for (const card of cards) {
+                const cityData = JSON.parse(card.dataset.city || '{}');
+                if (
+                    cityData.table_id === currentCity.table_id &&
+                    cityData.dock_num === currentCity.dock_num
+                ) {
+                    card.dataset.city = JSON.stringify(currentCity);
+
+                    const props = [
+                        ['Организация', currentCity.name_organ],
+                        ['Псевдоним', currentCity.pseudonim],
+                        ['Время работы', currentCity.work_time],
+                        ['Название раздела', currentCity.table_name],
+                        ['Номер в таблице', currentCity.some_number],
+                        ['IP address', currentCity.ip_address],
+                    ];
+
+                    card.innerHTML = `<h3 class="text-lg font-semibold mb-2 text-center">${currentCity.location || 'Неизвестно'}</h3>` +
+                        props
+                            .filter(([_, val]) => val)
+                            .map(([label, val]) => `<p><strong>${label}:</strong> ${val}</p>`)
+                            .join('');
+
+                    break;
+
+                }
+            }
+
+            this.showSuccessMessage(`Город "${data.name_organ}" успешно обновлён`);
+        } catch (error) {
+            console.error('Ошибка PUT-запроса:', error);
+            showError(error);
+        }
+    }
+
+    /**
+     * Удаляет город, отправляя DELETE-запрос, и обновляет DOM.
+     * @param {Object} currentCity - Объект текущего города.
+     */
+    async deleteCity(currentCity) {
+        // Показываем окно подтверждения
+        const confirmed = await this.showDeleteConfirmation(currentCity);
+        if (!confirmed) {
+            return; // Пользователь отменил удаление
+        }
+
+        try {
+            const response = await fetch(`cities/${currentCity.table_id}/${currentCity.dock_num}/`, {
+                method: 'DELETE',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': this.csrfToken,
+                },
+            });
+
+            if (!response.ok) {
+                const errorData = await response.json().catch(() => null);
+                showError(errorData?.message || 'Ошибка при удалении города');
+                return;
+            }
+
+            // Удаляем из локальных данных
+            const index = this.citiesData.findIndex(city =>
+                city.table_id === currentCity.table_id && city.dock_num === currentCity.dock_num
+            );
+
+            if (index !== -1) {
+                this.citiesData.splice(index, 1);
+            }
+
+            // Удаляем карточку из DOM
+            const container = document.getElementById('city-cards');
+            const cards = container.querySelectorAll('.card-style');
+            document.getElementById('default-search').value = '';
+
+            for (const card of cards) {
+                const cityData = JSON.parse(card.dataset.city || '{}');
+                if (
+                    cityData.table_id === currentCity.table_id &&
+                    cityData.dock_num === currentCity.dock_num
+                ) {
+                    card.remove();
+                    break;
+                }
+            }
+
+            this.showSuccessMessage(`Город "${currentCity.name_organ}" успешно удалён`);
+            this.hideModal();
+        } catch (error) {
+            console.error('Ошибка DELETE-запроса:', error);
+            showError(error);
+        }
+    }
+
+
+    /**
+     * Показывает сообщение об успехе с анимацией.
+     * @param {string} message - Текст сообщения.
+     */
+    showSuccessMessage(message) {
+        const serverInfo = document.getElementById('server-info');
+        serverInfo.classList.remove('hidden', 'animate-popup-reverse');
+        serverInfo.classList.add('flex', 'animate-popup');
+        serverInfo.querySelector('p').textContent = message;
+        serverInfo.scrollIntoView({ behavior: 'smooth', block: 'start' });
+
+        setTimeout(() => {
+            serverInfo.classList.remove('animate-popup');
+            serverInfo.classList.add('animate-popup-reverse');
+            setTimeout(() => {
+                serverInfo.classList.add('hidden');
+                serverInfo.classList.remove('flex', 'animate-popup-reverse');
+            }, 1000);
+        }, 5000);
+    }
+
+    /**
+     * Отображает модальное окно с подтверждением удаления города.
+     * Возвращает Promise, который резолвится в true при подтверждении и false при отмене.
+     *
+     * @param {Object} cityToDelete - Объект города, который пользователь хочет удалить.
+     * @param {string} cityToDelete.name_organ - Название организации (города), отображаемое в подтверждении.
+     * @returns {Promise<boolean>} Promise, который возвращает true, если пользователь подтвердил удаление, и false — если отменил.
+     */
+    showDeleteConfirmation(cityToDelete) {
+        return new Promise((resolve) => {
+            const serverInfo = document.getElementById('server-info');
+            serverInfo.classList.remove('hidden', 'animate-popup-reverse');
+            serverInfo.classList.add('flex', 'animate-popup');
+            serverInfo.querySelector('h3').textContent = 'Подтверждение удаления';
+            serverInfo.querySelector('p').textContent = `Вы уверены, что хотите удалить "${cityToDelete.name_organ}"?`;
+            serverInfo.scrollIntoView({ behavior: 'smooth', block: 'start' });
+
+            const divBtn = document.getElementById('btn-div');
+            divBtn.innerHTML = '';
+
+            const confirmBtn = document.createElement('button');
+            confirmBtn.id = 'confirm-delete';
+            confirmBtn.textContent = 'Удалить';
+            confirmBtn.classList.add('btn-submit', '!p-1', '!font-medium');
+
+            const cancelBtn = document.createElement('button');
+            cancelBtn.id = 'cancel-delete';
+            cancelBtn.textContent = 'Отмена';
+            cancelBtn.classList.add('btn-cancel', '!p-1', '!font-medium');
+
+            divBtn.appendChild(confirmBtn);
+            divBtn.appendChild(cancelBtn);
+
+            let resolved = false;  // 🔒 защита от двойного resolve
+
+            const cleanup = () => {
+                return new Promise((res) => {
+                    serverInfo.classList.remove('animate-popup');
+                    serverInfo.classList.add('animate-popup-reverse');
+                    setTimeout(() => {
+                        divBtn.innerHTML = '';
+                        serverInfo.querySelector('h3').textContent = '';
+                        serverInfo.querySelector('p').textContent = '';
+                        serverInfo.classList.add('hidden');
+                        res();
+                    }, 1000);
+                });
+            };
+
+            // Автоматическая отмена через 30 секунд
+            const timeoutId = setTimeout(() => {
+                if (resolved) return;
+                resolved = true;
+                cleanup().then(() => resolve(false));
+            }, 5000); // ✅ 30 секунд
+
+            confirmBtn.addEventListener('click', () => {
+                if (resolved) return;
+                resolved = true;
+                clearTimeout(timeoutId);
+                cleanup().then(() => resolve(true));
+            });
+
+            cancelBtn.addEventListener('click', () => {
+                if (resolved) return;
+                resolved = true;
+                clearTimeout(timeoutId);
+                cleanup().then(() => resolve(false));
+            });
+        });
+    }
+
+
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    toggleAccentClasses('a-cities','a-cities-mob')
+    // Города запрашиваются постранично через api/search/, весь справочник на страницу не передаётся
+    new CityAutocomplete('default-search', 'suggestions');
+    new CityModalHandler('city-modal');
+});
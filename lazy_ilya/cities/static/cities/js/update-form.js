@@ -1,3 +1,526 @@
-import{s as a}from"./utils.js";import{t as c}from"./toggleAccent.js";class d{constructor(t,e,s){this.form=document.getElementById(t),this.fileInput=document.getElementById(e),this.serverError=document.getElementById(s),this.infoMessage=document.getElementById("server-info"),this.errorMessage=document.getElementById("errorMessage"),this.initAccordion(),this.initWebSocket(),this.initFileUpload()}initAccordion(){document.querySelectorAll(".accordion-toggle").forEach(t=>{t.addEventListener("click",()=>{const e=t.nextElementSibling,s=t.querySelector("svg"),o=e.classList.contains("max-h-600");document.querySelectorAll(".accordion-content").forEach(i=>i.classList.remove("max-h-600")),document.querySelectorAll(".accordion-toggle svg").forEach(i=>i.classList.remove("rotate-180")),setTimeout(()=>{o||(e.classList.add("max-h-600"),s.classList.add("rotate-180"))},500)})})}initWebSocket(){const e=`${window.location.protocol==="https:"?"wss":"ws"}://${window.location.host}/ws/upload/`;this.socket=new WebSocket(e),this.socket.onopen=()=>{console.log("WebSocket подключен")},this.socket.onmessage=s=>{const o=JSON.parse(s.data);console.log("Прогресс с сервера:",o),this.updateProgress(o)},this.socket.onclose=s=>{console.log("WebSocket закрыт",s)},this.socket.onerror=s=>{console.error("Ошибка WebSocket:",s)}}updateProgress(t){const e=document.getElementById("upload-progress-container"),s=document.getElementById("upload-progress-bar"),o=document.getElementById("upload-progress-text");e&&s&&o&&(e.classList.remove("hidden"),s.style.width=`${t}%`,o.textContent=`Файл обработан на ${t}%`),t>=100&&(this.showSuccessMessage("Обработка успешно завершена!"),this.fileInput.value="",setTimeout(()=>{e.classList.add("hidden"),s.style.width="0%",o.textContent="0%"},2e3))}initFileUpload(){this.form.addEventListener("submit",async t=>{t.preventDefault();const e=this.fileInput.files[0];if(!e||e.name!=="globus.docx"){this.errorMessage.classList.remove("hidden"),a("Нужно добавить файл с названием globus.docx!!!"),this.fileInput.classList.remove("correct_input"),this.fileInput.classList.add("error_input"),setTimeout(()=>{this.fileInput.classList.add("correct_input"),this.fileInput.classList.remove("error_input"),this.errorMessage.classList.add("hidden")},4e3);return}else this.errorMessage.classList.add("hidden");const s=new FormData;s.append("cityFile",e);const o=document.querySelector("[name=csrfmiddlewaretoken]").value;try{const i=await fetch(this.form.action,{method:"POST",headers:{"X-CSRFToken":o},body:s}),n=await i.json();if(i.ok){const r=n.message||"Файл успешно загружен";console.log(r)}else a(n.error||"Ошибка загрузки файла")}catch(i){alert("Произошла ошибка при отправке файла"),console.error(i)}})}showSuccessMessage(t){const e=this.infoMessage;e.classList.remove("hidden","animate-popup-reverse"),e.classList.add("flex","animate-popup"),e.querySelector("p").textContent=t,setTimeout(()=>{e.classList.remove("animate-popup"),e.classList.add("animate-popup-reverse"),setTimeout(()=>{e.classList.add("hidden"),e.classList.remove("flex","animate-popup-reverse")},1e3)},4e3)}}class h{constructor(t){this.form=document.getElementById(t),this.dockInput=this.form.querySelector("#dock-num"),this.tableSelect=this.form.querySelector("#table-name"),this.closeModalBtn=document.getElementById("close-modal"),this.saveCity=document.getElementById("save-city"),this.isEditMode=!1,this.csrfToken=document.querySelector("[name=csrfmiddlewaretoken]").value,this.infoMessage=document.getElementById("server-info"),this.fields={location:this.form.querySelector("#location"),name_organ:this.form.querySelector("#name-organ"),pseudonim:this.form.querySelector("#pseudonim"),letters:this.form.querySelector("#letters"),writing:this.form.querySelector("#writing"),ip_address:this.form.querySelector("#ip-address"),some_number:this.form.querySelector("#some-number"),work_time:this.form.querySelector("#work-time")},this.init(),this.initCancelButton(),this.initSaveButton()}init(){this.dockInput.addEventListener("input",()=>this.handleDockNumInput(!1)),this.tableSelect.addEventListener("change",()=>this.handleDockNumInput())}async handleDockNumInput(t=!0){const e=this.tableSelect.value;if(!e){this.clearFields();return}const s=t?"":this.dockInput.value;if(!t&&s.trim()===""){this.clearFields();return}try{const i=await(await fetch(`city-info/?dock_num=${s}&table_id=${e}`)).json();i.found?(this.fillFields(i.data),this.saveCity.textContent="Сохранить изменения",this.isEditMode=!0,t&&(this.dockInput.value=i.data.dock_num||"")):i.last_num?(t&&(this.dockInput.value=i.last_num,this.clearFields()),this.saveCity.textContent="Создать запись",this.isEditMode=!1):(this.saveCity.textContent="Создать запись",this.clearFields(),this.isEditMode=!1)}catch(o){console.error("Ошибка при получении данных:",o)}}initSaveButton(){this.saveCity.addEventListener("click",async()=>{if(!this.tableSelect.value){a("Пожалуйста, выберите название таблицы"),this.tableSelect.focus();return}const t=this.isEditMode?"PUT":"POST",e="city-info/",s={dock_num:this.dockInput.value,table_id:this.tableSelect.value,location:this.fields.location.value,name_organ:this.fields.name_organ.value,pseudonim:this.fields.pseudonim.value,letters:this.fields.letters.checked,writing:this.fields.writing.checked,ip_address:this.fields.ip_address.value,some_number:this.fields.some_number.value,work_time:this.fields.work_time.value};try{const o=await fetch(e,{method:t,headers:{"Content-Type":"application/json","X-CSRFToken":this.csrfToken},body:JSON.stringify(s)});if(o.ok)this.showSuccessMessage(`Данные успешно сохранены для записи №${s.dock_num}${s.name_organ?" - "+s.name_organ:""}${s.location?" - "+s.location:""}`),this.form.reset(),this.saveCity.textContent="Сохранить",this.isEditMode=!1;else{const i=await o.json();let n="";for(const r in i.errors)n+=`${r}: ${i.errors[r].join(", ")}
-`;a(`Ошибка при сохранении:
-`+n)}}catch(o){console.error("Ошибка при отправке формы:",o)}})}fillFields(t){this.fields.location.value=t.location||"",this.fields.name_organ.value=t.name_organ||"",this.fields.pseudonim.value=t.pseudonim||"",this.fields.letters.checked=t.letters??!1,this.fields.writing.checked=t.writing??!1,this.fields.ip_address.value=t.ip_address||"",this.fields.some_number.value=t.some_number||"",this.fields.work_time.value=t.work_time||""}clearFields(){Object.entries(this.fields).forEach(([t,e])=>{e.type==="checkbox"?e.checked=!1:e.value=""})}initCancelButton(){this.closeModalBtn&&this.closeModalBtn.addEventListener("click",()=>{this.form.reset(),this.saveCity.textContent="Сохранить",this.isEditMode=!1})}showSuccessMessage(t){const e=this.infoMessage;e.classList.remove("hidden","animate-popup-reverse"),e.classList.add("flex","animate-popup"),e.querySelector("p").textContent=t,e.scrollIntoView({behavior:"smooth",block:"start"}),setTimeout(()=>{e.classList.remove("animate-popup"),e.classList.add("animate-popup-reverse"),e.scrollIntoView({behavior:"smooth",block:"start"}),setTimeout(()=>{e.classList.add("hidden"),e.classList.remove("flex","animate-popup-reverse")},1e3)},4e3)}}document.addEventListener("DOMContentLoaded",()=>{c("a-admin","a-admin-mob"),new d("uploadForm","fileInput","server-error"),new h("updateFormCities")});
+import {s as showError} from "./utils.js";
+import {t as toggleAccentClasses} from "./toggleAccent.js";
+
+/**
+ * Класс для обработки загрузки файла в аккордеоне с отображением прогресса через WebSocket.
+ */
+class AccordionUploader {
+    /**
+     * @param {string} formId - ID формы загрузки.
+     * @param {string} fileInputId - ID поля выбора файла.
+     * @param {string} serverErrorId - ID элемента для отображения ошибок.
+     */
+    constructor(formId, fileInputId, serverErrorId) {
+        /** @type {HTMLFormElement} */
+        this.form = document.getElementById(formId);
+        /** @type {HTMLInputElement} */
+        this.fileInput = document.getElementById(fileInputId);
+        /** @type {HTMLElement} */
+        this.serverError = document.getElementById(serverErrorId);
+        /** @type {HTMLElement} */
+        this.infoMessage = document.getElementById('server-info');
+        this.errorMessage = document.getElementById('errorMessage');
+
+        this.initAccordion();
+        this.initWebSocket();
+        this.initFileUpload();
+    }
+
+    /**
+     * Инициализация аккордеона с плавным раскрытием и поворотом иконки.
+     */
+    initAccordion() {
+        document.querySelectorAll('.accordion-toggle').forEach(button => {
+            button.addEventListener('click', () => {
+                const content = button.nextElementSibling;
+                const svg = button.querySelector('svg');
+
+                const isOpen = content.classList.contains('max-h-600');
+
+                // Закрыть все открытые аккордеоны
+                document.querySelectorAll('.accordion-content').forEach(c => c.classList.remove('max-h-600'));
+                document.querySelectorAll('.accordion-toggle svg').forEach(s => s.classList.remove('rotate-180'));
+
+                // Открыть текущий, если он был закрыт
+                setTimeout(() => {
+                    if (!isOpen) {
+                        content.classList.add('max-h-600');
+                        svg.classList.add('rotate-180');
+                    }
+                }, 500);
+            });
+        });
+    }
+
+    /**
+     * Устанавливает WebSocket-соединение и обрабатывает сообщения с прогрессом загрузки.
+     */
+    initWebSocket() {
+        const wsScheme = window.location.protocol === "https:" ? "wss" : "ws";
+        const socketUrl = `${wsScheme}://${window.location.host}/ws/upload/`;
+        this.socket = new WebSocket(socketUrl);
+
+        this.socket.onopen = () => {
+            console.log("WebSocket подключен");
+            // Сообщаем известную версию данных, чтобы сервер дослал пропущенные изменения
+            const version = Number(sessionStorage.getItem("citiesVersion"));
+            if (version) {
+                this.socket.send(JSON.stringify({type: "sync", version}));
+            }
+        };
+
+        this.socket.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data && (data.type === "cities_delta" || data.type === "cities_resync")) {
+                this.handleCitiesChange(data);
+                return;
+            }
+            console.log("Прогресс с сервера:", data);
+            this.updateProgress(data);
+        };
+
+        this.socket.onclose = (event) => {
+            console.log("WebSocket закрыт", event);
+        };
+
+        this.socket.onerror = (error) => {
+            console.error("Ошибка WebSocket:", error);
+        };
+    }
+
+    /**
+     * Запоминает версию данных и передает изменения списка городов остальным модулям страницы
+     * событием `cities:delta` (только изменившиеся строки) или `cities:resync` (загрузить список заново).
+     * @param {{type: string, version: number}} message - Сообщение сервера.
+     */
+    handleCitiesChange(message) {
+        sessionStorage.setItem("citiesVersion", String(message.version));
+        const eventName = message.type === "cities_delta" ? "cities:delta" : "cities:resync";
+        window.dispatchEvent(new CustomEvent(eventName, {detail: message}));
+        console.log(`Изменения списка городов, версия ${message.version}:`, message);
+    }
+
+    /**
+     * Обновляет визуальный прогресс загрузки на основе сообщения о прогрессе задачи импорта.
+     * @param {{progress: number, rows_per_second: number, eta_seconds: ?number}} data - Прогресс
+     *        от 0 до 100, скорость (строк в секунду) и оценка оставшегося времени.
+     */
+    updateProgress(data) {
+        const progress = data.progress;
+        const container = document.getElementById("upload-progress-container");
+        const bar = document.getElementById("upload-progress-bar");
+        const text = document.getElementById("upload-progress-text");
+
+        if (container && bar && text) {
+            container.classList.remove("hidden");
+            bar.style.width = `${progress}%`;
+            const eta = data.eta_seconds != null && progress < 100 ? `, осталось ~${Math.ceil(data.eta_seconds)} с` : "";
+            const rate = data.rows_per_second ? ` (${Math.round(data.rows_per_second)} строк/с${eta})` : "";
+            text.textContent = `Файл обработан на ${progress}%${rate}`;
+        }
+
+        if (progress >= 100) {
+            this.showSuccessMessage("Обработка успешно завершена!");
+            this.fileInput.value = '';
+            setTimeout(() => {
+                container.classList.add("hidden");
+                bar.style.width = "0%";
+                text.textContent = "0%";
+            }, 2000);
+        }
+    }
+
+    /**
+     * Инициализирует обработку отправки формы и валидацию файла.
+     */
+    initFileUpload() {
+        this.form.addEventListener('submit', async (e) => {
+            e.preventDefault();
+
+            const file = this.fileInput.files[0];
+            if (!file || file.name !== "globus.docx") {
+                this.errorMessage.classList.remove("hidden");
+                showError('Нужно добавить файл с названием globus.docx!!!');
+                this.fileInput.classList.remove("correct_input");
+                this.fileInput.classList.add("error_input");
+
+                setTimeout(() => {
+                    this.fileInput.classList.add("correct_input");
+                    this.fileInput.classList.remove("error_input");
+                    this.errorMessage.classList.add("hidden");
+                }, 4000);
+                return;
+            } else {
+                this.errorMessage.classList.add("hidden");
+            }
+
+            const formData = new FormData();
+            formData.append("cityFile", file);  // Название поля должно совпадать с серверной логикой
+
+            const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+
+            try {
+                const response = await fetch(this.form.action, {
+                    method: "POST",
+                    headers: {
+                        "X-CSRFToken": csrfToken,
+                    },
+                    body: formData,
+                });
+
+                const result = await response.json();
+
+                if (response.ok) {
+                    const message = result.message || "Файл успешно загружен";
+                    console.log(message);
+                    if (result.job_id) {
+                        // Прогресс приходит только подписавшимся на группу задачи
+                        this.socket.send(JSON.stringify({type: "subscribe", job_id: result.job_id}));
+                        this.pollImportJob(result.job_id);
+                    }
+                } else {
+                    showError(result.error || "Ошибка загрузки файла");
+                }
+
+            } catch (err) {
+                alert("Произошла ошибка при отправке файла");
+                console.error(err);
+            }
+        });
+    }
+
+    /**
+     * Периодически запрашивает состояние задачи импорта, пока она не завершится.
+     * Прогресс приходит через WebSocket, здесь отслеживается только ошибка импорта.
+     * @param {number} jobId - ID задачи импорта, полученный от сервера.
+     * @param {number} [interval=2000] - Интервал опроса в миллисекундах.
+     */
+    pollImportJob(jobId, interval = 2000) {
+        const timer = setInterval(async () => {
+            try {
+                const response = await fetch(`import-jobs/${jobId}/`);
+                if (!response.ok) {
+                    clearInterval(timer);
+                    return;
+                }
+                const job = await response.json();
+                if (job.status === "failed") {
+                    clearInterval(timer);
+                    showError(`Ошибка импорта: ${job.error}`);
+                } else if (job.status === "done") {
+                    clearInterval(timer);
+                    console.log(`Импорт №${jobId} завершен:`, job);
+                }
+            } catch (err) {
+                clearInterval(timer);
+                console.error("Ошибка при получении состояния импорта:", err);
+            }
+        }, interval);
+    }
+
+    /**
+     * Показывает сообщение об успехе с анимацией.
+     * @param {string} message - Текст сообщения.
+     */
+    showSuccessMessage(message) {
+        const serverInfo = this.infoMessage;
+        serverInfo.classList.remove('hidden', 'animate-popup-reverse');
+        serverInfo.classList.add('flex', 'animate-popup');
+        serverInfo.querySelector('p').textContent = message;
+
+        setTimeout(() => {
+            serverInfo.classList.remove('animate-popup');
+            serverInfo.classList.add('animate-popup-reverse');
+            setTimeout(() => {
+                serverInfo.classList.add('hidden');
+                serverInfo.classList.remove('flex', 'animate-popup-reverse');
+            }, 1000);
+        }, 4000);
+    }
+}
+
+/**
+ * Обработчик формы создания/редактирования города.
+ * Поддерживает автозаполнение, режимы редактирования и создания, отправку данных на сервер.
+ */
+
+
+class CityFormHandler {
+    /**
+     * @param {string} formId - ID формы, которую нужно обрабатывать
+     */
+    constructor(formId) {
+        /** @type {HTMLFormElement} */
+        this.form = document.getElementById(formId);
+
+        /** @type {HTMLInputElement} */
+        this.dockInput = this.form.querySelector('#dock-num');
+        /** @type {HTMLSelectElement} */
+        this.tableSelect = this.form.querySelector('#table-name');
+        /** @type {HTMLButtonElement} */
+        this.closeModalBtn = document.getElementById('close-modal');
+        /** @type {HTMLButtonElement} */
+        this.saveCity = document.getElementById('save-city');
+
+        /** Флаг, указывающий режим редактирования */
+        this.isEditMode = false;
+        /** @type {string} */
+        this.csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+        /** @type {HTMLElement} */
+        this.infoMessage = document.getElementById('server-info');
+
+        /** @type {Record<string, HTMLInputElement>} */
+        this.fields = {
+            location: this.form.querySelector('#location'),
+            name_organ: this.form.querySelector('#name-organ'),
+            pseudonim: this.form.querySelector('#pseudonim'),
+            letters: this.form.querySelector('#letters'),
+            writing: this.form.querySelector('#writing'),
+            ip_address: this.form.querySelector('#ip-address'),
+            some_number: this.form.querySelector('#some-number'),
+            work_time: this.form.querySelector('#work-time')
+        };
+
+        this.init();
+        this.initCancelButton();
+        this.initSaveButton();
+        this.initCitiesChanges();
+    }
+
+    /**
+     * Инициализация обработки изменения номера документа и таблицы
+     */
+    init() {
+        this.dockInput.addEventListener('input', () => this.handleDockNumInput(false));
+        this.tableSelect.addEventListener('change', () => this.handleDockNumInput());
+    }
+
+    /**
+     * Подписывается на изменения справочника после импорта (события AccordionUploader):
+     * `cities:delta` применяется к списку таблиц и открытой записи, `cities:resync` перезагружает данные.
+     */
+    initCitiesChanges() {
+        window.addEventListener('cities:delta', (e) => this.applyDelta(e.detail));
+        window.addEventListener('cities:resync', () => this.resync());
+    }
+
+    /**
+     * Применяет дельту: обновляет названия таблиц в списке, убирает удаленные таблицы
+     * и заново загружает открытую запись, если она изменилась.
+     * @param {{added: Array<Object>, updated: Array<Object>, deleted: Array<Array<number>>,
+     *          deleted_tables: Array<number>, tables: Record<string, string>}} delta
+     */
+    applyDelta(delta) {
+        for (const [tableId, tableName] of Object.entries(delta.tables)) {
+            let option = this.tableSelect.querySelector(`option[value="${tableId}"]`);
+            if (!option) {
+                option = new Option('', tableId);
+                this.tableSelect.add(option);
+            }
+            option.textContent = ` ${tableName}`;
+        }
+
+        const tableId = Number(this.tableSelect.value);
+        const dockNum = Number(this.dockInput.value);
+        for (const deletedId of delta.deleted_tables) {
+            this.tableSelect.querySelector(`option[value="${deletedId}"]`)?.remove();
+        }
+        if (tableId && delta.deleted_tables.includes(tableId)) {
+            this.form.reset();
+            this.isEditMode = false;
+            this.saveCity.textContent = 'Сохранить';
+            return;
+        }
+
+        const isCurrent = (table_id, dock_num) => table_id === tableId && dock_num === dockNum;
+        const changed = delta.added.some(row => isCurrent(row.table_id, row.dock_num))
+            || delta.updated.some(row => isCurrent(row.table_id, row.dock_num))
+            || delta.deleted.some(([table_id, dock_num]) => isCurrent(table_id, dock_num));
+        if (changed) {
+            this.handleDockNumInput(false);
+        }
+    }
+
+    /**
+     * Изменений слишком много для дельты: если форма не заполняется, перезагружает страницу
+     * (вместе со списком таблиц), иначе только заново загружает открытую запись.
+     */
+    resync() {
+        const touched = this.tableSelect.value || Object.values(this.fields).some(el =>
+            el.type === 'checkbox' ? el.checked : el.value.trim() !== '');
+        if (!touched) {
+            window.location.reload();
+        } else if (this.tableSelect.value && this.dockInput.value.trim() !== '') {
+            this.handleDockNumInput(false);
+        }
+    }
+
+    /**
+     * Получает и отображает данные о городе по номеру документа и ID таблицы
+     * @param {boolean} [first=true] - Флаг инициализации формы, при true номер будет запрошен автоматически
+     */
+    async handleDockNumInput(first = true) {
+        const tableId = this.tableSelect.value;
+        if (!tableId) {
+            this.clearFields();
+            return;
+        }
+
+        const dockNum = first ? '' : this.dockInput.value;
+        if (!first && dockNum.trim() === '') {
+            this.clearFields();
+            return;
+        }
+
+        try {
+            const response = await fetch(`city-info/?dock_num=${dockNum}&table_id=${tableId}`);
+            const result = await response.json();
+
+            if (result.found) {
+                this.fillFields(result.data);
+                this.saveCity.textContent = 'Сохранить изменения';
+                this.isEditMode = true;
+                if (first) {
+                    this.dockInput.value = result.data.dock_num || '';
+                }
+            } else if (result.last_num) {
+                if (first) {
+                    this.dockInput.value = result.last_num;
+                    this.clearFields();
+                }
+                this.saveCity.textContent = 'Создать запись';
+                this.isEditMode = false;
+            } else {
+                this.saveCity.textContent = 'Создать запись';
+                this.clearFields();
+                this.isEditMode = false;
+            }
+        } catch (err) {
+            console.error('Ошибка при получении данных:', err);
+        }
+    }
+
+    /**
+     * Инициализирует кнопку сохранения, отправляет форму на сервер
+     */
+    initSaveButton() {
+        this.saveCity.addEventListener('click', async () => {
+            if (!this.tableSelect.value) {
+                showError('Пожалуйста, выберите название таблицы');
+                this.tableSelect.focus();
+                return;
+            }
+
+            const method = this.isEditMode ? 'PUT' : 'POST';
+            const url = 'city-info/';
+            const data = {
+                dock_num: this.dockInput.value,
+                table_id: this.tableSelect.value,
+                location: this.fields.location.value,
+                name_organ: this.fields.name_organ.value,
+                pseudonim: this.fields.pseudonim.value,
+                letters: this.fields.letters.checked,
+                writing: this.fields.writing.checked,
+                ip_address: this.fields.ip_address.value,
+                some_number: this.fields.some_number.value,
+                work_time: this.fields.work_time.value,
+            };
+
+            try {
+                const response = await fetch(url, {
+                    method,
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'X-CSRFToken': this.csrfToken,
+                    },
+                    body: JSON.stringify(data)
+                });
+
+                if (response.ok) {
+                    this.showSuccessMessage(`Данные успешно сохранены для записи №${data.dock_num}${data.name_organ ? ' - ' + data.name_organ : ''}${data.location ? ' - ' + data.location : ''}`);
+                    this.form.reset();
+                    this.saveCity.textContent = 'Сохранить';
+                    this.isEditMode = false;
+                } else {
+                    const errorData = await response.json();
+                    let errorMsg = '';
+                    for (const field in errorData.errors) {
+                        errorMsg += `${field}: ${errorData.errors[field].join(', ')}\n`;
+                    }
+                    showError('Ошибка при сохранении:\n' + errorMsg);
+                }
+            } catch (err) {
+                console.error('Ошибка при отправке формы:', err);
+            }
+        });
+    }
+
+    /**
+     * Заполняет поля формы полученными данными
+     * @param {Record<string, any>} data
+     */
+    fillFields(data) {
+        this.fields.location.value = data.location || '';
+        this.fields.name_organ.value = data.name_organ || '';
+        this.fields.pseudonim.value = data.pseudonim || '';
+        this.fields.letters.checked = data.letters ?? false;
+        this.fields.writing.checked = data.writing ?? false;
+        this.fields.ip_address.value = data.ip_address || '';
+        this.fields.some_number.value = data.some_number || '';
+        this.fields.work_time.value = data.work_time || '';
+    }
+
+    /**
+     * Очищает все поля формы
+     */
+    clearFields() {
+        Object.entries(this.fields).forEach(([_, el]) => {
+            if (el.type === 'checkbox') {
+                el.checked = false;
+            } else {
+                el.value = '';
+            }
+        });
+    }
+
+    /**
+     * Обработчик кнопки "отмена" — сбрасывает форму
+     */
+    initCancelButton() {
+        if (this.closeModalBtn) {
+            this.closeModalBtn.addEventListener('click', () => {
+                this.form.reset();
+                this.saveCity.textContent = 'Сохранить';
+                this.isEditMode = false;
+            });
+        }
+    }
+
+    /**
+     * Показывает анимированное сообщение об успешной операции
+     * @param {string} message
+     */
+    showSuccessMessage(message) {
+        const serverInfo = this.infoMessage;
+        serverInfo.classList.remove('hidden', 'animate-popup-reverse');
+        serverInfo.classList.add('flex', 'animate-popup');
+        serverInfo.querySelector('p').textContent = message;
+        serverInfo.scrollIntoView({behavior: 'smooth', block: 'start'});
+
+        setTimeout(() => {
+            serverInfo.classList.remove('animate-popup');
+            serverInfo.classList.add('animate-popup-reverse');
+            serverInfo.scrollIntoView({behavior: 'smooth', block: 'start'});
+            setTimeout(() => {
+                serverInfo.classList.add('hidden');
+                serverInfo.classList.remove('flex', 'animate-popup-reverse');
+            }, 1000);
+        }, 4000);
+    }
+}
+
+document.addEventListener("DOMContentLoaded", () => {
+    toggleAccentClasses('a-admin','a-admin-mob');
+    new AccordionUploader("uploadForm", "fileInput", "server-error");
+    new  CityFormHandler("updateFormCities");
+});
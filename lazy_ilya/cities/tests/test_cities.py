@@ -39,7 +39,7 @@ class CitiesViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "cities/cities.html")
         self.assertIn('is_admin',response.context)
-        self.assertIn('cities_json', response.context)  # предположим, что контекст содержит 'cities'
+        self.assertNotIn('cities_json', response.context)  # города отдаёт api/search/
 
     def test_put_update_city_success(self):
         url = reverse('cities:edit_city', args=[self.city.table_id.id, self.city.dock_num])
@@ -1,3 +1,7 @@
+import shutil
+import tempfile
+from pathlib import Path
+
 from django.test import TestCase, Client
 from django.contrib.auth.models import User, Group
 from django.urls import reverse
@@ -5,6 +9,8 @@ from unittest.mock import patch, MagicMock
 from io import BytesIO
 from django.core.files.uploadedfile import SimpleUploadedFile
 
+from cities.models import ImportJob
+from lazy_ilya.utils.settings_for_app import ProjectSettings
 from myauth.models import CustomUser
 
 
@@ -54,10 +60,47 @@ class CitiesAdminTests(TestCase):
         response = self.client.post(self.url, {'cityFile': uploaded_file})
 
         self.assertEqual(response.status_code, 200)
-        self.assertJSONEqual(response.content, {"message": "Файл загружен успешно"})
+        job = ImportJob.objects.get()
+        self.assertJSONEqual(response.content, {"message": "Файл загружен успешно", "job_id": job.id})
+        self.assertEqual(job.status, ImportJob.Status.QUEUED)
         mock_thread.assert_called_once()
         mock_thread.return_value.start.assert_called_once()
 
+    @patch('cities.views.import_worker.wake')
+    def test_each_upload_is_stored_under_its_own_name(self, mock_wake):
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.client.login(username='adminuser', password='pass')
+
+        with patch.object(ProjectSettings, "tlg_dir", tmp_dir):
+            for content in (b"first", b"second"):
+                self.client.post(self.url, {'cityFile': SimpleUploadedFile("globus.docx", content)})
+
+        # Задача в очереди импортирует свой файл, даже если следом загрузили файл с тем же именем
+        first, second = ImportJob.objects.order_by("pk")
+        self.assertNotEqual(first.file_path, second.file_path)
+        self.assertEqual((tmp_dir / first.file_path).read_bytes(), b"first")
+        self.assertEqual((tmp_dir / second.file_path).read_bytes(), b"second")
+
+    @patch('cities.views.import_worker.wake')
+    def test_upload_is_rejected_when_import_queue_is_full(self, mock_wake):
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.client.login(username='adminuser', password='pass')
+        ImportJob.objects.create(file_path="running.docx", status=ImportJob.Status.RUNNING)
+        ImportJob.objects.create(file_path="queued.docx")
+
+        with patch.object(ProjectSettings, "tlg_dir", tmp_dir), \
+                patch.object(ProjectSettings, "import_max_pending", 2):
+            response = self.client.post(self.url, {'cityFile': SimpleUploadedFile("globus.docx", b"data")})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(ImportJob.objects.count(), 2)
+        # Файл отклоненной загрузки не остается в каталоге
+        self.assertEqual(list(tmp_dir.rglob("*.docx")), [])
+        mock_wake.assert_not_called()
+
     def test_post_no_file_uploaded(self):
         self.client.login(username='adminuser', password='pass')
 
@@ -0,0 +1,110 @@
+import json
+
+from django.db import connection
+from django.forms.models import model_to_dict
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cities.models import CityData, TableNames
+from cities.utils.common_func.cities_cache import get_cities_payload, invalidate_cities_cache
+from myauth.models import CustomUser
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "cities": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "cities-tests"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CitiesCacheTests(TestCase):
+    def setUp(self):
+        self.table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        self.city = CityData.objects.create(table_id=self.table, dock_num=1, location="Москва", name_organ="Орган")
+        CityData.objects.create(table_id=self.table, dock_num=2, location="", name_organ="Пусто")
+        invalidate_cities_cache()
+
+        self.user = CustomUser.objects.create_user(username="user", password="pass", phone_number="+79852000338")
+        self.client = Client()
+        self.client.login(username="user", password="pass")
+
+    def test_payload_is_built_once_per_version(self):
+        cities_json, etag, version = get_cities_payload()
+        self.assertEqual([city["location"] for city in json.loads(cities_json)], ["Москва"])
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = get_cities_payload()
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(again, (cities_json, etag, version))
+
+    def test_write_through_view_invalidates_payload(self):
+        _, etag, version = get_cities_payload()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                reverse("cities:edit_city", args=[self.table.id, self.city.dock_num]),
+                data=json.dumps({"location": "Химки"}), content_type="application/json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        cities_json, new_etag, new_version = get_cities_payload()
+        self.assertNotEqual(new_version, version)
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(json.loads(cities_json)[0]["location"], "Химки")
+
+    def test_admin_edit_invalidates_payload(self):
+        _, etag, _ = get_cities_payload()
+        admin = CustomUser.objects.create_superuser(username="root", password="pass", phone_number="+79852000999")
+        self.client.force_login(admin)
+        form = {key: value for key, value in model_to_dict(self.city).items() if value is not None}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("admin:cities_citydata_change", args=[self.city.pk]),
+                                        {**form, "location": "Химки"})
+
+        self.assertEqual(response.status_code, 302)
+        cities_json, new_etag, _ = get_cities_payload()
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(json.loads(cities_json)[0]["location"], "Химки")
+
+    def test_table_changes_invalidate_payload(self):
+        _, _, version = get_cities_payload()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.table.table_name = "Раздел 1 Новый"
+            self.table.save()
+        _, _, renamed_version = get_cities_payload()
+        self.assertNotEqual(renamed_version, version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.table.delete()
+        cities_json, _, deleted_version = get_cities_payload()
+        self.assertNotEqual(deleted_version, renamed_version)
+        self.assertEqual(json.loads(cities_json), [])
+
+    def test_cache_is_not_invalidated_before_commit(self):
+        _, _, version = get_cities_payload()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.city.location = "Химки"
+            self.city.save()
+            self.assertEqual(get_cities_payload()[2], version)
+        self.assertTrue(callbacks)
+
+    def test_list_view_returns_not_modified_for_known_etag(self):
+        url = reverse("cities:cities_list")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_search_etag_changes_after_invalidation(self):
+        url = reverse("cities:city_search")
+        etag = self.client.get(url, {"q": "моск"})["ETag"]
+        self.assertEqual(self.client.get(url, {"q": "моск"}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        invalidate_cities_cache()
+
+        response = self.client.get(url, {"q": "моск"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -0,0 +1,102 @@
+import json
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cities.models import CityData, CounterCities, TableNames
+from cities.utils.counters.city_counters import (
+    CityCounterAccumulator,
+    apply_counter_deltas,
+    city_counter_accumulator,
+    resolve_city_ids,
+)
+from myauth.models import CustomUser
+
+
+class CityCountersTests(TestCase):
+    def setUp(self):
+        self.table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        self.other = TableNames.objects.create(table_name="Раздел 2 Другой")
+        self.cities = [
+            CityData.objects.create(table_id=self.table, dock_num=num, location=f"Город {num}")
+            for num in range(1, 6)
+        ]
+        self.other_city = CityData.objects.create(table_id=self.other, dock_num=1, location="Другой")
+
+    def counts(self) -> dict:
+        return dict(CounterCities.objects.values_list("dock_num_id", "count_responses"))
+
+    def test_resolve_skips_missing_and_cross_pairs(self):
+        ids = resolve_city_ids([self.table.id, self.other.id, self.other.id], [2, 1, 3])
+        self.assertEqual(ids, [self.cities[1].id, self.other_city.id])
+
+    def test_resolve_uses_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resolve_city_ids([self.table.id] * 5, [1, 2, 3, 4, 5])
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_apply_creates_and_increments(self):
+        apply_counter_deltas({self.cities[0].id: 1, self.cities[1].id: 2})
+        apply_counter_deltas({self.cities[0].id: 3, self.cities[2].id: 3})
+
+        self.assertEqual(self.counts(), {self.cities[0].id: 4, self.cities[1].id: 2, self.cities[2].id: 3})
+
+    def test_apply_query_count_does_not_grow_with_cities(self):
+        with CaptureQueriesContext(connection) as ctx:
+            apply_counter_deltas({self.cities[0].id: 1})
+        small = len(ctx.captured_queries)
+        with CaptureQueriesContext(connection) as ctx:
+            apply_counter_deltas({city.id: num for num, city in enumerate(self.cities, start=1)})
+        self.assertEqual(len(ctx.captured_queries), small)
+
+    def test_accumulator_aggregates_until_flush(self):
+        accumulator = CityCounterAccumulator(flush_interval=60)
+        try:
+            accumulator.add([self.cities[0].id, self.cities[0].id])
+            accumulator.add([self.cities[0].id, self.cities[1].id])
+            self.assertEqual(self.counts(), {})
+
+            self.assertEqual(accumulator.flush(), 2)
+        finally:
+            if accumulator._timer is not None:
+                accumulator._timer.cancel()
+
+        self.assertEqual(self.counts(), {self.cities[0].id: 3, self.cities[1].id: 1})
+        self.assertEqual(accumulator.pending, {})
+
+    def test_accumulator_keeps_deltas_when_write_fails(self):
+        accumulator = CityCounterAccumulator(flush_interval=0)
+        with patch("cities.utils.counters.city_counters.apply_counter_deltas", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                accumulator.add([self.cities[0].id])
+
+        self.assertEqual(accumulator.pending, {self.cities[0].id: 1})
+        accumulator.flush()
+        self.assertEqual(self.counts(), {self.cities[0].id: 1})
+
+
+class IncrementCityCountersViewTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="user", password="pass", phone_number="+79852000338")
+        self.client = Client()
+        self.client.login(username="user", password="pass")
+        self.url = reverse("cities:city-counter")
+        table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        self.city = CityData.objects.create(table_id=table, dock_num=1, location="Москва")
+
+    def post(self, payload: dict):
+        return self.client.post(self.url, data=json.dumps(payload), content_type="application/json")
+
+    def test_increment_is_written_after_flush(self):
+        response = self.post({"table_ids": [self.city.table_id_id] * 2 + [999], "dock_num": [1, 1, 1]})
+        city_counter_accumulator.flush()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CounterCities.objects.get(dock_num=self.city).count_responses, 2)
+
+    def test_length_mismatch(self):
+        response = self.post({"table_ids": [1, 2], "dock_num": [1]})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,158 @@
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from channels.testing import WebsocketCommunicator
+from django.core.cache import caches
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from cities.consumers import UploadProgressConsumer
+from cities.models import TableNames
+from cities.utils.common_func.city_deltas import (
+    CityChangeSet,
+    current_delta_version,
+    deltas_since,
+    record_change_set,
+)
+from cities.utils.parser_word.globus_parser import GlobusParser
+from cities.tests.test_globus_parser import make_doc_table
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "cities": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "city-deltas-tests"},
+}
+
+
+def changes_for(tables, table_models) -> CityChangeSet:
+    change_set = CityChangeSet()
+    GlobusParser._process_tables_with_rows(tables, table_models, change_set)
+    return change_set
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CityChangeSetTests(TestCase):
+    def setUp(self):
+        caches["cities"].clear()
+        self.table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        GlobusParser._process_tables_with_rows([make_doc_table(5)], [self.table])
+        self.table.refresh_from_db()
+
+    def test_only_changed_rows_and_fields_are_collected(self):
+        doc_table = make_doc_table(6)
+        doc_table[4] = doc_table[4][:2] + ("Новый орган",) + doc_table[4][3:]  # Строка 2
+        del doc_table[5]  # Строка 3 удалена, остальные сдвинулись
+
+        message = changes_for([doc_table], [self.table]).to_message(1)
+
+        updated = {(item["table_id"], item["dock_num"]): item["fields"] for item in message["updated"]}
+        self.assertEqual(updated[(self.table.id, 2)], {"name_organ": "Новый орган"})
+        self.assertNotIn("some_number", updated[(self.table.id, 2)])
+        self.assertEqual(updated[(self.table.id, 3)]["location"], "Город 4")
+        self.assertEqual(len(message["updated"]), 4)  # Строки 2-5
+        self.assertEqual(message["added"], [])
+        self.assertEqual(message["deleted"], [])
+
+    def test_added_and_deleted_rows_use_table_and_dock_num_keys(self):
+        grown = changes_for([make_doc_table(7)], [self.table])
+        self.assertEqual([row["dock_num"] for row in grown.added.values()], [6, 7])
+        self.assertEqual(grown.added[(self.table.id, 6)]["table_name"], "Раздел 1 Тестовый")
+
+        shrunk = changes_for([make_doc_table(4)], [self.table])
+        self.assertEqual(shrunk.deleted, [(self.table.id, 5), (self.table.id, 6), (self.table.id, 7)])
+
+    def test_unchanged_import_produces_empty_change_set(self):
+        self.assertEqual(changes_for([make_doc_table(5)], [self.table]).size, 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CityDeltaLogTests(TestCase):
+    def setUp(self):
+        caches["cities"].clear()
+
+    def record(self, rows: int = 1) -> dict:
+        change_set = CityChangeSet()
+        change_set.deleted.extend((1, num) for num in range(rows))
+        return record_change_set(change_set)
+
+    def test_versions_are_sequential_and_missed_deltas_are_returned(self):
+        first, second = self.record(), self.record()
+
+        self.assertEqual((first["version"], second["version"]), (1, 2))
+        self.assertEqual(second["base_version"], 1)
+        self.assertEqual(deltas_since(0), [first, second])
+        self.assertEqual(deltas_since(2), [])
+
+    def test_client_too_far_behind_gets_resync(self):
+        with patch.object(ProjectSettings, "city_delta_history", 2):
+            for _ in range(3):
+                self.record()
+
+        self.assertIsNone(deltas_since(0))
+        self.assertEqual(len(deltas_since(1)), 2)
+
+    def test_version_survives_cache_clear_and_rolled_back_import_frees_it(self):
+        self.record()
+        caches["cities"].clear()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.record()
+            raise RuntimeError("импорт откатился")
+
+        self.assertEqual(self.record()["version"], 2)
+        self.assertEqual([delta["version"] for delta in deltas_since(0)], [1, 2])
+
+    def test_large_change_set_is_sent_as_resync(self):
+        with patch.object(ProjectSettings, "city_delta_max_rows", 2):
+            message = self.record(rows=3)
+
+        self.assertEqual(message, {"type": "cities_resync", "version": 1})
+        self.assertIsNone(deltas_since(0))
+        self.assertEqual(current_delta_version(), 1)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+)
+class UploadProgressConsumerDeltaTests(TestCase):
+    def setUp(self):
+        caches["cities"].clear()
+
+    async def connect(self, path: str = "/ws/upload/") -> WebsocketCommunicator:
+        communicator = WebsocketCommunicator(UploadProgressConsumer.as_asgi(), path)
+        communicator.scope["user"] = type("Anonymous", (), {"is_authenticated": False, "username": ""})()
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    def test_reconnecting_client_receives_missed_deltas_or_resync(self):
+        first = record_change_set(CityChangeSet(deleted=[(1, 1)]))
+        second = record_change_set(CityChangeSet(deleted=[(1, 2)]))
+
+        async def scenario():
+            behind = await self.connect("/ws/upload/?version=1")
+            self.assertEqual(await behind.receive_json_from(), second)
+            await behind.disconnect()
+
+            unknown = await self.connect("/ws/upload/?version=7")
+            self.assertEqual(await unknown.receive_json_from(), {"type": "cities_resync", "version": 2})
+            await unknown.disconnect()
+
+            current = await self.connect()
+            await current.send_json_to({"type": "sync", "version": 0})
+            self.assertEqual([await current.receive_json_from() for _ in range(2)], [first, second])
+            self.assertTrue(await current.receive_nothing())
+            await current.disconnect()
+
+        async_to_sync(scenario)()
+
+    def test_delta_is_forwarded_to_connected_client(self):
+        async def scenario():
+            client = await self.connect()
+            delta = await sync_to_async(record_change_set)(CityChangeSet(deleted=[(1, 1)]))
+            await get_channel_layer().group_send("progress_updates", {"type": "send_delta", "delta": delta})
+            self.assertEqual(await client.receive_json_from(), delta)
+            await client.disconnect()
+
+        async_to_sync(scenario)()
@@ -0,0 +1,97 @@
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+
+from cities.models import CityData, TableNames
+from cities.utils.search.city_search import search_cities
+from myauth.models import CustomUser
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "cities": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "city-search-tests"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CitySearchTests(TestCase):
+    def setUp(self):
+        self.table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        self.moscow = CityData.objects.create(table_id=self.table, dock_num=1, location="Москва",
+                                              name_organ="Орган связи", pseudonim="Сокол")
+        self.podolsk = CityData.objects.create(table_id=self.table, dock_num=2, location="Подольск",
+                                               name_organ="Отдел Москва", pseudonim="Ястреб")
+        CityData.objects.create(table_id=self.table, dock_num=3, location="Тверь",
+                                name_organ="Управление", pseudonim="Беркут")
+        CityData.objects.create(table_id=self.table, dock_num=4, location="", name_organ="Москва пустая")
+
+    def locations(self, query: str, **kwargs) -> list:
+        return [city["location"] for city in search_cities(query, **kwargs)["results"]]
+
+    def test_indexed_search_is_case_insensitive_substring(self):
+        self.assertEqual(self.locations("СКВ"), ["Москва", "Подольск"])
+        self.assertEqual(self.locations("ястр"), ["Подольск"])
+
+    def test_location_match_ranks_first(self):
+        self.assertEqual(self.locations("москва")[0], "Москва")
+
+    def test_rows_without_location_are_skipped(self):
+        self.assertNotIn("", self.locations("пустая"))
+        self.assertEqual(search_cities("пустая")["total"], 0)
+
+    def test_short_query_uses_scan(self):
+        self.assertEqual(self.locations("тв"), ["Тверь"])
+        self.assertEqual(self.locations("м"), ["Москва", "Подольск"])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.moscow.location = "Химки"
+        self.moscow.save()
+        self.assertEqual(self.locations("химк"), ["Химки"])
+
+        CityData.objects.bulk_update([CityData(pk=self.podolsk.pk, location="Клин")], ["location"])
+        self.assertEqual(self.locations("клин"), ["Клин"])
+
+        self.moscow.delete()
+        self.assertEqual(self.locations("химк"), [])
+
+    def test_quotes_in_query_do_not_break_search(self):
+        self.assertEqual(search_cities('"мос" OR')["total"], 0)
+
+    def test_pagination(self):
+        for num in range(5, 30):
+            CityData.objects.create(table_id=self.table, dock_num=num, location=f"Город {num}")
+
+        first = search_cities("город", page=1, page_size=10)
+        last = search_cities("город", page=3, page_size=10)
+
+        self.assertEqual(first["total"], 25)
+        self.assertEqual(len(first["results"]), 10)
+        self.assertTrue(first["has_next"])
+        self.assertEqual(len(last["results"]), 5)
+        self.assertFalse(last["has_next"])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CitySearchViewTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="user", password="pass", phone_number="+79852000338")
+        self.client = Client()
+        self.url = reverse("cities:city_search")
+        table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        CityData.objects.create(table_id=table, dock_num=1, location="Москва", name_organ="Орган")
+
+    def test_redirect_if_not_logged_in(self):
+        response = self.client.get(self.url, {"q": "моск"})
+        self.assertEqual(response.status_code, 302)
+
+    def test_search_returns_json(self):
+        self.client.login(username="user", password="pass")
+        response = self.client.get(self.url, {"q": "моск"})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["results"][0]["name_organ"], "Орган")
+
+    def test_invalid_page(self):
+        self.client.login(username="user", password="pass")
+        response = self.client.get(self.url, {"q": "моск", "page": "abc"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from cities.models import CityData, CityDailyTop, CityHitBucket, TableNames
+from cities.utils.counters.city_counters import CityCounterAccumulator, apply_counter_deltas
+from cities.utils.counters.city_stats import (
+    rebuild_daily_top,
+    record_hits,
+    sparkline_points,
+    top_cities_for_days,
+)
+
+
+class CityStatsTests(TestCase):
+    def setUp(self):
+        table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+        self.cities = [
+            CityData.objects.create(table_id=table, dock_num=num, location=f"Город {num}")
+            for num in range(1, 5)
+        ]
+
+    def hits(self, granularity: str) -> dict:
+        return dict(CityHitBucket.objects.filter(granularity=granularity).values_list("city_id", "hits"))
+
+    def test_counter_write_fills_hour_and_day_buckets(self):
+        first, second = self.cities[0].id, self.cities[1].id
+        apply_counter_deltas({first: 2, second: 1})
+        apply_counter_deltas({first: 1})
+
+        expected = {first: 3, second: 1}
+        self.assertEqual(self.hits(CityHitBucket.Granularity.HOUR), expected)
+        self.assertEqual(self.hits(CityHitBucket.Granularity.DAY), expected)
+
+    def test_flush_rebuilds_today_top(self):
+        accumulator = CityCounterAccumulator(flush_interval=0)
+        accumulator.add([self.cities[2].id] * 3 + [self.cities[0].id])
+
+        top = list(CityDailyTop.objects.filter(day=timezone.localdate()).values_list("rank", "city_id", "hits"))
+        self.assertEqual(top, [(1, self.cities[2].id, 3), (2, self.cities[0].id, 1)])
+
+    def test_week_top_sums_days_and_builds_sparkline(self):
+        now = timezone.now()
+        yesterday = now - timedelta(days=1)
+        old = now - timedelta(days=10)
+        record_hits({self.cities[0].id: 2, self.cities[1].id: 5}, moment=now)
+        record_hits({self.cities[0].id: 4}, moment=yesterday)
+        record_hits({self.cities[2].id: 100}, moment=old)
+        for moment in (now, yesterday, old):
+            rebuild_daily_top(timezone.localtime(moment).date())
+
+        top = top_cities_for_days(days=7, limit=3)
+
+        self.assertEqual([(item["city"].id, item["hits"]) for item in top],
+                         [(self.cities[0].id, 6), (self.cities[1].id, 5)])
+        self.assertEqual(top[0]["sparkline"], [0, 0, 0, 0, 0, 4, 2])
+
+    def test_rollup_command_prunes_old_hour_buckets(self):
+        record_hits({self.cities[0].id: 1}, moment=timezone.now() - timedelta(days=40))
+        record_hits({self.cities[0].id: 1})
+
+        call_command("rollup_city_stats", days=1, stdout=StringIO())
+
+        self.assertEqual(CityHitBucket.objects.filter(granularity=CityHitBucket.Granularity.HOUR).count(), 1)
+        self.assertEqual(CityHitBucket.objects.filter(granularity=CityHitBucket.Granularity.DAY).count(), 2)
+
+    def test_sparkline_points(self):
+        self.assertEqual(sparkline_points([0, 5, 10], width=100, height=10), "0.0,10.0 50.0,5.0 100.0,0.0")
+        self.assertEqual(sparkline_points([]), "")
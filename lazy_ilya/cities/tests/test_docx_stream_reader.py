@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from docx import Document
+
+from cities.utils.parser_word.docx_stream_reader import iter_docx_blocks, read_docx_tables
+
+GLOBUS_FILE = Path(settings.BASE_DIR).parent / "test_files" / "globus.docx"
+
+
+def read_with_python_docx(path):
+    document = Document(path)
+    paragraphs = [p.text for p in document.paragraphs]
+    tables = [[tuple(cell.text for cell in row.cells) for row in table.rows] for table in document.tables]
+    return paragraphs, tables
+
+
+class DocxStreamReaderTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def test_matches_python_docx_on_globus(self):
+        self.assertEqual(read_docx_tables(GLOBUS_FILE), read_with_python_docx(GLOBUS_FILE))
+
+    def test_merged_and_nested_cells(self):
+        document = Document()
+        document.add_paragraph("Заголовок")
+        document.add_paragraph("Раздел 1 Тест")
+        table = document.add_table(rows=4, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 2)).text = "Шапка"
+        table.cell(1, 0).merge(table.cell(3, 0)).text = "Строки\nвместе"
+        table.cell(1, 1).text = "a\tb"
+        table.cell(2, 2).add_table(rows=1, cols=1).cell(0, 0).text = "вложенная"
+        table.cell(3, 2).text = "конец"
+        path = self.tmp_dir / "merged.docx"
+        document.save(path)
+
+        self.assertEqual(read_docx_tables(path), read_with_python_docx(path))
+
+    def test_blocks_are_yielded_in_document_order(self):
+        kinds = [block[0] for block in iter_docx_blocks(GLOBUS_FILE)]
+        self.assertEqual(kinds[:2], ["paragraph", "paragraph"])
+        self.assertIn("row", kinds)
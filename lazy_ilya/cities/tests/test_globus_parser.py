@@ -0,0 +1,215 @@
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List, Tuple
+from unittest.mock import patch
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.forms.models import model_to_dict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from cities.models import CityDailyTop, CityData, CityHitBucket, CounterCities, ImportJob, TableNames
+from cities.utils.parser_word.globus_parser import GlobusParser
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+from myauth.models import CustomUser
+
+GLOBUS_FILE = Path(settings.BASE_DIR).parent / "test_files" / "globus.docx"
+
+# Импорт сбрасывает кэш списка городов и рассылает прогресс: в тестах без файлов в BASE_DIR/cache
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "cities": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "globus-parser-tests"},
+}
+IN_MEMORY_CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+
+
+def make_doc_table(rows_count: int, location_prefix: str = "Город") -> List[Tuple[str, ...]]:
+    """Создает таблицу в виде строк-кортежей: 3 строки заголовка и rows_count строк данных."""
+    rows: List[Tuple[str, ...]] = [("",) * 9] * 3
+    for num in range(1, rows_count + 1):
+        rows.append((str(num), f"{location_prefix} {num}", f"Орган {num}", f"Псевдоним {num}",
+                     "+", "-", f"10.0.0.{num}", str(num), "9-18"))
+    return rows
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class GlobusParserRowsTests(TestCase):
+    def setUp(self):
+        self.table = TableNames.objects.create(table_name="Раздел 1 Тестовый")
+
+    def count_queries(self, rows_count: int, location_prefix: str = "Город") -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            GlobusParser._process_tables_with_rows(
+                [make_doc_table(rows_count, location_prefix)], [self.table]
+            )
+        return len(ctx.captured_queries)
+
+    def test_rows_are_created_and_updated(self):
+        GlobusParser._process_tables_with_rows([make_doc_table(3)], [self.table])
+        self.assertEqual(CityData.objects.filter(table_id=self.table).count(), 3)
+
+        GlobusParser._process_tables_with_rows([make_doc_table(2, "Новый")], [self.table])
+        rows = list(CityData.objects.filter(table_id=self.table).order_by("dock_num"))
+        self.assertEqual([row.location for row in rows], ["Новый 1", "Новый 2"])
+        self.assertTrue(rows[0].letters)
+        self.assertFalse(rows[0].writing)
+
+    def test_query_count_does_not_grow_with_rows_on_insert(self):
+        small = self.count_queries(5)
+        CityData.objects.all().delete()
+        large = self.count_queries(50)
+        self.assertEqual(small, large)
+
+    def test_query_count_does_not_grow_with_rows_on_reimport(self):
+        GlobusParser._process_tables_with_rows([make_doc_table(5)], [self.table])
+        small = self.count_queries(5)
+        GlobusParser._process_tables_with_rows([make_doc_table(200)], [self.table])
+        large = self.count_queries(200)
+        self.assertEqual(small, large)
+
+    def test_unchanged_table_is_skipped(self):
+        other = TableNames.objects.create(table_name="Раздел 2 Другой")
+        GlobusParser._process_tables_with_rows([make_doc_table(3), make_doc_table(2)], [self.table, other])
+        self.table.refresh_from_db()
+        other.refresh_from_db()
+
+        stats = GlobusParser._process_tables_with_rows(
+            [make_doc_table(3), make_doc_table(2, "Новый")], [self.table, other]
+        )
+
+        self.assertEqual(stats["rows_updated"], 2)
+        self.assertEqual(stats["rows_deleted"], 0)
+        self.assertEqual(CityData.objects.filter(table_id=self.table).count(), 3)
+
+
+    def test_rows_of_tables_missing_from_document_are_deleted(self):
+        other = TableNames.objects.create(table_name="Раздел 2 Другой")
+        GlobusParser._process_tables_with_rows([make_doc_table(3), make_doc_table(2)], [self.table, other])
+        self.table.refresh_from_db()
+
+        stats = GlobusParser._process_tables_with_rows([make_doc_table(3)], [self.table])
+
+        self.assertEqual((stats["rows_total"], stats["rows_deleted"]), (3, 2))
+        self.assertFalse(CityData.objects.filter(table_id=other).exists())
+        self.assertEqual(CityData.objects.filter(table_id=self.table).count(), 3)
+
+    def test_dependent_rows_of_deleted_city_are_deleted(self):
+        GlobusParser._process_tables_with_rows([make_doc_table(3)], [self.table])
+        removed = CityData.objects.get(table_id=self.table, dock_num=3)
+        kept = CityData.objects.get(table_id=self.table, dock_num=1)
+        for city in (removed, kept):
+            CounterCities.objects.create(dock_num=city, count_responses=5)
+            CityHitBucket.objects.create(city=city, granularity=CityHitBucket.Granularity.DAY,
+                                         bucket_start=timezone.now(), hits=5)
+            CityDailyTop.objects.create(day=timezone.localdate(), rank=city.dock_num, city=city, hits=5)
+
+        stats = GlobusParser._process_tables_with_rows([make_doc_table(2, "Новый")], [self.table])
+
+        # Внешние ключи SQLite отложенные: нарушения видны только при проверке (или фиксации)
+        connection.check_constraints()
+        self.assertEqual(stats["rows_deleted"], 1)
+        for model, field in ((CounterCities, "dock_num"), (CityHitBucket, "city"), (CityDailyTop, "city")):
+            self.assertEqual(list(model.objects.values_list(field, flat=True)), [kept.id])
+
+    @unittest.skipUnless(hasattr(sqlite3.Connection, "setlimit"), "Connection.setlimit есть с Python 3.11")
+    def test_sync_is_not_limited_by_bound_variables(self):
+        # Предел числа параметров запроса снижен со SQLITE_MAX_VARIABLE_NUMBER (32766) до 100:
+        # удаление через id__in=[...] падало, как только записей больше предела.
+        # Тот же случай на 33000 строк при обычном пределе — benchmarks/bench_city_sync.py
+        rows_count = 300
+        connection.ensure_connection()
+        previous = connection.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 100)
+        self.addCleanup(connection.connection.setlimit, sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, previous)
+        GlobusParser._process_tables_with_rows([make_doc_table(rows_count)], [self.table])
+
+        stats = GlobusParser._process_tables_with_rows([make_doc_table(rows_count - 1, "Новый")], [self.table])
+
+        self.assertEqual(stats["rows_updated"], rows_count - 1)
+        self.assertEqual(stats["rows_deleted"], 1)
+        self.assertEqual(CityData.objects.filter(location__startswith="Новый").count(), rows_count - 1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM city_staging")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHES, CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS)
+class GlobusParserFileHashTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        shutil.copy(GLOBUS_FILE, self.tmp_dir / "globus.docx")
+        tlg_patcher = patch.object(ProjectSettings, "tlg_dir", self.tmp_dir)
+        tlg_patcher.start()
+        self.addCleanup(tlg_patcher.stop)
+
+    def import_as_job(self) -> dict:
+        stats = GlobusParser.process_file("globus.docx")
+        ImportJob.objects.create(file_path="globus.docx", status=ImportJob.Status.DONE,
+                                 finished_at=timezone.now(), **stats)
+        return stats
+
+    def test_reupload_of_same_file_is_skipped(self):
+        first = self.import_as_job()
+        self.assertGreater(first["rows_added"], 0)
+        self.assertEqual(len(first["file_hash"]), 64)
+
+        with patch.object(GlobusParser, "_load_doc") as mock_load:
+            second = GlobusParser.process_file("globus.docx")
+
+        mock_load.assert_not_called()
+        self.assertEqual(second["file_hash"], first["file_hash"])
+        self.assertEqual(second["rows_added"] + second["rows_updated"] + second["rows_deleted"], 0)
+
+    def test_manual_edit_disables_file_fast_path(self):
+        self.import_as_job()
+        city = CityData.objects.exclude(location="").first()
+        city.location = "Изменено вручную"
+        city.save()
+
+        stats = GlobusParser.process_file("globus.docx")
+
+        city.refresh_from_db()
+        self.assertEqual(stats["rows_updated"], 1)
+        self.assertNotEqual(city.location, "Изменено вручную")
+
+    def test_admin_edit_disables_file_fast_path(self):
+        self.import_as_job()
+        admin = CustomUser.objects.create_superuser(username="root", password="pass", phone_number="+79852000999")
+        self.client.force_login(admin)
+        city = CityData.objects.exclude(location="").first()
+        form = {key: value for key, value in model_to_dict(city).items() if value is not None}
+
+        response = self.client.post(reverse("admin:cities_citydata_change", args=[city.pk]),
+                                    {**form, "location": "Изменено в админке"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(GlobusParser.process_file("globus.docx")["rows_updated"], 1)
+
+    def test_moved_or_deleted_city_invalidates_its_tables(self):
+        self.import_as_job()
+        source, target = TableNames.objects.all()[:2]
+        city = CityData.objects.filter(table_id=source).order_by("-dock_num").first()
+        city.table_id = target
+        city.dock_num = CityData.objects.filter(table_id=target).count() + 1
+        city.save()
+        self.assertEqual(set(TableNames.objects.filter(content_hash="")), {source, target})
+
+        TableNames.objects.filter(pk__in=[source.pk, target.pk]).update(content_hash="x")
+        city.delete()
+        self.assertEqual(list(TableNames.objects.filter(content_hash="")), [target])
+
+    def test_failed_last_import_disables_file_fast_path(self):
+        stats = self.import_as_job()
+        ImportJob.objects.create(file_path="globus.docx", status=ImportJob.Status.FAILED,
+                                 finished_at=timezone.now(), file_hash=stats["file_hash"])
+
+        with patch.object(GlobusParser, "_load_doc", wraps=GlobusParser._load_doc) as mock_load:
+            GlobusParser.process_file("globus.docx")
+
+        mock_load.assert_called_once()
@@ -0,0 +1,142 @@
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from cities.models import ImportJob
+from cities.utils.import_jobs.import_worker import IMPORT_UPLOAD_DIR, ImportWorker, worker_id
+from lazy_ilya.utils.admission import AdmissionRejected
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+from myauth.models import CustomUser
+
+
+class ImportWorkerTests(TestCase):
+    def setUp(self):
+        self.worker = ImportWorker()
+
+    @patch("cities.utils.parser_word.globus_parser.GlobusParser.process_file")
+    def test_jobs_run_one_by_one_in_order(self, mock_process):
+        mock_process.return_value = {"rows_total": 3, "rows_added": 2, "rows_updated": 1, "rows_deleted": 0}
+        first = self.worker.enqueue("first.docx")
+        second = self.worker.enqueue("second.docx")
+
+        self.assertEqual(self.worker.run_pending(), 2)
+
+        self.assertEqual([c.args[0] for c in mock_process.call_args_list], ["first.docx", "second.docx"])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, ImportJob.Status.DONE)
+        self.assertEqual(second.status, ImportJob.Status.DONE)
+        self.assertEqual(first.rows_added, 2)
+        self.assertIsNotNone(first.started_at)
+        self.assertIsNotNone(first.finished_at)
+
+    @patch("cities.utils.parser_word.globus_parser.GlobusParser.process_file")
+    def test_failed_job_stores_error(self, mock_process):
+        mock_process.side_effect = ValueError("битый файл")
+        job = self.worker.enqueue("globus.docx")
+
+        self.worker.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertEqual(job.error, "битый файл")
+
+    def test_no_job_is_claimed_while_another_is_running(self):
+        ImportJob.objects.create(file_path="running.docx", status=ImportJob.Status.RUNNING)
+        self.worker.enqueue("globus.docx")
+        self.assertIsNone(self.worker.claim_next())
+
+    def test_enqueue_is_rejected_when_queue_is_full(self):
+        now = timezone.now()
+        ImportJob.objects.create(file_path="done.docx", status=ImportJob.Status.DONE,
+                                 started_at=now - timedelta(seconds=40), finished_at=now)
+        ImportJob.objects.create(file_path="running.docx", status=ImportJob.Status.RUNNING)
+        ImportJob.objects.create(file_path="queued.docx")
+
+        with patch.object(ProjectSettings, "import_max_pending", 2):
+            with self.assertRaises(AdmissionRejected) as rejected:
+                self.worker.enqueue("globus.docx")
+
+        self.assertEqual((rejected.exception.status, rejected.exception.retry_after), (429, 40))
+        self.assertFalse(ImportJob.objects.filter(file_path="globus.docx").exists())
+
+    def test_interrupted_jobs_are_requeued(self):
+        job = ImportJob.objects.create(file_path="globus.docx", status=ImportJob.Status.RUNNING)
+        self.assertEqual(self.worker.recover_interrupted(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.QUEUED)
+        self.assertEqual(self.worker.claim_next().pk, job.pk)
+
+    def running_job(self, worker: str, heartbeat_age: float) -> ImportJob:
+        return ImportJob.objects.create(
+            file_path="globus.docx", status=ImportJob.Status.RUNNING, worker=worker,
+            heartbeat_at=timezone.now() - timedelta(seconds=heartbeat_age),
+        )
+
+    def test_job_of_live_worker_is_not_requeued(self):
+        # Задачу сейчас выполняет run_import_jobs или другой процесс daphne
+        self.running_job(f"{socket.gethostname()}-other:1", heartbeat_age=1)
+        self.running_job(worker_id(), heartbeat_age=1)
+        self.assertEqual(self.worker.recover_interrupted(), 0)
+
+    def test_job_with_stale_heartbeat_is_requeued(self):
+        job = self.running_job("other-host:1", heartbeat_age=ProjectSettings.import_lease_timeout + 1)
+        self.assertEqual(self.worker.recover_interrupted(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.heartbeat_at), (ImportJob.Status.QUEUED, "", None))
+
+    def test_job_of_dead_local_process_is_requeued_at_once(self):
+        finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                  capture_output=True, text=True, check=True)
+        self.running_job(f"{socket.gethostname()}:{finished.stdout.strip()}", heartbeat_age=1)
+        self.assertEqual(self.worker.recover_interrupted(), 1)
+
+    @patch("cities.utils.parser_word.globus_parser.GlobusParser.process_file")
+    def test_claimed_job_holds_lease_and_upload_is_removed(self, mock_process):
+        tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        upload = tmp_dir / IMPORT_UPLOAD_DIR / "abc_globus.docx"
+        upload.parent.mkdir()
+        upload.write_bytes(b"docx")
+        mock_process.return_value = {}
+        self.worker.enqueue(f"{IMPORT_UPLOAD_DIR}/abc_globus.docx")
+
+        job = self.worker.claim_next()
+        self.assertEqual(job.worker, worker_id())
+        self.assertIsNotNone(job.heartbeat_at)
+        with patch.object(ProjectSettings, "tlg_dir", tmp_dir):
+            self.worker.run_job(job)
+
+        self.assertEqual(job.status, ImportJob.Status.DONE)
+        self.assertFalse(upload.exists())
+
+
+class ImportJobViewTests(TestCase):
+    def setUp(self):
+        admin_group = Group.objects.create(name='admin')
+        self.admin_user = CustomUser.objects.create_user(username='adminuser', password='pass',
+                                                         phone_number='+79852000355')
+        self.admin_user.groups.add(admin_group)
+        self.job = ImportJob.objects.create(file_path="globus.docx")
+
+    def test_job_status(self):
+        self.client.login(username='adminuser', password='pass')
+        response = self.client.get(reverse('cities:import_job', args=[self.job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], ImportJob.Status.QUEUED)
+        self.assertEqual(response.json()["job_id"], self.job.id)
+
+    def test_job_not_found(self):
+        self.client.login(username='adminuser', password='pass')
+        response = self.client.get(reverse('cities:import_job', args=[999]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,125 @@
+from concurrent.futures import Future
+from typing import Callable, List, Tuple
+
+from asgiref.sync import async_to_sync
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+
+from cities.consumers import UploadProgressConsumer
+from cities.utils.import_jobs.progress_publisher import ChannelSender, ProgressPublisher
+from myauth.models import CustomUser
+
+
+class FakeSender(ChannelSender):
+    """Запоминает отправленные сообщения и отложенные вызовы вместо цикла событий."""
+
+    def __init__(self):
+        super().__init__()
+        self.sent: List[Tuple[str, dict]] = []
+        self.scheduled: List[Tuple[float, Callable[[], None]]] = []
+
+    def send(self, group, message):
+        self.sent.append((group, message["progress"]))
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def call_later(self, delay, callback):
+        self.scheduled.append((delay, callback))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ProgressPublisherTests(TestCase):
+    def setUp(self):
+        self.sender = FakeSender()
+        self.clock = FakeClock()
+        self.publisher = ProgressPublisher(7, max_rate=2, sender=self.sender, clock=self.clock)
+
+    def run_scheduled(self):
+        scheduled, self.sender.scheduled = self.sender.scheduled, []
+        for _, callback in scheduled:
+            callback()
+
+    def test_updates_are_coalesced_to_latest(self):
+        for done in range(0, 100, 10):
+            self.publisher.update(done, 100)
+
+        self.assertEqual(len(self.sender.scheduled), 1)
+        self.run_scheduled()
+        self.assertEqual([(group, message["rows_done"]) for group, message in self.sender.sent],
+                         [("import_job_7", 90)])
+
+        # Следующая отправка откладывается до конца интервала 1 / max_rate
+        self.clock.now += 0.1
+        self.publisher.update(95, 100)
+        self.assertAlmostEqual(self.sender.scheduled[0][0], 0.4)
+
+    def test_rate_and_eta_are_reported(self):
+        self.clock.now = 2.0
+        self.publisher.update(50, 200)
+        self.run_scheduled()
+
+        message = self.sender.sent[-1][1]
+        self.assertEqual(message["progress"], 25)
+        self.assertEqual(message["rows_per_second"], 25.0)
+        self.assertEqual(message["eta_seconds"], 6.0)
+        self.assertFalse(message["done"])
+
+    def test_finish_is_sent_immediately_and_drops_pending_update(self):
+        self.publisher.update(10, 100)
+        self.publisher.finish(data_version="abc")
+        self.run_scheduled()
+
+        self.assertEqual(len(self.sender.sent), 1)
+        message = self.sender.sent[0][1]
+        self.assertEqual((message["progress"], message["done"], message["data_version"]), (100, True, "abc"))
+
+    def test_publisher_without_job_sends_nothing(self):
+        publisher = ProgressPublisher(None, sender=self.sender)
+        publisher.update(1, 2)
+        publisher.finish()
+        self.assertEqual((self.sender.sent, self.sender.scheduled), ([], []))
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class JobProgressSubscriptionTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_user(username="admin", password="pass",
+                                                     phone_number="+79990000001")
+        self.admin.groups.add(Group.objects.create(name="admin"))
+        self.user = CustomUser.objects.create_user(username="user", password="pass",
+                                                    phone_number="+79990000002")
+
+    async def connect(self, user) -> WebsocketCommunicator:
+        communicator = WebsocketCommunicator(UploadProgressConsumer.as_asgi(), "/ws/upload/")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    def test_only_subscribed_admin_receives_job_progress(self):
+        async def scenario():
+            admin = await self.connect(self.admin)
+            user = await self.connect(self.user)
+            for client in (admin, user):
+                await client.send_json_to({"type": "subscribe", "job_id": 5})
+            await admin.receive_nothing()
+
+            # Отправка идет из фонового цикла событий, как из потока импорта
+            ProgressPublisher(5, sender=ChannelSender()).finish()
+
+            message = await admin.receive_json_from(timeout=5)
+            self.assertEqual((message["job_id"], message["progress"], message["done"]), (5, 100, True))
+            self.assertTrue(await user.receive_nothing())
+            await admin.disconnect()
+            await user.disconnect()
+
+        async_to_sync(scenario)()
@@ -0,0 +1,133 @@
+import asyncio
+import multiprocessing
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from channels.exceptions import ChannelFull
+
+from lazy_ilya.utils.sqlite_channel_layer import SQLiteChannelLayer
+
+
+def send_from_other_process(path: str, group: str) -> None:
+    """Отправляет сообщение группе из отдельного процесса, как run_import_jobs."""
+    layer = SQLiteChannelLayer(path)
+    asyncio.run(layer.group_send(group, {"type": "send_progress", "progress": 42}))
+
+
+class SQLiteChannelLayerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.path = self.tmp_dir / "channels.sqlite3"
+
+    def make_layer(self, **kwargs) -> SQLiteChannelLayer:
+        layer = SQLiteChannelLayer(self.path, **{"poll_interval": 0.01, **kwargs})
+        self.addCleanup(lambda: asyncio.run(layer.close()))
+        return layer
+
+    def test_send_and_receive_in_order(self):
+        layer = self.make_layer()
+
+        async def scenario():
+            channel = await layer.new_channel()
+            await layer.send(channel, {"type": "a", "bytes": b"\x00\xff", "items": [1, "два"]})
+            await layer.send(channel, {"type": "b"})
+            return [await layer.receive(channel), await layer.receive(channel)]
+
+        first, second = asyncio.run(scenario())
+        self.assertEqual(first, {"type": "a", "bytes": b"\x00\xff", "items": [1, "два"]})
+        self.assertEqual(second, {"type": "b"})
+
+    def test_receive_waits_for_message_from_another_connection(self):
+        receiver, sender = self.make_layer(), self.make_layer()
+
+        async def scenario():
+            waiting = asyncio.ensure_future(receiver.receive("test.channel"))
+            await asyncio.sleep(0.05)
+            self.assertFalse(waiting.done())
+            await sender.send("test.channel", {"type": "hello"})
+            return await asyncio.wait_for(waiting, timeout=5)
+
+        self.assertEqual(asyncio.run(scenario()), {"type": "hello"})
+
+    def test_capacity(self):
+        layer = self.make_layer(capacity=2, channel_capacity={"big.*": 3})
+
+        async def scenario():
+            await layer.send("small", {"type": "1"})
+            await layer.send("small", {"type": "2"})
+            with self.assertRaises(ChannelFull):
+                await layer.send("small", {"type": "3"})
+            for num in range(3):
+                await layer.send("big.one", {"type": str(num)})
+
+            # В group_send переполненный канал пропускается, остальные получают сообщение
+            await layer.group_add("everyone", "small")
+            await layer.group_add("everyone", "free")
+            await layer.group_send("everyone", {"type": "news"})
+            return await layer.receive("free")
+
+        self.assertEqual(asyncio.run(scenario()), {"type": "news"})
+        self.assertEqual(layer.counts()["messages"], 5)
+
+    def test_groups(self):
+        layer = self.make_layer()
+
+        async def scenario():
+            await layer.group_add("progress", "one")
+            await layer.group_add("progress", "two")
+            await layer.group_discard("progress", "two")
+            await layer.group_send("progress", {"type": "send_progress"})
+            await layer.group_send("nobody", {"type": "lost"})
+            return await layer.receive("one")
+
+        self.assertEqual(asyncio.run(scenario()), {"type": "send_progress"})
+        self.assertEqual(layer.counts(), {"messages": 0, "groups": 1})
+
+    def test_expiry(self):
+        layer = self.make_layer(expiry=0.05, group_expiry=0.05)
+
+        async def scenario():
+            await layer.group_add("progress", "stale")
+            await layer.send("stale", {"type": "old"})
+            await asyncio.sleep(0.1)
+            layer._next_cleanup = 0  # Не ждать CLEANUP_INTERVAL
+            await layer.send("fresh", {"type": "new"})
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(layer.receive("stale"), timeout=0.1)
+
+        asyncio.run(scenario())
+        self.assertEqual(layer.counts(), {"messages": 1, "groups": 0})
+
+    def test_flush(self):
+        layer = self.make_layer()
+
+        async def scenario():
+            await layer.group_add("progress", "one")
+            await layer.send("one", {"type": "x"})
+            await layer.flush()
+
+        asyncio.run(scenario())
+        self.assertEqual(layer.counts(), {"messages": 0, "groups": 0})
+
+    def test_group_send_from_another_process(self):
+        layer = self.make_layer()
+
+        async def scenario():
+            await layer.group_add("import_job_1", "web.channel")
+            waiting = asyncio.ensure_future(layer.receive("web.channel"))
+            process = multiprocessing.get_context("spawn").Process(
+                target=send_from_other_process, args=(str(self.path), "import_job_1")
+            )
+            process.start()
+            try:
+                return await asyncio.wait_for(waiting, timeout=30)
+            finally:
+                await asyncio.get_running_loop().run_in_executor(None, process.join)
+
+        started = time.monotonic()
+        self.assertEqual(asyncio.run(scenario()), {"type": "send_progress", "progress": 42})
+        self.assertLess(time.monotonic() - started, 30)
@@ -0,0 +1,81 @@
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase
+
+from cities.models import TableNames
+from cities.tests.test_globus_parser import GLOBUS_FILE
+from cities.utils.parser_word.globus_parser import GlobusParser
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+
+
+class SQLitePragmasTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+    def open(self, alias: str) -> DatabaseWrapper:
+        """Новое подключение к файловой базе с теми же настройками, что у default."""
+        wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": str(self.tmp_dir / "db.sqlite3")}, alias)
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper: DatabaseWrapper, name: str):
+        return wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        with patch.object(ProjectSettings, "sqlite_cache_size", -1024):
+            wrapper = self.open("pragmas")
+
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -1024)
+        self.assertEqual(self.pragma(wrapper, "mmap_size"), ProjectSettings.sqlite_mmap_size)
+        self.assertEqual(self.pragma(wrapper, "temp_store"), 2)  # MEMORY
+
+    def test_reader_sees_previous_snapshot_while_import_writes(self):
+        writer, reader = self.open("writer"), self.open("reader")
+        writer.connection.execute("CREATE TABLE city (name TEXT)")
+        writer.connection.execute("INSERT INTO city VALUES ('Старый')")
+
+        writer.connection.execute("BEGIN IMMEDIATE")
+        writer.connection.execute("INSERT INTO city VALUES ('Новый')")
+        started = time.monotonic()
+        before_commit = reader.connection.execute("SELECT COUNT(*) FROM city").fetchone()[0]
+        self.assertLess(time.monotonic() - started, 1)
+        writer.connection.execute("COMMIT")
+
+        self.assertEqual(before_commit, 1)
+        self.assertEqual(reader.connection.execute("SELECT COUNT(*) FROM city").fetchone()[0], 2)
+
+
+class GlobusImportTransactionTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        shutil.copy(GLOBUS_FILE, self.tmp_dir / "globus.docx")
+        tlg_patcher = patch.object(ProjectSettings, "tlg_dir", self.tmp_dir)
+        tlg_patcher.start()
+        self.addCleanup(tlg_patcher.stop)
+
+    def test_failed_import_is_rolled_back_entirely(self):
+        with patch.object(GlobusParser, "_process_tables_with_rows", side_effect=RuntimeError("сбой")):
+            with self.assertRaises(RuntimeError):
+                GlobusParser.process_file("globus.docx")
+
+        # Таблицы, созданные _sync_tables до ошибки, откатываются вместе с импортом
+        self.assertFalse(TableNames.objects.exists())
+
+    def test_import_is_rolled_back_if_its_delta_version_is_not_recorded(self):
+        with patch("cities.utils.parser_word.globus_parser.record_change_set", side_effect=RuntimeError("сбой")):
+            with self.assertRaises(RuntimeError):
+                GlobusParser.process_file("globus.docx")
+
+        # Версия изменений выдается в транзакции импорта, а не после ее фиксации
+        self.assertFalse(TableNames.objects.exists())
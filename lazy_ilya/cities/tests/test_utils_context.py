@@ -1,4 +1,3 @@
-import json
 from unittest import TestCase
 from unittest.mock import Mock
 
@@ -7,7 +6,7 @@ from django.test import RequestFactory, TestCase as DjangoTestCase
 from django.utils.timezone import now
 
 from cities.models import TableNames, CityData
-from cities.utils.common_func.get_city_context import get_all_cities, get_context_admin_cities
+from cities.utils.common_func.get_city_context import get_cities_context, get_context_admin_cities
 from myauth.models import CustomUser
 
 
@@ -45,44 +44,41 @@ class GetCitiesTestCase(DjangoTestCase):
         self.admin_group = Group.objects.create(name="admins")
         self.ilia_group = Group.objects.create(name="ilia-group")
 
-    def test_get_all_cities_as_superuser(self):
+    def test_get_cities_context_as_superuser(self):
         request = self.factory.get("/")
         request.user = self.admin
 
-        context = get_all_cities(request)
+        context = get_cities_context(request)
 
-        self.assertIn("cities_json", context)
-        cities = json.loads(context["cities_json"])
-        self.assertEqual(len(cities), 1)  # Только одна запись с location
-        self.assertEqual(cities[0]["location"], "Москва")
+        self.assertNotIn("cities_json", context)  # Города страница получает через API поиска
         self.assertTrue(context["is_admin"])
         self.assertFalse(context["is_ilia"])
 
-    def test_get_all_cities_as_admin_group(self):
+    def test_get_cities_context_as_admin_group(self):
         self.user.groups.add(self.admin_group)
         request = self.factory.get("/")
         request.user = self.user
 
-        context = get_all_cities(request)
+        context = get_cities_context(request)
 
         self.assertTrue(context["is_admin"])
         self.assertFalse(context["is_ilia"])
 
-    def test_get_all_cities_as_ilia_group(self):
+    def test_get_cities_context_as_ilia_group(self):
         self.user.groups.add(self.ilia_group)
         request = self.factory.get("/")
         request.user = self.user
 
-        context = get_all_cities(request)
+        context = get_cities_context(request)
 
         self.assertFalse(context["is_admin"])
         self.assertTrue(context["is_ilia"])
 
-    def test_get_all_cities_as_regular_user(self):
+    def test_get_cities_context_as_regular_user(self):
         request = self.factory.get("/")
         request.user = self.user
 
-        context = get_all_cities(request)
+        context = get_cities_context(request)
 
         self.assertFalse(context["is_admin"])
         self.assertFalse(context["is_ilia"])
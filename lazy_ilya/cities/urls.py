@@ -1,6 +1,7 @@
 from django.urls import path
 
-from cities.views import base_view, Cities, CitiesAdmin, CityInfoView, increment_city_counters
+from cities.views import base_view, Cities, CitiesAdmin, CitiesListView, CityInfoView, CitySearchView, ImportJobView, \
+    increment_city_counters
 
 app_name = "cities"
 urlpatterns = [
@@ -9,6 +10,9 @@ urlpatterns = [
     path("cities/delete/<int:table_id>/<int:dock_num>/", Cities.as_view(), name="delete_city"),
     path("admin/", CitiesAdmin.as_view(), name="admin_city"),
     path("admin/city-info/", CityInfoView.as_view(), name="city_info"),
+    path("admin/import-jobs/<int:job_id>/", ImportJobView.as_view(), name="import_job"),
     path("api/city-counter/", increment_city_counters, name="city-counter"),
+    path("api/search/", CitySearchView.as_view(), name="city_search"),
+    path("api/cities/", CitiesListView.as_view(), name="cities_list"),
 
 ]
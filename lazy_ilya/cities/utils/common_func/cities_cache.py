@@ -0,0 +1,88 @@
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.core.cache import caches
+from django.db.models import Q
+
+from cities.models import CityData
+from lazy_ilya.utils.settings_for_app import logger
+
+CACHE_ALIAS = "cities"
+VERSION_KEY = "cities:version"
+PAYLOAD_KEY = "cities:payload:{version}"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_cities_version() -> str:
+    """
+    Возвращает текущую версию данных о городах.
+
+    Версия — случайный токен, а не счётчик: после перезапуска или очистки кэша
+    новая версия не совпадёт ни с одной из выданных раньше, и ETag в браузерах
+    не окажется ошибочно актуальным.
+
+    Returns:
+        str: Токен версии.
+    """
+    cache = _cache()
+    version: Optional[str] = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_cities_cache() -> str:
+    """
+    Объявляет сохранённый список городов устаревшим.
+
+    Вызывается после любой записи в CityData и TableNames: после импорта явно
+    (он пишет записи SQL-запросами мимо сигналов), в остальных случаях —
+    из сигналов cities.signals после фиксации транзакции. Старый payload
+    не удаляется явно, он просто больше не читается и истекает сам.
+
+    Returns:
+        str: Новая версия данных.
+    """
+    version = uuid.uuid4().hex
+    _cache().set(VERSION_KEY, version, timeout=None)
+    logger.debug(f"Кэш списка городов сброшен, новая версия {version}")
+    return version
+
+
+def _build_cities() -> List[Dict[str, Any]]:
+    """Собирает список всех городов с непустым адресом."""
+    all_rows = CityData.objects.select_related("table_id").exclude(
+        Q(location__isnull=True) | Q(location__exact="")
+    )
+    return [row.to_dict() for row in all_rows]
+
+
+def get_cities_payload() -> Tuple[str, str, str]:
+    """
+    Возвращает сериализованный список городов из кэша, при необходимости собирая его.
+
+    Список собирается один раз на версию данных; дальше все запросы получают
+    готовую JSON-строку.
+
+    Returns:
+        Tuple[str, str, str]: JSON-строка со списком городов, ETag (хэш содержимого)
+            и версия данных, для которой он собран.
+    """
+    cache = _cache()
+    version = get_cities_version()
+    key = PAYLOAD_KEY.format(version=version)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached["json"], cached["etag"], version
+
+    cities_json = json.dumps(_build_cities(), ensure_ascii=False)
+    etag = '"' + hashlib.sha1(cities_json.encode("utf-8")).hexdigest() + '"'
+    cache.set(key, {"json": cities_json, "etag": etag})
+    logger.debug(f"Список городов собран и сохранён в кэш, версия {version}")
+    return cities_json, etag, version
@@ -0,0 +1,174 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Max
+
+from cities.models import CityData, CityDelta
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+# Поля CityData, которые передаются клиентам (кроме ключа table_id + dock_num)
+DELTA_FIELDS = (
+    "location", "name_organ", "pseudonim", "letters",
+    "writing", "ip_address", "some_number", "work_time",
+)
+
+# Ключ строки: (table_id, dock_num), как в списке городов и в URL cities/<table_id>/<dock_num>/
+RowKey = Tuple[int, int]
+
+
+def _is_listed(location: Optional[str]) -> bool:
+    """Попадает ли строка в список городов (get_cities_payload пропускает строки без адреса)."""
+    return bool(location)
+
+
+@dataclass
+class CityChangeSet:
+    """
+    Изменения списка городов за один импорт.
+
+    Attributes:
+        added (Dict[RowKey, Dict[str, Any]]): Новые строки списка, целиком (CityData.to_dict).
+        updated (Dict[RowKey, Dict[str, Any]]): Изменившиеся поля существующих строк.
+        deleted (List[RowKey]): Ключи строк, исчезнувших из списка.
+        deleted_tables (List[int]): Удаленные таблицы; их строки клиент удаляет сам.
+        tables (Dict[int, str]): Новые и переименованные таблицы: id -> table_name.
+    """
+    added: Dict[RowKey, Dict[str, Any]] = field(default_factory=dict)
+    updated: Dict[RowKey, Dict[str, Any]] = field(default_factory=dict)
+    deleted: List[RowKey] = field(default_factory=list)
+    deleted_tables: List[int] = field(default_factory=list)
+    tables: Dict[int, str] = field(default_factory=dict)
+
+    def add_row(self, row: "CityData") -> None:
+        """Учитывает новую строку."""
+        if _is_listed(row.location):
+            self.added[(row.table_id_id, row.dock_num)] = row.to_dict()
+
+    def update_row(self, row: "CityData", changed: Dict[str, Any], old_location: Optional[str]) -> None:
+        """
+        Учитывает изменение существующей строки.
+
+        Строка, у которой появился или пропал адрес, для клиента добавляется или удаляется.
+
+        Args:
+            row (CityData): Строка с уже примененными изменениями.
+            changed (Dict[str, Any]): Изменившиеся поля и их новые значения.
+            old_location (Optional[str]): Адрес до изменения.
+        """
+        key = (row.table_id_id, row.dock_num)
+        if not _is_listed(row.location):
+            if _is_listed(old_location):
+                self.deleted.append(key)
+        elif not _is_listed(old_location):
+            self.added[key] = row.to_dict()
+        else:
+            self.updated[key] = {name: value for name, value in changed.items() if name in DELTA_FIELDS}
+
+    def delete_rows(self, rows: List[Tuple[int, int, Optional[str]]]) -> None:
+        """Учитывает удаленные строки: (table_id, dock_num, location)."""
+        self.deleted.extend((table_id, dock_num) for table_id, dock_num, location in rows if _is_listed(location))
+
+    @property
+    def size(self) -> int:
+        """Количество затронутых строк и таблиц."""
+        return (len(self.added) + len(self.updated) + len(self.deleted)
+                + len(self.deleted_tables) + len(self.tables))
+
+    def to_message(self, version: int) -> Dict[str, Any]:
+        """
+        Сообщение для клиентов.
+
+        Args:
+            version (int): Номер версии данных после этих изменений.
+
+        Returns:
+            Dict[str, Any]: {"type": "cities_delta", "version", "base_version", "added",
+            "updated" (ключ и fields), "deleted" (пары [table_id, dock_num]), "deleted_tables", "tables"}.
+        """
+        return {
+            "type": "cities_delta",
+            "version": version,
+            "base_version": version - 1,
+            "added": list(self.added.values()),
+            "updated": [
+                {"table_id": table_id, "dock_num": dock_num, "fields": fields}
+                for (table_id, dock_num), fields in self.updated.items()
+            ],
+            "deleted": [list(key) for key in self.deleted],
+            "deleted_tables": self.deleted_tables,
+            "tables": {str(table_id): name for table_id, name in self.tables.items()},
+        }
+
+
+def resync_message(version: int) -> Dict[str, Any]:
+    """Указание клиенту заново загрузить список городов целиком."""
+    return {"type": "cities_resync", "version": version}
+
+
+def current_delta_version() -> int:
+    """
+    Возвращает номер текущей версии данных для дельт.
+
+    В отличие от get_cities_version это счетчик: по нему клиент понимает,
+    сколько изменений пропустил.
+
+    Returns:
+        int: Номер версии, 0 — изменений еще не было.
+    """
+    return CityDelta.objects.aggregate(version=Max("version"))["version"] or 0
+
+
+def record_change_set(change_set: CityChangeSet) -> Dict[str, Any]:
+    """
+    Присваивает изменениям новую версию и сохраняет их в журнале последних изменений.
+
+    Вызывается в транзакции импорта: транзакции SQLite начинаются с блокировки записи
+    (transaction_mode IMMEDIATE), поэтому два импорта не получат одну версию,
+    а если импорт откатится, его версия не будет выдана клиентам.
+
+    Если изменений больше ProjectSettings.city_delta_max_rows, дельта не быстрее полной
+    загрузки списка, поэтому вместо нее в журнал записывается указание на resync.
+    Журнал хранит ProjectSettings.city_delta_history последних версий.
+
+    Args:
+        change_set (CityChangeSet): Изменения импорта.
+
+    Returns:
+        Dict[str, Any]: Сообщение для рассылки клиентам (cities_delta или cities_resync).
+    """
+    with transaction.atomic():
+        version = current_delta_version() + 1
+        if change_set.size > ProjectSettings.city_delta_max_rows:
+            logger.info(f"Изменено {change_set.size} строк, клиентам отправляется resync (версия {version})")
+            message = resync_message(version)
+        else:
+            message = change_set.to_message(version)
+
+        CityDelta.objects.create(version=version, message=message)
+        CityDelta.objects.filter(version__lte=version - ProjectSettings.city_delta_history).delete()
+    return message
+
+
+def deltas_since(version: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Возвращает дельты, которые клиент с версией version пропустил.
+
+    Args:
+        version (int): Последняя версия, которую видел клиент.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: Дельты по порядку (пустой список, если клиент
+        не отстал) или None, если их уже нет в журнале или среди них есть resync —
+        тогда клиенту нужно загрузить список заново.
+    """
+    current = current_delta_version()
+    if version == current:
+        return []
+    if version > current:
+        # Журнал начат заново (например, база восстановлена из копии)
+        return None
+    missed = list(CityDelta.objects.filter(version__gt=version).values_list("message", flat=True))
+    if len(missed) != current - version or any(message["type"] != "cities_delta" for message in missed):
+        return None
+    return missed
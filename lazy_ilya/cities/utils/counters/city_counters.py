@@ -0,0 +1,165 @@
+import atexit
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db import close_old_connections, transaction
+
+from cities.models import CityData, CounterCities
+from cities.utils.counters.city_stats import increment_expression, rebuild_daily_top, record_hits
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+
+def resolve_city_ids(table_ids: Sequence[int], dock_nums: Sequence[int]) -> List[int]:
+    """
+    Находит ID записей CityData для пар (table_id, dock_num) одним запросом.
+
+    Пары, для которых запись не найдена, пропускаются. Повторяющиеся пары дают
+    повторяющиеся ID, чтобы каждое упоминание засчитывалось как отдельный запрос.
+
+    Args:
+        table_ids (Sequence[int]): ID таблиц.
+        dock_nums (Sequence[int]): Номера записей в таблицах, той же длины.
+
+    Returns:
+        List[int]: ID найденных записей CityData в порядке пар.
+    """
+    pairs = [(int(table_id), int(dock_num)) for table_id, dock_num in zip(table_ids, dock_nums)]
+    if not pairs:
+        return []
+    # Выбираем по обоим спискам и отсекаем лишние сочетания в Python: один запрос на любое число пар
+    rows = CityData.objects.filter(
+        table_id__in={table_id for table_id, _ in pairs},
+        dock_num__in={dock_num for _, dock_num in pairs},
+    ).values_list("table_id", "dock_num", "id")
+    ids_by_pair = {(table_id, dock_num): city_id for table_id, dock_num, city_id in rows}
+    return [ids_by_pair[pair] for pair in pairs if pair in ids_by_pair]
+
+
+def apply_counter_deltas(deltas: Dict[int, int]) -> None:
+    """
+    Прибавляет приращения к счетчикам CounterCities за постоянное число запросов.
+
+    Недостающие счетчики создаются одним bulk_create, затем все счетчики
+    увеличиваются одним UPDATE через F(), без чтения текущего значения,
+    поэтому параллельные запросы не теряют приращения. В той же транзакции
+    приращения добавляются в часовые и суточные интервалы (CityHitBucket).
+
+    Args:
+        deltas (Dict[int, int]): Приращение для каждого ID записи CityData.
+    """
+    deltas = {city_id: delta for city_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        CounterCities.objects.bulk_create(
+            [CounterCities(dock_num_id=city_id, count_responses=0) for city_id in deltas],
+            ignore_conflicts=True,
+        )
+        CounterCities.objects.filter(dock_num_id__in=list(deltas)).update(
+            count_responses=increment_expression("count_responses", "dock_num_id", deltas)
+        )
+        record_hits(deltas)
+
+
+class CityCounterAccumulator:
+    """
+    Накопитель счетчиков запросов к городам внутри процесса.
+
+    Запросы со страницы поиска приходят на каждую отрисованную пачку карточек.
+    Накопитель складывает приращения в памяти и раз в flush_interval секунд
+    записывает их в БД одним пакетом (apply_counter_deltas). При
+    flush_interval <= 0 приращения записываются сразу.
+
+    При ошибке записи приращения возвращаются в накопитель и будут записаны
+    при следующем сбросе. Перед завершением процесса накопитель сбрасывается
+    через atexit; при аварийном завершении теряется не больше одного периода.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None) -> None:
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def flush_interval(self) -> float:
+        """Период сброса в секундах; по умолчанию берётся из ProjectSettings."""
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return ProjectSettings.counter_flush_interval
+
+    @property
+    def pending(self) -> Dict[int, int]:
+        """Копия ещё не записанных приращений."""
+        with self._lock:
+            return dict(self._pending)
+
+    def add(self, city_ids: Iterable[int]) -> None:
+        """
+        Добавляет по одному запросу к каждому переданному ID записи CityData.
+
+        Args:
+            city_ids (Iterable[int]): ID записей CityData, повторы суммируются.
+        """
+        with self._lock:
+            self._pending.update(city_ids)
+            immediate = self.flush_interval <= 0
+            if not immediate and self._pending and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_by_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Записывает накопленные приращения в БД.
+
+        Returns:
+            int: Количество обновлённых счетчиков.
+        """
+        with self._lock:
+            deltas, self._pending = dict(self._pending), Counter()
+        if not deltas:
+            return 0
+        try:
+            apply_counter_deltas(deltas)
+        except Exception:
+            with self._lock:
+                self._pending.update(deltas)
+            raise
+        logger.debug(f"Записаны счетчики запросов к городам: {len(deltas)}")
+        try:
+            rebuild_daily_top()
+        except Exception as e:
+            # Приращения уже записаны, рейтинг пересчитается при следующем сбросе
+            logger.error(f"Не удалось пересчитать рейтинг городов за сутки: {e}")
+        return len(deltas)
+
+    def _flush_by_timer(self) -> None:
+        """Тело таймера: сбрасывает накопитель и, если за это время пришли новые данные, планирует следующий сброс."""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.exception(f"Ошибка записи счетчиков запросов к городам: {e}")
+        finally:
+            close_old_connections()
+            with self._lock:
+                self._timer = None
+                if self._pending:
+                    self._timer = threading.Timer(self.flush_interval, self._flush_by_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def flush_at_exit(self) -> None:
+        """Сбрасывает накопитель при завершении процесса, не пробрасывая ошибки."""
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Не удалось записать счетчики при завершении процесса: {e}")
+
+
+city_counter_accumulator = CityCounterAccumulator()
+atexit.register(city_counter_accumulator.flush_at_exit)
@@ -0,0 +1,207 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, When
+from django.db.models.expressions import Combinable
+from django.utils import timezone
+
+from cities.models import CityData, CityDailyTop, CityHitBucket
+
+# Сколько мест рейтинга хранится за каждые сутки
+DAILY_TOP_SIZE = 20
+# Сколько дней хранятся часовые интервалы
+HOUR_BUCKETS_KEEP_DAYS = 30
+
+
+def bucket_starts(moment: Optional[datetime] = None) -> Dict[str, datetime]:
+    """
+    Возвращает начало часового и суточного интервала для момента времени (в местном часовом поясе).
+
+    Args:
+        moment (Optional[datetime]): Момент времени, по умолчанию — текущий.
+
+    Returns:
+        Dict[str, datetime]: Начало интервала для каждого значения CityHitBucket.Granularity.
+    """
+    local = timezone.localtime(moment or timezone.now())
+    hour = local.replace(minute=0, second=0, microsecond=0)
+    return {
+        CityHitBucket.Granularity.HOUR: hour,
+        CityHitBucket.Granularity.DAY: hour.replace(hour=0),
+    }
+
+
+def _day_start(day: date) -> datetime:
+    """Возвращает начало суточного интервала для даты (местная полночь)."""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def increment_expression(field: str, key: str, deltas: Dict[int, int]) -> Combinable:
+    """
+    Строит выражение F(field) + приращение для одного UPDATE по нескольким записям.
+
+    Если у всех записей одинаковое приращение, прибавляется константа,
+    иначе приращение выбирается через Case/When по значению key.
+
+    Args:
+        field (str): Увеличиваемое поле.
+        key (str): Поле, по которому определяется приращение записи (ID города).
+        deltas (Dict[int, int]): Приращение для каждого значения key.
+
+    Returns:
+        Combinable: Выражение для QuerySet.update().
+    """
+    by_delta: Dict[int, List[int]] = defaultdict(list)
+    for city_id, delta in deltas.items():
+        by_delta[delta].append(city_id)
+    if len(by_delta) == 1:
+        (delta, _), = by_delta.items()
+        return F(field) + delta
+    return F(field) + Case(
+        *(When(**{f"{key}__in": ids}, then=delta) for delta, ids in by_delta.items()),
+        default=0,
+        output_field=IntegerField(),
+    )
+
+
+def record_hits(deltas: Dict[int, int], moment: Optional[datetime] = None) -> None:
+    """
+    Прибавляет запросы к часовым и суточным интервалам городов.
+
+    Как и счетчики CounterCities: недостающие интервалы создаются одним bulk_create,
+    затем все интервалы увеличиваются одним UPDATE через F().
+    Должна вызываться внутри транзакции.
+
+    Args:
+        deltas (Dict[int, int]): Приращение для каждого ID записи CityData.
+        moment (Optional[datetime]): Время запросов, по умолчанию — текущее.
+    """
+    starts = bucket_starts(moment)
+    CityHitBucket.objects.bulk_create(
+        [
+            CityHitBucket(city_id=city_id, granularity=granularity, bucket_start=start, hits=0)
+            for granularity, start in starts.items()
+            for city_id in deltas
+        ],
+        ignore_conflicts=True,
+    )
+    in_current_buckets = Q()
+    for granularity, start in starts.items():
+        in_current_buckets |= Q(granularity=granularity, bucket_start=start)
+    CityHitBucket.objects.filter(in_current_buckets, city_id__in=list(deltas)).update(
+        hits=increment_expression("hits", "city_id", deltas)
+    )
+
+
+def rebuild_daily_top(day: Optional[date] = None) -> int:
+    """
+    Пересчитывает рейтинг городов за сутки из суточных интервалов.
+
+    Args:
+        day (Optional[date]): Дата, по умолчанию — сегодня (местное время).
+
+    Returns:
+        int: Количество мест в сохранённом рейтинге.
+    """
+    day = day or timezone.localdate()
+    start = _day_start(day)
+    top = (
+        CityHitBucket.objects.filter(granularity=CityHitBucket.Granularity.DAY, bucket_start=start, hits__gt=0)
+        .order_by("-hits", "city_id")
+        .values_list("city_id", "hits")[:DAILY_TOP_SIZE]
+    )
+    rows = [
+        CityDailyTop(day=day, rank=rank, city_id=city_id, hits=hits)
+        for rank, (city_id, hits) in enumerate(top, start=1)
+    ]
+    with transaction.atomic():
+        CityDailyTop.objects.filter(day=day).delete()
+        CityDailyTop.objects.bulk_create(rows)
+    return len(rows)
+
+
+def prune_hour_buckets(keep_days: int = HOUR_BUCKETS_KEEP_DAYS) -> int:
+    """
+    Удаляет часовые интервалы старше keep_days дней. Суточные интервалы и рейтинги не удаляются.
+
+    Returns:
+        int: Количество удалённых записей.
+    """
+    border = timezone.now() - timedelta(days=keep_days)
+    deleted, _ = CityHitBucket.objects.filter(
+        granularity=CityHitBucket.Granularity.HOUR, bucket_start__lt=border
+    ).delete()
+    return deleted
+
+
+def top_cities_for_days(days: int = 7, limit: int = 3) -> List[Dict[str, Any]]:
+    """
+    Возвращает самые популярные города за последние days дней со спарклайном по дням.
+
+    Рейтинг собирается из заранее посчитанных CityDailyTop (не больше
+    days * DAILY_TOP_SIZE строк), спарклайны — из суточных интервалов только
+    для попавших в рейтинг городов. Объём чтения не зависит от размера справочника.
+    Город, ни в один из дней не вошедший в суточный рейтинг (DAILY_TOP_SIZE мест),
+    в рейтинг за период тоже не попадёт.
+
+    Args:
+        days (int): Количество последних дней, включая сегодняшний.
+        limit (int): Количество городов в рейтинге.
+
+    Returns:
+        List[Dict[str, Any]]: Города по убыванию запросов: city (CityData), hits
+            и sparkline (список количества запросов по дням, от старых к новым).
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    top = list(
+        CityDailyTop.objects.filter(day__gte=first_day)
+        .values("city_id")
+        .annotate(total=Sum("hits"))
+        .order_by("-total", "city_id")[:limit]
+    )
+    if not top:
+        return []
+
+    city_ids = [row["city_id"] for row in top]
+    cities = CityData.objects.select_related("table_id").in_bulk(city_ids)
+    day_start = _day_start(first_day)
+    series: Dict[int, Dict[date, int]] = defaultdict(dict)
+    for city_id, start, hits in CityHitBucket.objects.filter(
+        city_id__in=city_ids, granularity=CityHitBucket.Granularity.DAY, bucket_start__gte=day_start
+    ).values_list("city_id", "bucket_start", "hits"):
+        series[city_id][timezone.localtime(start).date()] = hits
+
+    day_list = [first_day + timedelta(days=offset) for offset in range(days)]
+    return [
+        {
+            "city": cities[row["city_id"]],
+            "hits": row["total"],
+            "sparkline": [series[row["city_id"]].get(day, 0) for day in day_list],
+        }
+        for row in top
+        if row["city_id"] in cities
+    ]
+
+
+def sparkline_points(values: Sequence[int], width: int = 120, height: int = 30) -> str:
+    """
+    Переводит ряд значений в атрибут points для SVG polyline.
+
+    Args:
+        values (Sequence[int]): Значения по порядку.
+        width (int): Ширина области рисования.
+        height (int): Высота области рисования.
+
+    Returns:
+        str: Строка вида "x1,y1 x2,y2 ...".
+    """
+    if not values:
+        return ""
+    peak = max(values) or 1
+    step = width / max(len(values) - 1, 1)
+    return " ".join(
+        f"{index * step:.1f},{height - value / peak * height:.1f}" for index, value in enumerate(values)
+    )
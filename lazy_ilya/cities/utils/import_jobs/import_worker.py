@@ -0,0 +1,294 @@
+import math
+import os
+import socket
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from cities.models import ImportJob
+from cities.utils.import_jobs.progress_publisher import ProgressPublisher
+from cities.utils.parser_word.globus_parser import GlobusParser
+from lazy_ilya.utils.admission import AdmissionRejected
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+# Каталог внутри tlg_dir, куда CitiesAdmin сохраняет загруженные файлы: у каждой задачи свой файл
+IMPORT_UPLOAD_DIR = "import_jobs"
+
+# По скольким последним задачам оценивается длительность импорта для Retry-After
+RETRY_AFTER_SAMPLE = 10
+# Длительность импорта для Retry-After, пока завершенных задач нет, в секундах
+DEFAULT_IMPORT_SECONDS = 30
+
+
+def worker_id() -> str:
+    """Идентификатор обработчика задач импорта: "хост:pid" текущего процесса."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _is_dead_local_worker(worker: str) -> bool:
+    """
+    Проверяет, что обработчик запущен на этом хосте и его процесса уже нет.
+
+    Args:
+        worker (str): Идентификатор обработчика ("хост:pid").
+
+    Returns:
+        bool: True, если процесс обработчика точно завершился.
+    """
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+class ImportWorker:
+    """
+    Фоновый обработчик задач импорта файла globus.docx.
+
+    Задачи хранятся в модели ImportJob и выполняются строго по одной: пока есть
+    задача в состоянии running, следующая не будет взята в работу. Взявший задачу
+    обработчик записывает в нее свой идентификатор и периодически обновляет
+    heartbeat_at; задачи, чей обработчик завершился или давно не подавал сигнал,
+    возвращаются в очередь методом recover_interrupted. Задачу, которую сейчас
+    выполняет другой процесс (run_import_jobs или другой процесс daphne), он не трогает.
+
+    Обработчик можно запускать двумя способами:
+    - в процессе веб-сервера: метод wake() поднимает фоновый поток, который
+      разбирает очередь и завершается, когда она пуста;
+    - отдельной management-командой run_import_jobs.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def enqueue(file_path: str) -> ImportJob:
+        """
+        Ставит файл в очередь на импорт, если в очереди и в работе меньше
+        ProjectSettings.import_max_pending задач.
+
+        Проверка и создание задачи идут в одной транзакции; транзакции SQLite
+        начинаются с блокировки записи (transaction_mode IMMEDIATE), поэтому
+        предел общий для всех процессов веб-сервера.
+
+        Args:
+            file_path (str): Имя файла в каталоге tlg_dir.
+
+        Returns:
+            ImportJob: Созданная задача в состоянии queued.
+
+        Raises:
+            AdmissionRejected: Очередь задач импорта заполнена (429 с Retry-After).
+        """
+        with transaction.atomic():
+            pending = ImportJob.objects.filter(
+                status__in=[ImportJob.Status.QUEUED, ImportJob.Status.RUNNING]
+            ).count()
+            if pending >= ProjectSettings.import_max_pending:
+                logger.warning(f"Отказ в постановке импорта: в очереди и в работе {pending} задач")
+                raise AdmissionRejected(
+                    "import", 429, ImportWorker.retry_after(pending),
+                    "Очередь импорта заполнена, повторите позже",
+                )
+            job = ImportJob.objects.create(file_path=str(file_path))
+        logger.info(f"Задача импорта №{job.id} поставлена в очередь: {job.file_path}")
+        return job
+
+    @staticmethod
+    def retry_after(pending: int) -> int:
+        """
+        Оценка, через сколько секунд в очереди импорта освободится место.
+
+        Args:
+            pending (int): Задач в очереди и в работе.
+
+        Returns:
+            int: Средняя длительность последних задач, умноженная на число задач впереди.
+        """
+        durations = [
+            (job.finished_at - job.started_at).total_seconds()
+            for job in ImportJob.objects.filter(
+                status=ImportJob.Status.DONE, started_at__isnull=False, finished_at__isnull=False
+            ).order_by("-finished_at")[:RETRY_AFTER_SAMPLE]
+        ]
+        average = sum(durations) / len(durations) if durations else DEFAULT_IMPORT_SECONDS
+        return max(1, math.ceil(average * (pending - ProjectSettings.import_max_pending + 1)))
+
+    @staticmethod
+    def pending_snapshot() -> Dict[str, int]:
+        """Задачи импорта в очереди и в работе и предел их числа (для страницы статистики)."""
+        counts = dict(
+            ImportJob.objects.filter(status__in=[ImportJob.Status.QUEUED, ImportJob.Status.RUNNING])
+            .values_list("status").annotate(total=Count("pk"))
+        )
+        return {
+            "max_pending": ProjectSettings.import_max_pending,
+            "queued": counts.get(ImportJob.Status.QUEUED, 0),
+            "running": counts.get(ImportJob.Status.RUNNING, 0),
+        }
+
+    @staticmethod
+    def recover_interrupted() -> int:
+        """
+        Возвращает в очередь прерванные задачи в состоянии running.
+
+        Задача считается прерванной, если ее обработчик не подавал сигнал дольше
+        ProjectSettings.import_lease_timeout или если это процесс на этом же хосте,
+        который уже завершился.
+
+        Returns:
+            int: Количество возвращённых в очередь задач.
+        """
+        stale_before = timezone.now() - timedelta(seconds=ProjectSettings.import_lease_timeout)
+        recovered = 0
+        for job in ImportJob.objects.filter(status=ImportJob.Status.RUNNING):
+            if job.heartbeat_at is not None and job.heartbeat_at >= stale_before \
+                    and not _is_dead_local_worker(job.worker):
+                continue
+            # Условие на heartbeat_at: если обработчик успел подать сигнал, задача остается за ним
+            recovered += ImportJob.objects.filter(
+                pk=job.pk, status=ImportJob.Status.RUNNING, heartbeat_at=job.heartbeat_at
+            ).update(status=ImportJob.Status.QUEUED, started_at=None, worker="", heartbeat_at=None)
+        if recovered:
+            logger.warning(f"Возвращено в очередь прерванных задач импорта: {recovered}")
+        return recovered
+
+    @staticmethod
+    def claim_next() -> Optional[ImportJob]:
+        """
+        Забирает в работу самую старую задачу из очереди.
+
+        Returns:
+            Optional[ImportJob]: Задача в состоянии running или None,
+            если очередь пуста либо другая задача уже выполняется.
+        """
+        with transaction.atomic():
+            if ImportJob.objects.filter(status=ImportJob.Status.RUNNING).exists():
+                return None
+            job = ImportJob.objects.filter(status=ImportJob.Status.QUEUED).order_by("pk").first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = ImportJob.objects.filter(pk=job.pk, status=ImportJob.Status.QUEUED).update(
+                status=ImportJob.Status.RUNNING, started_at=now, worker=worker_id(), heartbeat_at=now
+            )
+        if not claimed:
+            return None
+        job.refresh_from_db()
+        return job
+
+    @staticmethod
+    def run_job(job: ImportJob) -> ImportJob:
+        """
+        Выполняет импорт и сохраняет результат в задаче.
+
+        Args:
+            job (ImportJob): Задача в состоянии running.
+
+        Returns:
+            ImportJob: Задача в состоянии done или failed.
+        """
+        logger.info(f"Запуск задачи импорта №{job.id}: {job.file_path}")
+        stop_heartbeat = threading.Event()
+        heartbeat = threading.Thread(
+            target=ImportWorker._heartbeat, args=(job, stop_heartbeat), name="import-heartbeat", daemon=True
+        )
+        heartbeat.start()
+        try:
+            # Прогресс публикуется в группу задачи, на нее подписывается только загрузивший файл
+            stats = GlobusParser.process_file(job.file_path, progress=ProgressPublisher(job.id))
+        except Exception as e:
+            job.status = ImportJob.Status.FAILED
+            job.error = str(e) or e.__class__.__name__
+            logger.error(f"Задача импорта №{job.id} завершилась с ошибкой: {job.error}")
+        else:
+            job.status = ImportJob.Status.DONE
+            for field, value in (stats or {}).items():
+                setattr(job, field, value)
+            logger.info(f"Задача импорта №{job.id} завершена")
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+        job.finished_at = timezone.now()
+        job.heartbeat_at = None
+        job.save()
+        if Path(job.file_path).parts[:1] == (IMPORT_UPLOAD_DIR,):
+            # Файл загружен только для этой задачи и больше не нужен
+            (ProjectSettings.tlg_dir / job.file_path).unlink(missing_ok=True)
+        return job
+
+    @staticmethod
+    def _heartbeat(job: ImportJob, stop: threading.Event) -> None:
+        """
+        Тело потока сигналов: пока задача выполняется, обновляет ее heartbeat_at.
+
+        Импорт держит транзакцию записи, поэтому обновление может ждать ее фиксации;
+        неудачная попытка только логируется, следующая будет через интервал.
+        """
+        try:
+            while not stop.wait(ProjectSettings.import_heartbeat_interval):
+                try:
+                    ImportJob.objects.filter(pk=job.pk, worker=job.worker).update(heartbeat_at=timezone.now())
+                except DatabaseError as e:
+                    logger.warning(f"Не удалось обновить сигнал задачи импорта №{job.id}: {e}")
+        finally:
+            connection.close()
+
+    def run_pending(self) -> int:
+        """
+        Возвращает в очередь прерванные задачи и выполняет задачи, пока очередь не опустеет.
+
+        Returns:
+            int: Количество выполненных задач.
+        """
+        self.recover_interrupted()
+        processed = 0
+        while True:
+            job = self.claim_next()
+            if job is None:
+                return processed
+            self.run_job(job)
+            processed += 1
+
+    def wake(self) -> None:
+        """
+        Сообщает обработчику о новой задаче и при необходимости запускает фоновый поток.
+        """
+        with self._lock:
+            self._wakeup.set()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="import-worker", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """
+        Тело фонового потока: разбирает очередь и завершается, когда новых задач нет.
+        """
+        try:
+            while True:
+                self._wakeup.clear()
+                self.run_pending()
+                with self._lock:
+                    if not self._wakeup.is_set():
+                        self._thread = None
+                        return
+        except Exception as e:
+            logger.exception(f"Ошибка обработчика задач импорта: {e}")
+        finally:
+            close_old_connections()
+
+
+import_worker = ImportWorker()
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from channels.layers import get_channel_layer
+
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+# Сколько finish ждет доставки итогового сообщения, в секундах
+FINISH_TIMEOUT = 5.0
+
+
+def job_group(job_id: int) -> str:
+    """Имя группы Channels, в которую публикуется прогресс задачи импорта."""
+    return f"import_job_{job_id}"
+
+
+class ChannelSender:
+    """
+    Отправляет сообщения в слой каналов из одного долгоживущего цикла событий.
+
+    async_to_sync на каждое сообщение поднимает цикл событий и поток заново;
+    здесь цикл запускается в фоновом потоке один раз на процесс, а потоки
+    импорта только ставят в него задачи.
+    """
+
+    def __init__(self) -> None:
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="progress-sender", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def send(self, group: str, message: Dict[str, Any]) -> Future:
+        """
+        Ставит отправку сообщения группе в очередь цикла событий.
+
+        Args:
+            group (str): Имя группы.
+            message (Dict[str, Any]): Событие Channels (с ключом type).
+
+        Returns:
+            Future: Завершается, когда сообщение передано в слой каналов.
+        """
+        return asyncio.run_coroutine_threadsafe(self._group_send(group, message), self._ensure_loop())
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """Выполняет callback в цикле событий через delay секунд."""
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(loop.call_later, delay, callback)
+
+    @staticmethod
+    async def _group_send(group: str, message: Dict[str, Any]) -> None:
+        try:
+            await get_channel_layer().group_send(group, message)
+        except Exception as e:  # Прогресс не должен прерывать импорт
+            logger.error(f"Не удалось отправить сообщение группе {group}: {e}")
+
+
+progress_sender = ChannelSender()
+
+
+class ProgressPublisher:
+    """
+    Публикует прогресс одной задачи импорта в ее собственную группу (job_group).
+
+    Обновления объединяются: клиентам уходит не больше max_rate сообщений в секунду,
+    и всегда последнее из накопившихся. Кроме процента в сообщении есть скорость
+    (строк в секунду) и оценка оставшегося времени.
+
+    Сообщение клиенту: {"job_id", "progress", "rows_done", "rows_total",
+    "rows_per_second", "eta_seconds", "done"}.
+    """
+
+    def __init__(
+        self,
+        job_id: Optional[int],
+        max_rate: Optional[float] = None,
+        sender: ChannelSender = progress_sender,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            job_id (Optional[int]): ID задачи импорта; None — публиковать некуда
+                (импорт вызван напрямую, без задачи), все вызовы ничего не делают.
+            max_rate (Optional[float]): Сообщений в секунду, по умолчанию ProjectSettings.progress_max_rate.
+            sender (ChannelSender): Через что отправлять сообщения.
+            clock (Callable[[], float]): Источник времени.
+        """
+        self.job_id = job_id
+        self.group = job_group(job_id) if job_id is not None else None
+        self.min_interval = 1 / (max_rate or ProjectSettings.progress_max_rate)
+        self._sender = sender
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._latest: Optional[Dict[str, Any]] = None
+        self._scheduled = False
+        self._last_sent = float("-inf")
+        self._rows_total = 0
+        self.sent = 0
+
+    def update(self, rows_done: int, rows_total: int) -> None:
+        """
+        Сообщает о ходе импорта; отправка откладывается, если предыдущая была недавно.
+
+        Args:
+            rows_done (int): Обработано строк.
+            rows_total (int): Всего строк.
+        """
+        if self.group is None:
+            return
+        message = self._message(rows_done, rows_total)
+        with self._lock:
+            self._rows_total = rows_total
+            self._latest = message
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = max(0.0, self._last_sent + self.min_interval - self._clock())
+        self._sender.call_later(delay, self._flush)
+
+    def finish(self, **extra: Any) -> None:
+        """
+        Сразу отправляет итоговое сообщение (100%) и ждет его передачи в слой каналов.
+
+        Args:
+            **extra (Any): Дополнительные поля сообщения (например, data_version).
+        """
+        if self.group is None:
+            return
+        with self._lock:
+            self._latest = None  # Отложенное обновление больше не нужно
+            rows_total = self._rows_total
+        message = {**self._message(rows_total, rows_total), "done": True, **extra}
+        try:
+            self._send(message).result(timeout=FINISH_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Не удалось отправить итог задачи импорта №{self.job_id}: {e}")
+
+    def _flush(self) -> None:
+        """Отправляет последнее накопившееся обновление (выполняется в цикле событий)."""
+        with self._lock:
+            message, self._latest = self._latest, None
+            self._scheduled = False
+            if message is None:
+                return
+            self._last_sent = self._clock()
+        self._send(message)
+
+    def _send(self, message: Dict[str, Any]) -> Future:
+        self.sent += 1
+        logger.debug(f"Прогресс задачи импорта №{self.job_id}: {message['progress']}%")
+        return self._sender.send(self.group, {"type": "send_progress", "progress": message})
+
+    def _message(self, rows_done: int, rows_total: int) -> Dict[str, Any]:
+        elapsed = self._clock() - self._started
+        rate = rows_done / elapsed if elapsed > 0 else 0.0
+        eta = (rows_total - rows_done) / rate if rate else None
+        return {
+            "job_id": self.job_id,
+            "progress": int(rows_done / rows_total * 100) if rows_total else 100,
+            "rows_done": rows_done,
+            "rows_total": rows_total,
+            "rows_per_second": round(rate, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "done": False,
+        }
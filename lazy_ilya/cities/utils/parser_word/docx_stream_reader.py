@@ -0,0 +1,217 @@
+import zipfile
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterator, List, Tuple, Union
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _w(tag: str) -> str:
+    """Возвращает полное имя тега в пространстве имён WordprocessingML."""
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_TBL = _w("tbl")
+W_TBL_GRID = _w("tblGrid")
+W_GRID_COL = _w("gridCol")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_TC_PR = _w("tcPr")
+W_GRID_SPAN = _w("gridSpan")
+W_V_MERGE = _w("vMerge")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+
+# Текстовые эквиваленты элементов внутри w:r (как в python-docx)
+RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+W_T = _w("t")
+W_BR = _w("br")
+
+DocxBlock = Union[Tuple[str, str], Tuple[str, int, Tuple[str, ...]]]
+
+
+def _run_text(run: etree._Element) -> str:
+    """
+    Возвращает текст элемента w:r так же, как Run.text в python-docx.
+
+    Args:
+        run (etree._Element): Элемент w:r.
+
+    Returns:
+        str: Текст фрагмента.
+    """
+    parts: List[str] = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph: etree._Element) -> str:
+    """
+    Возвращает текст элемента w:p так же, как Paragraph.text в python-docx.
+
+    Args:
+        paragraph (etree._Element): Элемент w:p.
+
+    Returns:
+        str: Текст абзаца.
+    """
+    parts: List[str] = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def _cell_props(cell: etree._Element) -> Tuple[int, bool]:
+    """
+    Читает из w:tcPr объединение ячейки.
+
+    Args:
+        cell (etree._Element): Элемент w:tc.
+
+    Returns:
+        Tuple[int, bool]: Количество столбцов сетки, которые занимает ячейка (gridSpan),
+            и признак продолжения вертикального объединения (vMerge="continue").
+    """
+    grid_span, v_merge_continue = 1, False
+    tc_pr = cell.find(W_TC_PR)
+    if tc_pr is not None:
+        span = tc_pr.find(W_GRID_SPAN)
+        if span is not None:
+            grid_span = int(span.get(W_VAL, "1"))
+        merge = tc_pr.find(W_V_MERGE)
+        if merge is not None:
+            v_merge_continue = merge.get(W_VAL, "continue") == "continue"
+    return grid_span, v_merge_continue
+
+
+def _release(element: etree._Element) -> None:
+    """Очищает обработанный элемент и удаляет уже пройденных соседей, чтобы не держать их в памяти."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def iter_docx_blocks(file_path: Union[str, Path]) -> Iterator[DocxBlock]:
+    """
+    Потоково читает word/document.xml из файла .docx без построения объектной модели python-docx.
+
+    Возвращает блоки верхнего уровня документа в порядке следования:
+    - ("paragraph", text) — абзац тела документа (в том числе заголовки "Раздел N");
+    - ("row", table_index, cells) — строка таблицы верхнего уровня в виде кортежа текстов ячеек.
+
+    Тексты ячеек совпадают с row.cells[i].text в python-docx: объединённые по горизонтали
+    ячейки (gridSpan) повторяются, продолжение вертикального объединения (vMerge) берёт текст
+    верхней ячейки. Вложенные таблицы игнорируются, как и в python-docx.
+
+    Args:
+        file_path (Union[str, Path]): Путь к файлу .docx.
+
+    Yields:
+        DocxBlock: Абзац или строка таблицы.
+    """
+    tbl_depth = 0
+    table_index = -1
+    col_count = 0
+    rows_seen = rows_emitted = 0
+    pending: List[str] = []
+    recent: Deque[str] = deque()
+
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        # Фильтр по тегам: события по элементам форматирования (w:rPr, w:pPr и т.п.) не поднимаются в Python
+        events = etree.iterparse(xml, events=("start", "end"), tag=(W_P, W_TBL, W_TBL_GRID, W_TR, W_TC))
+        for event, elem in events:
+            tag = elem.tag
+            if event == "start":
+                if tag == W_TBL:
+                    tbl_depth += 1
+                    if tbl_depth == 1:
+                        table_index += 1
+                        col_count = 0
+                        rows_seen = rows_emitted = 0
+                        pending = []
+                continue
+
+            if tag == W_P:
+                if tbl_depth == 0 and elem.getparent() is not None and elem.getparent().tag == W_BODY:
+                    yield "paragraph", _paragraph_text(elem)
+                    _release(elem)
+            elif tbl_depth != 1:
+                if tag == W_TBL:
+                    tbl_depth -= 1
+            elif tag == W_TBL_GRID:
+                col_count = sum(1 for _ in elem.iterchildren(W_GRID_COL))
+                recent = deque(maxlen=col_count or None)
+            elif tag == W_TC:
+                text = "\n".join(_paragraph_text(p) for p in elem.iterchildren(W_P))
+                grid_span, v_merge_continue = _cell_props(elem)
+                for span_idx in range(grid_span):
+                    if v_merge_continue:
+                        value = recent[0] if len(recent) == col_count else ""
+                    elif span_idx > 0:
+                        value = recent[-1]
+                    else:
+                        value = text
+                    pending.append(value)
+                    recent.append(value)
+            elif tag == W_TR:
+                rows_seen += 1
+                while len(pending) >= col_count > 0 and rows_emitted < rows_seen:
+                    yield "row", table_index, tuple(pending[:col_count])
+                    del pending[:col_count]
+                    rows_emitted += 1
+                _release(elem)
+            elif tag == W_TBL:
+                while rows_emitted < rows_seen:
+                    yield "row", table_index, tuple(pending[:col_count])
+                    del pending[:col_count]
+                    rows_emitted += 1
+                tbl_depth -= 1
+                _release(elem)
+
+
+def read_docx_tables(file_path: Union[str, Path]) -> Tuple[List[str], List[List[Tuple[str, ...]]]]:
+    """
+    Собирает результат iter_docx_blocks в абзацы и таблицы.
+
+    Args:
+        file_path (Union[str, Path]): Путь к файлу .docx.
+
+    Returns:
+        Tuple[List[str], List[List[Tuple[str, ...]]]]: Тексты абзацев тела документа
+            и таблицы верхнего уровня, каждая — список строк-кортежей.
+    """
+    paragraphs: List[str] = []
+    tables: List[List[Tuple[str, ...]]] = []
+    for block in iter_docx_blocks(file_path):
+        if block[0] == "paragraph":
+            paragraphs.append(block[1])
+        else:
+            _, table_index, cells = block
+            while len(tables) <= table_index:
+                tables.append([])
+            tables[table_index].append(cells)
+    return paragraphs, tables
@@ -1,6 +1,9 @@
 import asyncio
+import hashlib
+import json
 import os
 import time
+from collections import defaultdict
 from pathlib import Path
 
 from docx.table import _Cell, Table
@@ -17,7 +20,9 @@ import re
 from pprint import pprint
 from queue import Queue
 
+from django.db import connection, transaction
 from django.db.models import Q, QuerySet
+from django.utils import timezone
 from docx.enum.section import WD_ORIENT
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.table import WD_ALIGN_VERTICAL
@@ -26,12 +31,14 @@ from docx.oxml.ns import qn
 from docx.shared import Inches, Pt, RGBColor
 from docx.text.font import Font
 
-from cities.models import TableNames, CityData
+from cities.models import TableNames, CityData, ImportJob
+from cities.utils.common_func.cities_cache import get_cities_payload, invalidate_cities_cache
+from cities.utils.common_func.city_deltas import CityChangeSet, record_change_set
+from cities.utils.import_jobs.progress_publisher import ProgressPublisher, progress_sender
+from cities.utils.parser_word.docx_stream_reader import read_docx_tables
 
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
 from docx import Document
 
 from lazy_ilya.utils.settings_for_app import (ProjectSettings, logger)
@@ -42,6 +49,12 @@ class GlobusParser:
     Класс обрабатывает содержимое файла с Городами.
     """
 
+    # Поля CityData, которые берутся из документа (кроме table_id) и синхронизируются с базой
+    SYNC_FIELDS: Tuple[str, ...] = (
+        "dock_num", "location", "name_organ", "pseudonim", "letters",
+        "writing", "ip_address", "some_number", "work_time",
+    )
+
     def __init__(self) -> None:
         """
         Инициализирует экземпляр класса GlobusParser.
@@ -62,7 +75,7 @@ class GlobusParser:
         }
 
     @classmethod
-    def process_file(cls, file_path: str) -> None:
+    def process_file(cls, file_path: str, progress: Optional[ProgressPublisher] = None) -> Dict[str, Any]:
         """
         Обрабатывает документ по указанному пути.
 
@@ -71,54 +84,152 @@ class GlobusParser:
         file_path : str
             Путь к файлу документа для обработки.
 
+        progress : Optional[ProgressPublisher]
+            Куда публиковать прогресс задачи импорта; по умолчанию прогресс не отправляется.
+
         Логика работы:
         ---------------
-        1. Загружает документ с помощью метода _load_doc.
-        2. Извлекает таблицы и параграфы из документа.
+        0. Считает SHA-256 файла; если он совпадает с хэшем последнего успешного
+           импорта и строки не менялись вручную, обработка пропускается.
+        1. Потоково читает документ методом _load_doc: тексты абзацев и строки таблиц.
         3. Обрабатывает параграфы методом _process_paragraphs, который возвращает:
             - processed_tables: список обработанных таблиц (структура не уточнена, возможно List[Any])
             - tables_to_add: таблицы, которые необходимо добавить
             - tables_to_update: таблицы, которые необходимо обновить
         4. Синхронизирует таблицы через _sync_tables.
         5. Обрабатывает таблицы с учётом строк через _process_tables_with_rows.
-        6. Финализирует прогресс обработки через _finalize_progress.
+           Шаги 3–5 выполняются в одной транзакции: ошибка откатывает весь импорт.
+           В той же транзакции изменениям присваивается номер версии (record_change_set).
+        6. Финализирует прогресс обработки через _finalize_progress и рассылает клиентам
+           только изменившиеся строки (CityChangeSet).
 
         Исключения:
         -----------
-        Любые исключения логируются с уровнем ошибки.
+        Любые исключения логируются с уровнем ошибки и пробрасываются дальше,
+        чтобы задача импорта (ImportJob) была помечена как завершившаяся с ошибкой.
 
         Возвращаемое значение:
         ----------------------
-        None
+        Dict[str, Any]
+            Статистика импорта: rows_total, rows_added, rows_updated, rows_deleted, file_hash.
         """
+        progress = progress or ProgressPublisher(None)
         try:
-            doc = cls._load_doc(
-                file_path)  # тип doc зависит от реализации _load_doc (вероятно, объект python-docx.Document)
-            tables = doc.tables  # Обычно список объектов таблиц документа
-            paragraphs = doc.paragraphs  # Список параграфов документа
+            file_hash = cls._file_hash(file_path)
+            if cls._is_unchanged_file(file_hash):
+                logger.info(f"Файл {file_path} не изменился с последнего импорта, обработка пропущена")
+                progress.finish()
+                return {
+                    "rows_total": CityData.objects.count(),
+                    "rows_added": 0,
+                    "rows_updated": 0,
+                    "rows_deleted": 0,
+                    "file_hash": file_hash,
+                }
+
+            # paragraphs: тексты абзацев, tables: строки таблиц в виде кортежей текстов ячеек
+            paragraphs, tables = cls._load_doc(file_path)
 
-            # Предполагаемые типы возвращаемых значений:
-            # processed_tables: List[Any]
-            # tables_to_add: List[Any]
-            # tables_to_update: List[Any]
-            processed_tables, tables_to_add, tables_to_update = cls._process_paragraphs(paragraphs)
+            # Изменения списка городов для рассылки клиентам собираются по ходу синхронизации
+            change_set = CityChangeSet()
 
-            # Синхронизация таблиц: метод без возвращаемого значения
-            cls._sync_tables(processed_tables, tables_to_add, tables_to_update)
+            # Весь импорт — одна транзакция: при ошибке база остается как до импорта,
+            # а читатели до фиксации видят прежний снимок (WAL, см. sqlite_pragmas)
+            with transaction.atomic():
+                # Предполагаемые типы возвращаемых значений:
+                # processed_tables: List[Any]
+                # tables_to_add: List[Any]
+                # tables_to_update: List[Any]
+                processed_tables, tables_to_add, tables_to_update = cls._process_paragraphs(paragraphs)
 
-            # Обработка таблиц с учетом строк: метод без возвращаемого значения
-            cls._process_tables_with_rows(tables, processed_tables)
+                # Синхронизация таблиц: метод без возвращаемого значения
+                cls._sync_tables(processed_tables, tables_to_add, tables_to_update, change_set)
+
+                # Обработка таблиц с учетом строк: возвращает статистику изменений
+                stats = cls._process_tables_with_rows(tables, processed_tables, change_set, progress)
+
+                # Версия изменений выдается под той же блокировкой записи, что и импорт
+                delta = record_change_set(change_set)
+            # Записи городов синхронизируются SQL-запросами мимо сигналов cities.signals
+            invalidate_cities_cache()
 
             # Завершение обработки
-            cls._finalize_progress()
+            cls._finalize_progress(delta, progress)
+            stats["file_hash"] = file_hash
+            return stats
 
         except Exception as e:
             logger.exception(f"Непредвиденное исключение: {e}")
+            raise
+
+    @staticmethod
+    def _file_hash(file_path: str) -> str:
+        """
+        Считает SHA-256 содержимого файла.
+
+        Параметры:
+        -----------
+        file_path : str
+            Путь к файлу документа (относительно tlg_dir).
+
+        Возвращаемое значение:
+        ----------------------
+        str
+            Хэш файла в шестнадцатеричном виде.
+        """
+        digest = hashlib.sha256()
+        with open(ProjectSettings.tlg_dir / file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _is_unchanged_file(file_hash: str) -> bool:
+        """
+        Проверяет, можно ли пропустить импорт файла целиком.
+
+        Импорт пропускается, если последняя завершённая задача импорта прошла успешно
+        с тем же хэшем файла и ни одна таблица не изменялась вручную после неё
+        (у всех таблиц сохранён хэш содержимого).
+
+        Параметры:
+        -----------
+        file_hash : str
+            SHA-256 загружаемого файла.
+
+        Возвращаемое значение:
+        ----------------------
+        bool
+            True, если данные в базе уже соответствуют файлу.
+        """
+        last_job = ImportJob.objects.filter(
+            status__in=[ImportJob.Status.DONE, ImportJob.Status.FAILED]
+        ).order_by("-finished_at", "-pk").first()
+        if last_job is None or last_job.status != ImportJob.Status.DONE or last_job.file_hash != file_hash:
+            return False
+        return TableNames.objects.exists() and not TableNames.objects.filter(content_hash="").exists()
+
+    @staticmethod
+    def _table_hash(rows: List[List[str]]) -> str:
+        """
+        Считает SHA-256 нормализованного содержимого таблицы.
+
+        Параметры:
+        -----------
+        rows : List[List[str]]
+            Строки таблицы (без заголовка) в виде списков очищенных текстов ячеек.
+
+        Возвращаемое значение:
+        ----------------------
+        str
+            Хэш содержимого таблицы в шестнадцатеричном виде.
+        """
+        return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
 
     @staticmethod
-    def _load_doc(file_path: str) -> Document:
+    def _load_doc(file_path: str) -> Tuple[List[str], List[List[Tuple[str, ...]]]]:
         """
-        Загружает документ Word из указанного пути.
+        Потоково читает документ Word из указанного пути без построения объектной модели python-docx.
 
         Параметры:
         -----------
@@ -127,21 +238,22 @@ class GlobusParser:
 
         Возвращаемое значение:
         ----------------------
-        Document
-            Объект документа Word (из python-docx).
+        Tuple[List[str], List[List[Tuple[str, ...]]]]
+            Тексты абзацев тела документа и таблицы, каждая — список строк-кортежей
+            с текстами ячеек (см. docx_stream_reader.iter_docx_blocks).
         """
-        return Document(ProjectSettings.tlg_dir / file_path)
+        return read_docx_tables(ProjectSettings.tlg_dir / file_path)
 
     @classmethod
-    def _process_paragraphs(cls, paragraphs: List[Any]) -> Tuple[
+    def _process_paragraphs(cls, paragraphs: List[str]) -> Tuple[
         List["TableNames"], List["TableNames"], List["TableNames"]]:
         """
         Обрабатывает список параграфов, выделяя из них разделы и соответствующие таблицы.
 
         Параметры:
         -----------
-        paragraphs : List[Any]
-            Список параграфов документа (объекты из python-docx или подобные).
+        paragraphs : List[str]
+            Тексты абзацев тела документа.
 
         Логика:
         --------
@@ -162,10 +274,10 @@ class GlobusParser:
         processed_tables, tables_to_add, tables_to_update = [], [], []
 
         for paragraph in paragraphs[1:]:
-            match = re.match(r"^Раздел (\d+)\s*(.*)", paragraph.text.strip())
+            match = re.match(r"^Раздел (\d+)\s*(.*)", paragraph.strip())
             if match:
                 section_number = match.group(1)
-                section_name = paragraph.text.strip()
+                section_name = paragraph.strip()
                 table = TableNames.objects.filter(
                     Q(table_name__startswith=f"Раздел {section_number}") &
                     Q(table_name__regex=rf"^Раздел {section_number}(?!\d)")
@@ -187,7 +299,8 @@ class GlobusParser:
     def _sync_tables(cls,
                      processed_tables: List["TableNames"],
                      tables_to_add: List["TableNames"],
-                     tables_to_update: List["TableNames"]) -> None:
+                     tables_to_update: List["TableNames"],
+                     change_set: Optional[CityChangeSet] = None) -> None:
         """
         Синхронизирует таблицы с базой данных: добавляет новые, обновляет изменённые и удаляет устаревшие.
 
@@ -202,6 +315,9 @@ class GlobusParser:
         tables_to_update : List[TableNames]
             Список таблиц, требующих обновления (изменение названия).
 
+        change_set : Optional[CityChangeSet]
+            Куда записать новые, переименованные и удалённые таблицы.
+
         Возвращаемое значение:
         ----------------------
         None
@@ -216,58 +332,83 @@ class GlobusParser:
             for t in tables_to_update:
                 logger.info(f"Обновлено название таблицы '{t.table_name}' (ID: {t.id})")
 
+        if change_set is not None:
+            change_set.tables.update((t.id, t.table_name) for t in tables_to_add + tables_to_update)
+
         deleted = TableNames.objects.exclude(id__in=[t.id for t in processed_tables])
-        deleted_count = deleted.count()
+        deleted_ids = list(deleted.values_list("id", flat=True))
         deleted.delete()
-        if deleted_count:
-            logger.info(f"Удалено {deleted_count} устаревших таблиц.")
+        if deleted_ids:
+            logger.info(f"Удалено {len(deleted_ids)} устаревших таблиц.")
+            if change_set is not None:
+                change_set.deleted_tables.extend(deleted_ids)
 
     @classmethod
     def _process_tables_with_rows(cls,
-                                  tables: List[Any],
-                                  tables_id: List["TableNames"]) -> None:
+                                  tables: List[List[Tuple[str, ...]]],
+                                  tables_id: List["TableNames"],
+                                  change_set: Optional[CityChangeSet] = None,
+                                  progress: Optional[ProgressPublisher] = None) -> Dict[str, int]:
         """
         Обрабатывает строки таблиц из документа, синхронизирует данные с базой.
 
         Параметры:
         -----------
-        tables : List[Any]
-            Список таблиц из документа (например, объекты таблиц python-docx).
+        tables : List[List[Tuple[str, ...]]]
+            Таблицы документа: списки строк, каждая строка — кортеж текстов ячеек.
 
         tables_id : List[TableNames]
             Список моделей таблиц из базы данных, соответствующих таблицам документа.
 
+        change_set : Optional[CityChangeSet]
+            Куда записать добавленные, изменённые (только изменившиеся поля) и удалённые строки.
+
+        progress : Optional[ProgressPublisher]
+            Куда публиковать прогресс: обработано строк из общего числа, скорость и оценка времени.
+
         Логика:
         --------
         - Для каждой таблицы (параллельно с моделью таблицы) проходит по строкам,
           начиная с четвертой (index 3).
+        - Если хэш содержимого таблицы совпадает с сохранённым, её строки не сравниваются
+          с базой, а существующие записи остаются без изменений.
         - Извлекает и корректирует данные из ячеек.
-        - Ищет запись в базе по table_id и dock_num (номер строки).
-        - Если запись существует, обновляет при необходимости.
-        - Если нет — создает новую.
-        - Отправляет прогресс обработки через Channels.
-        - В конце вызывает синхронизацию данных с БД (_sync_city_data).
+        - Собирает строки заново разобранных таблиц для загрузки во временную таблицу.
+        - Для change_set сравнивает их с записями из заранее загруженного индекса
+          (_load_existing_cities) по table_id и dock_num (номер строки).
+        - После каждой таблицы сообщает прогресс издателю (он сам ограничивает частоту отправки).
+        - В конце вызывает синхронизацию данных с БД (_sync_city_data): добавление,
+          обновление и удаление выполняются в базе, статистика берётся из их результатов.
 
         Возвращаемое значение:
         ----------------------
-        None
-        """
-        channel_layer = get_channel_layer()
-        processed_cities, cities_to_add, cities_to_update = [], [], []
-
-        for num, (table_model, doc_table) in enumerate(zip(tables_id, tables)):
-            progress = int((num / len(tables)) * 100)
-            logger.info(f"Отправка прогресса: {progress}%")
-            async_to_sync(channel_layer.group_send)(
-                "progress_updates", {"type": "send_progress", "progress": progress}
-            )
-            for row_num, row in enumerate(doc_table.rows[3:]):
-                # cells = [cell.text.strip().replace("\n", "<br>") for cell in row.cells]
-                cells = [cell.text.strip() for cell in row.cells]
-                row_in_db = CityData.objects.select_related("table_id").filter(
-                    table_id=table_model.id,
-                    dock_num=row_num + 1
-                ).first()
+        Dict[str, int]
+            Статистика импорта: rows_total, rows_added, rows_updated, rows_deleted.
+        """
+        progress = progress or ProgressPublisher(None)
+        rows_total = sum(max(0, len(doc_table) - 3) for doc_table in tables)
+        rows_done = 0
+        staged_rows: List[Tuple[Any, ...]] = []
+        staged_keys = set()
+        cities_to_add: List["CityData"] = []
+        existing_cities = cls._load_existing_cities()
+        unchanged_tables = set()
+        tables_to_rehash: List["TableNames"] = []
+
+        for table_model, doc_table in zip(tables_id, tables):
+            progress.update(rows_done, rows_total)
+            rows_done += max(0, len(doc_table) - 3)
+            rows_cells = [[cell.strip() for cell in row] for row in doc_table[3:]]
+            table_hash = cls._table_hash(rows_cells)
+            if table_model.content_hash == table_hash:
+                logger.info(f"Таблица '{table_model.table_name}' не изменилась, пропускаю")
+                unchanged_tables.add(table_model.id)
+                continue
+            table_model.content_hash = table_hash
+            tables_to_rehash.append(table_model)
+
+            for row_num, cells in enumerate(rows_cells):
+                row_in_db = existing_cities.get((table_model.id, row_num + 1))
 
                 value_corrector = {"+": True, "-": False}
                 cls.model_inf = {
@@ -282,96 +423,191 @@ class GlobusParser:
                     "some_number": cells[7] if cells[6] not in ["+", "-"] else cells[8],
                     "work_time": cells[8] if cells[6] not in ["+", "-"] else cells[9],
                 }
+                staged_keys.add((table_model.id, row_num + 1))
+                staged_rows.append((table_model.id, *(cls.model_inf[field] for field in cls.SYNC_FIELDS)))
 
+                if change_set is None:
+                    continue
                 if row_in_db:
-                    needs_update = False
+                    old_location = row_in_db.location
+                    changed = {}
                     for key, value in cls.model_inf.items():
                         if getattr(row_in_db, key) != value:
                             setattr(row_in_db, key, value)
-                            needs_update = True
-                    if needs_update:
-                        cities_to_update.append(row_in_db)
-                    processed_cities.append(row_in_db)
+                            changed[key] = value
+                    if changed:
+                        change_set.update_row(row_in_db, changed, old_location)
                 else:
-                    new_row = CityData(**cls.model_inf)
-                    cities_to_add.append(new_row)
-                    processed_cities.append(new_row)
+                    cities_to_add.append(CityData(**cls.model_inf))
+
+        # Удаляются записи таблиц, которых нет в документе или которые разобраны заново,
+        # если строки с тем же (table_id, dock_num) в документе больше нет
+        deleted_rows = [
+            (table_id, dock_num, row.location)
+            for (table_id, dock_num), row in existing_cities.items()
+            if table_id not in unchanged_tables and (table_id, dock_num) not in staged_keys
+        ]
+        added, updated, deleted = cls._sync_city_data(staged_rows, unchanged_tables)
+        if change_set is not None:
+            for row in cities_to_add:
+                change_set.add_row(row)
+            if deleted_rows:
+                change_set.delete_rows(deleted_rows)
+        if tables_to_rehash:
+            TableNames.objects.bulk_update(tables_to_rehash, ["content_hash"])
+        return {
+            "rows_total": len(staged_rows) + sum(
+                1 for table_id, _ in existing_cities if table_id in unchanged_tables
+            ),
+            "rows_added": added,
+            "rows_updated": updated,
+            "rows_deleted": deleted,
+        }
 
-        cls._sync_city_data(cities_to_add, cities_to_update, processed_cities)
+    @staticmethod
+    def _load_existing_cities() -> Dict[Tuple[int, int], "CityData"]:
+        """
+        Загружает все записи городов одним запросом и строит по ним индекс.
+
+        Возвращаемое значение:
+        ----------------------
+        Dict[Tuple[int, int], CityData]
+            Словарь, где ключ — пара (table_id, dock_num), значение — запись CityData
+            (с уже подгруженной таблицей, чтобы сравнение не порождало новых запросов).
+        """
+        return {
+            (row.table_id_id, row.dock_num): row
+            for row in CityData.objects.select_related("table_id")
+        }
 
     @classmethod
     def _sync_city_data(cls,
-                        cities_to_add: List["CityData"],
-                        cities_to_update: List["CityData"],
-                        processed_cities: List["CityData"]) -> None:
+                        staged_rows: List[Tuple[Any, ...]],
+                        unchanged_tables: Optional[set] = None) -> Tuple[int, int, int]:
         """
-        Синхронизирует записи городов с базой: добавляет новые, обновляет существующие и удаляет устаревшие.
+        Синхронизирует записи городов с базой через временную таблицу (staging).
+
+        Разобранные строки загружаются во временную таблицу city_staging, после чего
+        добавление, обновление и удаление выполняются тремя запросами над множествами
+        с соединением по (table_id, dock_num) в одной транзакции. Так не возникает ни
+        списков id длиной во всю базу в IN (...) (предел числа параметров SQLite),
+        ни огромных CASE-выражений bulk_update; время синхронизации почти не зависит
+        от числа строк. Записи, ссылающиеся на удаляемые города (CounterCities,
+        CityHitBucket, CityDailyTop), удаляются теми же запросами над множествами.
 
         Параметры:
         -----------
-        cities_to_add : List[CityData]
-            Список новых записей для добавления.
-
-        cities_to_update : List[CityData]
-            Список записей для обновления.
+        staged_rows : List[Tuple[Any, ...]]
+            Строки заново разобранных таблиц: (table_id, *SYNC_FIELDS).
 
-        processed_cities : List[CityData]
-            Все записи, которые должны остаться в базе.
+        unchanged_tables : Optional[set]
+            ID таблиц, содержимое которых не изменилось: их записи остаются как есть.
+            Записи всех остальных таблиц, которых нет среди staged_rows, удаляются.
 
         Возвращаемое значение:
         ----------------------
-        None
-        """
-        if cities_to_add:
-            created = CityData.objects.bulk_create(cities_to_add)
-            for row in created:
-                logger.info(f"Добавил новую запись id = '{row.id}' - {row.location}")
-
-        if cities_to_update:
-            CityData.objects.bulk_update(cities_to_update, [
-                "location", "name_organ", "pseudonim", "letters",
-                "writing", "ip_address", "some_number", "work_time"
-            ])
-            for row in cities_to_update:
-                logger.info(f"Обновил запись id = '{row.id}' - {row.location}")
-
-        to_delete = CityData.objects.select_related("table_id").exclude(
-            id__in=[r.id for r in processed_cities]
-        )
-        deleted_count = to_delete.count()
-        to_delete.delete()
-        if deleted_count:
-            logger.info(f"Удалено {deleted_count} устаревших записей городов.")
+        Tuple[int, int, int]
+            Количество добавленных, обновлённых и удалённых записей.
+        """
+        table = CityData._meta.db_table
+        columns = ", ".join(cls.SYNC_FIELDS)
+        key_match = "c.table_id_id = s.table_id AND c.dock_num = s.dock_num"
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Типы колонок как в cities_citydata: без них сравнение по ключу не использует индексы
+            column_types = ", ".join(
+                f"{field} {CityData._meta.get_field(field).db_type(connection)}" for field in cls.SYNC_FIELDS
+            )
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS city_staging ("
+                f"table_id INTEGER NOT NULL, {column_types}, PRIMARY KEY (table_id, dock_num))"
+            )
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS city_staging_kept (table_id INTEGER PRIMARY KEY)")
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS city_staging_stale (id INTEGER PRIMARY KEY)")
+            try:
+                placeholders = ", ".join(["%s"] * (len(cls.SYNC_FIELDS) + 1))
+                cursor.executemany(
+                    f"INSERT OR REPLACE INTO city_staging (table_id, {columns}) VALUES ({placeholders})",
+                    staged_rows,
+                )
+                cursor.executemany(
+                    "INSERT INTO city_staging_kept (table_id) VALUES (%s)",
+                    [(table_id,) for table_id in unchanged_tables or ()],
+                )
+
+                cursor.execute(
+                    f"INSERT INTO {table} (processed_at, table_id_id, {columns}) "
+                    f"SELECT %s, s.table_id, {', '.join('s.' + field for field in cls.SYNC_FIELDS)} "
+                    f"FROM city_staging AS s "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {table} AS c WHERE {key_match})",
+                    [connection.ops.adapt_datetimefield_value(timezone.now())],
+                )
+                added = cursor.rowcount
+
+                cursor.execute(
+                    f"UPDATE {table} AS c SET "
+                    + ", ".join(f"{field} = s.{field}" for field in cls.SYNC_FIELDS)
+                    + f" FROM city_staging AS s WHERE {key_match} AND ("
+                    + " OR ".join(f"c.{field} IS NOT s.{field}" for field in cls.SYNC_FIELDS)
+                    + ")"
+                )
+                updated = cursor.rowcount
+
+                cursor.execute(
+                    f"INSERT INTO city_staging_stale (id) SELECT c.id FROM {table} AS c "
+                    f"WHERE c.table_id_id NOT IN (SELECT table_id FROM city_staging_kept) "
+                    f"AND NOT EXISTS (SELECT 1 FROM city_staging AS s WHERE {key_match})"
+                )
+                # Сырой DELETE обходит каскад Django: сначала удаляются зависимые записи
+                # (счетчики, интервалы запросов, рейтинги), иначе фиксация упадет на внешних ключах
+                for relation in CityData._meta.related_objects:
+                    cursor.execute(
+                        f"DELETE FROM {relation.related_model._meta.db_table} "
+                        f"WHERE {relation.field.column} IN (SELECT id FROM city_staging_stale)"
+                    )
+                cursor.execute(f"DELETE FROM {table} WHERE id IN (SELECT id FROM city_staging_stale)")
+                deleted = cursor.rowcount
+            finally:
+                for staging_table in ("city_staging", "city_staging_kept", "city_staging_stale"):
+                    cursor.execute(f"DELETE FROM {staging_table}")
+
+        logger.info(f"Записи городов: добавлено {added}, обновлено {updated}, удалено {deleted}.")
+        return added, updated, deleted
 
     @classmethod
-    def _finalize_progress(cls) -> None:
+    def _finalize_progress(cls,
+                           delta: Optional[Dict[str, Any]] = None,
+                           progress: Optional[ProgressPublisher] = None) -> None:
         """
         Завершает процесс обновления, отправляя в канал итоговые данные.
 
+        Параметры:
+        -----------
+        delta : Optional[Dict[str, Any]]
+            Сообщение об изменениях списка городов за импорт с номером версии (record_change_set).
+
+        progress : Optional[ProgressPublisher]
+            Издатель прогресса задачи импорта.
+
         Логика:
         --------
-        - Получает все актуальные записи городов с непустым location.
-        - Преобразует их в словари (через метод to_dict модели).
-        - Отправляет сообщение с прогрессом 100% и списком городов через Channels.
+        - Один раз собирает кэш списка городов для новой версии данных (get_cities_payload),
+          чтобы первый запрос после импорта не собирал его сам.
+        - Отправляет в группу задачи сообщение с прогрессом 100% и версией данных.
+        - Рассылает изменения с уже присвоенным номером версии
+          всем клиентам (группа progress_updates): добавленные, изменённые и удалённые строки,
+          а не весь список. При слишком большом числе изменений клиенты получают указание
+          загрузить список заново (cities_resync).
 
         Возвращаемое значение:
         ----------------------
         None
         """
-        all_rows = CityData.objects.select_related("table_id").exclude(
-            Q(location__isnull=True) | Q(location__exact="")
-        )
-        updated_cities = [el.to_dict() for el in all_rows]
-        channel_layer = get_channel_layer()
-        async_to_sync(channel_layer.group_send)(
-            "progress_updates",
-            {
-                "type": "send_progress",
-                "progress": 100,
-                "cities": updated_cities
-            }
-        )
+        _, _, data_version = get_cities_payload()
+        (progress or ProgressPublisher(None)).finish(data_version=data_version)
         logger.info(f"Отправка прогресса: 100%")
+        if delta is not None:
+            progress_sender.send("progress_updates", {"type": "send_delta", "delta": delta})
+            logger.info(f"Отправлены изменения списка городов, версия {delta['version']}")
 
     @classmethod
     def _style_cell_text(cls, cell: _Cell, justify: bool = False) -> None:
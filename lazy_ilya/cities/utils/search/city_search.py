@@ -0,0 +1,126 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from cities.models import CityData
+
+FTS_TABLE = "cities_citydata_fts"
+# Триграммный токенизатор FTS5 находит подстроки длиной от трёх символов
+MIN_INDEXED_QUERY_LEN = 3
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Веса столбцов для bm25: совпадение в адресе важнее, чем в органе или псевдониме
+BM25_WEIGHTS = (10.0, 5.0, 5.0)
+
+SEARCH_FIELDS = ("location", "name_organ", "pseudonim")
+
+
+def _fts_query(query: str) -> str:
+    """
+    Превращает строку поиска в запрос FTS5 на поиск подстроки.
+
+    Строка берётся в кавычки целиком, поэтому спецсимволы синтаксиса FTS5
+    не интерпретируются, а совпадение ищется как подстрока, как и раньше в браузере.
+    """
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _fts_search(query: str, offset: int, limit: int) -> Tuple[List[int], int]:
+    """
+    Ищет города по полнотекстовому индексу cities_citydata_fts.
+
+    Args:
+        query (str): Строка поиска длиной не меньше MIN_INDEXED_QUERY_LEN.
+        offset (int): Смещение первой записи страницы.
+        limit (int): Размер страницы.
+
+    Returns:
+        Tuple[List[int], int]: ID найденных записей страницы в порядке релевантности
+            и общее количество совпадений.
+    """
+    city_table = CityData._meta.db_table
+    where = (
+        f"FROM {FTS_TABLE} JOIN {city_table} AS c ON c.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s AND c.location IS NOT NULL AND c.location != ''"
+    )
+    match = _fts_query(query)
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) {where}", [match])
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT c.id {where} ORDER BY bm25({FTS_TABLE}, {weights}), c.id LIMIT %s OFFSET %s",
+            [match, limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return ids, total
+
+
+def _scan_search(query: str, offset: int, limit: int) -> Tuple[List[int], int]:
+    """
+    Ищет города без индекса: для коротких строк поиска и для СУБД без FTS5.
+
+    iregex в SQLite выполняется через модуль re, поэтому регистр кириллицы
+    не учитывается так же, как в индексе. Совпадения в начале адреса идут первыми.
+    """
+    pattern = re.escape(query)
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__iregex": pattern})
+    rows = (
+        CityData.objects.exclude(Q(location__isnull=True) | Q(location__exact=""))
+        .filter(condition)
+        .annotate(
+            rank=Case(
+                When(location__iregex=f"^{pattern}", then=Value(0)),
+                When(location__iregex=pattern, then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("rank", "pk")
+    )
+    total = rows.count()
+    ids = list(rows.values_list("pk", flat=True)[offset:offset + limit])
+    return ids, total
+
+
+def search_cities(query: str, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """
+    Ищет города по адресу, названию органа и псевдониму.
+
+    Строки поиска от MIN_INDEXED_QUERY_LEN символов ищутся по триграммному индексу FTS5
+    и сортируются по bm25, более короткие — перебором с сортировкой по началу адреса.
+    Записи без адреса (пустые строки таблиц) в выдачу не попадают.
+
+    Args:
+        query (str): Строка поиска.
+        page (int): Номер страницы, начиная с 1.
+        page_size (int): Размер страницы, не больше MAX_PAGE_SIZE.
+
+    Returns:
+        Dict[str, Any]: Словарь с ключами results (список CityData.to_dict()),
+            total, page, page_size и has_next.
+    """
+    query = query.strip()
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    offset = (page - 1) * page_size
+
+    if not query:
+        ids, total = [], 0
+    elif len(query) >= MIN_INDEXED_QUERY_LEN and connection.vendor == "sqlite":
+        ids, total = _fts_search(query, offset, page_size)
+    else:
+        ids, total = _scan_search(query, offset, page_size)
+
+    rows = CityData.objects.select_related("table_id").in_bulk(ids)
+    return {
+        "results": [rows[pk].to_dict() for pk in ids if pk in rows],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "has_next": offset + len(ids) < total,
+    }
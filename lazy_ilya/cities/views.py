@@ -1,21 +1,28 @@
+import hashlib
 import json
-import threading
 import traceback
+import uuid
+from pathlib import Path
 from typing import List, Dict, Any
 
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db.models import Q
 from django.http import HttpRequest, HttpResponse, JsonResponse, Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
 from cities.forms import CityDataForm
-from cities.models import CityData, CounterCities
-from cities.utils.common_func.get_city_context import get_all_cities, get_context_admin_cities
-from cities.utils.parser_word.globus_parser import GlobusParser
+from cities.models import CityData, CounterCities, ImportJob
+from cities.utils.common_func.cities_cache import get_cities_payload, get_cities_version
+from cities.utils.common_func.get_city_context import get_cities_context, get_context_admin_cities
+from cities.utils.counters.city_counters import city_counter_accumulator, resolve_city_ids
+from cities.utils.import_jobs.import_worker import IMPORT_UPLOAD_DIR, import_worker
+from cities.utils.search.city_search import DEFAULT_PAGE_SIZE, search_cities
 from file_creator.utils.storage import OverwritingFileSystemStorage
+from lazy_ilya.utils.admission import AdmissionRejected
 from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
 
 
@@ -36,15 +43,15 @@ class Cities(LoginRequiredMixin, View):
 
     def get(self, request: HttpRequest) -> HttpResponse:
         """
-        Получает список всех городов.
+        Отображает страницу поиска городов.
 
         Args:
             request (HttpRequest): Объект запроса.
 
         Returns:
-            HttpResponse: Ответ с HTML-шаблоном и данными о городах в формате JSON.
+            HttpResponse: Ответ с HTML-шаблоном. Данные о городах страница запрашивает через CitySearchView.
         """
-        context = get_all_cities(request=request)
+        context = get_cities_context(request=request)
         return render(
             request=request,
             template_name="cities/cities.html",
@@ -153,6 +160,75 @@ class Cities(LoginRequiredMixin, View):
             return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
 
+class CitySearchView(LoginRequiredMixin, View):
+    """
+    API поиска городов по адресу, названию органа и псевдониму.
+    """
+    login_url = reverse_lazy('myauth:login')
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """
+        Возвращает страницу результатов поиска, отсортированных по релевантности.
+
+        Параметры запроса: q — строка поиска, page — номер страницы (с 1),
+        page_size — размер страницы.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: Найденные города (results), общее количество (total), page, page_size
+                и has_next или ошибка 400 при некорректных параметрах.
+        """
+        try:
+            page = int(request.GET.get("page", 1))
+            page_size = int(request.GET.get("page_size", DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return JsonResponse({"error": "page и page_size должны быть числами"}, status=400)
+
+        # Ответ зависит только от параметров запроса и версии данных о городах
+        etag_source = f"{get_cities_version()}?{request.GET.urlencode()}"
+        etag = '"' + hashlib.sha1(etag_source.encode("utf-8")).hexdigest() + '"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = JsonResponse(search_cities(request.GET.get("q", ""), page=page, page_size=page_size))
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CitiesListView(LoginRequiredMixin, View):
+    """
+    API полного списка городов с непустым адресом.
+
+    Список берётся из версионированного кэша (cities_cache) и отдаётся с ETag,
+    поэтому браузер скачивает его заново только после изменения данных.
+    """
+    login_url = reverse_lazy('myauth:login')
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Возвращает сериализованный список городов или 304, если у клиента актуальная версия.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: JSON-массив городов (CityData.to_dict()) с заголовком ETag.
+        """
+        cities_json, etag, _ = get_cities_payload()
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(cities_json, content_type="application/json")
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
 class CitiesAdmin(LoginRequiredMixin, UserPassesTestMixin, View):
     """
     Класс для обработки запросов, связанных с обновлением городов через админ панель
@@ -197,7 +273,8 @@ class CitiesAdmin(LoginRequiredMixin, UserPassesTestMixin, View):
             request (HttpRequest): Объект запроса.
 
         Returns:
-            JsonResponse: Ответ с сообщением об успешной загрузке файла или ошибкой.
+            JsonResponse: Ответ с сообщением об успешной загрузке файла и job_id задачи импорта
+                или ошибкой (429 с Retry-After, если очередь импорта заполнена).
         """
         try:
             uploaded_file = request.FILES.get("cityFile")
@@ -206,20 +283,26 @@ class CitiesAdmin(LoginRequiredMixin, UserPassesTestMixin, View):
                 logger.bind(user=request.user.username).error(f"FILES: {request.FILES}")
                 return JsonResponse({"error": "Файл не загружен"}, status=400)
 
-            fs = OverwritingFileSystemStorage(
-                location=ProjectSettings.tlg_dir, allow_overwrite=True
+            # У каждой задачи свой файл: более поздняя загрузка не подменит файл задачи в очереди
+            fs = OverwritingFileSystemStorage(location=ProjectSettings.tlg_dir)
+            file_path = fs.save(
+                f"{IMPORT_UPLOAD_DIR}/{uuid.uuid4().hex}_{Path(uploaded_file.name).name}", uploaded_file
             )
-            file_path = fs.save(uploaded_file.name, uploaded_file)
-
-            logger.bind(user=request.user.username).info("Запуск обработки файла в отдельном потоке")
 
-            # Запускаем обработку файла в отдельном потоке
-            threading.Thread(
-                target=GlobusParser.process_file, args=(file_path,)
-            ).start()
+            # Ставим импорт в очередь, задачи выполняются фоновым обработчиком по одной.
+            # Если очередь заполнена, файл не нужен: клиент получит 429 с Retry-After
+            try:
+                job = import_worker.enqueue(file_path)
+            except AdmissionRejected:
+                fs.delete(file_path)
+                raise
+            import_worker.wake()
             logger.bind(user=request.user.username).info(
-                f"Файл загружен успешно")
-            return JsonResponse({"message": "Файл загружен успешно"}, status=200)
+                f"Файл загружен успешно, задача импорта №{job.id}")
+            return JsonResponse({"message": "Файл загружен успешно", "job_id": job.id}, status=200)
+
+        except AdmissionRejected as rejected:
+            return rejected.response()
 
         except Exception as e:
             # Если возникает исключение, логируем его и возвращаем сообщение об ошибке
@@ -231,6 +314,43 @@ class CitiesAdmin(LoginRequiredMixin, UserPassesTestMixin, View):
             )
 
 
+class ImportJobView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """
+    Представление для получения состояния задачи импорта файла с городами.
+    """
+    login_url = reverse_lazy('myauth:login')
+
+    def test_func(self):
+        # Проверяем, что пользователь в группе admin
+        return self.request.user.groups.filter(name='admin').exists()
+
+    def handle_no_permission(self):
+        if not self.request.user.is_authenticated:
+            # Если не залогинен — редиректим на страницу логина
+            return redirect(self.login_url)
+        # Возвращаем 403 вместо редиректа
+        from django.http import HttpResponseForbidden
+        return HttpResponseForbidden("Доступ запрещён, только админ может сюда заходить")
+
+    def get(self, request: HttpRequest, job_id: int) -> JsonResponse:
+        """
+        Возвращает состояние задачи импорта.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+            job_id (int): ID задачи импорта.
+
+        Returns:
+            JsonResponse: Данные задачи (состояние, счетчики строк, время, ошибка)
+                или 404, если задача не найдена.
+        """
+        try:
+            job = ImportJob.objects.get(pk=job_id)
+        except ImportJob.DoesNotExist:
+            return JsonResponse({"error": "Задача импорта не найдена"}, status=404)
+        return JsonResponse(job.to_dict())
+
+
 class CityInfoView(LoginRequiredMixin, UserPassesTestMixin,View):
     """
     Представление для работы с данными о городах (CityData).
@@ -349,6 +469,8 @@ def increment_city_counters(request: HttpRequest) -> JsonResponse:
 
     Каждая пара (table_id, dock_num) используется для поиска записи CityData.
     Если такая запись найдена, увеличивается соответствующий счетчик в модели CounterCities.
+    Записи ищутся одним запросом, а приращения накапливаются в city_counter_accumulator
+    и записываются в БД пакетом раз в ProjectSettings.counter_flush_interval секунд.
 
     Returns:
         JsonResponse:
@@ -368,14 +490,10 @@ def increment_city_counters(request: HttpRequest) -> JsonResponse:
         if len(table_ids) != len(dock_nums):
             return JsonResponse({"error": "table_ids и dock_num должны быть одинаковой длины"}, status=400)
 
-        for table_id, dock_num in zip(table_ids, dock_nums):
-            try:
-                city = CityData.objects.get(table_id=table_id, dock_num=dock_num)
-                counter, created = CounterCities.objects.get_or_create(dock_num=city)
-                counter.count_responses += 1
-                counter.save()
-            except CityData.DoesNotExist:
-                continue  # Запись не найдена — пропускаем
+        # Все пары разрешаются одним запросом, ненайденные пропускаются;
+        # приращения копятся в памяти и записываются в БД пакетом
+        city_ids = resolve_city_ids(table_ids, dock_nums)
+        city_counter_accumulator.add(city_ids)
 
         logger.bind(user=getattr(request.user, 'username', 'Anonymous')).info(
             "Обновлены счетчики запросов к городам"
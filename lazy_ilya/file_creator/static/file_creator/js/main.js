@@ -1,13 +1,1001 @@
-/* empty css        */function F(s,...n){n.forEach(t=>t.classList.remove("show")),setTimeout(()=>{n.forEach(t=>t.classList.add("hidden")),s.classList.remove("hidden"),setTimeout(()=>{s.classList.add("show")},100)},500)}function _(){const s=document.querySelectorAll(".step"),n={1:document.getElementById("step1-form"),2:document.getElementById("step2-form"),3:document.getElementById("step3-form"),4:document.getElementById("step4-form")};s.forEach(t=>{t.addEventListener("click",()=>{const i=t.dataset.step;s.forEach(e=>e.classList.remove("li-style-active")),t.classList.add("li-style-active");const a=n[i],d=Object.values(n).filter(e=>e!==a);a?F(a,...d):(Object.values(n).forEach(e=>e.classList.remove("show")),setTimeout(()=>{Object.values(n).forEach(e=>e.classList.add("hidden"))},500))})})}function M(){const s=document.getElementById("files"),n=document.getElementById("file-list"),t=document.getElementById("server-info"),i=document.getElementById("btn-div");let a=[];s.addEventListener("change",()=>{a=Array.from(s.files),d()});function d(){n.innerHTML="",a.forEach(m=>{const c=document.createElement("li");c.classList.add("flex","justify-between","items-center","gap-2","mb-1");const o=document.createElement("span");o.textContent=`${m.name} (${(m.size/1024).toFixed(1)} KB)`;const v=y();v.addEventListener("click",()=>{u(m)}),c.appendChild(o),c.appendChild(v),n.appendChild(c)}),e()}function e(){const m=new DataTransfer;a.forEach(c=>m.items.add(c)),s.files=m.files}function y(){const m=document.createElement("button");return m.type="button",m.innerHTML=`Удалить<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke-width="1.5" stroke="currentColor" class="shrink-0 inline size-3 md:size-5 ms-1">
-  <path stroke-linecap="round" stroke-linejoin="round" d="m14.74 9-.346 9m-4.788 0L9.26 9m9.968-3.21c.342.052.682.107 1.022.166m-1.022-.165L18.16 19.673a2.25 2.25 0 0 1-2.244 2.077H8.084a2.25 2.25 0 0 1-2.244-2.077L4.772 5.79m14.456 0a48.108 48.108 0 0 0-3.478-.397m-12 .562c.34-.059.68-.114 1.022-.165m0 0a48.11 48.11 0 0 1 3.478-.397m7.5 0v-.916c0-1.18-.91-2.164-2.09-2.201a51.964 51.964 0 0 0-3.32 0c-1.18.037-2.09 1.022-2.09 2.201v.916m7.5 0a48.667 48.667 0 0 0-7.5 0" />
-</svg>
-`,m.classList.add("btn-delete"),m}function u(m){t.classList.remove("hidden"),t.classList.add("flex","animate-popup"),t.querySelector("h3").textContent="Подтверждение удаления",t.querySelector("p").textContent=`Вы уверены, что хотите удалить файл "${m.name}"?`,i.innerHTML="";const c=document.createElement("button");c.id="confirm-delete",c.textContent="Да, Нах!",c.classList.add("btn-submit","!p-1","!font-medium");const o=document.createElement("button");o.id="cancel-delete",o.textContent="Передумал",o.classList.add("btn-cancel","!p-1","!font-medium"),i.appendChild(c),i.appendChild(o),c.addEventListener("click",()=>{const v=a.indexOf(m);v!==-1&&(a.splice(v,1),d()),l()}),o.addEventListener("click",l)}function l(){t.classList.remove("animate-popup"),t.classList.add("animate-popup-reverse"),setTimeout(()=>{t.classList.add("hidden"),t.classList.remove("flex","animate-popup-reverse"),t.querySelector("h3").textContent="",t.querySelector("p").textContent="",i.innerHTML=""},500)}function r(){a=[],n.innerHTML="",s.value=""}return{clearFileList:r}}function A(s,n="server-error"){const t=document.getElementById(n);if(!t){console.warn(`Элемент с id "${n}" не найден.`);return}const i=t.querySelector("p");if(!i){console.warn(`В элементе с id "${n}" отсутствует <p> для текста ошибки.`);return}t.classList.remove("hidden","animate-popup-reverse"),t.classList.add("flex","animate-popup"),i.textContent=(typeof s=="string"?s:s.message)||"Произошла ошибка при отправке данных",t.scrollIntoView({behavior:"smooth",block:"start"}),console.error("Ошибка запроса:",s),setTimeout(()=>{t.classList.remove("animate-popup"),t.classList.add("animate-popup-reverse"),setTimeout(()=>{t.classList.add("hidden"),t.classList.remove("flex","animate-popup-reverse")},1e3)},4e3)}function b(){return`<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke-width="1.5" stroke="currentColor" class="size-6">
-  <path stroke-linecap="round" stroke-linejoin="round" d="M15.59 14.37a6 6 0 0 1-5.84 7.38v-4.8m5.84-2.58a14.98 14.98 0 0 0 6.16-12.12A14.98 14.98 0 0 0 9.631 8.41m5.96 5.96a14.926 14.926 0 0 1-5.841 2.58m-.119-8.54a6 6 0 0 0-7.381 5.84h4.8m2.581-5.84a14.927 14.927 0 0 0-2.58 5.84m2.699 2.7c-.103.021-.207.041-.311.06a15.09 15.09 0 0 1-2.448-2.448 14.9 14.9 0 0 1 .06-.312m-2.24 2.39a4.493 4.493 0 0 0-1.757 4.306 4.493 4.493 0 0 0 4.306-1.758M16.5 9a1.5 1.5 0 1 1-3 0 1.5 1.5 0 0 1 3 0Z" />
-</svg>
-`}async function P(s,n,t){const i=document.getElementById("save-content");i.disabled=!0;const a=document.querySelector("[name=csrfmiddlewaretoken]").value,d={files:s,content:n};try{const e=await fetch(t,{method:"PUT",headers:{"Content-Type":"application/json","X-CSRFToken":a},body:JSON.stringify(d)}),y=await e.json();if(!e.ok)throw new Error(y.error||`Ошибка: ${e.status}`);return console.log("Все изменения успешно сохранены:",y),!0}catch(e){return A(e,"server-error2"),!1}finally{i.disabled=!1}}async function N(s,n,t){const i=document.getElementById("save-edited-content"),a=document.getElementById("save-content"),d=document.getElementById("btn-div2"),e=document.getElementById("file-content"),y=document.getElementById("file-names-list");n.classList.add("li-style-active");let u=300;const l=new Map;let r=null,m=null,c=null;if(Array.isArray(s.new_files)&&Array.isArray(s.content)&&(s.new_files.forEach((o,v)=>{l.set(o,s.content[v])}),s.new_files.forEach((o,v)=>{const h=document.createElement("li");h.setAttribute("tabindex","0"),h.classList.add("focus:outline-none","focus:ring-2","focus:ring-[--color-accent]"),h.classList.add("file-item","group","group-focus:outline-none","group-focus:ring-2","group-focus:ring-[--color-accent]");const p=document.createElement("span");p.textContent=o,p.classList.add("file-name","cursor-pointer","group-hover:text-[--color-accent]"),h.addEventListener("keydown",g=>{g.key==="Tab"&&h.click()}),h.addEventListener("click",()=>{e.scrollIntoView({behavior:"smooth",block:"start"}),e.value=l.get(o),e.disabled=!1,e.style.height="auto",u=e.scrollHeight,e.style.height=u+"px",i.disabled=!1,a.disabled=!1,document.querySelectorAll(".file-item").forEach(g=>g.classList.remove("file-item-selected")),h.classList.add("file-item-selected"),c=o});const L=document.createElement("button");L.title="Удалить",L.innerHTML=`
+// step-navigation.js
+
+/**
+ * Функция для показа нужной формы и скрытия остальных с анимацией.
+ * @param {HTMLElement} targetForm - форма, которую нужно показать
+ * @param  {...HTMLElement} otherForms - формы, которые нужно скрыть
+ */
+function showForm(targetForm, ...otherForms) {
+    // Убираем класс 'show' у всех других форм
+    otherForms.forEach(f => f.classList.remove('show'));
+
+    // После анимации скрытия, скрываем формы и показываем нужную
+    setTimeout(() => {
+        otherForms.forEach(f => f.classList.add('hidden'));
+        targetForm.classList.remove('hidden');
+
+        setTimeout(() => {
+            targetForm.classList.add('show');
+        }, 100);
+    }, 500);
+}
+
+/**
+ * Настраивает навигацию по шагам формы.
+ */
+function setupStepNavigation() {
+    const steps = document.querySelectorAll('.step');
+    const forms = {
+        1: document.getElementById('step1-form'),
+        2: document.getElementById('step2-form'),
+        3: document.getElementById('step3-form'),
+        4: document.getElementById('step4-form'),
+    };
+
+    steps.forEach(step => {
+        step.addEventListener('click', () => {
+            const selectedStep = step.dataset.step;
+
+            // Обновляем активный шаг
+            steps.forEach(s => s.classList.remove('li-style-active'));
+            step.classList.add('li-style-active');
+
+            const targetForm = forms[selectedStep];
+            const otherForms = Object.values(forms).filter(f => f !== targetForm);
+
+            if (targetForm) {
+                showForm(targetForm, ...otherForms);
+            } else {
+                // Если шаг невалидный — скрыть всё
+                Object.values(forms).forEach(f => f.classList.remove('show'));
+                setTimeout(() => {
+                    Object.values(forms).forEach(f => f.classList.add('hidden'));
+                }, 500);
+            }
+        });
+    });
+}
+
+// file-upload.js
+
+/**
+ * Настраивает загрузку файлов с отображением списка, удалением и подтверждением удаления.
+ * Подходит для простых форм с input[type="file"] и кастомным отображением.
+ *
+ * Элементы DOM:
+ * - #files: input с типом "file"
+ * - #file-list: ul/li контейнер для списка файлов
+ * - #server-info: блок с сообщением и кнопками подтверждения
+ * - #btn-div: контейнер для кнопок подтверждения/отмены
+ *
+ * @returns {Object} clearFileList - функция очистки всех выбранных файлов
+ */
+function setupFileUpload() {
+    const fileInput = document.getElementById('files');
+    const fileList = document.getElementById('file-list');
+    const serverInfo = document.getElementById('server-info');
+    const divBtn = document.getElementById('btn-div');
+
+    /** @type {File[]} */
+    let selectedFiles = [];
+
+    // Обновляем список файлов при выборе
+    fileInput.addEventListener('change', () => {
+        selectedFiles = Array.from(fileInput.files);
+        renderFileList();
+    });
+
+    /**
+     * Отрисовывает список выбранных файлов и добавляет кнопки удаления.
+     */
+    function renderFileList() {
+        fileList.innerHTML = '';
+
+        selectedFiles.forEach((file) => {
+            const li = document.createElement('li');
+            li.classList.add('flex', 'justify-between', 'items-center', 'gap-2', 'mb-1');
+
+            const fileInfo = document.createElement('span');
+            fileInfo.textContent = `${file.name} (${(file.size / 1024).toFixed(1)} KB)`;
+
+            const removeBtn = createDeleteButton();
+            removeBtn.addEventListener('click', () => {
+                showDeleteConfirmation(file);
+            });
+
+            li.appendChild(fileInfo);
+            li.appendChild(removeBtn);
+            fileList.appendChild(li);
+        });
+
+        updateInputFiles();
+    }
+
+    /**
+     * Обновляет input.files вручную, основываясь на selectedFiles.
+     */
+    function updateInputFiles() {
+        const dataTransfer = new DataTransfer();
+        selectedFiles.forEach(file => dataTransfer.items.add(file));
+        fileInput.files = dataTransfer.files;
+    }
+
+    /**
+     * Создаёт кнопку удаления с иконкой.
+     * @returns {HTMLButtonElement}
+     */
+    function createDeleteButton() {
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.innerHTML = 'Удалить' +
+            '<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke-width="1.5" stroke="currentColor" class="shrink-0 inline size-3 md:size-5 ms-1">\n' +
+            '  <path stroke-linecap="round" stroke-linejoin="round" d="m14.74 9-.346 9m-4.788 0L9.26 9m9.968-3.21c.342.052.682.107 1.022.166m-1.022-.165L18.16 19.673a2.25 2.25 0 0 1-2.244 2.077H8.084a2.25 2.25 0 0 1-2.244-2.077L4.772 5.79m14.456 0a48.108 48.108 0 0 0-3.478-.397m-12 .562c.34-.059.68-.114 1.022-.165m0 0a48.11 48.11 0 0 1 3.478-.397m7.5 0v-.916c0-1.18-.91-2.164-2.09-2.201a51.964 51.964 0 0 0-3.32 0c-1.18.037-2.09 1.022-2.09 2.201v.916m7.5 0a48.667 48.667 0 0 0-7.5 0" />\n' +
+            '</svg>\n';
+        button.classList.add('btn-delete');
+        return button;
+    }
+
+    /**
+     * Показывает модальное окно для подтверждения удаления файла.
+     * @param {File} fileToDelete - файл, который пользователь хочет удалить
+     */
+    function showDeleteConfirmation(fileToDelete) {
+        serverInfo.classList.remove('hidden');
+        serverInfo.classList.add('flex', 'animate-popup');
+        serverInfo.querySelector('h3').textContent = 'Подтверждение удаления';
+        serverInfo.querySelector('p').textContent = `Вы уверены, что хотите удалить файл "${fileToDelete.name}"?`;
+
+        divBtn.innerHTML = ''; // Удаляем предыдущие кнопки, если есть
+
+        const confirmBtn = document.createElement('button');
+        confirmBtn.id = 'confirm-delete';
+        confirmBtn.textContent = 'Да, Нах!';
+        confirmBtn.classList.add('btn-submit', '!p-1', '!font-medium');
+
+        const cancelBtn = document.createElement('button');
+        cancelBtn.id = 'cancel-delete';
+        cancelBtn.textContent = 'Передумал';
+        cancelBtn.classList.add('btn-cancel', '!p-1', '!font-medium');
+
+        divBtn.appendChild(confirmBtn);
+        divBtn.appendChild(cancelBtn);
+
+        confirmBtn.addEventListener('click', () => {
+            const index = selectedFiles.indexOf(fileToDelete);
+            if (index !== -1) {
+                selectedFiles.splice(index, 1);
+                renderFileList();
+            }
+            hideServerInfo();
+        });
+
+        cancelBtn.addEventListener('click', hideServerInfo);
+    }
+
+    /**
+     * Скрывает блок server-info и очищает его содержимое и кнопки.
+     */
+    function hideServerInfo() {
+        // serverInfo.classList.add('hidden');
+        serverInfo.classList.remove('animate-popup');
+        serverInfo.classList.add('animate-popup-reverse');
+        setTimeout(() => {
+            serverInfo.classList.add('hidden');
+            serverInfo.classList.remove('flex', 'animate-popup-reverse');
+            serverInfo.querySelector('h3').textContent = '';
+            serverInfo.querySelector('p').textContent = '';
+            divBtn.innerHTML = '';
+        }, 500);
+    }
+
+    /**
+     * Полностью очищает выбранные файлы и сбрасывает input.
+     */
+    function clearFileList() {
+        selectedFiles = [];
+        fileList.innerHTML = '';
+        fileInput.value = '';
+    }
+
+    return {clearFileList};
+}
+
+/**
+ * Показывает анимированный блок с сообщением об ошибке на странице.
+ *
+ * @param {Error | string} error - Объект ошибки или строка с текстом ошибки.
+ * @param {string} [elementId='server-error'] - ID HTML-элемента, в котором отображается ошибка.
+ *
+ * HTML-структура элемента ошибки должна выглядеть так:
+ * <div id="server-error" class="hidden">
+ *   <p></p>
+ * </div>
+ *
+ * Анимации должны быть определены в CSS:
+ * - animate-popup
+ * - animate-popup-reverse
+ *
+ * Пример использования:
+ * ```js
+ * try {
+ *   await sendRequest();
+ * } catch (e) {
+ *   showError(e);
+ * }
+ * ```
+ */
+function showError(error, elementId = 'server-error') {
+    const errorBlock = document.getElementById(elementId);
+    if (!errorBlock) {
+        console.warn(`Элемент с id "${elementId}" не найден.`);
+        return;
+    }
+
+    const errorText = errorBlock.querySelector('p');
+    if (!errorText) {
+        console.warn(`В элементе с id "${elementId}" отсутствует <p> для текста ошибки.`);
+        return;
+    }
+
+    errorBlock.classList.remove('hidden', 'animate-popup-reverse');
+    errorBlock.classList.add('flex', 'animate-popup');
+    errorText.textContent = (typeof error === 'string' ? error : error.message) || 'Произошла ошибка при отправке данных';
+    // Мягкий скролл к блоку ошибки
+    errorBlock.scrollIntoView({behavior: 'smooth', block: 'start'});
+
+    console.error('Ошибка запроса:', error);
+
+    setTimeout(() => {
+        errorBlock.classList.remove('animate-popup');
+        errorBlock.classList.add('animate-popup-reverse');
+
+        setTimeout(() => {
+            errorBlock.classList.add('hidden');
+            errorBlock.classList.remove('flex', 'animate-popup-reverse');
+        }, 1000);
+    }, 4000);
+}
+
+
+function getCheckIcon() {
+    return '<svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke-width="1.5" stroke="currentColor" class="size-6">\n' +
+        '  <path stroke-linecap="round" stroke-linejoin="round" d="M15.59 14.37a6 6 0 0 1-5.84 7.38v-4.8m5.84-2.58a14.98 14.98 0 0 0 6.16-12.12A14.98 14.98 0 0 0 9.631 8.41m5.96 5.96a14.926 14.926 0 0 1-5.841 2.58m-.119-8.54a6 6 0 0 0-7.381 5.84h4.8m2.581-5.84a14.927 14.927 0 0 0-2.58 5.84m2.699 2.7c-.103.021-.207.041-.311.06a15.09 15.09 0 0 1-2.448-2.448 14.9 14.9 0 0 1 .06-.312m-2.24 2.39a4.493 4.493 0 0 0-1.757 4.306 4.493 4.493 0 0 0 4.306-1.758M16.5 9a1.5 1.5 0 1 1-3 0 1.5 1.5 0 0 1 3 0Z" />\n' +
+        '</svg>\n';
+}
+
+/**
+ * Отправка всех отредактированных файлов на сервер
+ * @param {string[]} files - массив имён файлов
+ * @param {string[]} content - массив содержимого файлов
+ * @param {string} url - адрес PUT-запроса
+ * @param {string} [errorElementId='error'] - id элемента для вывода ошибки
+ * @returns {Promise<boolean>}
+ */
+async function saveAllChanges(files, content, url) {
+    const saveButton = document.getElementById('save-content');
+    saveButton.disabled = true;
+    // Получаем CSRF токен из скрытого поля в форме
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+
+    const payload = {
+        files,
+        content
+    };
+
+    try {
+        const response = await fetch(url, {
+            method: 'PUT',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-CSRFToken': csrfToken,  // Отправляем CSRF токен
+            },
+            body: JSON.stringify(payload)
+        });
+
+        const result = await response.json();
+
+        if (!response.ok) {
+            throw new Error(result.error || `Ошибка: ${response.status}`);
+        }
+
+        console.log('Все изменения успешно сохранены:', result);
+        return true;
+    } catch (error) {
+        showError(error,'server-error2');
+        return false;
+    } finally {
+        saveButton.disabled = false;
+    }
+}
+
+/**
+ * Отображает список загруженных файлов и реализует интерфейс редактирования и удаления файлов.
+ *
+ * Основной функционал:
+ * - Список файлов отображается в виде элементов <li>.
+ * - При клике на файл отображается его содержимое в текстовом поле.
+ * - Возможность редактировать содержимое файла с немедленной синхронизацией с объектом `data`.
+ * - Поддержка удаления файлов с подтверждением.
+ * - Автоматическая активация кнопок "Сохранить".
+ * - Отображение и анимация формы редактирования.
+ *
+ * @param {Object} data - Объект с информацией о загруженных файлах.
+ * @param {string[]} data.new_files - Список имён файлов.
+ * @param {string[]} data.content - Содержимое файлов в том же порядке, что и `new_files`.
+ * @param {HTMLElement} step3 - DOM-элемент шага 3, которому добавляется активный стиль.
+ * @param {HTMLElement} formDiv3 - DOM-элемент блока формы редактирования файлов.
+ *
+ * @returns {Promise<void>} - Промис, завершающийся после инициализации интерфейса.
+ *
+ * Побочные эффекты:
+ * - Изменяет DOM (создаёт элементы, добавляет обработчики событий).
+ * - Модифицирует `data.new_files` и `data.content` при редактировании и удалении.
+ * - Анимирует показ `formDiv3`.
+ * - Устанавливает активный файл для редактирования.
+ * - Управляет состоянием кнопок "Сохранить" и "Сохранить всё".
+ *
+ * DOM-элементы, с которыми работает функция (должны быть заранее созданы в HTML):
+ * - `#save-edited-content` — кнопка "Сохранить файл".
+ * - `#save-content` — кнопка "Сохранить всё".
+ * - `#file-content` — textarea для редактирования файла.
+ * - `#file-names-list` — список файлов.
+ * - `#server-info2` — модальное окно подтверждения удаления.
+ * - `#btn-div2` — контейнер для кнопок подтверждения/отмены удаления.
+ */
+async function runStep2(data, step3, formDiv3) {
+    const saveButton = document.getElementById('save-edited-content');
+    const saveAllButton = document.getElementById('save-content');
+    const divBtn2 = document.getElementById('btn-div2');
+    const fileContentTextarea = document.getElementById('file-content');
+    const leftUlForm3 = document.getElementById('file-names-list');
+    step3.classList.add('li-style-active');
+    let maxHeight = 300; // Максимальная высота в px
+
+    const fileContentMap = new Map();
+    let firstFile = null;
+    let firstLi = null;
+    let currentFileName = null;
+
+    if (Array.isArray(data.new_files) && Array.isArray(data.content)) {
+        data.new_files.forEach((file, i) => {
+            fileContentMap.set(file, data.content[i]);
+        });
+
+        data.new_files.forEach((file, i) => {
+            const li = document.createElement('li');
+            li.setAttribute('tabindex', '0');
+            li.classList.add('focus:outline-none', 'focus:ring-2', 'focus:ring-[--color-accent]');
+            li.classList.add('file-item', 'group',
+                'group-focus:outline-none', 'group-focus:ring-2',
+                'group-focus:ring-[--color-accent]');
+
+            const fileSpan = document.createElement('span');
+            fileSpan.textContent = file;
+
+            fileSpan.classList.add('file-name', 'cursor-pointer', 'group-hover:text-[--color-accent]');
+            // fileSpan.classList.add();
+            li.addEventListener('keydown', (e) => {
+                if (e.key === 'Tab') {
+                    li.click();
+                }
+            });
+
+            li.addEventListener('click', () => {
+                // window.scrollTo({top: 0, behavior: 'smooth'});
+                fileContentTextarea.scrollIntoView({behavior: 'smooth', block: 'start'});
+                fileContentTextarea.value = fileContentMap.get(file);
+                fileContentTextarea.disabled = false;
+                fileContentTextarea.style.height = "auto";
+                maxHeight = fileContentTextarea.scrollHeight
+                fileContentTextarea.style.height = maxHeight + "px";
+
+                saveButton.disabled = false;
+                saveAllButton.disabled = false;
+
+                document.querySelectorAll('.file-item').forEach(el => el.classList.remove('file-item-selected'));
+                li.classList.add('file-item-selected');
+                currentFileName = file;
+            });
+
+            const deleteBtn = document.createElement('button');
+            deleteBtn.title = 'Удалить';
+            deleteBtn.innerHTML = `
                 <svg xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24" stroke-width="1.5"
                      stroke="currentColor" class="shrink-0 inline size-4 md:size-5 me-1">
                     <path stroke-linecap="round" stroke-linejoin="round"
                           d="m9.75 9.75 4.5 4.5m0-4.5-4.5 4.5M21 12a9 9 0 1 1-18 0 9 9 0 0 1 18 0Z"/>
                 </svg>
-                Удалить`,L.classList.add("opacity-0","btn-delete","!w-4/10","flex","group-hover:opacity-100","justify-center","items-center","!py-1"),L.addEventListener("click",g=>{g.stopPropagation();const f=document.getElementById("server-info2"),I=document.getElementById("btn-div");f.classList.remove("hidden"),f.scrollIntoView({behavior:"smooth",block:"start"}),f.classList.add("flex","animate-popup"),f.querySelector("h3").textContent=`Удалить файл "${o}"?`,f.querySelector("p").textContent="Это действие нельзя отменить.";const C=document.getElementById("confirm-delete");C&&C.remove();const T=document.getElementById("cancel-delete");T&&T.remove();const w=document.createElement("button");w.id="confirm-delete",w.textContent="Да, Нах!",w.classList.add("btn-submit","!p-1","!font-medium");const E=document.createElement("button");E.id="cancel-delete",E.textContent="Передумал",E.classList.add("btn-cancel","!p-1","!font-medium"),d.appendChild(w),d.appendChild(E),w.addEventListener("click",()=>{const x=s.new_files.indexOf(o);if(x!==-1&&(s.new_files.splice(x,1),s.content.splice(x,1)),l.delete(o),h.remove(),c===o){const B=document.querySelectorAll(".file-item");if(B.length>0){const k=B[Math.min(x,B.length-1)],S=k.querySelector(".file-name").textContent;c=S,e.value=l.get(S)||"",e.disabled=!1,e.style.height="auto",u=e.scrollHeight,e.style.height=u+"px",document.querySelectorAll(".file-item").forEach(H=>H.classList.remove("file-item-selected")),k.classList.add("file-item-selected")}else c=null,e.value="",e.disabled=!0,e.style.height="auto",e.style.height="2.5rem",a.disabled=!0,i.disabled=!0}f.classList.remove("animate-popup"),f.classList.add("animate-popup-reverse"),setTimeout(()=>{f.classList.add("hidden"),f.classList.remove("flex","animate-popup-reverse"),f.querySelector("h3").textContent="",f.querySelector("p").textContent="",I.innerHTML=""},500)}),E.addEventListener("click",()=>{f.classList.remove("animate-popup"),f.classList.add("animate-popup-reverse"),setTimeout(()=>{f.classList.add("hidden"),f.classList.remove("flex","animate-popup-reverse"),f.querySelector("h3").textContent="",f.querySelector("p").textContent="",I.innerHTML=""},500)})}),h.appendChild(p),h.appendChild(L),y.appendChild(h),v===0&&(r=o,m=h,c=o)})),await new Promise(o=>setTimeout(o,500)),t.classList.remove("hidden"),await new Promise(o=>setTimeout(o,100)),t.classList.add("show"),r){e.value=l.get(r),e.disabled=!1,e.style.height="auto",u=e.scrollHeight,e.style.height=u+"px",e.blur();const o=document.getElementById("save-edited-content");o.disabled=!1,a.disabled=!1,document.querySelectorAll(".file-item").forEach(v=>v.classList.remove("file-item-selected")),m.classList.add("file-item-selected")}e.addEventListener("input",()=>{if(c){const o=window.scrollY;e.style.height="auto",e.style.height=e.scrollHeight+"px",window.scrollTo({top:o});const v=e.value;l.set(c,v);const h=s.new_files.indexOf(c);h!==-1&&(s.content[h]=v)}}),await new Promise(o=>setTimeout(o,3e3))}async function j(s,n,t){const i=document.querySelector('.step[data-step="1"]'),a=document.querySelector('.step[data-step="2"]'),d=document.querySelector('.step[data-step="3"]'),e=document.getElementById("step3-form");i.classList.remove("li-style-active"),i.classList.add("li-style-complete","pointer-events-none"),i.querySelector("span").innerHTML=b(),a.classList.add("li-style-active");const y=document.createElement("h2");y.textContent="Илья читает, что ты написал";const u=document.createElement("p");if(u.classList.add("text-text","dark:text-text-dark"),u.textContent="Посмотри правильно ли Илья прочитал. Получены обработанные файлы, ниже приведены их названия.",Array.isArray(s.new_files)){const l=document.createElement("ul");l.className="list-disc pl-5 mt-2 text-sm md:text-base text-text dark:text-text-dark font-medium",s.new_files.forEach(r=>{const m=document.createElement("li");m.textContent=r,l.appendChild(m)}),n.appendChild(y),n.appendChild(u),n.appendChild(l)}await new Promise(l=>setTimeout(l,500)),n.classList.remove("hidden"),await new Promise(l=>setTimeout(l,100)),n.classList.add("show"),t.classList.remove("hidden"),await new Promise(l=>setTimeout(l,5e3)),t.classList.add("hidden"),n.classList.remove("show"),await new Promise(l=>setTimeout(l,1e3)),n.classList.add("hidden"),a.classList.remove("li-style-active"),a.classList.add("li-style-complete","pointer-events-none"),a.querySelector("span").innerHTML=b(),await N(s,d,e)}async function q(s,n,t,i,a,d,e){try{if(a.classList.remove("hidden"),await P(s.new_files,s.content,"/")===!0){a.classList.add("hidden"),window.scrollTo({top:0,behavior:"smooth"}),n.classList.remove("show"),await new Promise(r=>setTimeout(r,500)),n.classList.add("hidden"),t.classList.remove("li-style-active"),t.classList.add("li-style-complete","pointer-events-none"),t.querySelector("span").innerHTML=b(),await new Promise(r=>setTimeout(r,500)),i.classList.add("li-style-active");const u=document.createElement("h2");u.classList.add("text-text","dark:text-text-dark"),u.textContent="Илья поработал и хочет спать!";const l=document.createElement("p");l.classList.add("dark:text-text-dark","font-medium"),l.textContent="Теперь можно посмотреть, папку с архивом за сегодняшнее число, туда положил все файлы!",d.appendChild(u),d.appendChild(l),d.classList.remove("hidden"),await new Promise(r=>setTimeout(r,100)),d.classList.add("show"),e.classList.remove("hidden"),await new Promise(r=>setTimeout(r,5e3)),e.classList.add("hidden"),d.classList.remove("show"),await new Promise(r=>setTimeout(r,500)),d.classList.add("hidden"),i.classList.remove("li-style-active"),i.classList.add("li-style-complete","pointer-events-none"),i.querySelector("span").innerHTML=b(),await new Promise(r=>setTimeout(r,1e3)),location.reload()}else a.classList.add("hidden"),console.error("Ошибка при сохранении изменений")}catch(y){a.classList.add("hidden"),e.classList.add("hidden"),console.error("Ошибка во время обработки:",y)}}async function O(s,n,t){const i=document.getElementById("upload-spinner"),a=document.getElementById("upload-spinner2"),d=document.getElementById("upload-spinner3"),e=document.getElementById("upload-spinner4"),y=document.getElementById("step2-form"),u=document.getElementById("step3-form"),l=document.getElementById("step4-form"),r=document.getElementById("save-edited-content"),m=document.getElementById("save-content"),c=document.querySelector('.step[data-step="3"]'),o=document.querySelector('.step[data-step="4"]');try{const v=new FormData(s);i.classList.remove("hidden");const h=await fetch(s.action,{method:"POST",body:v}),p=await h.json();if(!h.ok)throw new Error(p.error||`Ошибка: ${h.status}`);console.log("Ответ от сервера:",p),s.reset(),t(),n.classList.remove("show"),setTimeout(()=>n.classList.add("hidden"),500),await j(p,y,a),m.addEventListener("click",()=>{q(p,u,c,o,d,l,e)}),r.addEventListener("click",()=>{q(p,u,c,o,d,l,e)})}catch(v){A(v)}finally{i.classList.add("hidden")}}const{clearFileList:$}=M();function z(){const s=document.getElementById("step1-form"),n=document.getElementById("file-upload-form"),t=document.getElementById("files-label"),i=document.getElementById("files"),a=document.getElementById("start-number-label"),d=document.getElementById("start-number"),e=document.getElementById("device-type-label"),y=document.getElementById("device-type"),u=document.getElementById("files-error"),l=document.getElementById("start-number-error"),r=document.getElementById("device-type-error");document.getElementById("upload-spinner");const m=()=>{[u,l,r].forEach(p=>p.classList.add("hidden"))},c=(p,L,g,f="")=>{f&&(g.textContent=f),g.classList.remove("hidden"),p.classList.remove("correct_input"),p.classList.add("error_input"),L.classList.remove("correct_label"),L.classList.add("error_label"),setTimeout(()=>{g.classList.add("hidden"),p.classList.add("correct_input"),p.classList.remove("error_input"),L.classList.add("correct_label"),L.classList.remove("error_label")},3e3)},o=()=>{const p=[".doc",".docx",".rtf"];if(i.files.length===0)return c(i,t,u,"Загрузите хотя бы один файл."),!1;for(let L=0;L<i.files.length;L++){const g=i.files[L],f=g.name.slice((g.name.lastIndexOf(".")-1>>>0)+2).toLowerCase();if(!p.includes("."+f))return c(i,t,u,"Допустимые форматы: .doc, .docx, .rtf"),!1}return!0},v=()=>{const p=d.value.trim(),L=Number(p);return p===""||isNaN(L)||L<=0?(c(d,a,l,"Введите число больше нуля."),!1):!0},h=()=>y.value===""?(c(y,e,r,"Выберите тип устройства."),!1):!0;n.addEventListener("submit",p=>{p.preventDefault(),m(),o()&v()&h()&&O(n,s,$)})}document.addEventListener("DOMContentLoaded",()=>{z(),_(),M();const s=document.getElementById("a-main");s.classList.toggle("bg-accent"),s.classList.toggle("dark:bg-accent-dark");const n=document.getElementById("a-main-mob");n.classList.toggle("bg-accent"),n.classList.toggle("dark:bg-accent-dark")});
+                Удалить`;
+            deleteBtn.classList.add('opacity-0', 'btn-delete', '!w-4/10', 'flex', 'group-hover:opacity-100', 'justify-center', 'items-center', '!py-1');
+
+            deleteBtn.addEventListener('click', (e) => {
+                e.stopPropagation();
+                // window.scrollTo({top: 0, behavior: 'smooth'});
+
+                const serverInfo = document.getElementById('server-info2');
+
+                const btnDiv = document.getElementById('btn-div');
+                serverInfo.classList.remove('hidden');
+                serverInfo.scrollIntoView({behavior: 'smooth', block: 'start'});
+                serverInfo.classList.add('flex', 'animate-popup');
+
+                serverInfo.querySelector('h3').textContent = `Удалить файл "${file}"?`;
+                serverInfo.querySelector('p').textContent = `Это действие нельзя отменить.`;
+
+                const oldConfirm = document.getElementById('confirm-delete');
+                if (oldConfirm) oldConfirm.remove();
+                const oldCancel = document.getElementById('cancel-delete');
+                if (oldCancel) oldCancel.remove();
+
+                const confirmBtn = document.createElement('button');
+                confirmBtn.id = 'confirm-delete';
+                confirmBtn.textContent = 'Да, Нах!';
+                confirmBtn.classList.add('btn-submit', '!p-1', '!font-medium');
+
+                const cancelBtn = document.createElement('button');
+                cancelBtn.id = 'cancel-delete';
+                cancelBtn.textContent = 'Передумал';
+                cancelBtn.classList.add('btn-cancel', '!p-1', '!font-medium');
+
+                divBtn2.appendChild(confirmBtn);
+                divBtn2.appendChild(cancelBtn);
+
+                confirmBtn.addEventListener('click', () => {
+                    const index = data.new_files.indexOf(file);
+                    if (index !== -1) {
+                        data.new_files.splice(index, 1);
+                        data.content.splice(index, 1);
+                    }
+                    fileContentMap.delete(file);
+                    li.remove();
+
+                    if (currentFileName === file) {
+                        const fileItems = document.querySelectorAll('.file-item');
+                        if (fileItems.length > 0) {
+                            const newLi = fileItems[Math.min(index, fileItems.length - 1)];
+                            const newFileName = newLi.querySelector('.file-name').textContent;
+
+                            currentFileName = newFileName;
+                            fileContentTextarea.value = fileContentMap.get(newFileName) || '';
+                            fileContentTextarea.disabled = false;
+                            fileContentTextarea.style.height = "auto";
+                            maxHeight = fileContentTextarea.scrollHeight
+                            fileContentTextarea.style.height = maxHeight + "px";
+
+                            document.querySelectorAll('.file-item').forEach(el => el.classList.remove('file-item-selected'));
+                            newLi.classList.add('file-item-selected');
+                        } else {
+                            currentFileName = null;
+                            fileContentTextarea.value = '';
+                            fileContentTextarea.disabled = true;
+                            fileContentTextarea.style.height = "auto";
+                            fileContentTextarea.style.height = "2.5rem";
+                            saveAllButton.disabled = true;
+                            saveButton.disabled = true;
+                        }
+                    }
+
+                    serverInfo.classList.remove('animate-popup');
+                    serverInfo.classList.add('animate-popup-reverse');
+                    setTimeout(() => {
+                        serverInfo.classList.add('hidden');
+                        serverInfo.classList.remove('flex', 'animate-popup-reverse');
+                        serverInfo.querySelector('h3').textContent = '';
+                        serverInfo.querySelector('p').textContent = '';
+                        btnDiv.innerHTML = '';
+                    }, 500);
+                });
+
+                cancelBtn.addEventListener('click', () => {
+                    // serverInfo.classList.add('hidden');
+                    // btnDiv.innerHTML = '';
+                    serverInfo.classList.remove('animate-popup');
+                    serverInfo.classList.add('animate-popup-reverse');
+                    setTimeout(() => {
+                        serverInfo.classList.add('hidden');
+                        serverInfo.classList.remove('flex', 'animate-popup-reverse');
+                        serverInfo.querySelector('h3').textContent = '';
+                        serverInfo.querySelector('p').textContent = '';
+                        btnDiv.innerHTML = '';
+                    }, 500);
+
+                });
+            });
+            li.appendChild(fileSpan);
+            li.appendChild(deleteBtn);
+            leftUlForm3.appendChild(li);
+
+            if (i === 0) {
+                firstFile = file;
+                firstLi = li;
+                currentFileName = file;
+            }
+        });
+    }
+
+    await new Promise(r => setTimeout(r, 500));
+    formDiv3.classList.remove('hidden');
+    await new Promise(r => setTimeout(r, 100));
+    formDiv3.classList.add('show');
+
+    if (firstFile) {
+        fileContentTextarea.value = fileContentMap.get(firstFile);
+        fileContentTextarea.disabled = false;
+        fileContentTextarea.style.height = "auto";
+        maxHeight = fileContentTextarea.scrollHeight
+        fileContentTextarea.style.height = maxHeight + "px";
+        fileContentTextarea.blur();  // Снимаем фокус, чтобы не скроллило
+
+        const saveButton = document.getElementById('save-edited-content');
+        saveButton.disabled = false;
+        saveAllButton.disabled = false;
+
+        document.querySelectorAll('.file-item').forEach(el => el.classList.remove('file-item-selected'));
+        firstLi.classList.add('file-item-selected');
+    }
+
+    fileContentTextarea.addEventListener('input', () => {
+        if (currentFileName) {
+            const scrollY = window.scrollY;
+
+            fileContentTextarea.style.height = 'auto';
+            fileContentTextarea.style.height = fileContentTextarea.scrollHeight + 'px';
+
+            window.scrollTo({top: scrollY});
+
+            const newText = fileContentTextarea.value;
+            fileContentMap.set(currentFileName, newText);
+            const index = data.new_files.indexOf(currentFileName);
+            if (index !== -1) {
+                data.content[index] = newText;
+            }
+        }
+    });
+
+
+    await new Promise(r => setTimeout(r, 3000));
+}
+
+/**
+ * Выполняет шаг 1 в многошаговой форме:
+ * - Обновляет стили прогресс-бара (step1 -> завершён, step2 -> активен)
+ * - Отображает полученные файлы на форме step2
+ * - Показывает и скрывает спиннер с анимацией
+ * - Переходит к шагу 2 (`runStep2`)
+ *
+ * @async
+ * @function runStep1
+ * @param {Object} data - Объект с данными, полученными после отправки формы.
+ * @param {string[]} data.new_files - Список имён новых файлов, полученных с сервера.
+ * @param {HTMLElement} formDiv2 - DOM-элемент контейнера формы шага 2.
+ * @param {HTMLElement} spinner2 - DOM-элемент спиннера для шага 2.
+ */
+async function runStep1(data, formDiv2, spinner2) {
+    const step1 = document.querySelector('.step[data-step="1"]');
+    const step2 = document.querySelector('.step[data-step="2"]');
+    const step3 = document.querySelector('.step[data-step="3"]');
+    const formDiv3 = document.getElementById('step3-form');
+
+    step1.classList.remove('li-style-active');
+    step1.classList.add('li-style-complete', 'pointer-events-none');
+    step1.querySelector('span').innerHTML = getCheckIcon();
+
+    step2.classList.add('li-style-active');
+
+    // Создаем и вставляем заголовок
+    const heading = document.createElement('h2');
+    // heading.classList.add('text-xl', 'text-text', 'dark:text-text-dark', 'font-semibold');
+    heading.textContent = 'Илья читает, что ты написал';
+
+    // Создаем и вставляем абзац
+    const paragraph = document.createElement('p');
+    paragraph.classList.add('text-text', 'dark:text-text-dark');
+    paragraph.textContent = 'Посмотри правильно ли Илья прочитал. ' +
+        'Получены обработанные файлы, ниже приведены их названия.';
+
+    // Если есть файлы, отображаем их в списке
+    if (Array.isArray(data.new_files)) {
+        const ul = document.createElement('ul');
+        ul.className = 'list-disc pl-5 mt-2 text-sm md:text-base text-text dark:text-text-dark font-medium';
+        data.new_files.forEach(file => {
+            const li = document.createElement('li');
+            li.textContent = file;
+            ul.appendChild(li);
+        });
+
+        formDiv2.appendChild(heading);
+        formDiv2.appendChild(paragraph);
+        formDiv2.appendChild(ul);
+    }
+
+    await new Promise(r => setTimeout(r, 500));
+    formDiv2.classList.remove('hidden');
+    await new Promise(r => setTimeout(r, 100));
+    formDiv2.classList.add('show');
+
+    spinner2.classList.remove('hidden');
+    await new Promise(r => setTimeout(r, 5000));
+    spinner2.classList.add('hidden');
+
+    formDiv2.classList.remove('show');
+    await new Promise(r => setTimeout(r, 1000));
+    formDiv2.classList.add('hidden');
+
+    step2.classList.remove('li-style-active');
+    step2.classList.add('li-style-complete', 'pointer-events-none');
+    step2.querySelector('span').innerHTML = getCheckIcon();
+
+    await runStep2(data, step3, formDiv3);
+}
+
+// handle-save-click.js
+
+/**
+ * Обработчик клика по кнопке "Сохранить все".
+ *
+ * @param {Object} data - Данные, полученные с сервера.
+ * @param {HTMLElement} formDiv3 - DOM-элемент формы для шага 3.
+ * @param {HTMLElement} step3 - DOM-элемент для шага 3.
+ * @param {HTMLElement} step4 - DOM-элемент для шага 4.
+ * @param {HTMLElement} spinner3 - DOM-элемент спиннера для шага 3.
+ * @param {HTMLElement} formDiv4 - DOM-элемент формы для шага 4.
+ * @param {HTMLElement} spinner4 - DOM-элемент спиннера для шага 4.
+ *
+ * @returns {Promise<void>}
+ */
+async function handleSaveClick(data, formDiv3, step3, step4, spinner3, formDiv4, spinner4) {
+    try {
+        // Показываем спиннер перед сохранением
+        spinner3.classList.remove('hidden');
+
+        // Сохраняем данные
+        const result = await saveAllChanges(data.new_files, data.content, '/');
+
+        if (result === true) {
+            // Прячем спиннер после сохранения
+            spinner3.classList.add('hidden');
+
+            // Переключаем шаги
+            window.scrollTo({top: 0, behavior: 'smooth'});
+            formDiv3.classList.remove('show');
+            await new Promise(r => setTimeout(r, 500));
+            formDiv3.classList.add('hidden');
+
+            step3.classList.remove('li-style-active');
+            step3.classList.add('li-style-complete', 'pointer-events-none');
+            step3.querySelector('span').innerHTML = getCheckIcon();
+
+            await new Promise(r => setTimeout(r, 500));
+            step4.classList.add('li-style-active');
+
+            // Показ текста
+            const heading = document.createElement('h2');
+            heading.classList.add('text-text', 'dark:text-text-dark');
+            heading.textContent = 'Илья поработал и хочет спать!';
+
+            const paragraph = document.createElement('p');
+            paragraph.classList.add('dark:text-text-dark', 'font-medium');
+            paragraph.textContent = 'Теперь можно посмотреть, папку с архивом за сегодняшнее число, туда положил все файлы!';
+
+            formDiv4.appendChild(heading);
+            formDiv4.appendChild(paragraph);
+
+            formDiv4.classList.remove('hidden');
+            await new Promise(r => setTimeout(r, 100));
+            formDiv4.classList.add('show');
+
+            // Показываем спиннер4 на время "отображения результата"
+            spinner4.classList.remove('hidden');
+
+            // Здесь можно добавить ожидание окончания обработки, если есть логика
+            // Или просто подождать пока отображается текст
+            await new Promise(r => setTimeout(r, 5000));  // Оставим короткую задержку для UX
+
+            spinner4.classList.add('hidden');
+
+            formDiv4.classList.remove('show');
+            await new Promise(r => setTimeout(r, 500));
+            formDiv4.classList.add('hidden');
+
+            step4.classList.remove('li-style-active');
+            step4.classList.add('li-style-complete', 'pointer-events-none');
+            step4.querySelector('span').innerHTML = getCheckIcon();
+
+            await new Promise(r => setTimeout(r, 1000));
+            location.reload();
+        } else {
+            spinner3.classList.add('hidden');
+            console.error('Ошибка при сохранении изменений');
+        }
+    } catch (error) {
+        spinner3.classList.add('hidden');
+        spinner4.classList.add('hidden');
+        console.error('Ошибка во время обработки:', error);
+    }
+}
+
+// upload-stream.js
+
+/**
+ * Отправляет форму загрузки и читает ответ сервера потоком (NDJSON).
+ *
+ * Сервер присылает по строке на каждый обработанный файл, как только файл готов:
+ * `{index, file, new_file, content | error, seconds}`, и последнюю строку `{done, total}`.
+ * Результаты раскладываются по `index`, поэтому порядок файлов совпадает с порядком загрузки.
+ *
+ * @async
+ * @function fetchUploadStream
+ * @param {HTMLFormElement} form - Форма загрузки.
+ * @param {Function} [onFile] - Вызывается для каждого файла: `onFile(item, processedCount)`.
+ * @returns {Promise<{new_files: string[], content: string[], errors: Object<string, string>}>}
+ *          Данные в том же виде, что и обычный JSON-ответ сервера.
+ * @throws {Error} Если сервер вернул ошибку или поток оборвался.
+ */
+async function fetchUploadStream(form, onFile = () => {}) {
+    const response = await fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: {'Accept': 'application/x-ndjson'},
+    });
+
+    if (!response.ok) {
+        const data = await response.json();
+        throw new Error(data.error || `Ошибка: ${response.status}`);
+    }
+
+    const items = [];
+    const errors = {};
+    let finished = false;
+    let processed = 0;
+
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const item = JSON.parse(line);
+        if (item.done) {
+            finished = true;
+        } else if (item.index === undefined) {
+            throw new Error(item.error || 'Ошибка обработки файлов');
+        } else {
+            if (item.error) {
+                errors[item.file] = item.error;
+            } else {
+                items[item.index] = item;
+            }
+            processed += 1;
+            onFile(item, processed);
+        }
+    };
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const {value, done} = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, {stream: true});
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+
+    if (!finished) {
+        throw new Error('Ответ сервера оборвался');
+    }
+
+    const ready = items.filter(Boolean);
+    return {
+        new_files: ready.map(item => item.new_file),
+        content: ready.map(item => item.content),
+        errors,
+    };
+}
+
+// submit-form.js
+
+/**
+ * Асинхронная отправка формы через fetch
+ *
+ * Эта функция отвечает за обработку отправки формы, выполнение шагов формы (например, шаг 1, шаг 3, шаг 4),
+ * и вызов функции сохранения данных по завершении всех шагов. Она использует Fetch API для отправки формы
+ * на сервер и обработки полученных данных.
+ *
+ * @param {HTMLFormElement} form - Элемент формы, который будет отправлен.
+ * @param {HTMLElement} formDiv - DOM-элемент для текущего шага формы.
+ * @param {Function} clearFileList - Функция для очистки списка загруженных файлов.
+ *
+ * @returns {Promise<void>} - Промис, который разрешается по завершении отправки формы.
+ */
+async function submitFormAsync(form, formDiv, clearFileList) {
+    const spinner = document.getElementById('upload-spinner');
+    const spinner2 = document.getElementById('upload-spinner2');
+    const spinner3 = document.getElementById('upload-spinner3');
+    const spinner4 = document.getElementById('upload-spinner4');
+    const formDiv2 = document.getElementById('step2-form');
+    const formDiv3 = document.getElementById('step3-form');
+    const formDiv4 = document.getElementById('step4-form');
+    const saveButton = document.getElementById('save-edited-content');
+    const saveAllButton = document.getElementById('save-content');
+    const step3 = document.querySelector('.step[data-step="3"]');
+    const step4 = document.querySelector('.step[data-step="4"]');
+
+    try {
+        const filesCount = new FormData(form).getAll('files').length;
+        const spinnerText = spinner.querySelector('span');
+
+        // Показать спиннер загрузки
+        spinner.classList.remove('hidden');
+
+        // Сервер присылает каждый файл сразу после обработки — показываем прогресс
+        const data = await fetchUploadStream(form, (item, processed) => {
+            spinnerText.textContent = `Обработано ${processed} из ${filesCount}: ${item.new_file}`;
+        });
+
+        console.log('Ответ от сервера:', data);
+
+        // Сбрасываем форму и очищаем файлы
+        form.reset();
+        clearFileList();
+
+        // Переключаем шаги формы
+        formDiv.classList.remove('show');
+        setTimeout(() => formDiv.classList.add('hidden'), 500);
+
+        // Выполняем шаг 1
+        await runStep1(data, formDiv2, spinner2);
+
+        // Обработка клика на кнопки сохранения
+        saveAllButton.addEventListener('click', () => {
+            handleSaveClick(data, formDiv3, step3, step4, spinner3, formDiv4, spinner4);
+        });
+
+        saveButton.addEventListener('click', () => {
+            handleSaveClick(data, formDiv3, step3, step4, spinner3, formDiv4, spinner4);
+        });
+
+    } catch (error) {
+        // Отображаем ошибку в случае неудачи
+        showError(error);
+    } finally {
+        // Скрываем спиннер после завершения
+        spinner.classList.add('hidden');
+        spinner.querySelector('span').textContent = 'Загрузка файлов...';
+    }
+}
+
+const {clearFileList} = setupFileUpload(); // сохранить доступ к функции очистки
+/**
+ * Инициализация пользовательской валидации формы загрузки файлов
+ * Поддерживает проверку:
+ * - Загружены ли файлы
+ * - Форматы файлов (.doc, .docx, .rtf)
+ * - Начальный номер > 0
+ * - Указан ли тип устройства
+ */
+function setupFormValidation() {
+    const formDiv = document.getElementById('step1-form');
+    const form = document.getElementById('file-upload-form');
+    const fileLabel = document.getElementById('files-label');
+    const fileInput = document.getElementById('files');
+    const startNumberLabel = document.getElementById('start-number-label');
+    const startNumberInput = document.getElementById('start-number');
+    const deviceTypeLabel = document.getElementById('device-type-label');
+    const deviceTypeInput = document.getElementById('device-type');
+
+    const filesError = document.getElementById('files-error');
+    const startNumberError = document.getElementById('start-number-error');
+    const deviceTypeError = document.getElementById('device-type-error');
+    const spinner = document.getElementById('upload-spinner');
+
+    /**
+     * Сброс всех сообщений об ошибке и возврат стилей по умолчанию
+     */
+    const resetErrors = () => {
+        [filesError, startNumberError, deviceTypeError].forEach(el => el.classList.add('hidden'));
+    };
+
+    /**
+     * Показать ошибку для конкретного поля с возвратом стилей через 3 секунды
+     * @param {HTMLElement} input - поле ввода
+     * @param {HTMLElement} label - связанный label
+     * @param {HTMLElement} errorEl - элемент ошибки
+     * @param {string} [message] - необязательный текст ошибки
+     */
+    const showError = (input, label, errorEl, message = '') => {
+        if (message) errorEl.textContent = message;
+        errorEl.classList.remove('hidden');
+        input.classList.remove('correct_input');
+        input.classList.add('error_input');
+        label.classList.remove('correct_label');
+        label.classList.add('error_label');
+
+        setTimeout(() => {
+            errorEl.classList.add('hidden');
+            input.classList.add('correct_input');
+            input.classList.remove('error_input');
+            label.classList.add('correct_label');
+            label.classList.remove('error_label');
+        }, 3000);
+    };
+
+    /**
+     * Проверка: загружены ли файлы, и все ли они нужного формата
+     * @returns {boolean}
+     */
+    const validateFiles = () => {
+        const allowedExtensions = ['.doc', '.docx', '.rtf'];
+        if (fileInput.files.length === 0) {
+            showError(fileInput, fileLabel, filesError, 'Загрузите хотя бы один файл.');
+            return false;
+        }
+
+        for (let i = 0; i < fileInput.files.length; i++) {
+            const file = fileInput.files[i];
+            const ext = file.name.slice(((file.name.lastIndexOf(".") - 1) >>> 0) + 2).toLowerCase();
+            if (!allowedExtensions.includes('.' + ext)) {
+                showError(fileInput, fileLabel, filesError, 'Допустимые форматы: .doc, .docx, .rtf');
+                return false;
+            }
+        }
+        return true;
+    };
+
+    /**
+     * Проверка: введено число > 0
+     * @returns {boolean}
+     */
+    const validateStartNumber = () => {
+        const value = startNumberInput.value.trim();
+        const number = Number(value);
+        if (value === '' || isNaN(number) || number <= 0) {
+            showError(startNumberInput, startNumberLabel, startNumberError, 'Введите число больше нуля.');
+            return false;
+        }
+        return true;
+    };
+
+    /**
+     * Проверка: выбран ли тип устройства
+     * @returns {boolean}
+     */
+    const validateDeviceType = () => {
+        if (deviceTypeInput.value === '') {
+            showError(deviceTypeInput, deviceTypeLabel, deviceTypeError, 'Выберите тип устройства.');
+            return false;
+        }
+        return true;
+    };
+
+
+    // Обработчик отправки формы
+    form.addEventListener('submit', (e) => {
+        e.preventDefault();
+        resetErrors();
+
+        const isValid =
+            validateFiles() &
+            validateStartNumber() &
+            validateDeviceType();
+
+        if (isValid) {
+            submitFormAsync(form, formDiv, clearFileList); // Асинхронная отправка формы
+        }
+    });
+}
+
+// main.js
+
+
+document.addEventListener('DOMContentLoaded', () => {
+    setupFormValidation();
+    setupStepNavigation();
+    setupFileUpload();
+    const aEl = document.getElementById('a-main')
+    aEl.classList.toggle('bg-accent');
+    aEl.classList.toggle('dark:bg-accent-dark');
+    const aElMob = document.getElementById('a-main-mob')
+    aElMob.classList.toggle('bg-accent');
+    aElMob.classList.toggle('dark:bg-accent-dark');
+
+
+});
@@ -0,0 +1,130 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from lazy_ilya.utils.admission import AdmissionController, AdmissionLimits, AdmissionRejected
+from myauth.models import CustomUser
+
+
+class TestAdmissionController(unittest.TestCase):
+    def make_controller(self, max_concurrent=1, max_queue=1, queue_timeout=5.0) -> AdmissionController:
+        return AdmissionController({"upload": AdmissionLimits(max_concurrent, max_queue, queue_timeout)})
+
+    def test_rejects_with_429_when_queue_is_full(self):
+        controller = self.make_controller(max_queue=0)
+        ticket = controller.acquire("upload")
+
+        with self.assertRaises(AdmissionRejected) as raised:
+            controller.acquire("upload")
+
+        self.assertEqual(raised.exception.status, 429)
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+        response = raised.exception.response()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], str(raised.exception.retry_after))
+
+        ticket.release()
+        ticket.release()  # Повторный release ничего не меняет
+        controller.acquire("upload").release()
+        self.assertEqual(controller.snapshot()["upload"]["active"], 0)
+        self.assertEqual(controller.snapshot()["upload"]["rejected"], 1)
+
+    def test_rejects_with_503_after_queue_timeout(self):
+        controller = self.make_controller(queue_timeout=0.2)
+        ticket = controller.acquire("upload")
+
+        started = time.monotonic()
+        with self.assertRaises(AdmissionRejected) as raised:
+            controller.acquire("upload")
+
+        self.assertEqual(raised.exception.status, 503)
+        self.assertLess(time.monotonic() - started, 2)
+        snapshot = controller.snapshot()["upload"]
+        self.assertEqual((snapshot["queue_depth"], snapshot["timed_out"]), (0, 1))
+        ticket.release()
+
+    def test_waiting_request_is_admitted_when_slot_frees(self):
+        controller = self.make_controller()
+        ticket = controller.acquire("upload")
+        admitted = threading.Event()
+
+        def wait_for_slot():
+            with controller.acquire("upload"):
+                admitted.set()
+
+        thread = threading.Thread(target=wait_for_slot)
+        thread.start()
+        while controller.snapshot()["upload"]["queue_depth"] == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertFalse(admitted.is_set())
+        self.assertGreater(controller.snapshot()["upload"]["oldest_wait_seconds"], 0)
+
+        ticket.release()
+        thread.join(timeout=5)
+
+        self.assertTrue(admitted.is_set())
+        snapshot = controller.snapshot()["upload"]
+        self.assertEqual((snapshot["active"], snapshot["queue_depth"], snapshot["admitted"]), (0, 0, 2))
+        self.assertGreaterEqual(snapshot["max_wait_seconds"], 0.05)
+
+    def test_streaming_iterator_releases_on_close(self):
+        controller = self.make_controller(max_queue=0)
+
+        iterator = controller.release_after(controller.acquire("upload"), iter(["a", "b"]))
+        iterator.close()  # Клиент отключился, не начав читать
+        exhausted = controller.release_after(controller.acquire("upload"), iter(["a", "b"]))
+        self.assertEqual(list(exhausted), ["a", "b"])
+
+        self.assertEqual(controller.snapshot()["upload"]["active"], 0)
+
+    def test_async_streaming_iterator_releases(self):
+        controller = self.make_controller(max_queue=0)
+
+        async def chunks():
+            yield "a"
+            yield "b"
+
+        async def read(iterator):
+            return [chunk async for chunk in iterator]
+
+        iterator = controller.release_after(controller.acquire("upload"), chunks())
+        iterator.close()  # Клиент отключился, не начав читать
+        exhausted = controller.release_after(controller.acquire("upload"), chunks())
+        self.assertEqual(async_to_sync(read)(exhausted), ["a", "b"])
+
+        self.assertEqual(controller.snapshot()["upload"]["active"], 0)
+
+
+class UploadAdmissionTests(TestCase):
+    def setUp(self):
+        CustomUser.objects.create_user(username='testuser', password='12345')
+        self.client.login(username='testuser', password='12345')
+        self.url = reverse('file_creator:file-creator-start')
+
+    def test_upload_is_rejected_when_saturated(self):
+        controller = AdmissionController({"upload": AdmissionLimits(1, 0, 1.0)})
+        ticket = controller.acquire("upload")
+        self.addCleanup(ticket.release)
+
+        with patch('file_creator.views.admission_controller', controller), \
+                patch('file_creator.views.iter_parsed_documents') as mock_iter_parsed:
+            response = self.client.post(
+                self.url, {'start_number': '1', 'files': SimpleUploadedFile("a.docx", b"data")}
+            )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        mock_iter_parsed.assert_not_called()
+
+    def test_admission_stats(self):
+        response = self.client.get(reverse('statistics_app:admission_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), dict)
@@ -1,10 +1,19 @@
 import os
+import shutil
 import tempfile
+import time
 import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from docx import Document as DocxDocument
 from spire.doc import Document, FileFormat
 
+from file_creator.utils.custom_converter import converter_to_docx
 from file_creator.utils.custom_converter.converter_to_docx import Converter
 
+TEST_FILES = Path(__file__).resolve().parents[3] / "test_files"
+
 
 class TestConverter(unittest.TestCase):
     def setUp(self):
@@ -67,3 +76,69 @@ class TestConverter(unittest.TestCase):
         # Дополнительно можно проверить, что файл .docx имеет ненулевой размер
         self.assertGreater(os.path.getsize(expected_docx_doc), 0)
         self.assertGreater(os.path.getsize(expected_docx_rtf), 0)
+
+
+_convert_to_docx = converter_to_docx.convert_to_docx
+
+
+def _slow_convert(source_path: str, target_path: str) -> str:
+    """Имитирует зависшую конвертацию для проверки таймаута."""
+    if source_path.endswith(".doc"):
+        time.sleep(30)
+    return _convert_to_docx(source_path, target_path)
+
+
+class TestParallelConverter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for name in ("example.doc", "example2.rtf", "example4.doc"):
+            shutil.copy(TEST_FILES / name, self.temp_dir.name)
+        with open(os.path.join(self.temp_dir.name, "broken.rtf"), "wb") as f:
+            f.write(b"\x00\x01 not a document")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parallel_conversion_reports_errors_per_file(self):
+        converter = Converter(self.temp_dir.name, max_workers=2)
+        converted = converter.convert_files()
+
+        self.assertCountEqual(
+            [os.path.basename(path) for path in converted],
+            ["example.docx", "example2.docx", "example4.docx"],
+        )
+        self.assertEqual(list(converter.errors), ["broken.rtf"])
+        for path in converted:
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_timeout_fails_only_slow_files(self):
+        os.remove(os.path.join(self.temp_dir.name, "broken.rtf"))
+        with patch.object(converter_to_docx, "convert_to_docx", _slow_convert):
+            converter = Converter(self.temp_dir.name, max_workers=2, timeout=5)
+            started = time.monotonic()
+            converted = converter.convert_files()
+
+        self.assertLess(time.monotonic() - started, 25)
+        self.assertEqual([os.path.basename(path) for path in converted], ["example2.docx"])
+        self.assertCountEqual(converter.errors, ["example.doc", "example4.doc"])
+
+
+class TestInMemoryConverter(unittest.TestCase):
+    def test_convert_in_memory_skips_docx(self):
+        doc_data = (TEST_FILES / "example.doc").read_bytes()
+        docx_data = b"already docx"
+
+        converter = Converter(max_workers=1)
+        streams = converter.convert_in_memory({"1_example.doc": doc_data, "2_ready.docx": docx_data})
+
+        self.assertEqual(list(streams), ["1_example.doc", "2_ready.docx"])
+        self.assertEqual(streams["2_ready.docx"].read(), docx_data)
+        self.assertGreater(len(DocxDocument(streams["1_example.doc"]).paragraphs), 0)
+        self.assertEqual(converter.errors, {})
+
+    def test_convert_in_memory_reports_broken_file(self):
+        converter = Converter(max_workers=1)
+        streams = converter.convert_in_memory({"broken.rtf": b"\x00\x01 not a document"})
+
+        self.assertEqual(streams, {})
+        self.assertEqual(list(converter.errors), ["broken.rtf"])
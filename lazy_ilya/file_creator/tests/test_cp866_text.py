@@ -0,0 +1,38 @@
+import unittest
+
+from file_creator.utils.parser_word.cp866_text import TRANSLITERATION, to_cp866_text
+from file_creator.utils.parser_word.my_parser import replace_unsupported_characters
+
+
+def can_encode(char: str) -> bool:
+    try:
+        char.encode("cp866")
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+class TestCp866Text(unittest.TestCase):
+    def test_matches_per_character_check(self):
+        text = "Привет, мир! «Ёлка» — 5€ № 7 ☺ 中文 \t\n"
+        expected = "".join(char if can_encode(char) else "?" for char in text)
+        self.assertEqual(replace_unsupported_characters(text), expected)
+
+    def test_custom_replacement(self):
+        self.assertEqual(to_cp866_text("a☺b中", replacement="*"), "a*b*")
+
+    def test_transliteration(self):
+        self.assertEqual(
+            to_cp866_text("«Цитата» — “quote” … 2×2 ☺", transliterate=True),
+            '"Цитата" - "quote" ... 2x2 ?',
+        )
+        self.assertEqual(to_cp866_text("пере­нос", transliterate=True), "перенос")
+
+    def test_transliteration_values_are_cp866(self):
+        for source, target in TRANSLITERATION.items():
+            with self.subTest(source=source):
+                target.encode("cp866")
+
+    def test_unsupported_replacement(self):
+        with self.assertRaises(ValueError):
+            to_cp866_text("☺", replacement="☻")
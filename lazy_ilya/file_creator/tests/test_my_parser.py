@@ -2,9 +2,12 @@ import os
 import shutil
 import tempfile
 import unittest
+from unittest.mock import patch
+
 from docx import Document as DocxDocument
 
-from file_creator.utils.parser_word.my_parser import Parser
+from file_creator.utils.custom_converter.worker_pool import ConverterPool
+from file_creator.utils.parser_word.my_parser import Parser, warm_up_parser
 
 
 class TestParser(unittest.TestCase):
@@ -68,3 +71,33 @@ class TestParser(unittest.TestCase):
         self.assertIn("ОСОБЫЙ ЗНАК", result[1].upper())
         self.assertIn("ЗАМЕСТИТЕЛЬ ДОЯРКИ", result[1].upper())
 
+
+    def test_all_files_limited_to_batch(self):
+        parser = Parser(self.test_dir, self.start_number, files=["test2.docx", "missing.docx", "test1.docx"])
+        self.assertEqual(parser.all_files(), ["test2.docx", "test1.docx"])
+
+    def test_create_from_streams(self):
+        with open(self.file1, "rb") as f1, open(self.file2, "rb") as f2:
+            streams = {"test1.docx": f1, "test2.docx": f2}
+            result = Parser(None, self.start_number).create_from_streams(streams)
+
+        self.assertEqual(result, Parser(self.test_dir, self.start_number).create_file_parsed())
+
+    def test_parallel_parsing_matches_serial_numbering(self):
+        for index in range(3, 7):
+            self._create_docx(os.path.join(self.test_dir, f"test{index}.docx"), [f"Документ {index}"], add_table=True)
+
+        pool = ConverterPool(size=2, warmup=warm_up_parser, title="разбора")
+        self.addCleanup(pool.shutdown)
+        serial = Parser(self.test_dir, self.start_number, max_workers=1)
+        parallel = Parser(self.test_dir, self.start_number, max_workers=2)
+        serial_result = serial.create_file_parsed()
+
+        with patch("file_creator.utils.parser_word.my_parser.parser_pool", pool):
+            self.assertEqual(parallel.create_file_parsed(), serial_result)
+        self.assertEqual(pool.counters()["tasks"], 6)
+        self.assertEqual(parallel.start_number, self.start_number + 6)
+        self.assertEqual(serial.start_number, parallel.start_number)
+        # Номера идут по отсортированным именам файлов
+        self.assertIn("Особый знак НР 105/П", serial_result[5])
+        self.assertIn("ДОКУМЕНТ 6", serial_result[5])
@@ -0,0 +1,120 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from docx import Document as DocxDocument
+
+from file_creator.utils.custom_converter.converter_to_docx import Converter
+from file_creator.utils.custom_converter.worker_pool import ConverterPool
+from file_creator.utils.parser_word.my_parser import warm_up_parser
+from file_creator.utils.parse_cache.cached_parsing import iter_parsed_documents
+from file_creator.utils.parse_cache.parse_cache import ParseResultCache, content_key
+
+TEST_FILES = Path(__file__).resolve().parents[3] / "test_files"
+
+
+def make_docx(text: str) -> bytes:
+    document = DocxDocument()
+    document.add_paragraph(text)
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "Особый знак"
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+class ParseResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ParseResultCache(Path(self.temp_dir.name), max_bytes=1024 * 1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_get_and_counters(self):
+        key = content_key(b"data")
+        self.assertIsNone(self.cache.get_template(key))
+        self.cache.put(key, docx=b"docx", template="шаблон")
+
+        self.assertEqual(self.cache.get_template(key), "шаблон")
+        self.assertEqual(self.cache.get_docx(key), b"docx")
+        self.assertEqual(self.cache.counters(), {"template_misses": 1, "template_hits": 1, "docx_hits": 1})
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseResultCache(Path(self.temp_dir.name), max_bytes=250)
+        old, used, new = (content_key(name.encode()) for name in ("old", "used", "new"))
+        cache.put(old, template="a" * 100)
+        cache.put(used, template="b" * 100)
+        past = time.time() - 100
+        os.utime(Path(self.temp_dir.name) / f"{old}.txt", (past, past))
+        os.utime(Path(self.temp_dir.name) / f"{used}.txt", (past + 1, past + 1))
+        cache.get_template(used)  # Обновляет время использования
+
+        cache.put(new, template="c" * 100)
+
+        self.assertIsNone(cache.get_template(old))
+        self.assertIsNotNone(cache.get_template(used))
+        self.assertIsNotNone(cache.get_template(new))
+        self.assertEqual(cache.counters()["evictions"], 1)
+
+    def test_disabled_cache(self):
+        cache = ParseResultCache(Path(self.temp_dir.name), max_bytes=0)
+        cache.put("key", template="шаблон")
+        self.assertIsNone(cache.get_template("key"))
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+
+class CachedParsingTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ParseResultCache(Path(self.temp_dir.name), max_bytes=10 * 1024 * 1024)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_repeated_upload_is_rendered_from_cache_with_new_number(self):
+        documents = {"1_letter.docx": make_docx("Просто абзац")}
+        first = list(iter_parsed_documents(documents, 10, cache=self.cache))
+        second = list(iter_parsed_documents(documents, 42, cache=self.cache))
+
+        self.assertFalse(first[0].cached)
+        self.assertTrue(second[0].cached)
+        self.assertIn("Особый знак НР 10/П", first[0].content)
+        self.assertEqual(second[0].content, first[0].content.replace("НР 10/П", "НР 42/П"))
+
+    def test_cached_docx_skips_conversion(self):
+        documents = {"1_example.doc": (TEST_FILES / "example.doc").read_bytes()}
+        first = list(iter_parsed_documents(documents, 1, Converter(max_workers=1), cache=self.cache))
+        # Шаблон потерян (например, после смены версии Parser), а .docx остался
+        for path in Path(self.temp_dir.name).glob("*.txt"):
+            path.unlink()
+        converter = MagicMock(spec=Converter)
+        converter.iter_in_memory.return_value = iter([])
+
+        second = list(iter_parsed_documents(documents, 1, converter, cache=self.cache))
+
+        converter.iter_in_memory.assert_called_once_with({})
+        self.assertEqual(second[0].content, first[0].content)
+        self.assertEqual(self.cache.counters()["docx_hits"], 1)
+
+    def test_documents_are_parsed_in_shared_pool(self):
+        documents = {f"{num}_letter.docx": make_docx(f"Письмо {num}") for num in range(3)}
+        documents["3_example.rtf"] = (TEST_FILES / "example2.rtf").read_bytes()
+        no_cache = ParseResultCache(Path(self.temp_dir.name), max_bytes=0)
+        serial = sorted(iter_parsed_documents(documents, 5, MagicMock(spec=Converter), cache=no_cache))
+
+        pool = ConverterPool(size=2, warmup=warm_up_parser, title="разбора")
+        self.addCleanup(pool.shutdown)
+        with patch("file_creator.utils.parser_word.my_parser.parser_pool", pool):
+            first = sorted(iter_parsed_documents(documents, 5, MagicMock(spec=Converter), cache=no_cache))
+            pids = {worker.process.pid for worker in pool._workers}
+            second = sorted(iter_parsed_documents(documents, 5, MagicMock(spec=Converter), cache=no_cache))
+
+        self.assertEqual(first, serial)
+        self.assertEqual(second, serial)
+        # Процессы пула переиспользуются между загрузками, а не запускаются заново
+        self.assertEqual({worker.process.pid for worker in pool._workers}, pids)
+        self.assertEqual(pool.counters()["tasks"], 8)
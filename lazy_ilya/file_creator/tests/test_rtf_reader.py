@@ -0,0 +1,72 @@
+import datetime
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from file_creator.utils.custom_converter.converter_to_docx import Converter
+from file_creator.utils.parse_cache.cached_parsing import iter_parsed_documents
+from file_creator.utils.parse_cache.parse_cache import ParseResultCache
+from file_creator.utils.parser_word import my_parser
+from file_creator.utils.parser_word.rtf_reader import read_rtf
+
+TEST_FILES = Path(__file__).resolve().parents[3] / "test_files"
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+SAMPLE = (
+    rb"{\rtf1\ansi\ansicpg1251\uc1\deff0{\fonttbl{\f0\fcharset204 Times New Roman;}{\f1\fcharset0 Arial;}}"
+    rb"{\colortbl;\red0\green0\blue0;}{\stylesheet{\s0 Normal;}}{\info{\title \'cd\'e5 \'f2\'e5\'ea\'f1\'f2}}"
+    rb"{\header \pard\plain \'ee\'e1\'fb\'f7\'ed\'fb\'e9\par}"
+    rb"{\headerf \trowd\cellx100\pard\intbl \'c8\'e7:\cell \'e3. \'cc\'ee\'f1\'ea\'e2\'e0\cell\row}"
+    rb"{\footer \pard \'ed\'e8\'e7\par}"
+    rb"\pard\plain \'cf\'f0\'e8\'e2\'e5\'f2, {\b \u1084?\u1080?\u1088?}!\tab{\*\bkmkstart x}\'e0\line\'e1\par"
+    rb"{\listtext 1.\tab}\pard \uc2\u8212\'97\'97 \'e2\~\'e3\par"
+    rb"\trowd\cellx100\cellx200\pard\intbl \'ee\'e4\'e8\'ed\par \'e4\'e2\'e0\cell \'f2\'f0\'e8\cell\row"
+    rb"\pard {\f1 \'e9}\par}"
+)
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 2, 3, 4, 5)
+
+
+class TestReadRtf(unittest.TestCase):
+    def test_reads_paragraphs_tables_and_headers(self):
+        content = read_rtf(SAMPLE)
+
+        self.assertEqual(content.body, [
+            "Привет, мир!\tа\nб",
+            "— в\xa0г",
+            [["один\nдва", "три"]],
+            "\xe9",
+        ])
+        self.assertEqual(content.header, [])  # Колонтитул без таблиц
+        self.assertEqual(content.first_page_header, [[["Из:", "г. Москва"]]])
+
+    def test_rejects_non_rtf(self):
+        with self.assertRaises(ValueError):
+            read_rtf(b"\x00\x01 not a document")
+
+    def test_test_files_match_golden_output(self):
+        names = sorted(path.name for path in TEST_FILES.iterdir() if path.suffix in (".doc", ".rtf"))
+        parser = my_parser.Parser(None, 100)
+        with patch.object(my_parser.datetime, "datetime", FrozenDatetime):
+            for index, name in enumerate(names):
+                if not name.endswith(".rtf"):
+                    continue
+                with self.subTest(name=name):
+                    template = parser.rtf_template((TEST_FILES / name).read_bytes())
+                    golden = (GOLDEN_DIR / f"{Path(name).stem}.txt").read_text(encoding="utf-8")
+                    self.assertEqual(parser.render(template, 100 + index), golden)
+
+    def test_rtf_upload_is_not_converted(self):
+        converter = MagicMock(spec=Converter)
+        converter.iter_in_memory.return_value = iter([])
+        documents = {"1_example2.rtf": (TEST_FILES / "example2.rtf").read_bytes()}
+
+        result = list(iter_parsed_documents(documents, 7, converter, cache=ParseResultCache(max_bytes=0)))
+
+        converter.iter_in_memory.assert_called_once_with({})
+        self.assertIsNone(result[0].error)
+        self.assertIn("Особый знак НР 7/П", result[0].content)
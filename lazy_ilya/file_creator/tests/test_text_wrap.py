@@ -0,0 +1,88 @@
+import datetime
+import random
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from file_creator.utils.custom_converter.converter_to_docx import Converter
+from file_creator.utils.parser_word import my_parser
+from file_creator.utils.parser_word.text_wrap import TextWrapper
+
+TEST_FILES = Path(__file__).resolve().parents[3] / "test_files"
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+
+def legacy_format_text(text: str, max_length: int = 60) -> str:
+    """Прежняя реализация Parser.format_text — эталон для сравнения."""
+    formatted_lines, current_line = [], []
+    for word in text.split():
+        if len(" ".join(current_line + [word])) <= max_length:
+            current_line.append(word)
+        else:
+            formatted_lines.append(" ".join(current_line))
+            current_line = [word]
+    if current_line:
+        formatted_lines.append(" ".join(current_line))
+    return "\n".join(formatted_lines)
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 1, 2, 3, 4, 5)
+
+
+class TestTextWrapper(unittest.TestCase):
+    def test_matches_legacy_format_text(self):
+        rnd = random.Random(7)
+        words = ["а", "слово", "ДЛИННОЕСЛОВО" * 6, "x" * 60, "y" * 61, "Москва,", "—"]
+        for width in (1, 5, 20, 60):
+            wrapper = TextWrapper(width)
+            for _ in range(200):
+                text = (" " if rnd.random() < 0.5 else "\n ").join(
+                    rnd.choice(words) for _ in range(rnd.randint(0, 30))
+                )
+                self.assertEqual(wrapper.wrap(text), legacy_format_text(text, width))
+
+    def test_break_long_words(self):
+        wrapper = TextWrapper(5, break_long_words=True)
+        self.assertEqual(wrapper.wrap("abcdefghijkl mn"), "abcde\nfghij\nkl mn")
+
+    def test_wrap_many_keeps_order(self):
+        wrapper = TextWrapper(3)
+        self.assertEqual(wrapper.wrap_many(["a b c", "", "dd"]), ["a b\nc", "", "dd"])
+
+    def test_invalid_width(self):
+        with self.assertRaises(ValueError):
+            TextWrapper(0)
+
+
+class TestParserWrapsSavedText(unittest.TestCase):
+    def test_transliterated_lines_fit_width(self):
+        # "…", "±", "≠" при сохранении заменяются несколькими символами
+        paragraph = " ".join(["Слово…", "±5", "a≠b", "«кавычки»"] * 20)
+        parser = my_parser.Parser(None, 1)
+        with patch.object(my_parser.ProjectSettings, "cp866_transliterate", True):
+            template = parser.build_template([], [paragraph])
+            saved = my_parser.replace_unsupported_characters(template, transliterate=True)
+
+        self.assertEqual(saved, template)
+        body = template.split("Содержимое документа:\n\n", 1)[1]
+        self.assertLessEqual(max(len(line) for line in body.splitlines()), my_parser.DEFAULT_WIDTH)
+        self.assertIn("СЛОВО...", body)
+
+
+class TestGoldenOutput(unittest.TestCase):
+    def test_test_files_output_is_unchanged(self):
+        names = sorted(path.name for path in TEST_FILES.iterdir() if path.suffix in (".doc", ".rtf"))
+        streams = Converter(max_workers=1).convert_in_memory(
+            {name: (TEST_FILES / name).read_bytes() for name in names}
+        )
+        with patch.object(my_parser.datetime, "datetime", FrozenDatetime):
+            content = my_parser.Parser(None, 100).create_from_streams(streams)
+
+        self.assertEqual(len(content), len(names))
+        for name, text in zip(names, content):
+            with self.subTest(name=name):
+                golden = (GOLDEN_DIR / f"{Path(name).stem}.txt").read_text(encoding="utf-8")
+                self.assertEqual(text, golden)
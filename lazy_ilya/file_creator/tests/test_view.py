@@ -1,14 +1,31 @@
+import io
 import json
+import os
 import tempfile
+import threading
 from unittest.mock import MagicMock, patch, mock_open
 
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from asgiref.testing import ApplicationCommunicator
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from docx import Document as DocxDocument
+from django.test import TestCase, TransactionTestCase
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
 from django.urls import reverse
 
 from file_creator.models import Counter
+from file_creator.utils.parse_cache.cached_parsing import ParsedDocument
 from myauth.models import CustomUser  # замените на свой путь, если отличается
 
 
+def read_stream(response) -> bytes:
+    """Дочитывает асинхронное содержимое потокового ответа."""
+    async def read() -> bytes:
+        return b"".join([chunk async for chunk in response.streaming_content])
+    return async_to_sync(read)()
+
+
 class UploadViewTests(TestCase):
     def setUp(self):
         self.user = CustomUser.objects.create_user(username='testuser', password='12345')
@@ -39,20 +56,15 @@ class UploadViewTests(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertJSONEqual(response.content, {'error': 'Номер документа должен быть больше нуля'})
 
-    @patch('file_creator.views.Converter')
-    @patch('file_creator.views.Parser')
-    @patch('file_creator.views.os')
-    @patch('file_creator.views.OverwritingFileSystemStorage')
-    def test_post_success(self, mock_storage, mock_os, mock_parser, mock_converter):
+    @patch('file_creator.views.iter_parsed_documents')
+    def test_post_success(self, mock_iter_parsed):
         # Настройка моков
-        mock_storage.return_value.save.side_effect = ['first.docx', 'second.docx']
         str1=b'data1'
         str2 = b'data2'
-        mock_parser.return_value.create_file_parsed.return_value = [f"Содержимое документа 1 {str1}", f"Содержимое документа 2 {str2}"]
-        mock_os.listdir.return_value = ['first.docx', 'second.docx']
-        mock_os.path.isfile.return_value = True
-        mock_os.path.join.side_effect = lambda a, b: f"{a}/{b}"
-        mock_os.path.splitext.side_effect = lambda x: ('d'+x.rsplit('.', 1)[0], '.txt')
+        mock_iter_parsed.return_value = [
+            ParsedDocument(1, "2_second.docx", f"Содержимое документа 2 {str2}"),
+            ParsedDocument(0, "1_first.docx", f"Содержимое документа 1 {str1}"),
+        ]
 
         # Создание двух временных файлов
         with tempfile.NamedTemporaryFile(suffix=".docx") as tmp1, \
@@ -78,7 +90,59 @@ class UploadViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         data = json.loads(response.content)
         self.assertIn('new_files', data)
-        self.assertEqual(data['new_files'], ['1_first.txt', '2_second.txt'])
+        self.assertEqual(data['new_files'], ['1__first.txt', '2__second.txt'])
+        self.assertEqual(data['content'], ["Содержимое документа 1 b'data1'", "Содержимое документа 2 b'data2'"])
+
+    @patch('file_creator.views.iter_parsed_documents')
+    def test_post_processes_batch_in_memory(self, mock_iter_parsed):
+        mock_iter_parsed.return_value = [
+            ParsedDocument(1, "2_broken.rtf", None, "SpireException: ошибка"),
+            ParsedDocument(0, "1_first_doc.doc", "Содержимое"),
+        ]
+
+        with tempfile.TemporaryDirectory() as tlg_dir:
+            uploads = [SimpleUploadedFile("first doc.doc", b"data"), SimpleUploadedFile("broken.rtf", b"bad")]
+            with patch('file_creator.views.ProjectSettings.tlg_dir', tlg_dir):
+                response = self.client.post(self.url, {'start_number': '5', 'files': uploads})
+            self.assertEqual(os.listdir(tlg_dir), [])
+
+        self.assertEqual(response.status_code, 200)
+        mock_iter_parsed.assert_called_once_with({"1_first_doc.doc": b"data", "2_broken.rtf": b"bad"}, 5)
+        self.assertEqual(json.loads(response.content), {
+            "content": ["Содержимое"],
+            "new_files": ["5__first_doc.txt"],
+            "errors": {"2_broken.rtf": "SpireException: ошибка"},
+        })
+
+    def test_post_streams_ndjson_per_file(self):
+        document = DocxDocument()
+        document.add_paragraph("Просто абзац")
+        document.add_table(rows=1, cols=1).cell(0, 0).text = "Особый знак"
+        docx_data = io.BytesIO()
+        document.save(docx_data)
+        uploads = [
+            SimpleUploadedFile("broken.rtf", b"\x00\x01 not a document"),
+            SimpleUploadedFile("letter.docx", docx_data.getvalue()),
+        ]
+
+        with patch('file_creator.views.ProjectSettings.converter_workers', 1), \
+                patch('file_creator.views.ProjectSettings.parse_cache_max_bytes', 0):
+            response = self.client.post(
+                self.url, {'start_number': '10', 'files': uploads}, HTTP_ACCEPT='application/x-ndjson'
+            )
+            lines = [json.loads(line) for line in read_stream(response).splitlines()]
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        # .rtf разбирается без конвертации и приходит первым
+        self.assertEqual([line.get("file") for line in lines], ["1_broken.rtf", "2_letter.docx", None])
+        self.assertIn("error", lines[0])
+        self.assertEqual(lines[1]["index"], 1)
+        self.assertEqual(lines[1]["new_file"], "11__letter.txt")
+        self.assertIn("Особый знак НР 11/П", lines[1]["content"])
+        self.assertIn("ПРОСТО АБЗАЦ", lines[1]["content"])
+        self.assertIn("seconds", lines[1])
+        self.assertFalse(lines[1]["cached"])
+        self.assertEqual(lines[2], {"done": True, "total": 2})
 
     def test_put_invalid_json(self):
         response = self.client.put(
@@ -89,7 +153,7 @@ class UploadViewTests(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertJSONEqual(response.content, {'error': 'Неверный формат данных. - JSONDecodeError'})
 
-    @patch('file_creator.views.replace_unsupported_characters', lambda s: s)
+    @patch('file_creator.views.replace_unsupported_characters', lambda s, **kwargs: s)
     @patch('file_creator.views.open', new_callable=mock_open)
     @patch('file_creator.views.Counter.objects.create')
     def test_put_success(self, mock_create, mock_open):
@@ -114,3 +178,72 @@ class UploadViewTests(TestCase):
             'status': 'success',
             'message': 'Все файлы успешно сохранены.'
         })
+
+
+class UploadStreamingASGITests(TransactionTestCase):
+    """Потоковый ответ через ASGI-обработчик Django, как под daphne: представление выполняется в другом потоке."""
+
+    def setUp(self):
+        CustomUser.objects.create_user(username='testuser', password='12345')
+        self.client.login(username='testuser', password='12345')
+        self.url = reverse('file_creator:file-creator-start')
+        # Страница формы выставляет cookie csrftoken: ASGI-обработчик, в отличие от тестового клиента, проверяет CSRF
+        self.client.get(self.url)
+
+    def test_post_stream_is_sent_before_last_file_is_processed(self):
+        last_file = threading.Event()
+
+        def parse_slowly(documents, start_number):
+            yield ParsedDocument(0, "1_first.docx", "Первый")
+            # Второй файл обрабатывается только после того, как клиент получил первую строку
+            if not last_file.wait(timeout=5):
+                raise TimeoutError("первая строка не отправлена до обработки последнего файла")
+            yield ParsedDocument(1, "2_second.docx", "Второй")
+
+        body = encode_multipart(BOUNDARY, {
+            'start_number': '1',
+            'files': [SimpleUploadedFile("first.docx", b"1"), SimpleUploadedFile("second.docx", b"2")],
+        })
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": self.url,
+            "raw_path": self.url.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"accept", b"application/x-ndjson"),
+                (b"x-csrftoken", self.client.cookies["csrftoken"].value.encode()),
+                (b"content-type", MULTIPART_CONTENT.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"cookie", self.client.cookies.output(header="", sep=";").strip().encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def request():
+            communicator = ApplicationCommunicator(ASGIHandler(), scope)
+            await communicator.send_input({"type": "http.request", "body": body, "more_body": False})
+            start = await communicator.receive_output(timeout=5)
+            first = await communicator.receive_output(timeout=5)
+            first_sent_early = not last_file.is_set()
+            last_file.set()
+            chunks = [first]
+            while chunks[-1].get("more_body"):
+                chunks.append(await communicator.receive_output(timeout=5))
+            await communicator.wait(timeout=5)
+            return start, first_sent_early, b"".join(chunk.get("body", b"") for chunk in chunks)
+
+        with patch('file_creator.views.iter_parsed_documents', parse_slowly):
+            start, first_sent_early, content = async_to_sync(request)()
+
+        self.assertEqual(start["status"], 200)
+        self.assertTrue(first_sent_early)
+        lines = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(lines[0]["content"], "Первый")
+        self.assertEqual([line.get("file") for line in lines], ["1_first.docx", "2_second.docx", None])
@@ -0,0 +1,98 @@
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from file_creator.utils.custom_converter.worker_pool import (
+    ConverterPool, PoolClosedError, WorkerCrashedError, current_rss, peak_rss,
+)
+
+
+class TestConverterPool(unittest.TestCase):
+    def make_pool(self, **kwargs) -> ConverterPool:
+        pool = ConverterPool(**{"size": 1, "max_tasks": 0, "max_rss_bytes": 0, **kwargs})
+        self.addCleanup(pool.shutdown)
+        return pool
+
+    def test_runs_in_separate_long_lived_process(self):
+        pool = self.make_pool()
+        pids = {pool.run(os.getpid, (), timeout=30) for _ in range(3)}
+
+        self.assertEqual(len(pids), 1)
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(pool.counters(), {"tasks": 3})
+
+    def test_recycles_after_max_tasks(self):
+        pool = self.make_pool(max_tasks=2)
+        pids = [pool.run(os.getpid, (), timeout=30) for _ in range(3)]
+
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(pool.counters()["recycled"], 1)
+
+    @unittest.skipIf(current_rss() is None, "RSS недоступен на этой платформе")
+    def test_recycles_after_memory_limit(self):
+        pool = self.make_pool(max_rss_bytes=1)
+        first = pool.run(os.getpid, (), timeout=30)
+        second = pool.run(os.getpid, (), timeout=30)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(pool.counters()["recycled"], 2)
+
+    @unittest.skipIf(peak_rss() is None, "Пиковый RSS недоступен на этой платформе")
+    def test_peak_rss_is_not_below_current(self):
+        self.assertGreaterEqual(peak_rss(), current_rss())
+
+    def test_timeout_kills_stuck_worker(self):
+        pool = self.make_pool()
+        pid = pool.run(os.getpid, (), timeout=30)
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            pool.run(time.sleep, (30,), timeout=1)
+
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertNotEqual(pool.run(os.getpid, (), timeout=30), pid)
+        self.assertEqual(pool.counters()["timeouts"], 1)
+
+    def test_crashed_worker_is_replaced(self):
+        pool = self.make_pool()
+        with self.assertRaises(WorkerCrashedError):
+            pool.run(os._exit, (3,), timeout=30)
+        self.assertIsInstance(pool.run(os.getpid, (), timeout=30), int)
+
+    def test_function_errors_are_raised_in_caller(self):
+        pool = self.make_pool()
+        with self.assertRaises(ValueError):
+            pool.run(int, ("не число",), timeout=30)
+
+        results = list(pool.imap_unordered(int, [("a", ("1",)), ("b", ("x",))], timeout=30))
+        self.assertEqual(sorted((name, value) for name, value, _ in results), [("a", 1), ("b", None)])
+        self.assertIsInstance(dict((name, error) for name, _, error in results)["b"], ValueError)
+
+    def test_counters_from_concurrent_tasks(self):
+        pool = self.make_pool(size=2)
+        tasks = [(str(number), ()) for number in range(20)]
+
+        self.assertEqual(len(list(pool.imap_unordered(os.getpid, tasks, timeout=30))), 20)
+        self.assertEqual(pool.counters(), {"tasks": 20})
+
+    def test_shutdown_wakes_tasks_waiting_for_worker(self):
+        pool = self.make_pool()
+        pool.run(os.getpid, (), timeout=30)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            busy = executor.submit(pool.run, time.sleep, (1,), 30)
+            while pool._idle.qsize():  # Единственный процесс занят
+                time.sleep(0.01)
+            waiting = executor.submit(pool.run, os.getpid, (), 30)
+            time.sleep(0.1)
+            self.assertFalse(waiting.done())
+
+            pool.shutdown()
+            with self.assertRaises(PoolClosedError):
+                waiting.result(timeout=10)
+            busy.result(timeout=30)
+
+        # После остановки пул снова запускается при следующей задаче
+        self.assertIsInstance(pool.run(os.getpid, (), timeout=30), int)
@@ -1,59 +1,240 @@
+import io
 import os
-from typing import List
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 
-from spire.doc import Document, FileFormat
+from file_creator.utils.custom_converter.worker_pool import ConverterPool, Task
 from lazy_ilya.utils.settings_for_app import logger,ProjectSettings
 
+# Формат исходного файла для загрузки из потока (имя члена spire.doc.FileFormat).
+# Spire.Doc импортируется только в процессах конвертации, не в веб-процессе
+STREAM_FORMATS = {".doc": "Doc", ".rtf": "Rtf"}
+
+
+def convert_to_docx(source_path: str, target_path: str) -> str:
+    """
+    Конвертирует один файл в .docx через Spire.Doc.
+
+    Функция верхнего уровня, чтобы её можно было выполнять в дочернем процессе.
+
+    Args:
+        source_path (str): Путь к исходному файлу (.doc, .rtf).
+        target_path (str): Путь к создаваемому файлу .docx.
+
+    Returns:
+        str: Путь к созданному файлу .docx.
+    """
+    from spire.doc import Document, FileFormat
+
+    document = Document()
+    document.LoadFromFile(source_path)
+    document.SaveToFile(target_path, FileFormat.Docx)
+    document.Close()
+    return target_path
+
+
+def convert_bytes_to_docx(data: bytes, file_name: str) -> bytes:
+    """
+    Конвертирует содержимое файла (.doc, .rtf) в .docx в памяти, без записи на диск.
+
+    Формат берётся по расширению, как при LoadFromFile: с FileFormat.Auto
+    Spire.Doc читает повреждённый файл как обычный текст вместо ошибки.
+
+    Args:
+        data (bytes): Содержимое исходного файла.
+        file_name (str): Имя исходного файла.
+
+    Returns:
+        bytes: Содержимое файла .docx.
+    """
+    from spire.doc import Document, FileFormat, Stream
+
+    file_format = getattr(FileFormat, STREAM_FORMATS.get(os.path.splitext(file_name)[1].lower(), "Auto"))
+    document = Document()
+    document.LoadFromStream(Stream(data), file_format)
+    output = Stream()
+    document.SaveToStream(output, FileFormat.Docx)
+    document.Close()
+    return bytes(output.ToArray())
+
+
+def warm_up() -> None:
+    """
+    Загружает Spire.Doc и выполняет пробную конвертацию .doc -> .docx.
+
+    Выполняется в каждом новом процессе пула, чтобы первая загрузка пользователя
+    не ждала инициализации Spire.Doc.
+    """
+    from spire.doc import Document, FileFormat, Stream
+
+    document = Document()
+    document.AddSection().AddParagraph().AppendText("Прогрев")
+    doc_data = Stream()
+    document.SaveToStream(doc_data, FileFormat.Doc)
+    document.Close()
+    convert_bytes_to_docx(bytes(doc_data.ToArray()), "warmup.doc")
+
+
+# Общий пул процессов конвертации веб-приложения
+converter_pool = ConverterPool(warmup=warm_up)
+
+
 class Converter:
     """
     Конвертирует файлы из форматов .rtf и .doc в .docx.
 
     Attributes:
         dir (str): Путь к директории, содержащей файлы для конвертации.
+        max_workers (int): Количество процессов для конвертации.
+        timeout (float): Время на конвертацию одного файла, в секундах.
+        files (Optional[List[str]]): Имена файлов пакета; если не заданы, обрабатывается вся директория.
+        pool (ConverterPool): Процессы, в которых выполняется конвертация.
+        errors (Dict[str, str]): Ошибки последнего вызова convert_files: имя файла -> текст ошибки.
     """
 
-    def __init__(self, directory: str):
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        files: Optional[List[str]] = None,
+        pool: Optional[ConverterPool] = None,
+    ):
         """
         Инициализирует экземпляр класса Converter.
 
         Args:
-            directory (str): Путь к директории для обработки файлов.
+            directory (Optional[str]): Путь к директории для обработки файлов; не нужен для convert_in_memory.
+            max_workers (Optional[int]): Сколько файлов пакета конвертировать одновременно (не больше
+                процессов пула), по умолчанию ProjectSettings.converter_workers.
+            timeout (Optional[float]): Время на один файл, по умолчанию ProjectSettings.converter_timeout.
+            files (Optional[List[str]]): Имена файлов пакета внутри directory.
+            pool (Optional[ConverterPool]): Пул процессов, по умолчанию общий converter_pool.
         """
         self.dir = directory
+        self.files: Optional[List[str]] = files
+        self.max_workers: int = max(1, max_workers or ProjectSettings.converter_workers)
+        self.timeout: float = timeout or ProjectSettings.converter_timeout
+        self.pool: ConverterPool = pool or converter_pool
+        self.errors: Dict[str, str] = {}
 
     def all_files(self) -> List[str]:
         """
-        Получает список файлов в директории для обработки.
+        Получает список файлов для обработки.
+
+        Если передан список файлов пакета, директория не просматривается.
 
         Returns:
             list[str]: Список имен файлов, которые будут конвертированы,
             исключая файлы с расширениями .txt и .docx.
         """
+        candidates = self.files if self.files is not None else os.listdir(self.dir)
         files = [
             file
-            for file in os.listdir(self.dir)
+            for file in candidates
             if os.path.isfile(os.path.join(self.dir, file))
                and not file.endswith((".txt", ".docx"))
         ]
         return files
 
+    def _tasks(self) -> List[Task]:
+        """Возвращает (имя файла, (исходный путь, путь к .docx)) для каждого файла на конвертацию."""
+        return [
+            (
+                file_name,
+                (
+                    os.path.join(self.dir, file_name),
+                    os.path.join(self.dir, f"{os.path.splitext(file_name)[0]}.docx"),
+                ),
+            )
+            for file_name in self.all_files()
+        ]
+
     def convert_files(self) -> List[str]:
         """
         Конвертирует файлы в формат .docx.
 
+        Файлы конвертируются в процессах пула, до max_workers одновременно.
+        Ошибка или превышение таймаута по одному файлу не прерывают остальные:
+        такие файлы попадают в self.errors.
+
         Returns:
             list[str]: Список полных путей к новым .docx файлам после конвертации.
         """
-        out_list = []
-        for file_name in self.all_files():
-            n_name = os.path.splitext(file_name)[0]
-            new_file_name = os.path.join(self.dir, f"{n_name}.docx")
-            document = Document()
-            document.LoadFromFile(os.path.join(self.dir, file_name))
-            document.SaveToFile(new_file_name, FileFormat.Docx)
-            out_list.append(new_file_name)
+        self.errors = {}
+        tasks = self._tasks()
+        results = self._run(convert_to_docx, tasks)
+        return [results[file_name] for file_name, _ in tasks if file_name in results]
+
+    def convert_in_memory(self, documents: Dict[str, bytes]) -> Dict[str, BinaryIO]:
+        """
+        Конвертирует документы в .docx, не записывая файлы на диск.
+
+        Файлы .docx не конвертируются и передаются как есть. Остальные
+        конвертируются так же, как в convert_files (в том числе параллельно
+        и с таймаутом), ошибки попадают в self.errors.
+
+        Args:
+            documents (Dict[str, bytes]): Содержимое файлов по их именам.
+
+        Returns:
+            Dict[str, BinaryIO]: Потоки с содержимым .docx по исходным именам файлов,
+            в порядке documents, без файлов с ошибками.
+        """
+        results = dict(self.iter_in_memory(documents))
+        return {file_name: results[file_name] for file_name in documents if results.get(file_name) is not None}
+
+    def iter_in_memory(self, documents: Dict[str, bytes]) -> Iterator[Tuple[str, Optional[BinaryIO]]]:
+        """
+        Конвертирует документы в памяти и отдает каждый, как только он готов.
+
+        Сначала отдаются файлы .docx (их конвертировать не нужно), затем
+        остальные по мере конвертации. Для файла с ошибкой отдается None,
+        а текст ошибки записывается в self.errors.
+
+        Args:
+            documents (Dict[str, bytes]): Содержимое файлов по их именам.
+
+        Yields:
+            Tuple[str, Optional[BinaryIO]]: Имя файла и поток с содержимым .docx или None.
+        """
+        self.errors = {}
+        tasks: List[Task] = []
+        for file_name, data in documents.items():
+            if file_name.lower().endswith(".docx"):
+                yield file_name, io.BytesIO(data)
+            else:
+                tasks.append((file_name, (data, file_name)))
+        for file_name, result in self._iter_run(convert_bytes_to_docx, tasks):
+            yield file_name, None if result is None else io.BytesIO(result)
+
+    def _run(self, func: Callable[..., Any], tasks: List[Task]) -> Dict[str, Any]:
+        """Выполняет func для каждой задачи и возвращает результаты успешных задач по именам файлов."""
+        return {
+            file_name: result
+            for file_name, result in self._iter_run(func, tasks)
+            if result is not None
+        }
+
+    def _iter_run(self, func: Callable[..., Any], tasks: List[Task]) -> Iterator[Tuple[str, Any]]:
+        """
+        Выполняет func для каждой задачи в пуле процессов и отдает (имя файла, результат) по мере готовности.
+
+        Ошибка или превышение таймаута по одному файлу не прерывают остальные:
+        для такого файла отдается None, а ошибка попадает в self.errors. Зависший
+        процесс пул завершает и заменяет новым.
+        """
+        for file_name, result, error in self.pool.imap_unordered(func, tasks, self.timeout, self.max_workers):
+            if error is not None:
+                self._fail(file_name, error)
+                yield file_name, None
+                continue
             logger.bind(filename=file_name).info("Конвертирован файл - ")
-        return out_list
+            yield file_name, result
+
+    def _fail(self, file_name: str, error: Exception) -> None:
+        """Запоминает и логирует ошибку конвертации файла."""
+        self.errors[file_name] = f"{type(error).__name__}: {error}"
+        logger.bind(filename=file_name).error(f"Ошибка конвертации: {self.errors[file_name]}")
 
 
 if __name__ == "__main__":
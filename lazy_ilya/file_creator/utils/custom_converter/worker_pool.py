@@ -0,0 +1,384 @@
+import atexit
+import ctypes
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+# Задача: имя файла и аргументы функции
+Task = Tuple[str, tuple]
+
+
+class WorkerCrashedError(RuntimeError):
+    """Процесс конвертации завершился, не вернув результат."""
+
+
+class PoolClosedError(RuntimeError):
+    """Пул остановлен, пока задача ждала свободный процесс."""
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    """PROCESS_MEMORY_COUNTERS из psapi (Windows)."""
+    _fields_ = [
+        ("cb", ctypes.c_ulong),
+        ("PageFaultCount", ctypes.c_ulong),
+        ("PeakWorkingSetSize", ctypes.c_size_t),
+        ("WorkingSetSize", ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+        ("PagefileUsage", ctypes.c_size_t),
+        ("PeakPagefileUsage", ctypes.c_size_t),
+    ]
+
+
+def _windows_memory_counters() -> Optional[_ProcessMemoryCounters]:
+    """Счетчики памяти текущего процесса в Windows или None, если их не удалось получить."""
+    counters = _ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+
+def _proc_status_kb(field: str) -> Optional[int]:
+    """Значение поля /proc/self/status в килобайтах (Linux)."""
+    try:
+        with open("/proc/self/status") as status:
+            return next((int(line.split()[1]) for line in status if line.startswith(f"{field}:")), None)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def current_rss() -> Optional[int]:
+    """
+    Возвращает объем памяти текущего процесса (RSS) в байтах.
+
+    Returns:
+        Optional[int]: RSS или None, если на этой платформе его не узнать.
+    """
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.WorkingSetSize if counters is not None else None
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Возвращает пиковый объем памяти текущего процесса (RSS) в байтах.
+
+    Returns:
+        Optional[int]: Пиковый RSS (Windows — PeakWorkingSetSize, Linux — VmHWM)
+        или None, если на этой платформе его не узнать.
+    """
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.PeakWorkingSetSize if counters is not None else None
+    peak_kb = _proc_status_kb("VmHWM")
+    return peak_kb * 1024 if peak_kb is not None else None
+
+
+def _worker_main(connection: Connection, warmup: Optional[Callable[[], Any]]) -> None:
+    """
+    Цикл процесса конвертации: получает (функция, аргументы), возвращает результат.
+
+    Ответ — (успех, результат или исключение, RSS процесса после задачи).
+    None вместо задачи завершает процесс.
+
+    Args:
+        connection (Connection): Конец канала со стороны процесса.
+        warmup (Optional[Callable[[], Any]]): Прогрев перед первой задачей (загрузка Spire.Doc).
+    """
+    if warmup is not None:
+        try:
+            warmup()
+        except Exception as e:  # Без прогрева процесс всё равно может работать
+            logger.error(f"Ошибка прогрева процесса конвертации: {e}")
+    connection.send((True, None, current_rss()))
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        func, args = message
+        try:
+            reply = (True, func(*args), current_rss())
+        except Exception as e:
+            reply = (False, e, current_rss())
+        try:
+            connection.send(reply)
+        except Exception:  # Например, исключение Spire.Doc не сериализуется
+            connection.send((False, RuntimeError(f"{type(reply[1]).__name__}: {reply[1]}"), current_rss()))
+
+
+class _Worker:
+    """Дочерний процесс конвертации и канал к нему."""
+
+    def __init__(self, context: multiprocessing.context.BaseContext, warmup: Optional[Callable[[], Any]]) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, warmup), name="converter-worker", daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+        self.tasks_done = 0
+        self.rss: Optional[int] = None
+
+    def wait_ready(self, timeout: float) -> None:
+        """Ждет окончания прогрева процесса."""
+        if self.ready:
+            return
+        if not self.connection.poll(timeout):
+            raise TimeoutError(f"процесс конвертации не запустился за {timeout:g} с")
+        _, _, self.rss = self.connection.recv()
+        self.ready = True
+
+    def stop(self) -> None:
+        """Просит процесс завершиться, при необходимости завершает принудительно."""
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+    def kill(self) -> None:
+        """Принудительно завершает процесс."""
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class ConverterPool:
+    """
+    Пул долгоживущих процессов конвертации, изолированных от процесса Django.
+
+    Spire.Doc загружается и прогревается только в дочерних процессах, поэтому
+    память веб-процесса не растет, а первая загрузка не ждет инициализации Spire.Doc
+    (если пул запущен заранее через start). Задачи передаются процессу через Pipe.
+    Процесс, не уложившийся в таймаут, завершается принудительно и заменяется новым.
+    Процесс перезапускается после max_tasks задач или если его память (RSS) превысила
+    max_rss_bytes.
+
+    Attributes:
+        stats (Counter): Счетчики текущего процесса: tasks, timeouts, crashes, recycled;
+            изменяются под блокировкой пула, копию отдает counters.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_tasks: Optional[int] = None,
+        max_rss_bytes: Optional[int] = None,
+        warmup: Optional[Callable[[], Any]] = None,
+        title: str = "конвертации",
+    ) -> None:
+        """
+        Инициализирует пул; процессы запускаются в start или при первой задаче.
+
+        Args:
+            size (Optional[int]): Количество процессов, по умолчанию ProjectSettings.converter_workers.
+            max_tasks (Optional[int]): Задач на процесс до перезапуска, по умолчанию
+                ProjectSettings.converter_worker_max_tasks; 0 — без ограничения.
+            max_rss_bytes (Optional[int]): Предел памяти процесса, по умолчанию
+                ProjectSettings.converter_worker_max_rss_bytes; 0 — без ограничения.
+            warmup (Optional[Callable[[], Any]]): Функция верхнего уровня, выполняемая
+                в каждом новом процессе до первой задачи.
+            title (str): Назначение пула для сообщений в логе ("пул конвертации", "пул разбора").
+        """
+        self._size = size
+        self._max_tasks = max_tasks
+        self._max_rss_bytes = max_rss_bytes
+        self._warmup = warmup
+        self.title = title
+        # spawn, а не fork: процесс не наследует потоки веб-процесса, а среда .NET,
+        # поднятая Spire.Doc до fork, в дочернем процессе зависает
+        self._context = multiprocessing.get_context("spawn")
+        # None в очереди — метка остановки пула (см. shutdown)
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+
+    @property
+    def size(self) -> int:
+        """Количество процессов."""
+        return max(1, self._size or ProjectSettings.converter_workers)
+
+    @property
+    def max_tasks(self) -> int:
+        """Задач на процесс до перезапуска; 0 — без ограничения."""
+        return self._max_tasks if self._max_tasks is not None else ProjectSettings.converter_worker_max_tasks
+
+    @property
+    def max_rss_bytes(self) -> int:
+        """Предел памяти процесса в байтах; 0 — без ограничения."""
+        if self._max_rss_bytes is not None:
+            return self._max_rss_bytes
+        return ProjectSettings.converter_worker_max_rss_bytes
+
+    def start(self) -> None:
+        """Запускает и прогревает процессы пула; повторный вызов ничего не делает."""
+        with self._lock:
+            if self._workers:
+                return
+            self._drain_idle()  # Метка остановки от предыдущего shutdown
+            for _ in range(self.size):
+                self._add_worker()
+            atexit.register(self.shutdown)
+        logger.info(f"Запущен пул {self.title}: {self.size} процесс(ов)")
+
+    def shutdown(self) -> None:
+        """
+        Останавливает все процессы пула.
+
+        Задачи, ждущие свободного процесса в run, получают PoolClosedError: очередь
+        остается прежней, в нее кладется метка остановки, которую каждый проснувшийся
+        возвращает следующему. Следующий start снова запускает процессы.
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+            self._drain_idle()
+            self._idle.put(None)
+        for worker in workers:
+            worker.stop()
+
+    def run(self, func: Callable[..., Any], args: tuple, timeout: float) -> Any:
+        """
+        Выполняет func(*args) в свободном процессе пула.
+
+        Args:
+            func (Callable[..., Any]): Функция верхнего уровня (передается по имени).
+            args (tuple): Аргументы функции.
+            timeout (float): Время на задачу в секундах; зависший процесс завершается.
+
+        Returns:
+            Any: Результат функции.
+
+        Raises:
+            TimeoutError: Задача не выполнена за timeout.
+            WorkerCrashedError: Процесс завершился во время задачи.
+            PoolClosedError: Пул остановлен, пока задача ждала свободный процесс.
+            Exception: Исключение, брошенное функцией.
+        """
+        self.start()
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)
+            raise PoolClosedError(f"пул {self.title} остановлен")
+        try:
+            worker.wait_ready(timeout)
+            worker.connection.send((func, args))
+            if not worker.connection.poll(timeout):
+                self._count("timeouts")
+                raise TimeoutError(f"задача пула {self.title} дольше {timeout:g} с")
+            success, result, worker.rss = worker.connection.recv()
+        except TimeoutError:
+            self._replace(worker, "таймаут")
+            raise
+        except (EOFError, OSError) as e:
+            self._count("crashes")
+            self._replace(worker, "аварийное завершение")
+            raise WorkerCrashedError(f"процесс пула {self.title} завершился: {e or worker.process.exitcode}")
+        except BaseException:
+            # Прерванный обмен (например, KeyboardInterrupt) оставляет канал в неизвестном состоянии
+            self._replace(worker, "прерванная задача")
+            raise
+
+        worker.tasks_done += 1
+        self._count("tasks")
+        if self.max_tasks and worker.tasks_done >= self.max_tasks:
+            self._replace(worker, f"выполнено {worker.tasks_done} задач", graceful=True)
+        elif self.max_rss_bytes and worker.rss and worker.rss > self.max_rss_bytes:
+            self._replace(worker, f"память {worker.rss // 2 ** 20} МБ", graceful=True)
+        else:
+            with self._lock:
+                # Процесс, остановленный shutdown во время задачи, в очередь не возвращается
+                if worker in self._workers:
+                    self._idle.put(worker)
+
+        if not success:
+            raise result
+        return result
+
+    def imap_unordered(
+        self, func: Callable[..., Any], tasks: List[Task], timeout: float, concurrency: Optional[int] = None
+    ) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Выполняет задачи в пуле и отдает результаты по мере готовности.
+
+        Args:
+            func (Callable[..., Any]): Функция верхнего уровня.
+            tasks (List[Task]): Имена файлов и аргументы функции.
+            timeout (float): Время на одну задачу в секундах.
+            concurrency (Optional[int]): Сколько задач выполнять одновременно (не больше size).
+
+        Yields:
+            Tuple[str, Any, Optional[Exception]]: Имя файла, результат и ошибка (или None).
+        """
+        if not tasks:
+            return
+        threads = max(1, min(concurrency or self.size, self.size, len(tasks)))
+        # Потоки только ждут ответа своего процесса по каналу
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="converter") as executor:
+            futures = {executor.submit(self.run, func, args, timeout): file_name for file_name, args in tasks}
+            try:
+                for future in as_completed(futures):
+                    error = future.exception()
+                    yield futures[future], None if error else future.result(), error
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def counters(self) -> Dict[str, int]:
+        """Копия счетчиков пула."""
+        with self._lock:
+            return dict(self.stats)
+
+    def _count(self, key: str) -> None:
+        """Увеличивает счетчик: run выполняется одновременно в нескольких потоках (imap_unordered)."""
+        with self._lock:
+            self.stats[key] += 1
+
+    def _drain_idle(self) -> None:
+        """Очищает очередь свободных процессов, не заменяя ее: ждущие в run остаются на этой очереди."""
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                return
+
+    def _add_worker(self) -> None:
+        worker = _Worker(self._context, self._warmup)
+        self._workers.append(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker: _Worker, reason: str, graceful: bool = False) -> None:
+        """Останавливает процесс и запускает вместо него новый."""
+        logger.info(f"Перезапуск процесса пула {self.title} ({reason})")
+        if graceful:
+            self._count("recycled")
+            worker.stop()
+        else:
+            worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self._add_worker()
@@ -0,0 +1,133 @@
+from itertools import chain
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from file_creator.utils.custom_converter.converter_to_docx import Converter
+from file_creator.utils.parse_cache.parse_cache import ParseResultCache, content_key, parse_result_cache
+from file_creator.utils.parser_word import my_parser
+from file_creator.utils.parser_word.my_parser import Parser, parse_template
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+
+class ParsedDocument(NamedTuple):
+    """
+    Результат обработки одного загруженного файла.
+
+    Attributes:
+        index (int): Позиция файла в загрузке; номер документа — start_number + index.
+        file (str): Имя загруженного файла.
+        content (Optional[str]): Отредактированный текст или None при ошибке.
+        error (Optional[str]): Текст ошибки или None.
+        cached (bool): Текст получен из кэша без конвертации и разбора.
+    """
+    index: int
+    file: str
+    content: Optional[str]
+    error: Optional[str] = None
+    cached: bool = False
+
+
+# Результат разбора одного файла: имя, шаблон (или None) и текст ошибки (или None)
+ParsedTemplate = Tuple[str, Optional[str], Optional[str]]
+
+
+def iter_parsed_documents(
+    documents: Dict[str, bytes],
+    start_number: int,
+    converter: Optional[Converter] = None,
+    cache: ParseResultCache = parse_result_cache,
+) -> Iterator[ParsedDocument]:
+    """
+    Конвертирует и разбирает загруженные документы, используя кэш по хэшу содержимого.
+
+    Порядок выдачи: сначала файлы, найденные в кэше шаблонов (текст собирается
+    из шаблона за микросекунды), затем .rtf, .docx и файлы с кэшированным .docx,
+    затем остальные по мере конвертации. Новые .docx и шаблоны сохраняются в кэш.
+    Файлы .rtf разбираются напрямую (Parser.rtf_template), через Spire.Doc
+    конвертируются только .doc. Если таких готовых к разбору файлов несколько,
+    они разбираются параллельно в долгоживущих процессах parser_pool
+    (при ProjectSettings.parser_workers > 1) и выдаются по мере готовности.
+
+    Args:
+        documents (Dict[str, bytes]): Содержимое загруженных файлов по их именам, в порядке загрузки.
+        start_number (int): Номер первого документа.
+        converter (Optional[Converter]): Конвертер; по умолчанию Converter() с настройками проекта.
+        cache (ParseResultCache): Кэш результатов.
+
+    Yields:
+        ParsedDocument: Результат по каждому файлу.
+    """
+    indexes = {file_name: index for index, file_name in enumerate(documents)}
+    keys = {file_name: content_key(data) for file_name, data in documents.items()}
+    converter = converter or Converter()
+
+    rtf: Dict[str, bytes] = {}  # .rtf, разбираемые без конвертации
+    ready: Dict[str, bytes] = {}  # Готовые .docx, которые осталось разобрать
+    to_convert: Dict[str, bytes] = {}
+    for file_name, data in documents.items():
+        index = indexes[file_name]
+        template = cache.get_template(keys[file_name])
+        if template is not None:
+            logger.bind(filename=file_name).info("Взят из кэша разбора файл - ")
+            yield ParsedDocument(index, file_name, Parser.render(template, start_number + index), cached=True)
+        elif file_name.lower().endswith(".rtf"):
+            rtf[file_name] = data
+        elif file_name.lower().endswith(".docx"):
+            ready[file_name] = data
+        else:
+            docx = cache.get_docx(keys[file_name])
+            if docx is None:
+                to_convert[file_name] = data
+            else:
+                ready[file_name] = docx
+
+    # Сконвертированные .doc разбираются здесь же, по мере готовности, пока остальные
+    # еще конвертируются; их .docx сохраняется в кэш вместе с шаблоном
+    converted_docx: Dict[str, bytes] = {}
+    converted = (
+        (file_name, None, converter.errors[file_name]) if stream is None
+        else _parse_in_process(file_name, converted_docx.setdefault(file_name, stream.getvalue()))
+        for file_name, stream in converter.iter_in_memory(to_convert)
+    )
+    for file_name, template, error in chain(_parse_templates(list(chain(rtf.items(), ready.items()))), converted):
+        index = indexes[file_name]
+        if error is not None:
+            yield ParsedDocument(index, file_name, None, error)
+            continue
+        cache.put(keys[file_name], docx=converted_docx.pop(file_name, None), template=template)
+        logger.bind(filename=file_name).info("Обработал файл - ")
+        yield ParsedDocument(index, file_name, Parser.render(template, start_number + index))
+
+    logger.debug(f"Кэш разбора документов: {cache.counters()}")
+
+
+def _parse_in_process(file_name: str, data: bytes) -> ParsedTemplate:
+    """Разбирает документ в текущем процессе; ошибка возвращается текстом."""
+    try:
+        return file_name, parse_template(file_name, data), None
+    except Exception as e:
+        logger.bind(filename=file_name).error(f"Ошибка разбора: {e}")
+        return file_name, None, f"{type(e).__name__}: {e}"
+
+
+def _parse_templates(documents: List[Tuple[str, bytes]]) -> Iterator[ParsedTemplate]:
+    """
+    Разбирает готовые .rtf и .docx: несколько файлов — параллельно в parser_pool, по мере готовности.
+
+    Args:
+        documents (List[Tuple[str, bytes]]): Имена файлов и их содержимое.
+
+    Yields:
+        ParsedTemplate: Имя файла, шаблон (или None) и текст ошибки (или None).
+    """
+    pool = my_parser.parser_pool
+    if pool.size < 2 or len(documents) < 2:
+        for file_name, data in documents:
+            yield _parse_in_process(file_name, data)
+        return
+    tasks = [(file_name, (file_name, data)) for file_name, data in documents]
+    for file_name, template, error in pool.imap_unordered(parse_template, tasks, ProjectSettings.parser_timeout):
+        if error is not None:
+            logger.bind(filename=file_name).error(f"Ошибка разбора: {error}")
+            yield file_name, None, f"{type(error).__name__}: {error}"
+        else:
+            yield file_name, template, None
@@ -0,0 +1,182 @@
+import hashlib
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+# Меняется при изменении формата шаблона или логики Parser, чтобы старые записи не использовались
+CACHE_VERSION = "3"
+
+DOCX_SUFFIX = ".docx"
+TEMPLATE_SUFFIX = ".txt"
+
+
+def content_key(data: bytes) -> str:
+    """
+    Ключ кэша для содержимого загруженного файла.
+
+    Args:
+        data (bytes): Содержимое файла.
+
+    Returns:
+        str: sha256 от версии кэша, настройки транслитерации (от нее зависит шаблон) и содержимого.
+    """
+    version = f"{CACHE_VERSION}:{int(ProjectSettings.cp866_transliterate)}"
+    return hashlib.sha256(version.encode() + data).hexdigest()
+
+
+class ParseResultCache:
+    """
+    Дисковый кэш результатов обработки загруженных документов по хэшу содержимого.
+
+    Для каждого файла хранятся сконвертированный .docx и шаблон разобранного
+    текста (Parser.document_template), не зависящий от номера документа. При
+    повторной загрузке того же файла текст получается из шаблона через
+    Parser.render без конвертации и разбора.
+
+    Записи — файлы <ключ>.docx и <ключ>.txt в каталоге кэша. Время изменения
+    файла обновляется при каждом попадании, поэтому при превышении max_bytes
+    удаляются давно не использованные записи (LRU). Запись файлов атомарна
+    (через временный файл и os.replace), так что кэш можно использовать из
+    нескольких процессов.
+
+    Attributes:
+        stats (Counter): Счетчики попаданий и промахов текущего процесса:
+            template_hits, template_misses, docx_hits, docx_misses, evictions.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+
+    @property
+    def directory(self) -> Path:
+        """Каталог кэша; по умолчанию берётся из ProjectSettings."""
+        return Path(self._directory or ProjectSettings.parse_cache_dir)
+
+    @property
+    def max_bytes(self) -> int:
+        """Предельный размер кэша в байтах; 0 отключает кэш."""
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return ProjectSettings.parse_cache_max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """Включен ли кэш."""
+        return self.max_bytes > 0
+
+    def get_template(self, key: str) -> Optional[str]:
+        """
+        Возвращает шаблон разобранного текста или None.
+
+        Args:
+            key (str): Ключ из content_key.
+        """
+        data = self._read(key, TEMPLATE_SUFFIX, "template")
+        return None if data is None else data.decode("utf-8")
+
+    def get_docx(self, key: str) -> Optional[bytes]:
+        """
+        Возвращает сконвертированный .docx или None.
+
+        Args:
+            key (str): Ключ из content_key.
+        """
+        return self._read(key, DOCX_SUFFIX, "docx")
+
+    def put(self, key: str, docx: Optional[bytes] = None, template: Optional[str] = None) -> None:
+        """
+        Сохраняет .docx и/или шаблон и, если нужно, освобождает место.
+
+        Ошибки записи только логируются: кэш не должен ломать обработку загрузки.
+
+        Args:
+            key (str): Ключ из content_key.
+            docx (Optional[bytes]): Сконвертированный .docx.
+            template (Optional[str]): Шаблон разобранного текста.
+        """
+        if not self.enabled:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if docx is not None:
+                self._write(key, DOCX_SUFFIX, docx)
+            if template is not None:
+                self._write(key, TEMPLATE_SUFFIX, template.encode("utf-8"))
+            self.evict()
+        except OSError as e:
+            logger.error(f"Не удалось записать кэш разбора документов: {e}")
+
+    def evict(self) -> int:
+        """
+        Удаляет давно не использованные записи, пока размер кэша больше max_bytes.
+
+        Returns:
+            int: Количество удаленных файлов.
+        """
+        with self._lock:
+            try:
+                entries = [entry for entry in os.scandir(self.directory) if entry.is_file()]
+            except FileNotFoundError:
+                return 0
+            stats = {entry.path: entry.stat() for entry in entries}
+            total = sum(stat.st_size for stat in stats.values())
+            removed = 0
+            for path in sorted(stats, key=lambda item: stats[item].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= stats[path].st_size
+                removed += 1
+            if removed:
+                self.stats["evictions"] += removed
+            return removed
+
+    def clear(self) -> None:
+        """Удаляет все записи и обнуляет счетчики."""
+        if self.directory.exists():
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    os.remove(entry.path)
+        with self._lock:
+            self.stats.clear()
+
+    def counters(self) -> Dict[str, int]:
+        """Копия счетчиков попаданий и промахов."""
+        with self._lock:
+            return dict(self.stats)
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def _read(self, key: str, suffix: str, kind: str) -> Optional[bytes]:
+        """Читает запись и обновляет время её использования; считает попадание или промах."""
+        if not self.enabled:
+            return None
+        path = self._path(key, suffix)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            data = None
+        with self._lock:
+            self.stats[f"{kind}_hits" if data is not None else f"{kind}_misses"] += 1
+        return data
+
+    def _write(self, key: str, suffix: str, data: bytes) -> None:
+        path = self._path(key, suffix)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+
+parse_result_cache = ParseResultCache()
@@ -0,0 +1,95 @@
+import codecs
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+# Замены для частых символов, которых нет в cp866: типографские кавычки, тире и т.п.
+TRANSLITERATION: Dict[str, str] = {
+    **dict.fromkeys("“”„‟«»″", '"'),
+    **dict.fromkeys("‘’‚‛′", "'"),
+    **dict.fromkeys("‐‑‒–—―−", "-"),
+    "…": "...",
+    "•": "·",
+    "×": "x",
+    "÷": ":",
+    "±": "+-",
+    "≈": "~",
+    "≠": "!=",
+    "≤": "<=",
+    "≥": ">=",
+    "→": "->",
+    "←": "<-",
+    "€": "EUR",
+    "©": "(c)",
+    "®": "(R)",
+    "™": "TM",
+    "²": "2",
+    "³": "3",
+    "½": "1/2",
+    "¼": "1/4",
+    "¾": "3/4",
+    # Невидимые символы просто удаляются
+    "\u00ad": "",  # мягкий перенос
+    "\u200b": "",  # пробел нулевой ширины
+    "\ufeff": "",  # BOM
+}
+
+
+def _make_error_handler(replacement: str, transliterate: bool) -> Callable[[UnicodeEncodeError], Tuple[str, int]]:
+    """
+    Создает обработчик ошибок кодека cp866.
+
+    Обработчик вызывается кодеком один раз на каждый непрерывный участок
+    неподдерживаемых символов, а не на каждый символ.
+    """
+    mapping = TRANSLITERATION if transliterate else {}
+
+    def handler(error: UnicodeEncodeError) -> Tuple[str, int]:
+        chunk = error.object[error.start:error.end]
+        return "".join(mapping.get(char, replacement) for char in chunk), error.end
+
+    return handler
+
+
+@lru_cache(maxsize=None)
+def cp866_error_handler(replacement: str = "?", transliterate: bool = False) -> str:
+    """
+    Регистрирует (один раз) обработчик ошибок кодека cp866 и возвращает его имя для encode(errors=...).
+
+    Args:
+        replacement (str): Символ для неподдерживаемых символов.
+        transliterate (bool): Сначала заменять символы по таблице TRANSLITERATION.
+
+    Returns:
+        str: Имя обработчика.
+
+    Raises:
+        ValueError: Если replacement сам не кодируется в cp866.
+    """
+    try:
+        replacement.encode("cp866")
+    except UnicodeEncodeError:
+        raise ValueError(f"Символ замены {replacement!r} не поддерживается cp866")
+    name = f"lazy_ilya_cp866_{replacement.encode('cp866').hex()}{'_translit' if transliterate else ''}"
+    codecs.register_error(name, _make_error_handler(replacement, transliterate))
+    return name
+
+
+def to_cp866_text(text: str, replacement: str = "?", transliterate: bool = False) -> str:
+    """
+    Заменяет в тексте символы, которых нет в cp866, за один проход кодека.
+
+    Args:
+        text (str): Исходный текст.
+        replacement (str): Символ, на который заменяются неподдерживаемые символы.
+        transliterate (bool): Заменять кавычки, тире и другие частые символы по таблице
+            TRANSLITERATION, а не на replacement.
+
+    Returns:
+        str: Текст, который кодируется в cp866 без ошибок.
+    """
+    if replacement == "?" and not transliterate:
+        # Встроенный обработчик "replace" дает тот же результат без вызовов Python-кода
+        errors = "replace"
+    else:
+        errors = cp866_error_handler(replacement, transliterate)
+    return text.encode("cp866", errors=errors).decode("cp866")
@@ -1,10 +1,18 @@
 import datetime
+import io
 import os
 from pprint import pprint
-from typing import List
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 
 import django
 from docx import Document
+from docx.document import Document as DocumentObject
+from docx.oxml.ns import qn
+from docx.table import Table
+from file_creator.utils.custom_converter.worker_pool import ConverterPool
+from file_creator.utils.parser_word.cp866_text import to_cp866_text
+from file_creator.utils.parser_word.rtf_reader import read_rtf
+from file_creator.utils.parser_word.text_wrap import DEFAULT_WIDTH, TextWrapper
 from lazy_ilya.utils.settings_for_app import logger,ProjectSettings
 
 # Укажите путь к настройкам вашего проекта
@@ -13,6 +21,61 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lazy_ilya.settings")
 # Настройка Django
 django.setup()
 
+P_TAG = qn("w:p")
+TBL_TAG = qn("w:tbl")
+
+# Метки в шаблоне документа (см. Parser.document_template). В тексте .docx символ \x00
+# встретиться не может, а upper() метки не меняет
+NUMBER_MARK = "\x00#\x00"
+DATE_MARK = "\x00@\x00"
+
+
+def parse_file_template(path: str) -> str:
+    """
+    Извлекает шаблон текста (см. Parser.document_template) из файла .docx.
+
+    Функция верхнего уровня, чтобы её можно было выполнять в процессе parser_pool.
+
+    Args:
+        path (str): Путь к файлу .docx.
+
+    Returns:
+        str: Шаблон отредактированного файла.
+    """
+    return Parser(None, 0).document_template(Document(path))
+
+
+def parse_template(file_name: str, data: bytes) -> str:
+    """
+    Извлекает шаблон текста из содержимого .rtf (по имени файла) или .docx.
+
+    Функция верхнего уровня, чтобы её можно было выполнять в процессе parser_pool.
+
+    Args:
+        file_name (str): Имя файла; .rtf разбирается без конвертации, остальное — как .docx.
+        data (bytes): Содержимое файла.
+
+    Returns:
+        str: Шаблон отредактированного файла.
+    """
+    parser = Parser(None, 0)
+    if file_name.lower().endswith(".rtf"):
+        return parser.rtf_template(data)
+    return parser.stream_template(io.BytesIO(data))
+
+
+def warm_up_parser() -> None:
+    """
+    Прогрев процесса parser_pool.
+
+    Работу делает сам импорт этого модуля в дочернем процессе (python-docx, django.setup()),
+    поэтому он выполняется один раз на процесс, а не на каждый разбор.
+    """
+
+
+# Долгоживущие процессы разбора, общие для загрузок и каталога: запускаются вместе
+# с приложением (asgi.py) и переиспользуются, как пул конвертации
+parser_pool = ConverterPool(size=ProjectSettings.parser_workers, warmup=warm_up_parser, title="разбора")
 
 
 class Parser:
@@ -22,35 +85,55 @@ class Parser:
     Attributes:
         directory (str): Путь к директории, содержащей файлы .docx.
         start_number (int): Начальный номер для именования выходных файлов.
+        files (Optional[List[str]]): Имена файлов пакета; если не заданы, обрабатывается вся директория.
+        max_workers (int): Сколько файлов create_file_parsed разбирает одновременно в parser_pool.
+        wrapper (TextWrapper): Перенос строк по ширине для выходного текста.
     """
 
-    def __init__(self, directory: str, start_number: int):
+    def __init__(
+        self,
+        directory: str,
+        start_number: int,
+        files: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
         """
         Инициализирует экземпляр класса Parser.
 
         Args:
             directory (str): Путь к директории для обработки файлов.
             start_number (int): Начальный номер для именования выходных файлов.
+            files (Optional[List[str]]): Имена файлов пакета в порядке нумерации.
+            max_workers (Optional[int]): Одновременных разборов, по умолчанию ProjectSettings.parser_workers.
         """
         self.directory: str = directory
         self.start_number: int = start_number
+        self.files: Optional[List[str]] = files
+        self.max_workers: int = max(1, max_workers or ProjectSettings.parser_workers)
+        self.wrapper: TextWrapper = TextWrapper(DEFAULT_WIDTH)
 
     def all_files(self) -> List[str]:
         """
-        Находит все файлы .docx в указанной директории.
+        Находит файлы .docx для обработки.
+
+        Если передан список файлов пакета, директория не просматривается:
+        возвращаются существующие файлы .docx из этого списка в исходном порядке.
+        Иначе файлы директории сортируются по имени, чтобы нумерация не зависела
+        от порядка os.listdir.
 
         Returns:
-            List[str]: Список имен файлов .docx в директории.
+            List[str]: Список имен файлов .docx.
         """
+        candidates = self.files if self.files is not None else sorted(os.listdir(self.directory))
         files: List[str] = [
             file
-            for file in os.listdir(self.directory)
+            for file in candidates
             if os.path.isfile(os.path.join(self.directory, file))
             and file.endswith(".docx")
         ]
         return files
 
-    def format_text(self, text: str, max_length: int = 60) -> str:
+    def format_text(self, text: str, max_length: int = DEFAULT_WIDTH) -> str:
         """
         Форматирует текст, ограничивая длину строк до max_length символов.
 
@@ -61,132 +144,301 @@ class Parser:
         Returns:
             str: Отформатированный текст с ограниченной длиной строк.
         """
-        words: List[str] = text.split()
-        formatted_lines: List[str] = []
-        current_line: List[str] = []
+        wrapper = self.wrapper if max_length == self.wrapper.width else TextWrapper(max_length)
+        return wrapper.wrap(self.to_cp866(text))
 
-        for word in words:
-            # Проверяем, если добавление слова превышает максимальную длину
-            if len(" ".join(current_line + [word])) <= max_length:
-                current_line.append(word)
-            else:
-                # Сохраняем текущую строку и начинаем новую
-                formatted_lines.append(" ".join(current_line))
-                current_line = [word]
+    @staticmethod
+    def to_cp866(text: str) -> str:
+        """
+        Приводит текст к виду, в котором он будет сохранен в .txt (cp866, см. UploadView.put).
 
-        # Добавляем последнюю строку, если она не пустая
-        if current_line:
-            formatted_lines.append(" ".join(current_line))
+        Транслитерация заменяет символ несколькими ("…" -> "..."), поэтому выполняется
+        до переноса по ширине, иначе строки получаются длиннее DEFAULT_WIDTH.
 
-        return "\n".join(formatted_lines)
+        Args:
+            text (str): Текст.
+
+        Returns:
+            str: Текст, который кодируется в cp866 без замен.
+        """
+        return to_cp866_text(text, transliterate=ProjectSettings.cp866_transliterate)
 
     def create_file_parsed(self) -> List[str]:
         """
         Создает отредактированные файлы .txt из документов .docx.
 
+        Номера назначаются заранее по списку all_files, поэтому документы
+        разбираются независимо: если файлов больше одного и max_workers > 1 —
+        параллельно в процессах parser_pool. Разбор дает шаблоны (document_template),
+        номер и дата подставляются после сборки результатов в исходном порядке, так что
+        результат совпадает с последовательным разбором.
+
         Returns:
             List[str]: Список содержимого отредактированных файлов.
         """
-        content_files: List[str] = []
-
-        for file in self.all_files():
-            document = Document(os.path.join(self.directory, file))
-            n_name: str = f"{self.start_number}_{os.path.splitext(file)[0]}.txt"
-            out_txt: str = ""
-
-            # Читаем верхний колонтитул
-            special_header = document.sections[0].first_page_header
-            common_header = document.sections[0].header
-
-            header = special_header if len(special_header.tables) else common_header
-
-            for table in header.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if "из:" in cell.text.lower():
-                            out_txt += (
-                                self.format_text(cell.text[:-1].strip().upper()) + " "
-                            )
-                        elif "г. москва" in cell.text.lower():
-                            out_txt += (
-                                self.format_text(cell.text.strip().upper())
-                                + f"  НР {self.start_number}   Для анального пользования\n".upper()
-                            )
-
-            # Читаем основной текст документа и таблицы
-            out_txt += "\n\n          Содержимое документа:\n\n"
-            num_tables: int = 0
-
-            for element in document.element.body:
-                if element.tag.endswith("p"):  # Проверяем, является ли элемент абзацем
-                    text: str = element.text.strip()
-                    if element.text.startswith(
-                        "Evaluation Warning: The document was created with Spire.Doc for Python."
-                    ):
-                        continue
-                    elif element.text.startswith("Куда и кому:"):
-                        new_str: str = text.replace("Куда и кому:", "")
-                        out_txt += self.format_text(new_str.upper()) + "\n"
-                    elif element.text.startswith("Уважаемый"):
-                        out_txt += "      " + self.format_text(text.upper()) + "\n"
-                    elif text:  # Если абзац не пустой
-                        out_txt += self.format_text(text.upper()) + "\n"
-                    else:  # Печатаем пустую строку для пустого абзаца
-                        out_txt += "\n"
-                elif element.tag.endswith("tbl") and num_tables < len(document.tables):
-                    table = document.tables[num_tables]  # Получаем таблицу по индексу
-                    for row in table.rows:
-                        for cell in row.cells:
-                            if cell.text.startswith("Особый знак"):
-                                out_txt += (
-                                    f"Особый знак НР {str(self.start_number)}/П Заместитель доярки\n"
-                                    f"{datetime.datetime.now().strftime('%d.%m.%Y')}   колхозник   А.М. Поликарп \n"
-                                )
-                                break
-
-                    num_tables += 1
-
-            self.start_number += 1
-            content_files.append(out_txt)
-            logger.bind(filename=n_name).info("Обработал файл - ")
-
-        return content_files
-
-
-def replace_unsupported_characters(text: str, replacement: str = "?") -> str:
-    """
-    Заменяет неподдерживаемые символы на указанный символ замены.
+        files = self.all_files()
+        paths = [os.path.join(self.directory, file) for file in files]
+        if min(self.max_workers, parser_pool.size, len(files)) > 1:
+            parsed: Dict[str, str] = {}
+            tasks = [(path, (path,)) for path in paths]
+            for path, template, error in parser_pool.imap_unordered(
+                parse_file_template, tasks, ProjectSettings.parser_timeout, self.max_workers
+            ):
+                if error is not None:
+                    raise error
+                parsed[path] = template
+            templates = [parsed[path] for path in paths]
+        else:
+            templates = [self.document_template(Document(path)) for path in paths]
+
+        out_texts: List[str] = []
+        for number, (file, template) in enumerate(zip(files, templates), start=self.start_number):
+            out_texts.append(self.render(template, number))
+            logger.bind(filename=f"{number}_{os.path.splitext(file)[0]}.txt").info("Обработал файл - ")
+        self.start_number += len(files)
+        return out_texts
+
+    def create_from_streams(self, documents: Dict[str, BinaryIO]) -> List[str]:
+        """
+        Создает отредактированный текст из документов .docx, переданных потоками.
 
-    Args:
-        text (str): Исходный текст.
-        replacement (str): Символ, на который будут заменены неподдерживаемые символы.
+        Используется при обработке загрузок в памяти: документы не записываются на диск.
 
-    Returns:
-        str: Текст с замененными неподдерживаемыми символами.
-    """
-    # Создаем новый текст с заменами
-    filtered_text: str = "".join(
-        char if can_encode(char) else replacement for char in text
-    )
+        Args:
+            documents (Dict[str, BinaryIO]): Потоки с содержимым .docx по именам файлов, в порядке нумерации.
 
-    return filtered_text
+        Returns:
+            List[str]: Список содержимого отредактированных файлов.
+        """
+        return [self.parse_stream(stream, file) for file, stream in documents.items()]
+
+    def parse_stream(self, stream: BinaryIO, file: str) -> str:
+        """
+        Извлекает отредактированный текст из документа .docx, переданного потоком.
+
+        Args:
+            stream (BinaryIO): Поток с содержимым .docx.
+            file (str): Имя файла, для логирования.
 
+        Returns:
+            str: Содержимое отредактированного файла.
+        """
+        return self.parse_document(Document(stream), file)
+
+    def stream_template(self, stream: BinaryIO) -> str:
+        """
+        Извлекает шаблон текста (см. document_template) из документа .docx, переданного потоком.
 
-def can_encode(char: str) -> bool:
+        Args:
+            stream (BinaryIO): Поток с содержимым .docx.
+
+        Returns:
+            str: Шаблон отредактированного файла.
+        """
+        return self.document_template(Document(stream))
+
+    def parse_document(self, document: DocumentObject, file: str) -> str:
+        """
+        Извлекает отредактированный текст из открытого документа и увеличивает номер.
+
+        Args:
+            document (DocumentObject): Открытый документ python-docx.
+            file (str): Имя файла, для логирования.
+
+        Returns:
+            str: Содержимое отредактированного файла.
+        """
+        n_name: str = f"{self.start_number}_{os.path.splitext(file)[0]}.txt"
+        out_txt = self.render(self.document_template(document), self.start_number)
+
+        self.start_number += 1
+        logger.bind(filename=n_name).info("Обработал файл - ")
+
+        return out_txt
+
+    @staticmethod
+    def render(template: str, number: int) -> str:
+        """
+        Подставляет номер документа и текущую дату в шаблон документа.
+
+        Args:
+            template (str): Шаблон из document_template.
+            number (int): Номер документа.
+
+        Returns:
+            str: Содержимое отредактированного файла.
+        """
+        return template.replace(NUMBER_MARK, str(number)).replace(
+            DATE_MARK, datetime.datetime.now().strftime('%d.%m.%Y')
+        )
+
+    def document_template(self, document: DocumentObject) -> str:
+        """
+        Извлекает отредактированный текст документа, не зависящий от номера документа.
+
+        Вместо номера и даты в тексте стоят метки NUMBER_MARK и DATE_MARK, их заменяет render.
+        Шаблон можно хранить и использовать повторно с другим номером.
+
+        Args:
+            document (DocumentObject): Открытый документ python-docx.
+
+        Returns:
+            str: Шаблон отредактированного файла.
+        """
+        # Читаем верхний колонтитул
+        special_header = document.sections[0].first_page_header
+        common_header = document.sections[0].header
+
+        header = special_header if len(special_header.tables) else common_header
+        header_rows = (
+            (cell.text for cell in row.cells) for table in header.tables for row in table.rows
+        )
+
+        # Основной текст и таблицы читаются за один проход по телу:
+        # document.tables пересобирает список при каждом обращении.
+        # Тексты ячеек вычисляются лениво, пока в строке не найдена подпись
+        body = (
+            element.text
+            if element.tag == P_TAG
+            else ((cell.text for cell in row.cells) for row in Table(element, document).rows)
+            for element in document.element.body.iterchildren()
+            if element.tag in (P_TAG, TBL_TAG)
+        )
+        return self.build_template(header_rows, body)
+
+    def rtf_template(self, data: bytes) -> str:
+        """
+        Извлекает шаблон текста (см. document_template) из документа .rtf без конвертации в .docx.
+
+        Args:
+            data (bytes): Содержимое файла .rtf.
+
+        Returns:
+            str: Шаблон отредактированного файла.
+
+        Raises:
+            ValueError: Если данные не являются документом RTF.
+        """
+        content = read_rtf(data)
+        header_tables = content.first_page_header or content.header
+        header_rows = (row for table in header_tables for row in table)
+        return self.build_template(header_rows, content.body)
+
+    def build_template(
+        self,
+        header_rows: Iterable[Iterable[str]],
+        body: Iterable[Union[str, Iterable[Iterable[str]]]],
+    ) -> str:
+        """
+        Собирает шаблон текста из колонтитула и основного текста документа.
+
+        Не зависит от формата исходного файла: .docx читает document_template, .rtf — rtf_template.
+
+        Args:
+            header_rows (Iterable[Iterable[str]]): Строки таблиц верхнего колонтитула — тексты ячеек.
+            body (Iterable[Union[str, Iterable[Iterable[str]]]]): Текст абзацев (str) и таблицы
+                (строки с текстами ячеек) основного текста по порядку.
+
+        Returns:
+            str: Шаблон отредактированного файла.
+        """
+        out_parts: List[str] = []
+
+        for row in header_rows:
+            for cell_text in row:
+                if "из:" in cell_text.lower():
+                    out_parts.append(
+                        self.format_text(cell_text[:-1].strip().upper()) + " "
+                    )
+                elif "г. москва" in cell_text.lower():
+                    out_parts.append(
+                        self.format_text(cell_text.strip().upper())
+                        + f"  НР {NUMBER_MARK}   Для анального пользования\n".upper()
+                    )
+
+        out_parts.append("\n\n          Содержимое документа:\n\n")
+        # Абзацы переносятся по ширине одним вызовом после обхода:
+        # позиции в out_parts и тексты для переноса
+        wrap_slots: List[int] = []
+        wrap_texts: List[str] = []
+
+        for block in body:
+            if isinstance(block, str):  # Абзац
+                paragraph = self._paragraph_to_wrap(block)
+                if paragraph is None:
+                    continue
+                prefix, text = paragraph
+                wrap_slots.append(len(out_parts))
+                wrap_texts.append(self.to_cp866(text))
+                out_parts.append(prefix)
+            else:  # Таблица
+                out_parts.append(self._table_text(block))
+
+        for slot, wrapped in zip(wrap_slots, self.wrapper.wrap_many(wrap_texts)):
+            out_parts[slot] += wrapped + "\n"
+
+        return "".join(out_parts)
+
+    def _paragraph_to_wrap(self, paragraph_text: str) -> Optional[Tuple[str, str]]:
+        """
+        Готовит абзац основного текста к переносу по ширине.
+
+        Args:
+            paragraph_text (str): Текст абзаца.
+
+        Returns:
+            Optional[Tuple[str, str]]: Отступ и текст для переноса; None для служебного абзаца.
+            Пустой абзац дает пустой текст, то есть пустую строку в выходном файле.
+        """
+        text: str = paragraph_text.strip()
+        if paragraph_text.startswith(
+            "Evaluation Warning: The document was created with Spire.Doc for Python."
+        ):
+            return None
+        elif paragraph_text.startswith("Куда и кому:"):
+            return "", text.replace("Куда и кому:", "").upper()
+        elif paragraph_text.startswith("Уважаемый"):
+            return "      ", text.upper()
+        return "", text.upper()
+
+    def _table_text(self, rows: Iterable[Iterable[str]]) -> str:
+        """
+        Возвращает подпись «Особый знак» для каждой строки таблицы, где она есть.
+
+        Args:
+            rows (Iterable[Iterable[str]]): Строки таблицы основного текста — тексты ячеек.
+
+        Returns:
+            str: Текст подписей или пустая строка.
+        """
+        signatures: List[str] = []
+        for row in rows:
+            for cell_text in row:
+                if cell_text.startswith("Особый знак"):
+                    signatures.append(
+                        f"Особый знак НР {NUMBER_MARK}/П Заместитель доярки\n"
+                        f"{DATE_MARK}   колхозник   А.М. Поликарп \n"
+                    )
+                    break
+        return "".join(signatures)
+
+
+def replace_unsupported_characters(text: str, replacement: str = "?", transliterate: bool = False) -> str:
     """
-    Проверяет, может ли символ быть закодирован в cp866.
+    Заменяет неподдерживаемые символы на указанный символ замены.
+
+    Текст обрабатывается одним вызовом кодека cp866 (см. to_cp866_text),
+    без проверки каждого символа по отдельности.
 
     Args:
-        char (str): Символ для проверки.
+        text (str): Исходный текст.
+        replacement (str): Символ, на который будут заменены неподдерживаемые символы.
+        transliterate (bool): Заменять типографские кавычки, тире и т.п. похожими символами cp866.
 
     Returns:
-        bool: True, если символ может быть закодирован в cp866, иначе False.
+        str: Текст с замененными неподдерживаемыми символами.
     """
-    try:
-        char.encode("cp866")
-        return True
-    except UnicodeEncodeError:
-        return False
+    return to_cp866_text(text, replacement, transliterate)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Union
+
+# Таблица — строки, каждая строка — тексты ячеек (абзацы ячейки разделены \n, как в python-docx)
+RtfTable = List[List[str]]
+RtfBlock = Union[str, RtfTable]
+
+# Токены RTF: управляющее слово с параметром, \'xx, управляющий символ, скобка группы,
+# перевод строки (в RTF не значим) и обычный текст
+TOKEN = re.compile(
+    rb"\\([a-zA-Z]{1,32})(-?\d{1,10})? ?"
+    rb"|\\'([0-9a-fA-F]{2})"
+    rb"|\\([^a-zA-Z])"
+    rb"|([{}])"
+    rb"|[\r\n]+"
+    rb"|([^\\{}\r\n]+)"
+)
+# Токены, значимые при пропуске группы целиком: скобки, экранированные скобки и \binN
+GROUP_TOKEN = re.compile(rb"\\bin(\d+) ?|\\[\\{}]|[{}]")
+
+# Группы, текст которых в документ не попадает (таблицы шрифтов и стилей, свойства,
+# картинки, объекты, колонтитулы четных страниц, нижние колонтитулы, номера списков и т.п.)
+SKIPPED_DESTINATIONS = frozenset({
+    "fonttbl", "colortbl", "stylesheet", "info", "listtable", "listoverridetable",
+    "revtbl", "rsidtbl", "generator", "pict", "object", "nonshppict", "shp",
+    "headerl", "footer", "footerl", "footerr", "footerf", "footnote", "annotation",
+    "listtext", "pntext", "pn", "fldinst", "xmlnstbl", "themedata",
+    "colorschememapping", "latentstyles", "datastore", "filetbl", "template",
+})
+HEADER_DESTINATIONS = {"header": "header", "headerr": "header", "headerf": "first_page_header"}
+
+# Управляющие слова и символы, заменяемые символом текста
+SYMBOLS = {
+    "tab": "\t", "line": "\n", "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022",
+    "lquote": "\u2018", "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d",
+    "emspace": "\u2003", "enspace": "\u2002", "qmspace": "\u2005",
+    "~": "\xa0", "_": "\u2011", "-": "", "\\": "\\", "{": "{", "}": "}",
+}
+
+# Кодовые страницы шрифтов по \fcharset; для остальных берётся \ansicpg документа
+CHARSET_CODEPAGES = {
+    0: "cp1252", 161: "cp1253", 162: "cp1254", 177: "cp1255", 178: "cp1256",
+    186: "cp1257", 204: "cp1251", 238: "cp1250",
+}
+DEFAULT_CODEPAGE = "cp1252"
+
+
+class RtfContent(NamedTuple):
+    """
+    Содержимое документа RTF в том виде, который нужен Parser.
+
+    Attributes:
+        body (List[RtfBlock]): Абзацы (str) и таблицы основного текста по порядку.
+        header (List[RtfTable]): Таблицы верхнего колонтитула (\\header, \\headerr).
+        first_page_header (List[RtfTable]): Таблицы колонтитула первой страницы (\\headerf).
+    """
+    body: List[RtfBlock]
+    header: List[RtfTable]
+    first_page_header: List[RtfTable]
+
+
+class _Story:
+    """Собирает абзацы и таблицы одного потока текста (тело документа или колонтитул)."""
+
+    def __init__(self) -> None:
+        self.blocks: List[RtfBlock] = []
+        self.parts: List[str] = []
+        self.cell_paragraphs: List[str] = []
+        self.row: List[str] = []
+        self.table: Optional[RtfTable] = None
+        self.in_table = False
+
+    def paragraph(self) -> None:
+        text = "".join(self.parts)
+        self.parts = []
+        if self.in_table:
+            self.cell_paragraphs.append(text)
+        else:
+            self._close_table()
+            self.blocks.append(text)
+
+    def cell(self) -> None:
+        self.cell_paragraphs.append("".join(self.parts))
+        self.parts = []
+        self.row.append("\n".join(self.cell_paragraphs))
+        self.cell_paragraphs = []
+
+    def end_row(self) -> None:
+        if self.table is None:
+            self.table = []
+        self.table.append(self.row)
+        self.row = []
+
+    def finish(self) -> List[RtfBlock]:
+        if self.parts:
+            self.in_table = False
+            self.paragraph()
+        self._close_table()
+        return self.blocks
+
+    def _close_table(self) -> None:
+        if self.table is not None:
+            self.blocks.append(self.table)
+            self.table = None
+
+
+def _group_end(data: bytes, position: int) -> int:
+    """
+    Находит конец текущей группы, не разбирая её содержимое.
+
+    Args:
+        data (bytes): Документ RTF.
+        position (int): Позиция внутри группы.
+
+    Returns:
+        int: Позиция после закрывающей скобки группы (или конец данных).
+    """
+    depth = 1
+    while True:
+        for match in GROUP_TOKEN.finditer(data, position):
+            token = match.group()
+            if token == b"{":
+                depth += 1
+            elif token == b"}":
+                depth -= 1
+                if not depth:
+                    return match.end()
+            elif match.group(1):  # \binN: N байт двоичных данных
+                position = match.end() + int(match.group(1))
+                break
+        else:
+            return len(data)
+
+
+def read_rtf(data: bytes) -> RtfContent:
+    """
+    Разбирает документ RTF без конвертации в .docx.
+
+    Из документа извлекаются абзацы и таблицы основного текста и таблицы верхних
+    колонтитулов — всё, что использует Parser. Текст \\'xx декодируется в кодировке
+    шрифта (\\fcharset) или документа (\\ansicpg), символы \\uN — с пропуском \\ucN
+    замещающих символов. Оформление не разбирается.
+
+    Args:
+        data (bytes): Содержимое файла .rtf.
+
+    Returns:
+        RtfContent: Абзацы, таблицы и колонтитулы документа.
+
+    Raises:
+        ValueError: Если данные не являются документом RTF.
+    """
+    if not data.lstrip().startswith(b"{\\rtf"):
+        raise ValueError("Файл не является документом RTF")
+
+    body = _Story()
+    headers: Dict[str, _Story] = {}
+    font_codepages: Dict[int, str] = {}
+
+    # Состояние группы: таблица шрифтов (её текст не нужен), \ucN, кодировка, поток текста.
+    # Прочие группы без нужного текста пропускаются целиком (_group_end)
+    in_fonttbl, uc, codepage, story = False, 1, DEFAULT_CODEPAGE, body
+    document_codepage = DEFAULT_CODEPAGE
+    stack: List[tuple] = []
+    destination_expected = False  # Начало группы: следующее слово может быть назначением
+    font, unicode_skip = 0, 0
+    pending = bytearray()
+
+    def flush_bytes() -> None:
+        if not in_fonttbl:
+            story.parts.append(pending.decode(codepage, errors="replace"))
+        pending.clear()
+
+    position, length = 0, len(data)
+    while position < length:
+        match = TOKEN.match(data, position)
+        if match is None:  # Одиночная обратная косая черта в конце файла
+            break
+        position = match.end()
+        word, param, hex_byte, symbol, brace, text = match.groups()
+
+        if hex_byte is not None:
+            if unicode_skip:
+                unicode_skip -= 1
+            else:
+                pending.append(int(hex_byte, 16))
+            destination_expected = False
+            continue
+        if pending:
+            flush_bytes()
+
+        if text is not None:
+            if unicode_skip:
+                skipped = min(unicode_skip, len(text))
+                unicode_skip -= skipped
+                text = text[skipped:]
+            if not in_fonttbl and text:
+                story.parts.append(text.decode(codepage, errors="replace"))
+            destination_expected = False
+            continue
+        if brace is None and word is None and symbol is None:  # Перевод строки
+            continue
+        unicode_skip = 0
+
+        if brace == b"{":
+            stack.append((in_fonttbl, uc, codepage, story))
+            destination_expected = True
+            continue
+        if brace == b"}":
+            if stack:
+                in_fonttbl, uc, codepage, story = stack.pop()
+            destination_expected = False
+            continue
+
+        if symbol is not None:
+            char = symbol.decode("latin-1")
+            if char == "*":  # Необязательное назначение: его текст не нужен
+                position = _group_end(data, position)
+                if stack:
+                    in_fonttbl, uc, codepage, story = stack.pop()
+            elif char in "\r\n":
+                if not in_fonttbl:
+                    story.paragraph()
+            elif not in_fonttbl and char in SYMBOLS:
+                story.parts.append(SYMBOLS[char])
+            destination_expected = False
+            continue
+
+        name = word.decode("ascii")
+        is_destination, destination_expected = destination_expected, False
+
+        if in_fonttbl:
+            if name == "f" and param:
+                font = int(param)
+            elif name == "fcharset" and param:
+                font_codepages[font] = CHARSET_CODEPAGES.get(int(param), document_codepage)
+            continue
+        if name == "fonttbl":
+            in_fonttbl = True
+        elif name in SKIPPED_DESTINATIONS:
+            # Группа пропускается целиком, без разбора на токены
+            position = _group_end(data, position)
+            if stack:
+                in_fonttbl, uc, codepage, story = stack.pop()
+        elif name in HEADER_DESTINATIONS and is_destination:
+            story = headers.setdefault(HEADER_DESTINATIONS[name], _Story())
+        elif name == "bin" and param:  # Двоичные данные вне пропускаемых групп
+            position += int(param)
+        elif name == "ansicpg" and param:
+            document_codepage = codepage = f"cp{int(param)}"
+        elif name == "f" and param:
+            codepage = font_codepages.get(int(param), document_codepage)
+        elif name == "uc" and param:
+            uc = int(param)
+        elif name == "u" and param:
+            story.parts.append(chr(int(param) % 0x10000))
+            unicode_skip = uc
+        elif name == "par":
+            story.paragraph()
+        elif name == "cell":
+            story.cell()
+        elif name == "row":
+            story.end_row()
+        elif name == "intbl":
+            story.in_table = True
+        elif name == "itap":
+            story.in_table = param is not None and int(param) > 0
+        elif name == "pard":
+            story.in_table = False
+        elif name in ("nestcell", "nestrow"):
+            story.parts.append("\n")
+        elif name in SYMBOLS:
+            story.parts.append(SYMBOLS[name])
+    if pending:
+        flush_bytes()
+
+    def tables(name: str) -> List[RtfTable]:
+        header = headers.get(name)
+        return [block for block in header.finish() if isinstance(block, list)] if header else []
+
+    return RtfContent(body.finish(), tables("header"), tables("first_page_header"))
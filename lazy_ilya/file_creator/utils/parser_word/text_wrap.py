@@ -0,0 +1,131 @@
+from typing import Callable, Iterable, List
+
+# Ширина строки в выходных .txt
+DEFAULT_WIDTH: int = 60
+
+
+def cp866_width(text: str) -> int:
+    """
+    Ширина текста в итоговом файле cp866.
+
+    cp866 — однобайтовая кодировка, а неподдерживаемые символы при сохранении
+    заменяются одним символом "?" (см. replace_unsupported_characters), поэтому
+    ширина равна количеству символов. Транслитерация может сделать строку
+    на несколько символов длиннее ("…" -> "...").
+
+    Args:
+        text (str): Текст.
+
+    Returns:
+        int: Ширина в символах файла cp866.
+    """
+    return len(text)
+
+
+class TextWrapper:
+    """
+    Разбивает текст на строки не длиннее width за один проход по словам.
+
+    Слова выделяются по пробельным символам и переносятся жадно. Длина текущей
+    строки хранится как число, поэтому строка не пересобирается на каждое слово.
+
+    Без break_long_words поведение совпадает с прежним Parser.format_text: слово
+    длиннее width занимает отдельную строку, а если оно первое в тексте, перед
+    ним остается пустая строка.
+
+    Attributes:
+        width (int): Максимальная ширина строки.
+        break_long_words (bool): Разрезать слова длиннее width на части по width символов.
+        measure (Callable[[str], int]): Функция ширины слова.
+    """
+
+    def __init__(
+        self,
+        width: int = DEFAULT_WIDTH,
+        break_long_words: bool = False,
+        measure: Callable[[str], int] = cp866_width,
+    ):
+        """
+        Инициализирует экземпляр класса TextWrapper.
+
+        Args:
+            width (int): Максимальная ширина строки.
+            break_long_words (bool): Разрезать слова длиннее width.
+            measure (Callable[[str], int]): Функция ширины слова.
+        """
+        if width <= 0:
+            raise ValueError(f"Ширина строки должна быть больше нуля: {width}")
+        self.width: int = width
+        self.break_long_words: bool = break_long_words
+        self.measure: Callable[[str], int] = measure
+
+    def _split_long(self, word: str) -> List[str]:
+        """Разрезает слово на части, каждая из которых не шире width."""
+        parts: List[str] = []
+        part_start = 0
+        part_width = 0
+        for index, char in enumerate(word):
+            char_width = self.measure(char)
+            if part_width + char_width > self.width and index > part_start:
+                parts.append(word[part_start:index])
+                part_start, part_width = index, 0
+            part_width += char_width
+        parts.append(word[part_start:])
+        return parts
+
+    def _words(self, text: str) -> Iterable[str]:
+        """Слова текста, длинные слова разрезаются."""
+        for word in text.split():
+            if self.measure(word) > self.width:
+                yield from self._split_long(word)
+            else:
+                yield word
+
+    def wrap(self, text: str) -> str:
+        """
+        Переносит текст по ширине.
+
+        Args:
+            text (str): Текст для форматирования.
+
+        Returns:
+            str: Строки, соединенные через "\\n".
+        """
+        lines: List[str] = []
+        current_line: List[str] = []
+        current_width = 0
+        width = self.width
+        # cp866_width совпадает с len, а встроенная функция заметно быстрее
+        measure = len if self.measure is cp866_width else self.measure
+
+        words = self._words(text) if self.break_long_words else text.split()
+        for word in words:
+            word_width = measure(word)
+            # Ширина строки с новым словом: пробел нужен, только если строка не пустая
+            new_width = current_width + word_width + 1 if current_line else word_width
+            if new_width <= width:
+                current_line.append(word)
+                current_width = new_width
+            else:
+                if current_line or not self.break_long_words:
+                    lines.append(" ".join(current_line))
+                current_line = [word]
+                current_width = word_width
+
+        if current_line:
+            lines.append(" ".join(current_line))
+
+        return "\n".join(lines)
+
+    def wrap_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Переносит по ширине несколько текстов, например все абзацы документа.
+
+        Args:
+            texts (Iterable[str]): Тексты для форматирования.
+
+        Returns:
+            List[str]: Отформатированные тексты в исходном порядке.
+        """
+        wrap = self.wrap
+        return [wrap(text) for text in texts]
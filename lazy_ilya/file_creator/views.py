@@ -1,20 +1,27 @@
 import json
 import os
-from typing import List
+import time
+from typing import AsyncIterator, Dict, List
+
+from asgiref.sync import sync_to_async
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
+from django.utils.text import get_valid_filename
 from django.views import View
 
 from file_creator.models import Counter
-from file_creator.utils.custom_converter.converter_to_docx import Converter
-from file_creator.utils.parser_word.my_parser import Parser, replace_unsupported_characters
-from file_creator.utils.storage import OverwritingFileSystemStorage
+from file_creator.utils.parse_cache.cached_parsing import iter_parsed_documents
+from file_creator.utils.parser_word.my_parser import replace_unsupported_characters
+from lazy_ilya.utils.admission import admission_controller, AdmissionRejected
 from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
 
+# Тип ответа для потоковой выдачи результатов: по одному JSON-объекту на строку
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
 
 class UploadView(LoginRequiredMixin, View):
     """
@@ -38,21 +45,25 @@ class UploadView(LoginRequiredMixin, View):
         # logger.bind(user=request.user.username).debug("Загрузил страницу")
         return render(request=request, template_name="file_creator/file_creator.html")
 
-    def post(self, request: HttpRequest) -> JsonResponse:
+    def post(self, request: HttpRequest) -> HttpResponse:
         """
         Обрабатывает загрузку документов и создает отредактированные файлы.
 
+        Если клиент передал заголовок Accept: application/x-ndjson, результаты
+        отдаются потоком, по строке на файл, как только файл обработан
+        (см. stream_results). Иначе возвращается один JSON со всеми файлами.
+
+        Одновременно обрабатывается ограниченное число загрузок (класс операций "upload"
+        в admission_controller); при перегрузке возвращается 429 или 503 с Retry-After.
+
         Args:
             request (HttpRequest): Объект запроса.
 
         Returns:
-            JsonResponse: Ответ с информацией о загруженных файлах и их содержимом.
+            HttpResponse: Ответ с информацией о загруженных файлах и их содержимом.
         """
         uploaded_files = request.FILES.getlist("files")
         document_number = int(request.POST.get("start_number", 0))
-        fs = OverwritingFileSystemStorage(
-            location=ProjectSettings.tlg_dir, allow_overwrite=True
-        )
 
         if not uploaded_files:
             return JsonResponse({"error": "Нет загруженных файлов"}, status=400)
@@ -62,29 +73,51 @@ class UploadView(LoginRequiredMixin, View):
                 {"error": "Номер документа должен быть больше нуля"}, status=400
             )
 
+        try:
+            ticket = admission_controller.acquire("upload")
+        except AdmissionRejected as rejected:
+            return rejected.response()
+
         new_files: List[str] = []  # Список для хранения имен новых файлов
+        streaming = False
 
         try:
+            # Пакет обрабатывается в памяти: на диск попадают только итоговые .txt (см. put),
+            # поэтому параллельные загрузки не видят чужих файлов
+            documents: Dict[str, bytes] = {}
             for index, uploaded_file in enumerate(uploaded_files):
-                # Сохраните файл и получите его имя
-                filename = fs.save(f"{index + 1}_{uploaded_file.name}", uploaded_file)
+                # Имя как при сохранении через FileSystemStorage
+                filename = get_valid_filename(f"{index + 1}_{uploaded_file.name}")
+                documents[filename] = uploaded_file.read()
                 new_files.append(
                     f"{index + document_number}_{str(os.path.splitext(filename)[0])[1:]}.txt"
                 )
 
-            # Конвертация файлов в .docx и парсинг содержимого
-            Converter(ProjectSettings.tlg_dir).convert_files()
-            content = Parser(
-                ProjectSettings.tlg_dir, document_number
-            ).create_file_parsed()
-
-            # Удаляем все файлы, кроме .txt
-            for file in os.listdir(ProjectSettings.tlg_dir):
-                file_path = os.path.join(ProjectSettings.tlg_dir, file)
-                if os.path.isfile(file_path) and not file_path.endswith(".txt"):
-                    os.remove(file_path)
+            if NDJSON_CONTENT_TYPE in request.headers.get("Accept", ""):
+                # Место освобождается, когда ответ дочитан или закрыт
+                streaming = True
+                return StreamingHttpResponse(
+                    admission_controller.release_after(
+                        ticket, self.stream_results(documents, new_files, document_number, request.user.username)
+                    ),
+                    content_type=NDJSON_CONTENT_TYPE,
+                )
+
+            # Конвертация в .docx (файлы .docx передаются как есть) и парсинг содержимого,
+            # повторно загруженные файлы берутся из кэша
+            results = sorted(iter_parsed_documents(documents, document_number), key=lambda result: result.index)
+            done = [result for result in results if result.error is None]
+
             # logger.bind(user=request.user.username).debug(f"{new_files} - отправил названние новых файлов")
-            return JsonResponse({"content": content, "new_files": new_files})
+            response = {
+                "content": [result.content for result in done],
+                "new_files": [new_files[result.index] for result in done],
+            }
+            errors = {result.file: result.error for result in results if result.error is not None}
+            if errors:
+                # Файлы, которые не удалось обработать, не прерывают обработку остальных
+                response["errors"] = errors
+            return JsonResponse(response)
 
         except ValueError as ve:
             logger.bind(user=request.user.username).error(f"ValueError: {str(ve)}")
@@ -99,6 +132,59 @@ class UploadView(LoginRequiredMixin, View):
             error_type = type(e).__name__
             return JsonResponse({"error": f"Произошла какая-то ошибка - {error_type} - {str(e)}"}, status=500)
 
+        finally:
+            if not streaming:
+                ticket.release()
+
+    @staticmethod
+    async def stream_results(
+        documents: Dict[str, bytes], new_files: List[str], document_number: int, username: str
+    ) -> AsyncIterator[str]:
+        """
+        Конвертирует и парсит документы, отдавая строку NDJSON по каждому файлу сразу после его обработки.
+
+        Генератор асинхронный: синхронный итератор Django под ASGI дочитывает целиком
+        до отправки первого байта. Каждый следующий файл конвертируется и парсится
+        в пуле потоков (sync_to_async), а готовые строки сразу уходят клиенту.
+
+        Строка файла: index (позиция в загрузке), file, new_file, content и cached (взят из кэша)
+        или error, seconds (время от начала обработки пакета). Последняя строка: {"done": true, "total": ...}.
+        Файлы из кэша и .docx идут первыми, остальные по мере конвертации, поэтому порядок строк
+        может отличаться от порядка загрузки; номер документа всегда берется по index.
+
+        Args:
+            documents (Dict[str, bytes]): Содержимое загруженных файлов по их именам.
+            new_files (List[str]): Имена итоговых .txt в порядке загрузки.
+            document_number (int): Номер первого документа.
+            username (str): Имя пользователя, для логирования.
+
+        Yields:
+            str: Строки NDJSON.
+        """
+        started = time.monotonic()
+
+        def line(item: dict) -> str:
+            return json.dumps(item, ensure_ascii=False) + "\n"
+
+        results = iter_parsed_documents(documents, document_number)
+        next_result = sync_to_async(next, thread_sensitive=False)
+        try:
+            while (result := await next_result(results, None)) is not None:
+                item = {"index": result.index, "file": result.file, "new_file": new_files[result.index]}
+                if result.error is None:
+                    item["content"] = result.content
+                    item["cached"] = result.cached
+                else:
+                    item["error"] = result.error
+                item["seconds"] = round(time.monotonic() - started, 3)
+                yield line(item)
+        except Exception as e:
+            # Заголовки уже отправлены, поэтому ошибка пакета передается последней строкой
+            logger.bind(user=username).error(str(e))
+            yield line({"error": f"Произошла какая-то ошибка - {type(e).__name__} - {e}"})
+            return
+        yield line({"done": True, "total": len(documents)})
+
     def put(self, request: HttpRequest) -> JsonResponse:
         """
         Обновляет содержимое документов на основе полученных данных.
@@ -115,7 +201,11 @@ class UploadView(LoginRequiredMixin, View):
 
             for file_name, file_content in zip(data['files'], data['content']):
 
-                new_content = replace_unsupported_characters(file_content)
+                # Текст разбора уже приведен к cp866 до переноса по ширине (Parser.to_cp866),
+                # здесь заменяются только символы, введенные при правке
+                new_content = replace_unsupported_characters(
+                    file_content, transliterate=ProjectSettings.cp866_transliterate
+                )
                 new_file_name: str = file_name
 
                 if not new_file_name.endswith(".txt"):
@@ -61,10 +61,19 @@ export class AccordionUploader {
 
         this.socket.onopen = () => {
             console.log("WebSocket подключен");
+            // Сообщаем известную версию данных, чтобы сервер дослал пропущенные изменения
+            const version = Number(sessionStorage.getItem("citiesVersion"));
+            if (version) {
+                this.socket.send(JSON.stringify({type: "sync", version}));
+            }
         };
 
         this.socket.onmessage = (event) => {
             const data = JSON.parse(event.data);
+            if (data && (data.type === "cities_delta" || data.type === "cities_resync")) {
+                this.handleCitiesChange(data);
+                return;
+            }
             console.log("Прогресс с сервера:", data);
             this.updateProgress(data);
         };
@@ -79,10 +88,24 @@ export class AccordionUploader {
     }
 
     /**
-     * Обновляет визуальный прогресс загрузки на основе полученного значения.
-     * @param {number} progress - Значение прогресса от 0 до 100.
+     * Запоминает версию данных и передает изменения списка городов остальным модулям страницы
+     * событием `cities:delta` (только изменившиеся строки) или `cities:resync` (загрузить список заново).
+     * @param {{type: string, version: number}} message - Сообщение сервера.
      */
-    updateProgress(progress) {
+    handleCitiesChange(message) {
+        sessionStorage.setItem("citiesVersion", String(message.version));
+        const eventName = message.type === "cities_delta" ? "cities:delta" : "cities:resync";
+        window.dispatchEvent(new CustomEvent(eventName, {detail: message}));
+        console.log(`Изменения списка городов, версия ${message.version}:`, message);
+    }
+
+    /**
+     * Обновляет визуальный прогресс загрузки на основе сообщения о прогрессе задачи импорта.
+     * @param {{progress: number, rows_per_second: number, eta_seconds: ?number}} data - Прогресс
+     *        от 0 до 100, скорость (строк в секунду) и оценка оставшегося времени.
+     */
+    updateProgress(data) {
+        const progress = data.progress;
         const container = document.getElementById("upload-progress-container");
         const bar = document.getElementById("upload-progress-bar");
         const text = document.getElementById("upload-progress-text");
@@ -90,7 +113,9 @@ export class AccordionUploader {
         if (container && bar && text) {
             container.classList.remove("hidden");
             bar.style.width = `${progress}%`;
-            text.textContent = `Файл обработан на ${progress}%`;
+            const eta = data.eta_seconds != null && progress < 100 ? `, осталось ~${Math.ceil(data.eta_seconds)} с` : "";
+            const rate = data.rows_per_second ? ` (${Math.round(data.rows_per_second)} строк/с${eta})` : "";
+            text.textContent = `Файл обработан на ${progress}%${rate}`;
         }
 
         if (progress >= 100) {
@@ -147,7 +172,11 @@ export class AccordionUploader {
                 if (response.ok) {
                     const message = result.message || "Файл успешно загружен";
                     console.log(message);
-                    // Можно отобразить сообщение
+                    if (result.job_id) {
+                        // Прогресс приходит только подписавшимся на группу задачи
+                        this.socket.send(JSON.stringify({type: "subscribe", job_id: result.job_id}));
+                        this.pollImportJob(result.job_id);
+                    }
                 } else {
                     showError(result.error || "Ошибка загрузки файла");
                 }
@@ -159,6 +188,35 @@ export class AccordionUploader {
         });
     }
 
+    /**
+     * Периодически запрашивает состояние задачи импорта, пока она не завершится.
+     * Прогресс приходит через WebSocket, здесь отслеживается только ошибка импорта.
+     * @param {number} jobId - ID задачи импорта, полученный от сервера.
+     * @param {number} [interval=2000] - Интервал опроса в миллисекундах.
+     */
+    pollImportJob(jobId, interval = 2000) {
+        const timer = setInterval(async () => {
+            try {
+                const response = await fetch(`import-jobs/${jobId}/`);
+                if (!response.ok) {
+                    clearInterval(timer);
+                    return;
+                }
+                const job = await response.json();
+                if (job.status === "failed") {
+                    clearInterval(timer);
+                    showError(`Ошибка импорта: ${job.error}`);
+                } else if (job.status === "done") {
+                    clearInterval(timer);
+                    console.log(`Импорт №${jobId} завершен:`, job);
+                }
+            } catch (err) {
+                clearInterval(timer);
+                console.error("Ошибка при получении состояния импорта:", err);
+            }
+        }, interval);
+    }
+
     /**
      * Показывает сообщение об успехе с анимацией.
      * @param {string} message - Текст сообщения.
@@ -44,6 +44,7 @@ export class CityFormHandler {
         this.init();
         this.initCancelButton();
         this.initSaveButton();
+        this.initCitiesChanges();
     }
 
     /**
@@ -54,6 +55,66 @@ export class CityFormHandler {
         this.tableSelect.addEventListener('change', () => this.handleDockNumInput());
     }
 
+    /**
+     * Подписывается на изменения справочника после импорта (события AccordionUploader):
+     * `cities:delta` применяется к списку таблиц и открытой записи, `cities:resync` перезагружает данные.
+     */
+    initCitiesChanges() {
+        window.addEventListener('cities:delta', (e) => this.applyDelta(e.detail));
+        window.addEventListener('cities:resync', () => this.resync());
+    }
+
+    /**
+     * Применяет дельту: обновляет названия таблиц в списке, убирает удаленные таблицы
+     * и заново загружает открытую запись, если она изменилась.
+     * @param {{added: Array<Object>, updated: Array<Object>, deleted: Array<Array<number>>,
+     *          deleted_tables: Array<number>, tables: Record<string, string>}} delta
+     */
+    applyDelta(delta) {
+        for (const [tableId, tableName] of Object.entries(delta.tables)) {
+            let option = this.tableSelect.querySelector(`option[value="${tableId}"]`);
+            if (!option) {
+                option = new Option('', tableId);
+                this.tableSelect.add(option);
+            }
+            option.textContent = ` ${tableName}`;
+        }
+
+        const tableId = Number(this.tableSelect.value);
+        const dockNum = Number(this.dockInput.value);
+        for (const deletedId of delta.deleted_tables) {
+            this.tableSelect.querySelector(`option[value="${deletedId}"]`)?.remove();
+        }
+        if (tableId && delta.deleted_tables.includes(tableId)) {
+            this.form.reset();
+            this.isEditMode = false;
+            this.saveCity.textContent = 'Сохранить';
+            return;
+        }
+
+        const isCurrent = (table_id, dock_num) => table_id === tableId && dock_num === dockNum;
+        const changed = delta.added.some(row => isCurrent(row.table_id, row.dock_num))
+            || delta.updated.some(row => isCurrent(row.table_id, row.dock_num))
+            || delta.deleted.some(([table_id, dock_num]) => isCurrent(table_id, dock_num));
+        if (changed) {
+            this.handleDockNumInput(false);
+        }
+    }
+
+    /**
+     * Изменений слишком много для дельты: если форма не заполняется, перезагружает страницу
+     * (вместе со списком таблиц), иначе только заново загружает открытую запись.
+     */
+    resync() {
+        const touched = this.tableSelect.value || Object.values(this.fields).some(el =>
+            el.type === 'checkbox' ? el.checked : el.value.trim() !== '');
+        if (!touched) {
+            window.location.reload();
+        } else if (this.tableSelect.value && this.dockInput.value.trim() !== '') {
+            this.handleDockNumInput(false);
+        }
+    }
+
     /**
      * Получает и отображает данные о городе по номеру документа и ID таблицы
      * @param {boolean} [first=true] - Флаг инициализации формы, при true номер будет запрошен автоматически
@@ -2,18 +2,22 @@ import {showError} from "./utils.js";
 
 /**
  * Автокомплит для поиска и отображения городов с возможностью ленивой загрузки карточек.
+ *
+ * Поиск выполняется на сервере (api/search/), результаты приходят постранично.
  */
 export class CityAutocomplete {
     /**
      * @param {string} inputId - ID текстового поля ввода.
      * @param {string} suggestionsId - ID контейнера подсказок.
-     * @param {Array<Object>} citiesData - Список данных по городам.
+     * @param {string} searchUrl - Адрес API поиска городов.
+     * @param {number} debounceMs - Задержка перед запросом после ввода (мс).
      */
-    constructor(inputId, suggestionsId, citiesData = []) {
+    constructor(inputId, suggestionsId, searchUrl = 'api/search/', debounceMs = 200) {
         this.input = document.getElementById(inputId);
         this.suggestions = document.getElementById(suggestionsId);
         this.counter = document.getElementById('counter');
-        this.citiesData = citiesData;
+        this.searchUrl = searchUrl;
+        this.debounceMs = debounceMs;
 
         this.selectedIndex = -1;
         this.renderedCities = [];
@@ -21,6 +25,13 @@ export class CityAutocomplete {
         this.renderingCancelled = false;
         this.observer = null;
 
+        this.debounceTimer = null;
+        this.abortController = null;
+        // Состояние постраничной загрузки карточек по нажатию Enter
+        this.cardsQuery = '';
+        this.nextPage = null;
+        this.loadingPage = false;
+
         if (!this.input || !this.suggestions) {
             console.warn("CityAutocomplete: Элементы не найдены на странице.");
             return;
@@ -42,12 +53,58 @@ export class CityAutocomplete {
         this.selectedIndex = -1;
     }
 
+    /**
+     * Запрашивает страницу результатов поиска.
+     * Предыдущий незавершённый запрос отменяется, чтобы устаревшие ответы не перезаписали новые.
+     * @param {string} query - Строка поиска
+     * @param {number} page - Номер страницы (с 1)
+     * @param {number} pageSize - Размер страницы
+     * @returns {Promise<{results: Array<Object>, total: number, has_next: boolean}|null>}
+     *          null, если запрос был отменён
+     */
+    async fetchCities(query, page = 1, pageSize = 20) {
+        this.abortController?.abort();
+        this.abortController = new AbortController();
+
+        const params = new URLSearchParams({q: query, page: String(page), page_size: String(pageSize)});
+        try {
+            const response = await fetch(`${this.searchUrl}?${params}`, {signal: this.abortController.signal});
+            if (!response.ok) {
+                throw new Error(`Ошибка поиска: ${response.status}`);
+            }
+            return await response.json();
+        } catch (err) {
+            if (err.name === 'AbortError') return null;
+            showError(err);
+            console.error('Ошибка поиска городов:', err);
+            return null;
+        }
+    }
+
+    /**
+     * Догружает следующую страницу результатов для карточек, если она есть.
+     * @param {number} pageSize - Размер страницы
+     */
+    async fetchNextCardsPage(pageSize = 50) {
+        if (this.nextPage === null || this.loadingPage) return;
+        this.loadingPage = true;
+        const data = await this.fetchCities(this.cardsQuery, this.nextPage, pageSize);
+        this.loadingPage = false;
+        if (!data || this.renderingCancelled) return;
+
+        this.remainingCities.push(...data.results);
+        this.nextPage = data.has_next ? this.nextPage + 1 : null;
+    }
+
     /**
      * Лениво подгружает карточки
      * @param {number} batchSize - Количество карточек за раз
      * @param {number} delay - Задержка между карточками (мс)
      */
     async loadMoreCities(batchSize = 10, delay = 100) {
+        if (this.remainingCities.length < batchSize) {
+            await this.fetchNextCardsPage();
+        }
         const nextBatch = this.remainingCities.splice(0, batchSize);
         const renderedNow = [];
         for (const city of nextBatch) {
@@ -62,7 +119,7 @@ export class CityAutocomplete {
         }
 
 
-        if (this.remainingCities.length === 0) {
+        if (this.remainingCities.length === 0 && this.nextPage === null) {
             this.observer?.disconnect();
         }
     }
@@ -77,7 +134,7 @@ export class CityAutocomplete {
         container.appendChild(sentinel);
 
         this.observer = new IntersectionObserver(([entry]) => {
-            if (entry.isIntersecting && this.remainingCities.length) {
+            if (entry.isIntersecting && (this.remainingCities.length || this.nextPage !== null)) {
                 this.loadMoreCities();
             }
         }, {root: null, threshold: 0.1});
@@ -137,17 +194,22 @@ export class CityAutocomplete {
     }
 
     /**
-     * Плавно отрисовывает карточки
-     * @param {Array<Object>} cities
+     * Плавно отрисовывает карточки всех совпадений, подгружая их с сервера постранично
+     * @param {string} query
      * @param {number} delay
      */
-    async renderCardsWithDelay(cities, delay = 100) {
+    async renderCardsWithDelay(query, delay = 100) {
         this.cancelRendering();
         this.clearCityCards();
 
         this.renderingCancelled = false;
-        this.renderedCities = cities.slice(0, 10);
-        this.remainingCities = cities.slice(10);
+        this.cardsQuery = query;
+        this.nextPage = 1;
+        this.remainingCities = [];
+        await this.fetchNextCardsPage();
+        if (this.renderingCancelled) return;
+
+        this.renderedCities = this.remainingCities.splice(0, 10);
 
         for (const city of this.renderedCities) {
             if (this.renderingCancelled) return;
@@ -166,35 +228,45 @@ export class CityAutocomplete {
         document.getElementById('scroll-sentinel')?.remove();
     }
 
-    /** Обработка ввода в поле */
+    /** Обработка ввода в поле: запрос к серверу откладывается, пока пользователь печатает */
     handleInput() {
-        const query = this.input.value.trim().toLowerCase();
+        const query = this.input.value.trim();
         this.cancelRendering();
         this.clearSelection();
         this.clearCityCards();
-        this.suggestions.innerHTML = '';
+        clearTimeout(this.debounceTimer);
 
         if (!query) {
+            this.abortController?.abort();
+            this.suggestions.innerHTML = '';
             this.suggestions.style.display = 'none';
             this.counter?.classList.add('opacity-0');
             return;
         }
 
-        const matches = this.citiesData.filter(city =>
-            (city.location && city.location.toLowerCase().includes(query)) ||
-            (city.name_organ && city.name_organ.toLowerCase().includes(query)) ||
-            (city.pseudonim && city.pseudonim.toLowerCase().includes(query))
-        );
+        this.debounceTimer = setTimeout(() => this.showSuggestions(query), this.debounceMs);
+    }
 
+    /**
+     * Запрашивает первую страницу совпадений и показывает подсказки
+     * @param {string} query
+     */
+    async showSuggestions(query) {
+        const data = await this.fetchCities(query);
+        // Пока шёл запрос, строка поиска могла измениться
+        if (!data || query !== this.input.value.trim()) return;
+
+        const matches = data.results;
+        this.suggestions.innerHTML = '';
         this.counter?.classList.remove('opacity-0');
-        if (this.counter) this.counter.textContent = `Найдено совпадений: ${matches.length}`;
+        if (this.counter) this.counter.textContent = `Найдено совпадений: ${data.total}`;
 
         if (!matches.length) {
             this.suggestions.style.display = 'none';
             return;
         }
 
-        matches.slice(0, 20).forEach(city => {
+        matches.forEach(city => {
             const li = document.createElement('li');
             li.classList.add('cursor-pointer', 'px-3', 'py-1', 'hover:bg-gray-200');
             li.textContent = `${city.location || ''}${city.name_organ ? ` — ${city.name_organ}` : ''}${city.pseudonim ? ` — (${city.pseudonim})` : ''}`;
@@ -237,15 +309,11 @@ export class CityAutocomplete {
                 if (this.selectedIndex >= 0) {
                     items[this.selectedIndex].click();
                 } else {
-                    const query = this.input.value.trim().toLowerCase();
+                    const query = this.input.value.trim();
                     if (!query) return;
 
-                    const matches = this.citiesData.filter(city =>
-                        (city.location && city.location.toLowerCase().includes(query)) ||
-                        (city.name_organ && city.name_organ.toLowerCase().includes(query)) ||
-                        (city.pseudonim && city.pseudonim.toLowerCase().includes(query))
-                    );
-                    this.renderCardsWithDelay(matches);
+                    clearTimeout(this.debounceTimer);
+                    this.renderCardsWithDelay(query);
                     this.suggestions.style.display = 'none';
                 }
                 break;
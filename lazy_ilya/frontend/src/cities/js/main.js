@@ -5,9 +5,7 @@ import {CityModalHandler} from "./update-cities.js";
 
 document.addEventListener('DOMContentLoaded', () => {
     toggleAccentClasses('a-cities','a-cities-mob')
-    console.log(citiesData)
-
-    const cities = citiesData;  // массив с данными
-    new CityAutocomplete('default-search', 'suggestions', cities);
-    new CityModalHandler('city-modal',cities);
+    // Города запрашиваются постранично через api/search/, весь справочник на страницу не передаётся
+    new CityAutocomplete('default-search', 'suggestions');
+    new CityModalHandler('city-modal');
 });
\ No newline at end of file
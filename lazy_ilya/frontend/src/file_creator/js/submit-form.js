@@ -3,6 +3,7 @@ import {saveAllChanges} from './save-all.js';
 import {showError} from './utils.js';
 import {runStep1} from './step1.js';
 import handleSaveClick from './handle-save-click.js';  // Импортируем новую функцию
+import {fetchUploadStream} from './upload-stream.js';
 
 /**
  * Асинхронная отправка формы через fetch
@@ -31,29 +32,17 @@ export default async function submitFormAsync(form, formDiv, clearFileList) {
     const step4 = document.querySelector('.step[data-step="4"]');
 
     try {
-        // Сбор данных из формы
-        const formData = new FormData(form);
+        const filesCount = new FormData(form).getAll('files').length;
+        const spinnerText = spinner.querySelector('span');
 
         // Показать спиннер загрузки
         spinner.classList.remove('hidden');
 
-        // Имитируем задержку
-        // await new Promise(resolve => setTimeout(resolve, 1000));
-
-        // Отправка данных формы через fetch
-        const response = await fetch(form.action, {
-            method: 'POST',
-            body: formData,
+        // Сервер присылает каждый файл сразу после обработки — показываем прогресс
+        const data = await fetchUploadStream(form, (item, processed) => {
+            spinnerText.textContent = `Обработано ${processed} из ${filesCount}: ${item.new_file}`;
         });
 
-        // Парсим ответ от сервера
-        const data = await response.json();
-
-        // Проверка на успешный ответ
-        if (!response.ok) {
-            throw new Error(data.error || `Ошибка: ${response.status}`);
-        }
-
         console.log('Ответ от сервера:', data);
 
         // Сбрасываем форму и очищаем файлы
@@ -82,5 +71,6 @@ export default async function submitFormAsync(form, formDiv, clearFileList) {
     } finally {
         // Скрываем спиннер после завершения
         spinner.classList.add('hidden');
+        spinner.querySelector('span').textContent = 'Загрузка файлов...';
     }
 }
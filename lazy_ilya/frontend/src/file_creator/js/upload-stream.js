@@ -0,0 +1,76 @@
+// upload-stream.js
+
+/**
+ * Отправляет форму загрузки и читает ответ сервера потоком (NDJSON).
+ *
+ * Сервер присылает по строке на каждый обработанный файл, как только файл готов:
+ * `{index, file, new_file, content | error, seconds}`, и последнюю строку `{done, total}`.
+ * Результаты раскладываются по `index`, поэтому порядок файлов совпадает с порядком загрузки.
+ *
+ * @async
+ * @function fetchUploadStream
+ * @param {HTMLFormElement} form - Форма загрузки.
+ * @param {Function} [onFile] - Вызывается для каждого файла: `onFile(item, processedCount)`.
+ * @returns {Promise<{new_files: string[], content: string[], errors: Object<string, string>}>}
+ *          Данные в том же виде, что и обычный JSON-ответ сервера.
+ * @throws {Error} Если сервер вернул ошибку или поток оборвался.
+ */
+export async function fetchUploadStream(form, onFile = () => {}) {
+    const response = await fetch(form.action, {
+        method: 'POST',
+        body: new FormData(form),
+        headers: {'Accept': 'application/x-ndjson'},
+    });
+
+    if (!response.ok) {
+        const data = await response.json();
+        throw new Error(data.error || `Ошибка: ${response.status}`);
+    }
+
+    const items = [];
+    const errors = {};
+    let finished = false;
+    let processed = 0;
+
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const item = JSON.parse(line);
+        if (item.done) {
+            finished = true;
+        } else if (item.index === undefined) {
+            throw new Error(item.error || 'Ошибка обработки файлов');
+        } else {
+            if (item.error) {
+                errors[item.file] = item.error;
+            } else {
+                items[item.index] = item;
+            }
+            processed += 1;
+            onFile(item, processed);
+        }
+    };
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const {value, done} = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, {stream: true});
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+
+    if (!finished) {
+        throw new Error('Ответ сервера оборвался');
+    }
+
+    const ready = items.filter(Boolean);
+    return {
+        new_files: ready.map(item => item.new_file),
+        content: ready.map(item => item.content),
+        errors,
+    };
+}
@@ -17,6 +17,17 @@ from cities.routing import websocket_urlpatterns
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "lazy_ilya.settings")
 django.setup()
+
+from file_creator.utils.custom_converter.converter_to_docx import converter_pool
+from file_creator.utils.parser_word.my_parser import parser_pool
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+
+# Процессы конвертации и разбора запускаются и прогреваются вместе с приложением,
+# чтобы первая загрузка не ждала инициализации Spire.Doc и запуска процессов разбора
+if ProjectSettings.converter_prewarm:
+    converter_pool.start()
+    if parser_pool.size > 1:
+        parser_pool.start()
 application = ProtocolTypeRouter(
     {
         "http": get_asgi_application(),
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 import os
 from pathlib import Path
 
+import django
 from django.urls import reverse_lazy
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -85,12 +86,22 @@ WSGI_APPLICATION = "lazy_ilya.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Импорт справочника городов идет одной транзакцией записи: IMMEDIATE берет блокировку
+# записи сразу при BEGIN, и другие пишущие ждут до timeout секунд, а не падают с
+# "database is locked" при попытке повысить блокировку. PRAGMA подключений — sqlite_pragmas.
+# Опция transaction_mode появилась в Django 5.1; на Django 4.2 (requirements.txt для
+# Windows) транзакции начинаются обычным BEGIN, и пишущие ждут блокировку только по timeout.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+        },
     }
 }
+if django.VERSION >= (5, 1):
+    DATABASES["default"]["OPTIONS"]["transaction_mode"] = "IMMEDIATE"
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -156,11 +167,35 @@ ASGI_APPLICATION = "lazy_ilya.asgi.application"
 
 # Настройка слоев каналов для приложения Channels.
 # Channels — это расширение Django для работы с веб-сокетами и другими асинхронными протоколами.
-CHANNEL_LAYERS = {
+# По умолчанию слой на общей базе SQLite: группы видны всем процессам веб-сервера
+# и процессу run_import_jobs. CHANNEL_LAYER=memory — слой в памяти одного процесса.
+if os.getenv("CHANNEL_LAYER", "sqlite") == "memory":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "lazy_ilya.utils.sqlite_channel_layer.SQLiteChannelLayer",
+            "CONFIG": {
+                "path": os.getenv("CHANNEL_LAYER_PATH", BASE_DIR / "cache" / "channels.sqlite3"),
+            },
+        },
+    }
+
+# Кэши Django.
+# cities — версионированный кэш списка городов. Файловый бэкенд общий для веб-сервера
+# и отдельного процесса run_import_jobs, поэтому сброс после импорта виден всем процессам.
+CACHES = {
     "default": {
-        # Используем слой каналов в памяти для разработки.
-        # Это не подходит для продакшена, так как данные будут потеряны при перезапуске сервера.
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "cities": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": BASE_DIR / "cache" / "cities",
+        "TIMEOUT": 24 * 60 * 60,
     },
 }
 
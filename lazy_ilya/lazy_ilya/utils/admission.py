@@ -0,0 +1,351 @@
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, Optional, TypeVar, Union
+
+from django.http import JsonResponse
+
+from lazy_ilya.utils.settings_for_app import logger, ProjectSettings
+
+T = TypeVar("T")
+
+# Вес нового замера в скользящем среднем времени выполнения и ожидания
+EWMA_WEIGHT = 0.2
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """
+    Ограничения одного класса операций.
+
+    Attributes:
+        max_concurrent (int): Сколько операций выполняется одновременно.
+        max_queue (int): Сколько запросов может ждать своей очереди; остальным сразу 429.
+        queue_timeout (float): Сколько секунд запрос ждет в очереди, после чего получает 503.
+    """
+    max_concurrent: int
+    max_queue: int
+    queue_timeout: float
+
+
+def default_limits() -> Dict[str, AdmissionLimits]:
+    """
+    Ограничения классов операций из ProjectSettings.
+
+    Импорт справочника городов сюда не входит: он выполняется позже фоновым
+    обработчиком, поэтому ограничивается числом задач ImportJob в базе
+    (ImportWorker.enqueue), а не временем запроса загрузки.
+
+    Returns:
+        Dict[str, AdmissionLimits]: upload — загрузка документов.
+    """
+    return {
+        "upload": AdmissionLimits(
+            ProjectSettings.upload_max_concurrent,
+            ProjectSettings.upload_max_queue,
+            ProjectSettings.upload_queue_timeout,
+        ),
+    }
+
+
+class AdmissionRejected(Exception):
+    """
+    Запрос не допущен к выполнению.
+
+    Attributes:
+        operation (str): Класс операции.
+        status (int): 429 — очередь заполнена, 503 — истекло время ожидания в очереди.
+        retry_after (int): Через сколько секунд стоит повторить запрос.
+    """
+
+    def __init__(self, operation: str, status: int, retry_after: int, message: str) -> None:
+        super().__init__(message)
+        self.operation = operation
+        self.status = status
+        self.retry_after = retry_after
+
+    def response(self) -> JsonResponse:
+        """JSON-ответ с кодом status и заголовком Retry-After."""
+        response = JsonResponse({"error": str(self), "retry_after": self.retry_after}, status=self.status)
+        response["Retry-After"] = str(self.retry_after)
+        return response
+
+
+class _Operation:
+    """Состояние одного класса операций: выполняющиеся, ожидающие и счетчики."""
+
+    def __init__(self, limits: AdmissionLimits) -> None:
+        self.limits = limits
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service = 0.0
+        self.waiting_since: Dict[int, float] = {}
+
+    def retry_after(self) -> int:
+        """Оценка времени до освобождения места: очередь перед новым запросом, деленная на параллельность."""
+        service = self.avg_service or self.limits.queue_timeout or 1.0
+        rounds = (self.waiting + 1) / max(1, self.limits.max_concurrent)
+        return max(1, math.ceil(service * rounds))
+
+
+class AdmissionTicket:
+    """Разрешение на выполнение операции; release освобождает место (повторный вызов ничего не делает)."""
+
+    def __init__(self, controller: "AdmissionController", operation: str, admitted_at: float) -> None:
+        self._controller = controller
+        self.operation = operation
+        self.admitted_at = admitted_at
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+    def __enter__(self) -> "AdmissionTicket":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class _ReleasingIterator:
+    """Итератор, освобождающий место операции по исчерпании или при close."""
+
+    def __init__(self, ticket: AdmissionTicket, iterator: Iterator[T]) -> None:
+        self._ticket = ticket
+        self._iterator = iter(iterator)
+
+    def __iter__(self) -> "_ReleasingIterator":
+        return self
+
+    def __next__(self) -> T:
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self._ticket.release()
+            raise
+
+    def close(self) -> None:
+        try:
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._ticket.release()
+
+
+class _AsyncReleasingIterator:
+    """
+    Асинхронный вариант _ReleasingIterator для потоковых ответов под ASGI.
+
+    close синхронный: Django вызывает его после отправки ответа, а также если
+    ответ закрыт до начала чтения.
+    """
+
+    def __init__(self, ticket: AdmissionTicket, iterator: AsyncIterator[T]) -> None:
+        self._ticket = ticket
+        self._iterator = iterator.__aiter__()
+
+    def __aiter__(self) -> "_AsyncReleasingIterator":
+        return self
+
+    async def __anext__(self) -> T:
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            self._ticket.release()
+            raise
+
+    def close(self) -> None:
+        self._ticket.release()
+
+
+class AdmissionController:
+    """
+    Ограничивает число одновременно выполняемых тяжелых операций по классам.
+
+    У каждого класса операций (upload, ...) свой предел параллельности и
+    своя ограниченная очередь. Запрос сверх предела ждет в очереди не дольше
+    queue_timeout; если очередь заполнена, он сразу получает отказ 429, если
+    время ожидания истекло — 503. В обоих случаях отказ содержит Retry-After,
+    оцененный по среднему времени выполнения операции. Так при всплеске запросов
+    часть из них быстро получает отказ, а остальные выполняются с обычной скоростью,
+    вместо того чтобы замедлиться все вместе.
+
+    Текущие длины очередей, время ожидания и счетчики отдает snapshot.
+
+    Состояние хранится в памяти процесса (threading.Condition), поэтому пределы
+    действуют на каждый процесс веб-сервера отдельно: при N процессах одновременно
+    выполняется до N * max_concurrent операций. Это ограничение ресурсов процесса
+    (память, потоки, соединения), а не общего числа операций; общий предел там,
+    где он нужен, хранится в базе (см. ImportWorker.enqueue).
+    """
+
+    def __init__(self, limits: Optional[Dict[str, AdmissionLimits]] = None) -> None:
+        """
+        Args:
+            limits (Optional[Dict[str, AdmissionLimits]]): Ограничения по классам операций;
+                по умолчанию берутся из ProjectSettings при первом обращении к классу.
+        """
+        self._limits = limits
+        self._operations: Dict[str, _Operation] = {}
+        self._condition = threading.Condition()
+        self._arrivals = itertools.count()
+
+    def limits_for(self, operation: str) -> AdmissionLimits:
+        """
+        Ограничения класса операций.
+
+        Args:
+            operation (str): Класс операции.
+
+        Returns:
+            AdmissionLimits: Ограничения из конструктора или из ProjectSettings.
+
+        Raises:
+            KeyError: Для неизвестного класса операций.
+        """
+        if self._limits is not None:
+            return self._limits[operation]
+        return default_limits()[operation]
+
+    def acquire(self, operation: str) -> AdmissionTicket:
+        """
+        Занимает место для операции, при необходимости ожидая в очереди.
+
+        Args:
+            operation (str): Класс операции.
+
+        Returns:
+            AdmissionTicket: Разрешение; после выполнения операции нужно вызвать release.
+
+        Raises:
+            AdmissionRejected: Очередь заполнена (429) или истекло время ожидания (503).
+        """
+        with self._condition:
+            state = self._state(operation)
+            limits = state.limits
+            if state.active < limits.max_concurrent and not state.waiting:
+                return self._admit(operation, state, waited=0.0)
+
+            if state.waiting >= limits.max_queue:
+                state.rejected += 1
+                retry_after = state.retry_after()
+                logger.warning(f"Отказ в выполнении {operation}: очередь заполнена ({state.waiting})")
+                raise AdmissionRejected(
+                    operation, 429, retry_after, "Сервер занят другими запросами, повторите позже"
+                )
+
+            started = time.monotonic()
+            token = next(self._arrivals)
+            state.waiting += 1
+            state.waiting_since[token] = started
+            try:
+                deadline = started + limits.queue_timeout
+                while state.active >= limits.max_concurrent or self._ahead(state, token):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        state.timed_out += 1
+                        retry_after = state.retry_after()
+                        logger.warning(
+                            f"Отказ в выполнении {operation}: ожидание дольше {limits.queue_timeout:g} с"
+                        )
+                        raise AdmissionRejected(
+                            operation, 503, retry_after, "Сервер перегружен, повторите позже"
+                        )
+                    self._condition.wait(remaining)
+            finally:
+                state.waiting -= 1
+                del state.waiting_since[token]
+                # Ушедший из очереди (допущенный или по таймауту) пропускает следующего
+                self._condition.notify_all()
+            return self._admit(operation, state, waited=time.monotonic() - started)
+
+    @staticmethod
+    def release_after(
+        ticket: AdmissionTicket, iterator: Union[Iterator[T], AsyncIterator[T]]
+    ) -> Union[Iterator[T], AsyncIterator[T]]:
+        """
+        Оборачивает содержимое потокового ответа: место освобождается, когда iterator
+        исчерпан или ответ закрыт (в том числе если клиент отключился до начала чтения).
+
+        Args:
+            ticket (AdmissionTicket): Разрешение операции.
+            iterator (Union[Iterator[T], AsyncIterator[T]]): Генератор содержимого ответа,
+                асинхронный — для ответов, которые под ASGI отправляются по мере готовности.
+
+        Returns:
+            Union[Iterator[T], AsyncIterator[T]]: Итератор того же вида с методом close,
+            который Django вызывает при закрытии ответа.
+        """
+        if hasattr(iterator, "__aiter__"):
+            return _AsyncReleasingIterator(ticket, iterator)
+        return _ReleasingIterator(ticket, iterator)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Текущее состояние всех классов операций.
+
+        Returns:
+            Dict[str, Dict[str, float]]: По классу операции: limits, active, queue_depth,
+            oldest_wait_seconds (сколько ждет самый давний запрос), avg_wait_seconds,
+            max_wait_seconds, avg_service_seconds, admitted, rejected, timed_out.
+        """
+        now = time.monotonic()
+        with self._condition:
+            return {
+                operation: {
+                    "max_concurrent": state.limits.max_concurrent,
+                    "max_queue": state.limits.max_queue,
+                    "queue_timeout": state.limits.queue_timeout,
+                    "active": state.active,
+                    "queue_depth": state.waiting,
+                    "oldest_wait_seconds": round(now - min(state.waiting_since.values(), default=now), 3),
+                    "avg_wait_seconds": round(state.avg_wait, 3),
+                    "max_wait_seconds": round(state.max_wait, 3),
+                    "avg_service_seconds": round(state.avg_service, 3),
+                    "admitted": state.admitted,
+                    "rejected": state.rejected,
+                    "timed_out": state.timed_out,
+                }
+                for operation, state in self._operations.items()
+            }
+
+    def _state(self, operation: str) -> _Operation:
+        state = self._operations.get(operation)
+        if state is None:
+            state = self._operations[operation] = _Operation(self.limits_for(operation))
+        return state
+
+    @staticmethod
+    def _ahead(state: _Operation, token: int) -> bool:
+        """Есть ли в очереди запрос, пришедший раньше (очередь обслуживается по порядку прихода)."""
+        return min(state.waiting_since) < token
+
+    def _admit(self, operation: str, state: _Operation, waited: float) -> AdmissionTicket:
+        state.active += 1
+        state.admitted += 1
+        state.avg_wait += EWMA_WEIGHT * (waited - state.avg_wait)
+        state.max_wait = max(state.max_wait, waited)
+        return AdmissionTicket(self, operation, time.monotonic())
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        with self._condition:
+            state = self._operations[ticket.operation]
+            state.active -= 1
+            service = time.monotonic() - ticket.admitted_at
+            state.avg_service = service if not state.avg_service else (
+                state.avg_service + EWMA_WEIGHT * (service - state.avg_service)
+            )
+            self._condition.notify_all()
+
+
+admission_controller = AdmissionController()
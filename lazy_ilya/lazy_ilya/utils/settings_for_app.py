@@ -22,12 +22,69 @@ class ProjectSettings:
         log_dir: Путь к папке для логов.
         LOGGER_LEVEL_STDOUT: Уровень логирования для stdout.
         LOGGER_LEVEL_FILE: Уровень логирования для файлового лога.
+        counter_flush_interval: Период сброса накопленных счетчиков запросов к городам в БД, в секундах.
+            0 — записывать сразу.
+        converter_workers: Количество процессов для конвертации загруженных .doc/.rtf в .docx.
+        converter_timeout: Время на конвертацию одного файла, в секундах.
+        converter_worker_max_tasks: Сколько файлов конвертирует процесс пула до перезапуска; 0 — без ограничения.
+        converter_worker_max_rss_bytes: Предел памяти процесса пула конвертации в байтах,
+            после которого он перезапускается; 0 — без ограничения.
+        converter_prewarm: Запускать пулы конвертации и разбора при старте веб-приложения (asgi.py).
+        parser_workers: Количество процессов пула разбора .docx и .rtf (parser_pool) для загрузок
+            (iter_parsed_documents) и каталога (Parser.create_file_parsed); 1 — разбор в самом процессе.
+        parser_timeout: Время на разбор одного документа в процессе пула, в секундах.
+        cp866_transliterate: Заменять в сохраняемых .txt типографские кавычки, тире и т.п.
+            похожими символами cp866, а не на "?". По умолчанию выключено: включение меняет
+            текст разбора у существующих установок (CP866_TRANSLITERATE=1).
+        parse_cache_dir: Каталог кэша результатов разбора загруженных документов.
+        parse_cache_max_bytes: Предельный размер этого кэша в байтах; 0 — кэш отключен.
+        city_delta_max_rows: Сколько строк может изменить импорт, чтобы клиентам ушла дельта;
+            при большем числе изменений им отправляется указание загрузить список заново.
+        city_delta_history: Сколько последних дельт хранится для отставших клиентов.
+        progress_max_rate: Сколько сообщений о прогрессе импорта в секунду получает клиент, не больше.
+        upload_max_concurrent: Сколько загрузок документов (UploadView) выполняется одновременно
+            в одном процессе веб-сервера.
+        upload_max_queue: Сколько запросов может ждать в очереди; остальные сразу получают 429.
+        upload_queue_timeout: Сколько секунд запрос ждет в очереди, после чего получает 503.
+        import_max_pending: Сколько задач импорта справочника городов может быть в очереди и
+            в работе одновременно (во всех процессах); следующая загрузка получает 429.
+        import_heartbeat_interval: Как часто обработчик задач импорта отмечает, что задача еще выполняется, в секундах.
+        import_lease_timeout: Через сколько секунд без такой отметки задача считается прерванной
+            и возвращается в очередь (если процесс обработчика на этом же хосте завершился — сразу).
+        sqlite_journal_mode, sqlite_synchronous, sqlite_cache_size, sqlite_mmap_size, sqlite_temp_store:
+            PRAGMA, которые выставляются каждому новому подключению к SQLite (sqlite_pragmas).
+            cache_size отрицательный — в КиБ, mmap_size — в байтах.
     """
     base_dir: Optional[Path] = BASE_DIR
     tlg_dir: Optional[str] = Path(os.getenv("TLG_PATH")).resolve()
     log_dir: Optional[Path] = BASE_DIR / "logs"  # Используем Path для лучшей работы с путями
     LOGGER_LEVEL_STDOUT: Optional[str] = os.getenv("LOGGER_LEVEL_STDOUT", "INFO")  # Устанавливаем значение по умолчанию
     LOGGER_LEVEL_FILE: Optional[str] = os.getenv("LOGGER_LEVEL_FILE", "DEBUG")  # Устанавливаем значение по умолчанию
+    counter_flush_interval: float = float(os.getenv("COUNTER_FLUSH_INTERVAL", "5"))
+    converter_workers: int = int(os.getenv("CONVERTER_WORKERS", min(4, os.cpu_count() or 1)))
+    converter_timeout: float = float(os.getenv("CONVERTER_TIMEOUT", "120"))
+    converter_worker_max_tasks: int = int(os.getenv("CONVERTER_WORKER_MAX_TASKS", "200"))
+    converter_worker_max_rss_bytes: int = int(float(os.getenv("CONVERTER_WORKER_MAX_RSS_MB", "500")) * 1024 * 1024)
+    converter_prewarm: bool = os.getenv("CONVERTER_PREWARM", "1") == "1"
+    parser_workers: int = int(os.getenv("PARSER_WORKERS", min(4, os.cpu_count() or 1)))
+    parser_timeout: float = float(os.getenv("PARSER_TIMEOUT", "60"))
+    cp866_transliterate: bool = os.getenv("CP866_TRANSLITERATE", "0") == "1"
+    parse_cache_dir: Path = Path(os.getenv("PARSE_CACHE_DIR", BASE_DIR / "cache" / "parsed"))
+    parse_cache_max_bytes: int = int(float(os.getenv("PARSE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+    city_delta_max_rows: int = int(os.getenv("CITY_DELTA_MAX_ROWS", "1000"))
+    city_delta_history: int = int(os.getenv("CITY_DELTA_HISTORY", "20"))
+    progress_max_rate: float = float(os.getenv("PROGRESS_MAX_RATE", "4"))
+    upload_max_concurrent: int = int(os.getenv("UPLOAD_MAX_CONCURRENT", min(4, os.cpu_count() or 1)))
+    upload_max_queue: int = int(os.getenv("UPLOAD_MAX_QUEUE", "8"))
+    upload_queue_timeout: float = float(os.getenv("UPLOAD_QUEUE_TIMEOUT", "30"))
+    import_max_pending: int = int(os.getenv("IMPORT_MAX_PENDING", "3"))
+    import_heartbeat_interval: float = float(os.getenv("IMPORT_HEARTBEAT_INTERVAL", "15"))
+    import_lease_timeout: float = float(os.getenv("IMPORT_LEASE_TIMEOUT", "120"))
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_cache_size: int = -int(float(os.getenv("SQLITE_CACHE_MB", "64")) * 1024)
+    sqlite_mmap_size: int = int(float(os.getenv("SQLITE_MMAP_MB", "256")) * 1024 * 1024)
+    sqlite_temp_store: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
 
 
 settings = ProjectSettings()
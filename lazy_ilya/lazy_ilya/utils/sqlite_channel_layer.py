@@ -0,0 +1,353 @@
+import asyncio
+import base64
+import json
+import random
+import sqlite3
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    expires REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_messages_channel ON channel_messages (channel, id);
+CREATE INDEX IF NOT EXISTS channel_messages_expires ON channel_messages (expires);
+CREATE TABLE IF NOT EXISTS channel_groups (
+    group_name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    joined REAL NOT NULL,
+    PRIMARY KEY (group_name, channel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS channel_groups_channel ON channel_groups (channel);
+"""
+
+# Как часто удаляются просроченные сообщения и членства в группах, в секундах
+CLEANUP_INTERVAL = 1.0
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and "__bytes__" in value:
+            return base64.b64decode(value["__bytes__"])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def serialize(message: Dict[str, Any]) -> str:
+    """Сериализует сообщение ASGI в JSON; bytes (бинарные кадры WebSocket) кодируются в base64."""
+    return json.dumps(_encode(message), ensure_ascii=False, separators=(",", ":"))
+
+
+def deserialize(body: str) -> Dict[str, Any]:
+    """Обратное к serialize."""
+    return _decode(json.loads(body))
+
+
+class _LoopState:
+    """Ожидающие receive в одном цикле событий и задача, следящая за изменениями базы."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.event = asyncio.Event()
+        self.waiters = 0
+        self.watcher: Optional[asyncio.Task] = None
+
+    def wake(self) -> None:
+        """Будит все ожидающие receive этого цикла (вызывается в самом цикле)."""
+        self.event.set()
+        self.event = asyncio.Event()
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    Слой каналов Channels на общей базе SQLite в режиме WAL.
+
+    Нужен, когда веб-сервер запущен в нескольких процессах (или импорт выполняется
+    отдельной командой run_import_jobs): InMemoryChannelLayer виден только внутри
+    своего процесса, а Redis в закрытой сети недоступен. Все процессы открывают
+    один файл базы; сообщения каналов и членство в группах хранятся в таблицах.
+
+    Поддерживается весь API слоя: send, receive, new_channel, group_add,
+    group_discard, group_send, flush, close, а также expiry (срок жизни
+    сообщения), group_expiry (срок членства в группе) и capacity/channel_capacity
+    (переполненный канал — ChannelFull в send, в group_send такой канал пропускается).
+
+    Запросы выполняются в отдельном потоке слоя, чтобы не блокировать цикл событий.
+    receive не опрашивает базу постоянно: сообщения из своего процесса будят его
+    сразу, а о записях других процессов фоновая задача узнает по PRAGMA data_version
+    (раз в poll_interval секунд) — один дешевый запрос на процесс, а не на канал.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        expiry: int = 60,
+        group_expiry: int = 86400,
+        capacity: int = 100,
+        channel_capacity: Optional[Dict[str, int]] = None,
+        poll_interval: float = 0.05,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            path (Union[str, Path]): Файл базы; каталог создается при необходимости.
+            expiry (int): Сколько секунд сообщение ждет получателя.
+            group_expiry (int): Сколько секунд действует членство в группе.
+            capacity (int): Сколько сообщений может ждать в одном канале.
+            channel_capacity (Optional[Dict[str, int]]): Отдельная емкость для каналов по шаблону имени.
+            poll_interval (float): Как часто проверять записи других процессов, в секундах.
+        """
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(channel_capacity or {})
+        self.path = Path(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        # Один поток на слой: соединение SQLite используется только из него
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-channel-layer")
+        self._connection: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._next_cleanup = 0.0
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+        self._loops_lock = threading.Lock()
+
+    # Работа с базой (в потоке слоя)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], T]) -> T:
+        """Выполняет func в транзакции с блокировкой записи (BEGIN IMMEDIATE)."""
+        connection = self._db()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+    def _has_room(self, connection: sqlite3.Connection, channel: str, now: float) -> bool:
+        (count,) = connection.execute(
+            "SELECT COUNT(*) FROM channel_messages WHERE channel = ? AND expires >= ?", (channel, now)
+        ).fetchone()
+        return count < self.get_capacity(channel)
+
+    def _cleanup(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        Удаляет просроченные сообщения и членства. Канал с просроченным сообщением
+        считается брошенным и исключается из всех групп, как в InMemoryChannelLayer.
+        """
+        if now < self._next_cleanup:
+            return
+        self._next_cleanup = now + CLEANUP_INTERVAL
+        connection.execute(
+            "DELETE FROM channel_groups WHERE channel IN "
+            "(SELECT channel FROM channel_messages WHERE expires < ?)", (now,)
+        )
+        connection.execute("DELETE FROM channel_messages WHERE expires < ?", (now,))
+        connection.execute("DELETE FROM channel_groups WHERE joined < ?", (now - self.group_expiry,))
+
+    def _send(self, channel: str, body: str) -> None:
+        def insert(connection: sqlite3.Connection) -> None:
+            now = time.time()
+            self._cleanup(connection, now)
+            if not self._has_room(connection, channel, now):
+                raise ChannelFull(channel)
+            connection.execute(
+                "INSERT INTO channel_messages (channel, expires, body) VALUES (?, ?, ?)",
+                (channel, now + self.expiry, body),
+            )
+
+        self._transaction(insert)
+
+    def _group_send(self, group: str, body: str) -> int:
+        def insert(connection: sqlite3.Connection) -> int:
+            now = time.time()
+            self._cleanup(connection, now)
+            channels = [
+                channel for (channel,) in connection.execute(
+                    "SELECT channel FROM channel_groups WHERE group_name = ? AND joined >= ?",
+                    (group, now - self.group_expiry),
+                )
+            ]
+            rows = [
+                (channel, now + self.expiry, body)
+                for channel in channels if self._has_room(connection, channel, now)
+            ]
+            connection.executemany("INSERT INTO channel_messages (channel, expires, body) VALUES (?, ?, ?)", rows)
+            return len(rows)
+
+        return self._transaction(insert)
+
+    def _pop(self, channel: str) -> Optional[str]:
+        connection = self._db()
+        # fetchall завершает оператор, иначе блокировка записи держится до сборки курсора
+        rows = connection.execute(
+            "DELETE FROM channel_messages WHERE id = (SELECT id FROM channel_messages "
+            "WHERE channel = ? AND expires >= ? ORDER BY id LIMIT 1) RETURNING body",
+            (channel, time.time()),
+        ).fetchall()
+        return rows[0][0] if rows else None
+
+    def _changed_elsewhere(self) -> bool:
+        """Записывал ли в базу другой процесс (или другое соединение) с прошлой проверки."""
+        (version,) = self._db().execute("PRAGMA data_version").fetchone()
+        changed = self._data_version is not None and version != self._data_version
+        self._data_version = version
+        return changed
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # Пробуждение receive
+
+    def _loop_state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = _LoopState(loop)
+            return state
+
+    def _wake_all(self) -> None:
+        """Будит ожидающие receive во всех циклах событий процесса."""
+        with self._loops_lock:
+            states = list(self._loops.values())
+        for state in states:
+            if state.loop.is_closed():
+                with self._loops_lock:
+                    self._loops.pop(state.loop, None)
+                continue
+            try:
+                state.loop.call_soon_threadsafe(state.wake)
+            except RuntimeError:  # Цикл закрылся между проверкой и вызовом
+                pass
+
+    async def _watch(self, state: _LoopState) -> None:
+        """Пока в цикле есть ожидающие receive, проверяет записи других процессов."""
+        while state.waiters:
+            await asyncio.sleep(self.poll_interval)
+            if await self._run(self._changed_elsewhere):
+                # Изменение замечает один наблюдатель, поэтому будятся все циклы процесса
+                self._wake_all()
+        state.watcher = None
+
+    # API слоя каналов
+
+    async def send(self, channel: str, message: Dict[str, Any]) -> None:
+        """
+        Отправляет сообщение в канал.
+
+        Raises:
+            ChannelFull: В канале уже capacity непрочитанных сообщений.
+        """
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+        await self._run(self._send, channel, serialize(message))
+        self._wake_all()
+
+    async def receive(self, channel: str) -> Dict[str, Any]:
+        """Ждет и возвращает первое сообщение канала."""
+        assert self.valid_channel_name(channel)
+        state = self._loop_state()
+        while True:
+            event = state.event  # До запроса: пробуждение во время запроса не потеряется
+            body = await self._run(self._pop, channel)
+            if body is not None:
+                return deserialize(body)
+            state.waiters += 1
+            if state.watcher is None:
+                state.watcher = asyncio.ensure_future(self._watch(state))
+            try:
+                await event.wait()
+            finally:
+                state.waiters -= 1
+
+    async def new_channel(self, prefix: str = "specific.") -> str:
+        """Возвращает новое уникальное имя канала."""
+        return "%s.sqlite!%s" % (prefix, "".join(random.choice(string.ascii_letters) for _ in range(12)))
+
+    async def group_add(self, group: str, channel: str) -> None:
+        """Добавляет канал в группу (повторное добавление продлевает членство)."""
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        await self._run(self._transaction, lambda connection: connection.execute(
+            "INSERT OR REPLACE INTO channel_groups (group_name, channel, joined) VALUES (?, ?, ?)",
+            (group, channel, time.time()),
+        ))
+
+    async def group_discard(self, group: str, channel: str) -> None:
+        """Убирает канал из группы."""
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+        await self._run(self._transaction, lambda connection: connection.execute(
+            "DELETE FROM channel_groups WHERE group_name = ? AND channel = ?", (group, channel)
+        ))
+
+    async def group_send(self, group: str, message: Dict[str, Any]) -> None:
+        """Отправляет сообщение всем каналам группы; переполненные каналы пропускаются."""
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        if await self._run(self._group_send, group, serialize(message)):
+            self._wake_all()
+
+    async def flush(self) -> None:
+        """Удаляет все сообщения и группы."""
+        def delete_all(connection: sqlite3.Connection) -> None:
+            connection.execute("DELETE FROM channel_messages")
+            connection.execute("DELETE FROM channel_groups")
+
+        await self._run(self._transaction, delete_all)
+
+    async def close(self) -> None:
+        """Закрывает соединение с базой."""
+        await self._run(self._close)
+
+    def counts(self) -> Dict[str, int]:
+        """Количество ожидающих сообщений и членств в группах (для отладки и тестов)."""
+        def count() -> List[int]:
+            return [self._db().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("channel_messages", "channel_groups")]
+
+        messages, groups = self._executor.submit(count).result()
+        return {"messages": messages, "groups": groups}
@@ -0,0 +1,39 @@
+from typing import Any, Dict
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from lazy_ilya.utils.settings_for_app import ProjectSettings
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    """
+    PRAGMA для подключений к базе из ProjectSettings.
+
+    WAL дает читателям (/cities/) прежний снимок данных, пока импорт держит
+    транзакцию записи, и не блокирует их на время ее фиксации.
+
+    Returns:
+        Dict[str, Any]: Имя PRAGMA -> значение, в порядке применения.
+    """
+    return {
+        "journal_mode": ProjectSettings.sqlite_journal_mode,
+        "synchronous": ProjectSettings.sqlite_synchronous,
+        "cache_size": ProjectSettings.sqlite_cache_size,
+        "mmap_size": ProjectSettings.sqlite_mmap_size,
+        "temp_store": ProjectSettings.sqlite_temp_store,
+    }
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs) -> None:
+    """
+    Выставляет PRAGMA каждому новому подключению Django к SQLite.
+
+    Запросы идут напрямую в подключение sqlite3, мимо курсора Django,
+    чтобы не попадать в connection.queries и подсчеты запросов в тестах.
+    """
+    if connection.vendor != "sqlite":
+        return
+    for name, value in sqlite_pragmas().items():
+        connection.connection.execute(f"PRAGMA {name}={value}")
@@ -5,6 +5,8 @@ from django.utils.timezone import now, timedelta
 
 from file_creator.models import Counter
 from cities.models import CounterCities, TableNames, CityData
+from cities.utils.counters.city_counters import apply_counter_deltas
+from cities.utils.counters.city_stats import rebuild_daily_top
 
 User = get_user_model()
 
@@ -54,3 +56,18 @@ class StatisticsAppTests(TestCase):
         self.assertEqual(response.context['coffee_cups'], 7)
         self.assertIn('best_day', response.context)
         self.assertEqual(len(response.context['top_cities']), 3)
+
+    def test_week_top_cities(self):
+        """Топ за неделю строится из рейтингов CityDailyTop"""
+        city = CityData.objects.get(location="Город2")
+        apply_counter_deltas({city.id: 4})
+        rebuild_daily_top()
+
+        self.client.login(username="testuser", password="password123")
+        response = self.client.get(reverse('statistics_app:statistics_app'))
+
+        week_top = response.context['week_top_cities']
+        self.assertEqual(len(week_top), 1)
+        self.assertEqual(week_top[0]['city'], city)
+        self.assertEqual(week_top[0]['hits'], 4)
+        self.assertEqual(week_top[0]['sparkline'][-1], 4)
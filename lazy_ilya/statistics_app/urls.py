@@ -1,9 +1,10 @@
 from django.urls import path
 
-from statistics_app.views import StatisticsApp
+from statistics_app.views import AdmissionStats, StatisticsApp
 
 app_name = "statistics_app"
 urlpatterns = [
     path("", StatisticsApp.as_view(), name="statistics_app"),
+    path("admission/", AdmissionStats.as_view(), name="admission_stats"),
 
 ]
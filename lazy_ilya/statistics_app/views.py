@@ -1,13 +1,16 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Sum
 from django.db.models.functions import TruncDate
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views import View
 
 from cities.models import CounterCities
+from cities.utils.import_jobs.import_worker import ImportWorker
+from cities.utils.counters.city_stats import sparkline_points, top_cities_for_days
 from file_creator.models import Counter
+from lazy_ilya.utils.admission import admission_controller
 
 
 # Create your views here.
@@ -47,10 +50,35 @@ class StatisticsApp(LoginRequiredMixin, View):
             .order_by("-count_responses")[:3]
         )
 
+        # ✅ Топ-3 городов за неделю со спарклайнами по дням из заранее посчитанных рейтингов
+        week_top_cities = top_cities_for_days(days=7, limit=3)
+        for item in week_top_cities:
+            item["sparkline_points"] = sparkline_points(item["sparkline"])
+
         return render(request, 'statistics_app/statistics_app.html', {
             'total_files': total_files,
             'best_day': best_day,
             'best_day_total': best_day_total,
             'coffee_cups': coffee_cups,
             'top_cities': top_cities,  # 🔥 Передаём в шаблон
+            'week_top_cities': week_top_cities,
         })
+
+
+class AdmissionStats(LoginRequiredMixin, View):
+    login_url = reverse_lazy('myauth:login')
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """
+        Текущее состояние ограничителя тяжелых операций: для загрузок документов сколько
+        выполняется, сколько ждет в очереди, время ожидания и число отказов (в этом процессе),
+        для импорта городов — задачи в общей очереди ImportJob.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: Снимок admission_controller.snapshot() по классам операций
+                и ImportWorker.pending_snapshot() под ключом "import".
+        """
+        return JsonResponse({**admission_controller.snapshot(), "import": ImportWorker.pending_snapshot()})